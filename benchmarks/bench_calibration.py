@@ -0,0 +1,107 @@
+"""Benchmark: NumPy calibration kernel vs the former pandas implementation.
+
+Times one 200k-row block (the chunked finalise's ``block_rows``) of six AI
+channels through
+
+* ``legacy``          -- the pandas ``apply_calibration`` this kernel replaced
+  (``raw.copy()``, one Series per column, ``.loc`` masked ``Rhtr``), kept
+  here verbatim as the baseline;
+* ``apply_calibration`` -- the DataFrame wrapper over the kernel (its
+  ``to_numpy`` block is column-major);
+* ``calibrate_array``   -- the kernel alone on a row-major block, as finalise
+  reads it from HDF5 (processed in cache tiles);
+* ``calibrate_array/F`` -- the kernel on the same block in column-major order.
+
+Run from the repository root::
+
+    python benchmarks/bench_calibration.py [--rows 200000] [--repeat 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from pioner.back.modes import apply_calibration, calibrate_array  # noqa: E402
+from pioner.shared.calibration import Calibration  # noqa: E402
+from pioner.shared.channels import (  # noqa: E402
+    AD595_AI,
+    HEATER_AO,
+    HEATER_CURRENT_AI,
+    UHTR_AI,
+    UMOD_AI,
+    UTPL_AI,
+)
+
+
+def legacy_apply_calibration(raw, sample_rate, calibration, voltage_profiles, ai_channels):
+    df = raw.copy()
+    df["time"] = (np.arange(len(df)) * 1000.0) / sample_rate
+    hw = calibration.hardware
+    df["Taux"] = hw.correct_ad595(100.0 * float(df[AD595_AI].mean()))
+    ax = df[UTPL_AI] * (1000.0 / hw.gain_utpl) + calibration.utpl0
+    df["temp"] = calibration.ttpl0 * ax + calibration.ttpl1 * (ax**2)
+    df["temp"] += df["Taux"]
+    ax_hr = df[UMOD_AI] * (1000.0 / hw.gain_umod) + calibration.utpl0
+    df["temp-hr"] = calibration.ttpl0 * ax_hr + calibration.ttpl1 * (ax_hr**2)
+    ih = calibration.ihtr0 + df[HEATER_CURRENT_AI] * calibration.ihtr1
+    nz = ih.abs() > 1e-9
+    rhtr = pd.Series(np.full(len(df), np.nan), index=df.index)
+    rhtr.loc[nz] = (
+        (df.loc[nz, UHTR_AI] - df.loc[nz, HEATER_CURRENT_AI] + calibration.uhtr0)
+        * calibration.uhtr1
+        / ih.loc[nz]
+    )
+    df["Thtr"] = (
+        calibration.thtr0
+        + calibration.thtr1 * (rhtr + calibration.thtrcorr)
+        + calibration.thtr2 * ((rhtr + calibration.thtrcorr) ** 2)
+    )
+    ref = np.asarray(voltage_profiles[HEATER_AO], dtype=float)
+    df["Uref"] = np.tile(ref, int(np.ceil(len(df) / ref.size)))[: len(df)]
+    return df.drop(columns=[c for c in ai_channels if c in df.columns])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    channels = list(range(6))
+    data = rng.uniform(-0.5, 0.5, size=(args.rows, len(channels)))
+    data[::10, HEATER_CURRENT_AI] = 0.0  # idle samples -> NaN Thtr
+    raw = pd.DataFrame(data, columns=channels)
+    data_f = np.asfortranarray(data)
+    profile = np.linspace(0.0, 1.0, 20_000)
+    cal = Calibration()
+    sr = 20_000.0
+
+    cases = {
+        "legacy": lambda: legacy_apply_calibration(raw, sr, cal, {HEATER_AO: profile}, channels),
+        "apply_calibration": lambda: apply_calibration(
+            raw, sr, cal, {HEATER_AO: profile}, ai_channels=channels
+        ),
+        "calibrate_array": lambda: calibrate_array(data, channels, sr, cal, uref_profile=profile),
+        "calibrate_array/F": lambda: calibrate_array(
+            data_f, channels, sr, cal, uref_profile=profile
+        ),
+    }
+    baseline = None
+    print(f"{args.rows} rows x {len(channels)} channels, best of {args.repeat}")
+    for name, fn in cases.items():
+        best = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+        baseline = baseline or best
+        print(f"  {name:<18} {best * 1e3:8.2f} ms   x{baseline / best:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ import h5py
 from datetime import datetime
 from pioner_app.core.calibration import Calibration
 from bisect import bisect_left
+from functools import lru_cache
 
 from pioner_app.core.settings import settings
 
@@ -190,6 +191,28 @@ def voltage_to_temperature( voltage: np.array, calibration: Calibration) -> np.a
         return temp
 
 
+@lru_cache(maxsize=8)
+def _t2v_table(theater0, theater1, theater2, safe_voltage, grid_size):
+    """Sorted, read-only (temp, volt) inverse table of one heater polynomial.
+
+    Only the polynomial and the grid decide it, so it is kept per key until a
+    coefficient or safe_voltage changes (edit / reload of the calibration).
+    The arrays are shared by every caller, hence read-only.
+    """
+    volt_calib = np.linspace(0.0, safe_voltage, grid_size, dtype=float)
+    temp_calib = theater0 * volt_calib + theater1 * (volt_calib**2) + theater2 * (volt_calib**3)
+
+    order = np.argsort(temp_calib, kind="mergesort")
+    temp_sorted = temp_calib[order]
+    volt_sorted = volt_calib[order]
+
+    temp_sorted, unique_idx = np.unique(temp_sorted, return_index=True)
+    volt_sorted = volt_sorted[unique_idx]
+    temp_sorted.flags.writeable = False
+    volt_sorted.flags.writeable = False
+    return temp_sorted, volt_sorted
+
+
     # TODO: think maybe to create a T-V (and vice versa) converter class
 def temperature_to_voltage(temp, calibration):
 
@@ -201,15 +224,10 @@ def temperature_to_voltage(temp, calibration):
         return float(voltage[0]) if voltage.size == 1 else voltage
 
     grid_size = max(20001, int(round(safe_voltage * 5000)))
-    volt_calib = np.linspace(0.0, safe_voltage, grid_size, dtype=float)
-    temp_calib = np.asarray(voltage_to_temperature(volt_calib, calibration), dtype=float)
-
-    order = np.argsort(temp_calib, kind="mergesort")
-    temp_sorted = temp_calib[order]
-    volt_sorted = volt_calib[order]
-
-    temp_sorted, unique_idx = np.unique(temp_sorted, return_index=True)
-    volt_sorted = volt_sorted[unique_idx]
+    temp_sorted, volt_sorted = _t2v_table(
+        float(calibration.theater0), float(calibration.theater1),
+        float(calibration.theater2), safe_voltage, grid_size,
+    )
 
     if temp_sorted.size == 0:
         voltage = np.zeros(len(temp), dtype=float)
@@ -15,10 +15,18 @@ implementations selected at runtime by the ``AcquisitionMode`` field of
   experiment arms its own AI scan and a separate monitoring AI session
   runs between experiments. Preserved as an alternative for empirical
   validation (see ``docs/live-streaming.md`` section 13.4).
+* :class:`ProcessAIProvider` -- the persistent scan, run by a child
+  process that owns the DAQ and the whole manager (:class:`AcquisitionEngine`
+  is its GUI-side proxy); samples come back through a shared-memory ring,
+  so GUI work cannot stall the half-buffer copy (``"process"``).
+
+Besides the pull API (``peek_last`` / ``read_new``) providers offer push
+delivery: :meth:`AIProvider.subscribe` returns a :class:`Subscription` fed
+with every ingested chunk, with an :class:`OverflowPolicy` per subscriber.
 
 The shared :func:`create_ai_provider` factory picks the right
-implementation based on a config string ("persistent" or
-"per_experiment").
+implementation based on a config string ("persistent",
+"per_experiment" or "process").
 
 Design rationale: ``docs/live-streaming.md`` section 3.
 """
@@ -26,14 +34,22 @@ Design rationale: ``docs/live-streaming.md`` section 3.
 from pioner.back.acquisition.base import AIProvider, AcquisitionMode
 from pioner.back.acquisition.persistent import PersistentAIProvider
 from pioner.back.acquisition.per_experiment import PerExperimentAIProvider
+from pioner.back.acquisition.process import AcquisitionEngine, ProcessAIProvider
 from pioner.back.acquisition.factory import create_ai_provider
 from pioner.back.acquisition.disk_recorder import DiskRecorder
+from pioner.back.acquisition.raw_recording import RawRecording
+from pioner.back.subscription import OverflowPolicy, Subscription
 
 __all__ = [
     "AIProvider",
+    "AcquisitionEngine",
     "AcquisitionMode",
     "PersistentAIProvider",
     "PerExperimentAIProvider",
+    "ProcessAIProvider",
     "create_ai_provider",
     "DiskRecorder",
+    "RawRecording",
+    "OverflowPolicy",
+    "Subscription",
 ]
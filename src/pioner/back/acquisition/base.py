@@ -11,16 +11,19 @@ from __future__ import annotations
 
 import abc
 import enum
-from typing import Sequence
+from typing import Callable, Optional, Sequence
 
 import numpy as np
 
+from pioner.back.subscription import OverflowPolicy, Subscription
+
 
 class AcquisitionMode(str, enum.Enum):
     """Valid values for the ``AcquisitionMode`` settings field."""
 
     PERSISTENT = "persistent"
     PER_EXPERIMENT = "per_experiment"
+    PROCESS = "process"
 
     @classmethod
     def from_string(cls, value: str | None) -> "AcquisitionMode":
@@ -63,6 +66,9 @@ class AIProvider(abc.ABC):
     * :meth:`read_new` -- "give me everything since my last call". Each
       caller passes a unique ``consumer_id``; the provider tracks one
       cursor per id. Used by the disk recorder.
+    * :meth:`subscribe` -- push instead of poll: each ingested chunk is
+      delivered once to a bounded queue or a callback, with a per-subscriber
+      overflow policy and lag / drop counters (:mod:`pioner.back.subscription`).
 
     Implementations MUST be safe to call from the Qt main thread (peek /
     read_new); the underlying ring buffer is locked appropriately by
@@ -102,6 +108,24 @@ class AIProvider(abc.ABC):
         (the consumer joins at the current head).
         """
 
+    @abc.abstractmethod
+    def subscribe(
+        self,
+        name: str,
+        maxsize: int = 8,
+        policy: OverflowPolicy | str = OverflowPolicy.DROP_OLDEST,
+        callback: Optional[Callable[[np.ndarray], None]] = None,
+    ) -> Subscription:
+        """Register a push consumer that receives every ingested chunk once.
+
+        Subscriptions survive the AI scan stopping and restarting (they are
+        simply not fed meanwhile); release one with :meth:`unsubscribe`.
+        """
+
+    @abc.abstractmethod
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop feeding ``subscription`` and close it."""
+
     # ------------------------------------------------------------------
     # Optional introspection -- default implementations are conservative
     # so subclasses only override when they have something meaningful to
@@ -111,6 +135,10 @@ class AIProvider(abc.ABC):
         """``True`` when an AI scan is currently running."""
         return False
 
+    def metrics_snapshot(self) -> dict:
+        """Acquisition telemetry (:mod:`pioner.back.telemetry`); ``{}`` if none."""
+        return {}
+
     @property
     def mode(self) -> AcquisitionMode:
         """Identifier for diagnostics / logging."""
@@ -10,26 +10,48 @@ finite-iso runs do not accumulate gigabytes of samples in RAM (the design
 requirement that motivated streaming over the earlier in-memory buffer).
 
 The recorded file holds one ``raw_ai`` dataset of shape ``(rows, channels)`` plus
-attributes ``mark_index`` (baseline|run boundary, -1 if never marked) and
-``rows``. Calibration (``apply_calibration``) and the final ``exp_data.h5``
-layout (``save_run_to_h5``) are produced by the caller at finalise time, reading
-this raw file back -- they need the mode's programs / voltage profiles, which the
+attributes ``mark_index`` (baseline|run boundary, -1 if never marked), ``rows``
+and the per-channel run statistics accumulated while draining (``stats_*``, see
+:class:`~pioner.back.acquisition.raw_recording.ChannelStats`). Given the
+ring's :class:`~pioner.shared.sample_codec.SampleCodec` the samples are
+written in its storage dtype (float32 / int16 counts) with the codec as
+dataset attributes; readers decode through ``SampleCodec.from_attrs``.
+Calibration (``apply_calibration``) and the final ``exp_data.h5`` layout
+(``save_run_to_h5``) are produced by the caller at finalise time, reading this
+raw file back -- they need the mode's programs / voltage profiles, which the
 recorder does not own. Wiring into slow / finite-iso lands in P1-17 steps 4 / 5.
 
 Mechanics. The persistent ring exposes a single, *destructive* per-consumer
 cursor: each ``read_new_samples`` returns everything appended since that
 consumer's previous call and advances the cursor. So:
 
-* every read + append runs under one lock -- draining is serialized, so two
+* every read + stage runs under one lock -- draining is serialized, so two
   callers (the background thread, ``mark_start``, ``stop``) never split a delta
-  across two appends out of order, and HDF5 (not thread-safe) is only ever
-  touched by one thread at a time.
+  across two appends out of order.
 * we **prime** the cursor at ``start`` (``reset_ring_cursor`` then one discarded
   ``read_new_samples``) so capture begins at arm, not at the trailing backlog.
 * the ring is sized to ``ring_max_seconds``; a background thread drains every
   ``poll_interval`` (well under the ring depth) so a long run does not overflow
   the ring between the explicit ``mark_start`` / ``stop`` drains.
 
+Writer stage. A drain only copies the delta into a preallocated staging block
+(``_STAGE_CHUNKS`` HDF5 chunks long); full blocks go through a queue to a
+dedicated writer thread, which is the only thread touching HDF5 between
+``start`` and ``stop`` (h5py is not thread-safe). So the ring drain never waits
+on the disk -- a writer more than ``_WRITER_QUEUE_BLOCKS`` blocks behind is
+counted (``writer_overflows``) and logged instead -- and the file sees few,
+large, chunk-aligned writes instead of a ``resize`` + write every 0.2 s. The
+dataset grows geometrically (doubling) and is trimmed to the captured rows at
+``stop``. Chunks are ``(rows, channels)`` with ``rows`` about one second of
+samples, bounded to 64 KiB - 1 MiB per chunk (the upper bound is h5py's
+default chunk cache, so a chunk is never re-read for a partial write).
+``compression`` (``Acquisition.RecordCompression``) enables ``lzf`` or
+``gzip`` plus the byte-shuffle filter; ADC-noise-limited float data compress
+poorly on their own, shuffle is what makes it pay on a Pi SD card. Staged rows
+not yet handed to the writer are lost if the process dies -- at most
+``_STAGE_CHUNKS`` seconds. A failed write is kept: nothing more is written,
+and the next drain (``mark_start``) or ``stop`` raises it.
+
 No samples are lost as long as the drain keeps up with the ring: HDF5 extendable
 appends are exact and order-preserving (verified), and ``mark_start`` / ``stop``
 each drain explicitly, so the mark always lands at the true baseline|run
@@ -40,14 +62,51 @@ rate -- is the separate HW soak item, P1-17 step 4c.)
 from __future__ import annotations
 
 import logging
+import os
+import queue
 import threading
-from typing import Optional, Protocol
+from typing import Optional, Protocol, cast
 
 import h5py
 import numpy as np
 
+from pioner.back.acquisition.raw_recording import (
+    INDEX_VERSION,
+    ChannelStats,
+    segment_file_path,
+    segment_index_path,
+    write_segment_index,
+)
+from pioner.shared.sample_codec import SampleCodec
+from pioner.shared.settings import RECORD_COMPRESSIONS
+
 logger = logging.getLogger(__name__)
 
+_GZIP_LEVEL = 4
+# HDF5 chunk sizing: ~1 s of rows, clamped to [64 KiB, 1 MiB] per chunk.
+_CHUNK_SECONDS = 1.0
+_CHUNK_MIN_BYTES = 64 * 1024
+_CHUNK_MAX_BYTES = 1024 * 1024
+# Staging block = this many chunks. The writer queue is unbounded (a drain
+# never waits on the disk); past this many queued blocks the writer is
+# reported as falling behind.
+_STAGE_CHUNKS = 4
+_WRITER_QUEUE_BLOCKS = 8
+
+
+def chunk_rows_for(sample_rate: Optional[float], n_channels: int, itemsize: int) -> int:
+    """HDF5 chunk length (rows) for a ``(rows, n_channels)`` raw dataset.
+
+    About ``_CHUNK_SECONDS`` of samples at ``sample_rate`` (the minimum
+    chunk size when the rate is unknown), clamped so a chunk stays between
+    ``_CHUNK_MIN_BYTES`` and ``_CHUNK_MAX_BYTES``.
+    """
+    row_bytes = max(1, int(n_channels) * int(itemsize))
+    lo = max(1, _CHUNK_MIN_BYTES // row_bytes)
+    hi = max(lo, _CHUNK_MAX_BYTES // row_bytes)
+    rows = int(sample_rate * _CHUNK_SECONDS) if sample_rate else lo
+    return min(max(rows, lo), hi)
+
 
 class RingSource(Protocol):
     """Minimal ring interface the recorder needs (``ExperimentManager`` satisfies it)."""
@@ -57,6 +116,12 @@ class RingSource(Protocol):
     def read_new_samples(self, consumer_id: str) -> np.ndarray: ...
 
 
+class CodecRingSource(RingSource, Protocol):
+    """A ring that can hand out rows in its storage dtype (``codec`` given)."""
+
+    def read_new_samples(self, consumer_id: str, decode: bool = True) -> np.ndarray: ...
+
+
 class DiskRecorder:
     """Stream the persistent AI ring to an HDF5 file from arm to stop (P1-17).
 
@@ -68,6 +133,9 @@ class DiskRecorder:
     h5_path
         Destination HDF5 file (overwritten on ``start``). Holds a single
         extendable ``raw_ai`` dataset plus ``mark_index`` / ``rows`` attributes.
+        When segmented, the stem for the segment files and their index (see
+        :mod:`~pioner.back.acquisition.raw_recording`); the file itself is
+        not created and :attr:`path` is the index.
     consumer_id
         Private cursor key on the ring. Must not collide with other consumers
         (the live plot, the iso-streaming cursor, ...).
@@ -76,6 +144,18 @@ class DiskRecorder:
         ``ring_max_seconds`` so the ring never overwrites un-captured samples.
     dataset
         Name of the raw dataset inside the file.
+    codec
+        The ring's storage codec (``ExperimentManager.sample_codec``). When
+        given, rows are drained undecoded and stored in ``codec.dtype`` with
+        the codec attributes on the dataset; ``None`` stores float64 volts.
+    sample_rate
+        AI rate (Hz), used only to size the HDF5 chunks (~1 s each).
+    compression
+        ``None`` / ``"none"``, ``"lzf"`` or ``"gzip"`` (with shuffle).
+    segment_seconds, segment_bytes
+        Roll over to a new SWMR segment file after this much data (whichever
+        comes first; ``segment_seconds`` needs ``sample_rate``). Both ``None``
+        keeps the single-file layout.
     """
 
     def __init__(
@@ -85,21 +165,63 @@ class DiskRecorder:
         consumer_id: str = "disk_recorder",
         poll_interval: float = 0.2,
         dataset: str = "raw_ai",
+        codec: Optional[SampleCodec] = None,
+        sample_rate: Optional[float] = None,
+        compression: Optional[str] = None,
+        segment_seconds: Optional[float] = None,
+        segment_bytes: Optional[int] = None,
     ) -> None:
+        compression = (compression or "none").lower()
+        if compression not in RECORD_COMPRESSIONS:
+            raise ValueError(
+                f"DiskRecorder compression must be one of {RECORD_COMPRESSIONS}, "
+                f"got {compression!r}"
+            )
+        if segment_seconds and not sample_rate:
+            raise ValueError("DiskRecorder segment_seconds needs sample_rate")
         self._ring = ring
         self._path = str(h5_path)
         self._consumer_id = str(consumer_id)
         self._poll_interval = float(poll_interval)
         self._dataset_name = str(dataset)
+        self._codec = codec
+        self._sample_rate = float(sample_rate) if sample_rate else None
+        self._compression = None if compression == "none" else compression
         self._rows: int = 0
         self._mark: Optional[int] = None
-        # One lock guards read+append (serialises drains so chunk order is kept)
-        # and every HDF5 access (h5py is not thread-safe) plus _rows / _mark.
+        self._stats = ChannelStats()
+        # One lock guards read+stage (serialises drains so chunk order is kept)
+        # plus the staging block, _rows, _mark and _written. HDF5 is owned by
+        # the writer thread while recording, so the lock is never held across
+        # disk I/O.
         self._lock = threading.Lock()
         self._stop = threading.Event()
         self._thread: Optional[threading.Thread] = None
         self._h5: Optional[h5py.File] = None
         self._dset: Optional[h5py.Dataset] = None
+        # Writer stage: staging block being filled, blocks queued for the
+        # writer, and written blocks returned for reuse.
+        self._chunk_rows: int = 0
+        self._stage: Optional[np.ndarray] = None
+        self._staged: int = 0
+        self._pending: queue.SimpleQueue = queue.SimpleQueue()
+        self._free: queue.SimpleQueue = queue.SimpleQueue()
+        self._writer: Optional[threading.Thread] = None
+        self._written: int = 0
+        # First failed write; once set no further block is written and the
+        # next drain / stop raises it.
+        self._write_error: Optional[BaseException] = None
+        self.writer_backlog_max = 0
+        self.writer_overflows = 0
+        self._recording = False
+        # Segmented layout: limits, the open segment and the index entries
+        # (the writer thread owns the files; _index_lock guards the entries).
+        self._segment_seconds = float(segment_seconds) if segment_seconds else None
+        self._segment_bytes = int(segment_bytes) if segment_bytes else None
+        self._segment_rows: int = 0
+        self._segments: list[dict] = []
+        self._seg_written: int = 0
+        self._index_lock = threading.Lock()
 
     # -- introspection -------------------------------------------------
     @property
@@ -118,9 +240,14 @@ class DiskRecorder:
         with self._lock:
             return self._rows
 
+    @property
+    def segmented(self) -> bool:
+        return self._segment_seconds is not None or self._segment_bytes is not None
+
     @property
     def path(self) -> str:
-        return self._path
+        """The raw file, or the segment index when segmented (what finalise reads)."""
+        return segment_index_path(self._path) if self.segmented else self._path
 
     # -- lifecycle -----------------------------------------------------
     def start(self) -> None:
@@ -131,20 +258,38 @@ class DiskRecorder:
         with self._lock:
             self._rows = 0
             self._mark = None
-            self._h5 = h5py.File(self._path, "w")
+            self._stats = ChannelStats()
+            # Monolithic: one file now. Segmented: the writer opens segment
+            # files as blocks arrive; the index exists from the start.
+            self._h5 = None if self.segmented else h5py.File(self._path, "w")
             self._dset = None  # created on the first non-empty chunk
+            self._written = 0
+            self._write_error = None
+            self.writer_backlog_max = 0
+            self.writer_overflows = 0
+            self._stage = None
+            self._staged = 0
+            self._recording = True
             # Prime so capture starts at arm, not at the trailing backlog:
             # reset clears any stale cursor, the discarded read sets it to head.
             self._ring.reset_ring_cursor(self._consumer_id)
             self._ring.read_new_samples(self._consumer_id)
+        if self.segmented:
+            with self._index_lock:
+                self._segments = []
+            self._write_index()
         self._stop.clear()
+        self._writer = threading.Thread(
+            target=self._write_loop, name="disk-recorder-writer", daemon=True
+        )
+        self._writer.start()
         self._thread = threading.Thread(
             target=self._loop, name="disk-recorder", daemon=True
         )
         self._thread.start()
         logger.info(
-            "DiskRecorder started -> %s (consumer=%s, poll=%.3fs)",
-            self._path, self._consumer_id, self._poll_interval,
+            "DiskRecorder started -> %s (consumer=%s, poll=%.3fs, compression=%s)",
+            self.path, self._consumer_id, self._poll_interval, self._compression,
         )
 
     def mark_start(self) -> None:
@@ -157,22 +302,41 @@ class DiskRecorder:
         with self._lock:
             self._drain_locked()
             self._mark = self._rows
+            self._stats.mark()
+        if self.segmented:
+            self._write_index()
         logger.info("DiskRecorder mark_start at row %d", self._mark)
 
     def stop(self) -> str:
-        """Stop draining, finalise the file, return its path.
+        """Stop draining, finalise the file, return its path (:attr:`path`).
 
         The raw samples live in the ``raw_ai`` dataset; ``mark_index`` / ``rows``
-        are stored as dataset attributes for the finalise (calibration) step.
+        are stored as dataset attributes for the finalise (calibration) step --
+        or, segmented, in the index, which is marked ``complete``. If a block
+        failed to write, the file is still closed and then the failure is
+        raised.
         """
         self._stop.set()
         if self._thread is not None:
             self._thread.join(timeout=2.0)
             self._thread = None
+        if self._write_error is None:
+            with self._lock:
+                self._drain_locked()  # final drain
+                self._flush_stage_locked()
+        if self._writer is not None:
+            self._pending.put(None)  # after every block: the writer drains first
+            self._writer.join()
+            self._writer = None
         with self._lock:
-            self._drain_locked()  # final drain
-            if self._h5 is not None:
+            self._recording = False
+            stats = self._stats.to_volts(self._codec)
+            if not self.segmented and self._h5 is not None:
                 if self._dset is not None:
+                    # Trim the geometric over-allocation back to what was written.
+                    self._dset.resize(self._written, axis=0)
+                    for key, value in ChannelStats.attrs_from(stats).items():
+                        self._dset.attrs[key] = value
                     self._dset.attrs["mark_index"] = (
                         -1 if self._mark is None else int(self._mark)
                     )
@@ -187,41 +351,234 @@ class DiskRecorder:
                 self._h5.close()
                 self._h5 = None
                 self._dset = None
+            self._stage = None
+        if self.segmented:
+            self._close_segment()
+            self._write_index(complete=True, stats=stats)
+        self._raise_write_error()
         logger.info("DiskRecorder stopped: %d rows (mark=%s) -> %s",
-                    self._rows, self._mark, self._path)
-        return self._path
+                    self._rows, self._mark, self.path)
+        return self.path
 
     # -- internals -----------------------------------------------------
     def _drain_locked(self) -> int:
-        """Read the pending delta and append it to disk. Caller holds ``self._lock``."""
-        chunk = self._ring.read_new_samples(self._consumer_id)
+        """Read the pending delta into the staging block. Caller holds ``self._lock``."""
+        self._raise_write_error()
+        if self._codec is not None:
+            chunk = cast(CodecRingSource, self._ring).read_new_samples(
+                self._consumer_id, decode=False
+            )
+        else:
+            chunk = self._ring.read_new_samples(self._consumer_id)
         if chunk.size == 0:
             return 0
-        n = int(chunk.shape[0])
-        if self._h5 is None:
+        if not self._recording:
             return 0  # stopped/closed: drop late samples rather than crash
-        if self._dset is None:
-            n_channels = int(chunk.shape[1])
-            self._dset = self._h5.create_dataset(
-                self._dataset_name,
-                shape=(0, n_channels),
-                maxshape=(None, n_channels),
-                chunks=True,
-                dtype="float64",
+        n = int(chunk.shape[0])
+        self._stats.update(chunk)
+        if self._stage is None:
+            self._chunk_rows = chunk_rows_for(
+                self._sample_rate, int(chunk.shape[1]), chunk.dtype.itemsize
             )
-        self._dset.resize(self._rows + n, axis=0)
-        self._dset[self._rows:self._rows + n] = chunk
+            self._stage = self._take_block(chunk)
+        done = 0
+        while done < n:
+            room = self._stage.shape[0] - self._staged
+            take = min(room, n - done)
+            self._stage[self._staged:self._staged + take] = chunk[done:done + take]
+            self._staged += take
+            done += take
+            if self._staged == self._stage.shape[0]:
+                self._flush_stage_locked()
         self._rows += n
         return n
 
+    def _take_block(self, like: np.ndarray) -> np.ndarray:
+        """A staging block (reused from the writer when one is free)."""
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            return np.empty(
+                (self._chunk_rows * _STAGE_CHUNKS, int(like.shape[1])), dtype=like.dtype
+            )
+
+    def _flush_stage_locked(self) -> None:
+        """Hand the staged rows to the writer and start a fresh block.
+
+        Never waits on the disk (``_lock`` is held): a writer more than
+        ``_WRITER_QUEUE_BLOCKS`` behind is counted and logged instead.
+        """
+        if self._stage is None or self._staged == 0:
+            return
+        self._raise_write_error()
+        block, n = self._stage, self._staged
+        self._pending.put((block, n))
+        backlog = self._pending.qsize()
+        self.writer_backlog_max = max(self.writer_backlog_max, backlog)
+        if backlog > _WRITER_QUEUE_BLOCKS:
+            self.writer_overflows += 1
+            if self.writer_overflows == 1:
+                logger.warning(
+                    "DiskRecorder writer is %d blocks behind the ring (%s)",
+                    backlog, self.path,
+                )
+        self._stage = self._take_block(block)
+        self._staged = 0
+
+    def _raise_write_error(self) -> None:
+        if self._write_error is not None:
+            raise RuntimeError(
+                f"DiskRecorder write to {self.path} failed"
+            ) from self._write_error
+
+    def _write_loop(self) -> None:
+        """Writer thread: append queued blocks to ``raw_ai`` until the sentinel.
+
+        After the first failed write the remaining blocks are discarded: the
+        file would have a hole, and the failure is raised to the caller.
+        """
+        while True:
+            item = self._pending.get()
+            if item is None:
+                return
+            block, n = item
+            try:
+                if self._write_error is None:
+                    self._write_block(block[:n])
+            except Exception as exc:
+                logger.exception("DiskRecorder write of %d rows failed", n)
+                self._write_error = exc
+            finally:
+                self._free.put(block)
+
+    def _create_dataset(self, h5: h5py.File, n_channels: int) -> h5py.Dataset:
+        dset = h5.create_dataset(
+            self._dataset_name,
+            shape=(0, n_channels),
+            maxshape=(None, n_channels),
+            chunks=(self._chunk_rows, n_channels),
+            dtype="float64" if self._codec is None else self._codec.dtype,
+            compression=self._compression,
+            compression_opts=_GZIP_LEVEL if self._compression == "gzip" else None,
+            shuffle=self._compression is not None,
+        )
+        if self._codec is not None:
+            for key, value in self._codec.attrs().items():
+                dset.attrs[key] = value
+        return dset
+
+    def _write_block(self, rows: np.ndarray) -> None:
+        if self.segmented:
+            self._write_segmented(rows)
+            return
+        if self._h5 is None:
+            return
+        n = int(rows.shape[0])
+        if self._dset is None:
+            self._dset = self._create_dataset(self._h5, int(rows.shape[1]))
+        end = self._written + n
+        if end > self._dset.shape[0]:
+            # Double (in whole chunks) so resizes stay O(log rows).
+            grow = max(end, 2 * self._dset.shape[0])
+            grow = -(-grow // self._chunk_rows) * self._chunk_rows
+            self._dset.resize(grow, axis=0)
+        self._dset[self._written:end] = rows
+        with self._lock:
+            self._written = end
+
+    # -- segmented layout (writer thread) ------------------------------
+    def _write_segmented(self, rows: np.ndarray) -> None:
+        """Append across segment boundaries; exact resizes, so SWMR readers
+        see only written rows in the dataset shape."""
+        if not self._segment_rows:
+            row_bytes = int(rows.shape[1]) * rows.dtype.itemsize
+            limits = []
+            if self._segment_seconds is not None and self._sample_rate:
+                limits.append(int(self._segment_seconds * self._sample_rate))
+            if self._segment_bytes is not None:
+                limits.append(self._segment_bytes // row_bytes)
+            # Whole chunks per segment, at least one.
+            rows_per = max(self._chunk_rows, min(limits) // self._chunk_rows * self._chunk_rows)
+            self._segment_rows = rows_per
+        done, n = 0, int(rows.shape[0])
+        while done < n:
+            if self._dset is None:
+                self._open_segment(int(rows.shape[1]))
+            assert self._dset is not None
+            take = min(n - done, self._segment_rows - self._seg_written)
+            end = self._seg_written + take
+            self._dset.resize(end, axis=0)
+            self._dset[self._seg_written:end] = rows[done:done + take]
+            self._dset.flush()  # publish to SWMR readers
+            self._seg_written = end
+            with self._lock:
+                self._written += take
+            done += take
+            if self._seg_written == self._segment_rows:
+                self._close_segment()
+
+    def _open_segment(self, n_channels: int) -> None:
+        with self._index_lock:
+            number = len(self._segments)
+        path = segment_file_path(self._path, number)
+        h5 = h5py.File(path, "w", libver="latest")
+        dset = self._create_dataset(h5, n_channels)
+        dset.attrs["segment"] = number
+        dset.attrs["start_row"] = self._written
+        h5.swmr_mode = True  # no new objects / attributes from here on
+        self._h5, self._dset, self._seg_written = h5, dset, 0
+        with self._index_lock:
+            self._segments.append(
+                {"file": os.path.basename(path), "start": self._written, "stop": None}
+            )
+        self._write_index()
+
+    def _close_segment(self) -> None:
+        if self._h5 is None:
+            return
+        self._h5.close()
+        self._h5 = self._dset = None
+        with self._index_lock:
+            self._segments[-1]["stop"] = self._written
+        self._write_index()
+
+    def _write_index(self, complete: bool = False, stats: Optional[dict] = None) -> None:
+        """Rewrite the segment index. Never called with ``self._lock`` held.
+
+        ``_index_lock`` is held across the snapshot and the write, so the file
+        always ends up with the newest state; ``_written`` / ``_mark`` are read
+        under ``self._lock`` so the row count and the boundary come from one
+        moment (lock order: ``_index_lock`` then ``_lock``).
+        """
+        with self._index_lock:
+            with self._lock:
+                written, mark = self._written, self._mark
+            index = {
+                "version": INDEX_VERSION,
+                "dataset": self._dataset_name,
+                "rows": int(written),
+                "mark_index": -1 if mark is None else int(mark),
+                "complete": bool(complete),
+                "segments": [dict(seg) for seg in self._segments],
+            }
+            if stats:
+                index["stats"] = stats
+            try:
+                write_segment_index(segment_index_path(self._path), index)
+            except OSError:
+                logger.exception("DiskRecorder failed to write segment index")
+
     def _loop(self) -> None:
         while not self._stop.is_set():
+            if self._write_error is not None:
+                return  # nothing more is written; stop() raises the failure
             try:
                 with self._lock:
                     self._drain_locked()
             except Exception:
-                logger.exception("DiskRecorder drain failed")
+                if self._write_error is None:
+                    logger.exception("DiskRecorder drain failed")
             self._stop.wait(self._poll_interval)
 
 
-__all__ = ["DiskRecorder", "RingSource"]
+__all__ = ["DiskRecorder", "RingSource", "chunk_rows_for"]
@@ -12,6 +12,7 @@ import logging
 from pioner.back.acquisition.base import AIProvider, AcquisitionMode
 from pioner.back.acquisition.persistent import PersistentAIProvider
 from pioner.back.acquisition.per_experiment import PerExperimentAIProvider
+from pioner.back.acquisition.process import AcquisitionEngine, ProcessAIProvider
 from pioner.back.experiment_manager import ExperimentManager
 
 logger = logging.getLogger(__name__)
@@ -19,7 +20,7 @@ logger = logging.getLogger(__name__)
 
 def create_ai_provider(
     mode: str | AcquisitionMode | None,
-    em: ExperimentManager,
+    em: ExperimentManager | AcquisitionEngine,
     ring_max_seconds: float = 2.0,
 ) -> AIProvider:
     """Construct the appropriate :class:`AIProvider` for the given mode.
@@ -27,12 +28,13 @@ def create_ai_provider(
     Parameters
     ----------
     mode
-        ``"persistent"`` or ``"per_experiment"`` (string from
-        ``settings.json``), or an :class:`AcquisitionMode` instance. Any
-        other value falls back to PERSISTENT with a warning.
+        ``"persistent"``, ``"per_experiment"`` or ``"process"`` (string
+        from ``settings.json``), or an :class:`AcquisitionMode` instance.
+        Any other value falls back to PERSISTENT with a warning.
     em
         The owning :class:`ExperimentManager` (shared with the mode
-        classes; the provider attaches its ring buffer to ``em``'s).
+        classes; the provider attaches its ring buffer to ``em``'s). For
+        ``"process"`` the :class:`AcquisitionEngine` standing in for it.
     ring_max_seconds
         Depth of in-RAM history.
     """
@@ -47,6 +49,9 @@ def create_ai_provider(
     if acq_mode is AcquisitionMode.PER_EXPERIMENT:
         logger.info("Using PerExperimentAIProvider (AcquisitionMode='per_experiment')")
         return PerExperimentAIProvider(em, ring_max_seconds=ring_max_seconds)
+    if acq_mode is AcquisitionMode.PROCESS:
+        logger.info("Using ProcessAIProvider (AcquisitionMode='process')")
+        return ProcessAIProvider(em, ring_max_seconds=ring_max_seconds)
 
     # Defensive: AcquisitionMode.from_string already normalised; this
     # branch is essentially unreachable but keeps type checkers happy.
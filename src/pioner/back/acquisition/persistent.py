@@ -13,12 +13,13 @@ This is the recommended default. Rationale and trade-offs are in
 from __future__ import annotations
 
 import logging
-from typing import Optional, Sequence
+from typing import Callable, Optional, Sequence
 
 import numpy as np
 
 from pioner.back.acquisition.base import AIProvider, AcquisitionMode
 from pioner.back.experiment_manager import ExperimentManager
+from pioner.back.subscription import OverflowPolicy, Subscription
 
 logger = logging.getLogger(__name__)
 
@@ -103,6 +104,21 @@ class PersistentAIProvider(AIProvider):
             return np.empty((0, 0), dtype=float)
         return self._em.read_new_samples(consumer_id)
 
+    def subscribe(
+        self,
+        name: str,
+        maxsize: int = 8,
+        policy: OverflowPolicy | str = OverflowPolicy.DROP_OLDEST,
+        callback: Optional[Callable[[np.ndarray], None]] = None,
+    ) -> Subscription:
+        return self._em.subscribe(name, maxsize=maxsize, policy=policy, callback=callback)
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._em.unsubscribe(subscription)
+
+    def metrics_snapshot(self) -> dict:
+        return self._em.metrics_snapshot()
+
     def is_active(self) -> bool:
         return self._active
 
@@ -0,0 +1,633 @@
+"""Out-of-process acquisition engine (``AcquisitionMode = "process"``).
+
+In the in-process modes the ring worker, the DiskRecorder and the Qt GUI
+(live tick, silx redraws, pandas calibration) share one interpreter and one
+GIL, so a slow redraw can delay the half-buffer copy long enough to overrun
+the device FIFO (``postmortem/2026-05-23-fifo-overrun-continuous-ai.md``).
+Here a spawned child process owns the single :class:`DaqDeviceHandler` and a
+full :class:`ExperimentManager` -- ring, AO drive, finite scans, stop / zero
+-- and the GUI process drives it through :class:`AcquisitionEngine`, a proxy
+with the manager surface that :class:`LocalDeviceController`, the modes'
+injected runs, the providers and the DiskRecorder use:
+
+* **commands** go over a ``multiprocessing`` pipe. The child runs each on a
+  worker thread, so ``request_stop`` reaches a ``finite_scan`` in flight;
+  return values come back pickled and exceptions are re-raised in the GUI
+  process. Commands that arm something carry the current ``ai_params`` /
+  ``ao_params``, so rate changes made in the GUI process apply;
+* **samples** come back through a :class:`SharedRing`, a seqlock-published
+  ring in shared memory. The child writes every ingested chunk (in the
+  storage dtype, ``Acquisition.StorageDtype``) and posts the new write index
+  on the pipe; readers copy straight out of the shared pages and a pump
+  thread feeds the GUI-side push subscriptions;
+* **telemetry**: the child's :class:`AcquisitionMetrics` snapshot is fetched
+  over the pipe and merged with the GUI-side consumer stats, so
+  ``acquisition_metrics()`` stays populated.
+
+AO and AI stay on one device handle, so the ``EXTTRIGGER`` pairing works as in
+process. The child exits when the GUI process closes the pipe (or dies).
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import multiprocessing as mp
+import os
+import pickle
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, Sequence
+
+import numpy as np
+
+from pioner.back.acquisition.base import AcquisitionMode
+from pioner.back.acquisition.persistent import PersistentAIProvider
+from pioner.back.acquisition.shm_ring import SharedRing
+from pioner.back.daq_device import DaqDeviceHandler
+from pioner.back.experiment_manager import ExperimentManager, ScanResult
+from pioner.back.subscription import OverflowPolicy, Subscription
+from pioner.back.telemetry import AcquisitionMetrics
+from pioner.shared.sample_codec import SampleCodec
+from pioner.shared.settings import BackSettings
+
+logger = logging.getLogger(__name__)
+
+# How long start() waits for the child to open the DAQ (the spawn start
+# re-imports numpy / pandas, which alone takes ~1 s on a Pi).
+_START_TIMEOUT_S = 30.0
+# How long shutdown() waits for the child to stop its scans and exit.
+_STOP_TIMEOUT_S = 5.0
+# Child threads running commands: a finite scan, a request_stop / stop_ao
+# aimed at it, and a metrics poll can all be in flight together.
+_COMMAND_WORKERS = 4
+
+# Child -> parent message tags.
+_REPLY = "reply"
+_RING = "ring"
+
+# Manager methods the child forwards unchanged.
+_FORWARDED = frozenset({
+    "finite_scan", "request_stop", "ao_set", "ao_modulated", "stop_ao",
+    "zero_ao", "worker_counters", "metrics_snapshot",
+})
+
+
+def _portable(exc: BaseException) -> BaseException:
+    """``exc`` if it survives pickling, else a RuntimeError carrying its text."""
+    try:
+        pickle.loads(pickle.dumps(exc))
+    except Exception:
+        return RuntimeError(f"{type(exc).__name__}: {exc}")
+    return exc
+
+
+class _EngineServer:
+    """Child side: the DAQ handle, the manager and the shared-ring writer."""
+
+    def __init__(self, conn, settings: BackSettings) -> None:
+        self._conn = conn
+        self._settings = settings
+        self._send_lock = threading.Lock()
+        self._daq = DaqDeviceHandler(settings.daq_params)
+        self._daq.try_connect()
+        self._em = ExperimentManager(self._daq, settings)
+        # Session of the shared ring; swapped by the command threads, written
+        # by the manager's ring worker through the subscription callback.
+        self._ring_lock = threading.Lock()
+        self._ring: Optional[SharedRing] = None
+        self._codec = SampleCodec()
+        self._em.subscribe("shared_ring", callback=self._on_chunk)
+        self._pool = ThreadPoolExecutor(_COMMAND_WORKERS, thread_name_prefix="engine-cmd")
+
+    def serve(self) -> None:
+        """Run commands until the GUI process closes the pipe."""
+        try:
+            while True:
+                try:
+                    msg = self._conn.recv()
+                except (EOFError, OSError):
+                    break
+                if msg is None:
+                    break
+                self._pool.submit(self._execute, *msg)
+        finally:
+            self._shutdown()
+
+    # -- commands ------------------------------------------------------
+    def start_ring_buffer(
+        self, ai_channels: Sequence[int], max_seconds: float, shm_name: str, codec: SampleCodec
+    ) -> None:
+        ring = SharedRing.attach(shm_name)
+        with self._ring_lock:
+            self._close_ring_locked()
+            self._ring, self._codec = ring, codec
+        try:
+            self._em.start_ring_buffer(ai_channels, max_seconds=max_seconds)
+        except BaseException:
+            with self._ring_lock:
+                self._close_ring_locked()
+            raise
+
+    def stop_ring_buffer(self) -> None:
+        self._em.stop_ring_buffer()
+        with self._ring_lock:
+            self._close_ring_locked()
+
+    def stop(self) -> None:
+        self._em.stop()
+        with self._ring_lock:
+            self._close_ring_locked()
+
+    # -- internals -----------------------------------------------------
+    def _execute(self, call_id: int, name: str, args: tuple, kwargs: dict, params) -> None:
+        try:
+            if params is not None:
+                # Update in place: the manager and its device handlers hold
+                # references to these objects.
+                ai_params, ao_params = params
+                vars(self._settings.ai_params).update(vars(ai_params))
+                vars(self._settings.ao_params).update(vars(ao_params))
+            target = getattr(self._em if name in _FORWARDED else self, name)
+            result = target(*args, **kwargs)
+        except BaseException as exc:
+            self._send((_REPLY, call_id, False, _portable(exc)))
+            return
+        try:
+            self._send((_REPLY, call_id, True, result))
+        except Exception as exc:  # e.g. an unpicklable return value
+            self._send((_REPLY, call_id, False, _portable(exc)))
+
+    def _send(self, msg: tuple) -> None:
+        with self._send_lock:
+            self._conn.send(msg)
+
+    def _on_chunk(self, chunk: np.ndarray) -> None:
+        """Ring worker callback: publish ``chunk`` and post the new index."""
+        with self._ring_lock:
+            if self._ring is None:
+                return
+            head = self._ring.write(self._codec.encode(chunk))
+        try:
+            self._send((_RING, head))
+        except (OSError, ValueError):
+            pass  # GUI process gone; serve() is about to shut down
+
+    def _close_ring_locked(self) -> None:
+        if self._ring is not None:
+            self._ring.close()
+            self._ring = None
+
+    def _shutdown(self) -> None:
+        self._em.request_stop()
+        try:
+            self._em.stop()
+        except Exception:
+            logger.exception("ExperimentManager.stop failed in the acquisition process")
+        self._pool.shutdown(wait=True)
+        with self._ring_lock:
+            self._close_ring_locked()
+        self._daq.quit()
+
+
+def _engine_main(conn, settings: BackSettings) -> None:
+    """Child process entry: open the DAQ, report, then serve commands."""
+    try:
+        server = _EngineServer(conn, settings)
+    except BaseException as exc:
+        conn.send((_REPLY, 0, False, _portable(exc)))
+        return
+    conn.send((_REPLY, 0, True, os.getpid()))
+    server.serve()
+
+
+class _ForwardedMetrics:
+    """``ExperimentManager.metrics`` stand-in, read through the engine."""
+
+    def __init__(self, engine: "AcquisitionEngine") -> None:
+        self._engine = engine
+
+    def snapshot(self) -> dict:
+        return self._engine.metrics_snapshot()
+
+
+class AcquisitionEngine:
+    """The acquisition process, seen from the GUI process.
+
+    Offers the :class:`ExperimentManager` methods the controller, the modes'
+    injected runs and the DiskRecorder call; scans and AO are executed by the
+    child, ring reads are served from the shared ring here. Call
+    :meth:`start` to spawn the child and :meth:`shutdown` to end it.
+
+    Parameters
+    ----------
+    settings
+        The :class:`BackSettings` the child builds its DAQ handle and manager
+        from (pickled once at start).
+    start_timeout
+        Seconds :meth:`start` waits for the child to report the DAQ open.
+    """
+
+    def __init__(self, settings: BackSettings, start_timeout: float = _START_TIMEOUT_S) -> None:
+        self._settings = settings
+        self._start_timeout = float(start_timeout)
+        self._process: Optional[mp.process.BaseProcess] = None
+        self._conn = None
+        self._send_lock = threading.Lock()
+        # Calls awaiting a reply, by id. Failed by the reader when the child
+        # goes away, so no caller blocks on a dead process.
+        self._calls_lock = threading.Lock()
+        self._calls: dict[int, Future] = {}
+        self._call_ids = itertools.count(1)
+        self._closed = True
+        self._reader: Optional[threading.Thread] = None
+
+        # GUI-side view of the shared ring. Kept mapped after
+        # stop_ring_buffer so a final snapshot still reads it, replaced at the
+        # next start_ring_buffer.
+        self._ring_lock = threading.Lock()
+        self._ring: Optional[SharedRing] = None
+        self._ring_codec = SampleCodec()
+        self._ring_running = False
+        self._ring_cursors: dict[str, int] = {}
+        # Consumer lag / losses of the readers on this side.
+        self._reads = AcquisitionMetrics()
+        self._last_metrics: dict = {}
+        self.metrics = _ForwardedMetrics(self)
+
+        # Push subscribers, fed by the pump from the shared ring. ``_head`` is
+        # the latest index the child posted, ``_published`` how far the pump
+        # got; both guarded by ``_pump_cond`` (taken after ``_ring_lock``).
+        self._subscribers: list[Subscription] = []
+        self._subscribers_lock = threading.Lock()
+        self._pump_cond = threading.Condition()
+        self._head = 0
+        self._published = 0
+        self._pump_stop = False
+        self._pump: Optional[threading.Thread] = None
+
+    # -- lifecycle -----------------------------------------------------
+    def start(self) -> None:
+        """Spawn the acquisition process and wait for it to open the DAQ."""
+        if self.is_connected():
+            raise RuntimeError("Acquisition process is already running")
+        ctx = mp.get_context("spawn")
+        conn, child_conn = ctx.Pipe()
+        process = ctx.Process(
+            target=_engine_main,
+            args=(child_conn, self._settings),
+            name="pioner-acquisition",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        try:
+            if not conn.poll(self._start_timeout):
+                raise RuntimeError(f"no answer within {self._start_timeout:.0f} s")
+            _, _, ok, value = conn.recv()
+        except (EOFError, OSError, RuntimeError) as exc:
+            ok, value = False, exc
+        if not ok:
+            conn.close()
+            process.join(timeout=_STOP_TIMEOUT_S)
+            if process.is_alive():
+                process.terminate()
+            raise RuntimeError(f"Acquisition process failed to start: {value}") from value
+        self._process, self._conn, self._closed = process, conn, False
+        self._pump_stop = False
+        self._reader = threading.Thread(target=self._read_loop, name="engine-reader", daemon=True)
+        self._pump = threading.Thread(target=self._pump_loop, name="engine-pump", daemon=True)
+        self._reader.start()
+        self._pump.start()
+        logger.info("Acquisition process started (pid=%s)", value)
+
+    def shutdown(self) -> None:
+        """Stop the child (it stops its scans and releases the DAQ) and join it."""
+        process, conn = self._process, self._conn
+        if process is None:
+            return
+        try:
+            with self._send_lock:
+                conn.send(None)
+        except (OSError, ValueError):
+            pass
+        process.join(timeout=_STOP_TIMEOUT_S)
+        if process.is_alive():
+            logger.warning("Acquisition process did not exit; terminating")
+            process.terminate()
+            process.join(timeout=2.0)
+        if self._reader is not None:
+            self._reader.join(timeout=2.0)
+        conn.close()
+        with self._pump_cond:
+            self._pump_stop = True
+            self._pump_cond.notify_all()
+        if self._pump is not None:
+            self._pump.join(timeout=2.0)
+        with self._ring_lock:
+            if self._ring is not None:
+                self._ring.close()
+                self._ring = None
+            self._ring_running = False
+        self._process = self._conn = self._reader = self._pump = None
+        logger.info("Acquisition process stopped")
+
+    def is_connected(self) -> bool:
+        process = self._process
+        return process is not None and process.is_alive() and not self._closed
+
+    @property
+    def pid(self) -> Optional[int]:
+        process = self._process
+        return process.pid if process is not None else None
+
+    # -- manager surface: commands --------------------------------------
+    def finite_scan(
+        self,
+        voltage_profiles: dict,
+        ai_channels: Sequence[int],
+        seconds: float,
+        single_shot: bool = False,
+    ) -> ScanResult:
+        return self._call(
+            "finite_scan", (voltage_profiles, list(ai_channels), seconds),
+            {"single_shot": single_shot}, sync=True,
+        )
+
+    def request_stop(self) -> None:
+        self._call("request_stop")
+
+    def ao_set(self, channel: int, voltage: float) -> None:
+        self._call("ao_set", (channel, voltage), sync=True)
+
+    def ao_modulated(self, voltage_profiles: dict) -> None:
+        self._call("ao_modulated", (voltage_profiles,), sync=True)
+
+    def stop_ao(self) -> None:
+        self._call("stop_ao")
+
+    def zero_ao(self) -> None:
+        """Drive every AO channel to 0 V; best-effort like the manager's."""
+        try:
+            self._call("zero_ao")
+        except Exception:
+            logger.exception("Failed to drive AO to 0 V on shutdown")
+
+    def stop(self) -> None:
+        self._call("stop")
+        self._ring_running = False
+
+    def worker_counters(self) -> dict:
+        return self._call("worker_counters")
+
+    # -- manager surface: ring -------------------------------------------
+    def start_ring_buffer(self, ai_channels: Sequence[int], max_seconds: float = 10.0) -> None:
+        """Start the child's ring, published through a fresh shared ring."""
+        if self._ring_running:
+            raise RuntimeError("Ring buffer is already running")
+        ai = self._settings.ai_params
+        codec = SampleCodec.for_storage(
+            self._settings.acquisition.storage_dtype,
+            len(ai_channels),
+            ai.full_scale_volts(),
+        )
+        # Same depth as the child's own ring (never under one half-buffer).
+        capacity = max(ai.sample_rate // 2, int(round(float(max_seconds) * ai.sample_rate)))
+        ring = SharedRing.create(capacity, len(ai_channels), codec.dtype)
+        with self._ring_lock:
+            old, self._ring = self._ring, ring
+            self._ring_codec = codec
+            self._ring_cursors.clear()
+            with self._pump_cond:
+                self._head = self._published = 0
+        if old is not None:
+            old.close()
+        self._reads.reset()
+        try:
+            self._call(
+                "start_ring_buffer", (list(ai_channels), float(max_seconds), ring.name, codec),
+                sync=True,
+            )
+        except BaseException:
+            with self._ring_lock:
+                if self._ring is ring:
+                    self._ring = None
+            ring.close()
+            raise
+        self._ring_running = True
+
+    def stop_ring_buffer(self) -> None:
+        if self.is_connected():
+            self._call("stop_ring_buffer")
+        self._ring_running = False
+
+    @property
+    def sample_codec(self) -> SampleCodec:
+        """Storage codec of the current ring session (see ``read_new_samples``)."""
+        return self._ring_codec
+
+    def snapshot_ring_buffer(self) -> np.ndarray:
+        """Return a copy of all samples currently held in the ring buffer."""
+        with self._ring_lock:
+            if self._ring is None:
+                return np.empty((0, 0), dtype=float)
+            rows, _, _ = self._ring.read(0)
+            codec = self._ring_codec
+        return np.empty((0, 0), dtype=float) if rows.size == 0 else codec.decode(rows)
+
+    def peek_last_samples(self, samples: int, copy: bool = True) -> np.ndarray:
+        """Return the most recent ``samples`` rows (always a copy).
+
+        A view into pages the child keeps overwriting could not be checked
+        against the sequence word, so ``copy=False`` still copies.
+        """
+        if samples <= 0:
+            return np.empty((0, 0), dtype=float)
+        with self._ring_lock:
+            if self._ring is None:
+                return np.empty((0, 0), dtype=float)
+            head = self._ring.total_written()
+            rows, _, _ = self._ring.read(head - min(int(samples), head))
+            codec = self._ring_codec
+        rows = rows[-int(samples):]
+        return np.empty((0, 0), dtype=float) if rows.size == 0 else codec.decode(rows)
+
+    def read_new_samples(self, consumer_id: str, decode: bool = True) -> np.ndarray:
+        """Return everything appended since this consumer's previous call.
+
+        Same contract as :meth:`ExperimentManager.read_new_samples`: the first
+        call joins at the oldest row held, a consumer lapped by the writer
+        has the gap reported as ``samples_lost``.
+        """
+        with self._ring_lock:
+            ring = self._ring
+            if ring is None:
+                return np.empty((0, 0), dtype=float)
+            last_seen = self._ring_cursors.get(consumer_id)
+            start = max(0, ring.total_written() - ring.capacity) if last_seen is None else last_seen
+            rows, head, samples_lost = ring.read(start)
+            if last_seen is None:
+                samples_lost = 0  # rows overwritten since joining, not a lag
+            self._ring_cursors[consumer_id] = head
+            codec = self._ring_codec
+        self._reads.record_read(consumer_id, head - start, samples_lost)
+        if samples_lost:
+            logger.warning(
+                "Ring buffer consumer %s fell behind by %d samples (dropped from ring)",
+                consumer_id, samples_lost,
+            )
+        if rows.size == 0:
+            return np.empty((0, 0), dtype=float)
+        return codec.decode(rows) if decode else rows
+
+    def reset_ring_cursor(self, consumer_id: str) -> None:
+        """Drop the cursor for ``consumer_id``. Next read starts at head."""
+        with self._ring_lock:
+            self._ring_cursors.pop(consumer_id, None)
+
+    # -- manager surface: push / telemetry ---------------------------------
+    def subscribe(
+        self,
+        name: str,
+        maxsize: int = 8,
+        policy: OverflowPolicy | str = OverflowPolicy.DROP_OLDEST,
+        callback: Optional[Callable[[np.ndarray], None]] = None,
+    ) -> Subscription:
+        """Register a push consumer of ring chunks (see :mod:`..subscription`)."""
+        sub = Subscription(name, maxsize=maxsize, policy=policy, callback=callback)
+        with self._subscribers_lock:
+            self._subscribers.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        """Stop delivering to ``sub`` and close it (queued chunks stay drainable)."""
+        with self._subscribers_lock:
+            if sub in self._subscribers:
+                self._subscribers.remove(sub)
+        sub.close()
+
+    def subscription_stats(self) -> list[dict]:
+        """Per-subscriber lag / delivered / dropped counters."""
+        with self._subscribers_lock:
+            subs = list(self._subscribers)
+        return [sub.stats() for sub in subs]
+
+    def metrics_snapshot(self) -> dict:
+        """The child's telemetry plus this side's consumers and subscribers.
+
+        Once the child is gone the last snapshot is returned, so a final
+        telemetry line or a mode's ``metrics_snapshot`` still has numbers.
+        """
+        try:
+            snap = self._call("metrics_snapshot")
+        except RuntimeError:
+            return dict(self._last_metrics)
+        snap["consumers"] = self._reads.snapshot()["consumers"]
+        snap["subscribers"] = self.subscription_stats()
+        snap["engine"] = {"pid": self.pid, "alive": self.is_connected()}
+        self._last_metrics = snap
+        return snap
+
+    # -- internals -----------------------------------------------------
+    def _call(self, name: str, args: tuple = (), kwargs: Optional[dict] = None,
+              sync: bool = False) -> Any:
+        """Run ``name`` in the child and return its result (or raise its error)."""
+        future: Future = Future()
+        with self._calls_lock:
+            if self._closed:
+                raise RuntimeError("Acquisition process is not running")
+            call_id = next(self._call_ids)
+            self._calls[call_id] = future
+        params = (self._settings.ai_params, self._settings.ao_params) if sync else None
+        try:
+            with self._send_lock:
+                self._conn.send((call_id, name, args, kwargs or {}, params))
+        except (OSError, ValueError) as exc:
+            with self._calls_lock:
+                self._calls.pop(call_id, None)
+            raise RuntimeError("Acquisition process is not running") from exc
+        return future.result()
+
+    def _read_loop(self) -> None:
+        """Dispatch the child's replies and ring notifications."""
+        try:
+            while True:
+                msg = self._conn.recv()
+                if msg[0] == _RING:
+                    with self._pump_cond:
+                        self._head = msg[1]
+                        self._pump_cond.notify_all()
+                    continue
+                _, call_id, ok, value = msg
+                with self._calls_lock:
+                    future = self._calls.pop(call_id, None)
+                if future is None:
+                    continue
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+        except (EOFError, OSError):
+            pass
+        finally:
+            with self._calls_lock:
+                self._closed = True
+                pending, self._calls = self._calls, {}
+            for future in pending.values():
+                future.set_exception(RuntimeError("Acquisition process exited"))
+
+    def _pump_loop(self) -> None:
+        """Feed push subscribers from the shared ring (GUI process side)."""
+        while True:
+            with self._pump_cond:
+                while not self._pump_stop and self._head <= self._published:
+                    self._pump_cond.wait()
+                if self._pump_stop:
+                    return
+            with self._subscribers_lock:
+                subs = list(self._subscribers)
+            with self._ring_lock:
+                ring = self._ring
+                with self._pump_cond:
+                    start = self._published
+                    if ring is None:
+                        self._published = self._head
+                        continue
+                try:
+                    rows, head, _ = ring.read(start) if subs else (None, ring.total_written(), 0)
+                except TimeoutError:
+                    logger.warning("Shared ring writer stalled; live subscribers not fed")
+                    continue
+                with self._pump_cond:
+                    self._published = head
+                codec = self._ring_codec
+            if rows is None or rows.size == 0:
+                continue
+            chunk = codec.decode(rows)
+            chunk.flags.writeable = False
+            for sub in subs:
+                sub._offer(chunk)
+
+
+class ProcessAIProvider(PersistentAIProvider):
+    """The persistent AI scan, run by the acquisition process.
+
+    Same lifecycle as :class:`PersistentAIProvider` -- one scan from Connect
+    to Disconnect -- driven through an :class:`AcquisitionEngine` instead of
+    an in-process :class:`ExperimentManager`.
+    """
+
+    def __init__(self, em: AcquisitionEngine, ring_max_seconds: float = 2.0) -> None:
+        if not isinstance(em, AcquisitionEngine):
+            raise TypeError(
+                "AcquisitionMode 'process' needs an AcquisitionEngine, "
+                f"got {type(em).__name__}"
+            )
+        super().__init__(em, ring_max_seconds=ring_max_seconds)  # type: ignore[arg-type]
+
+    @property
+    def mode(self) -> AcquisitionMode:
+        return AcquisitionMode.PROCESS
+
+
+__all__ = ["AcquisitionEngine", "ProcessAIProvider"]
@@ -0,0 +1,333 @@
+"""Segmented raw recordings: naming, the segment index and a block reader.
+
+A monolithic ``raw_ai`` file is unreadable until ``DiskRecorder.stop`` closes
+it, and a crash in a multi-day run can take the whole record with it. With
+``Acquisition.RecordSegmentSeconds`` / ``RecordSegmentMegabytes`` set, the
+recorder instead rolls over into numbered segment files next to the requested
+path::
+
+    x_raw.h5                      requested path (not created when segmented)
+    x_raw.seg0000.h5 ...          one ``raw_ai`` dataset each, SWMR-enabled
+    x_raw.segments.json           the index below
+
+The index is rewritten atomically (temp file + ``os.replace``) at every
+segment open / close, at ``mark_start`` and at ``stop``::
+
+    {"version": 1, "dataset": "raw_ai", "rows": 123456, "mark_index": 400,
+     "complete": false,
+     "segments": [{"file": "x_raw.seg0000.h5", "start": 0, "stop": 120000},
+                  {"file": "x_raw.seg0001.h5", "start": 120000, "stop": null}]}
+
+``stop: null`` marks the active segment; its length is whatever its SWMR
+dataset holds when read (``rows`` is the count at the last index write). After
+a crash every closed segment is intact and the active one is readable up to its
+last flushed block.
+
+:class:`RawRecording` reads either layout -- a monolithic file or an index --
+as one row-addressed stream, opening one segment at a time, so finalise and
+analysis never hold more than the requested block.
+
+Run statistics. While draining, the recorder keeps :class:`ChannelStats` --
+per-channel count / sum / sum of squares / min / max over the whole record plus
+count / sum up to ``mark_index`` (the baseline) -- and stores them in volts at
+``stop`` (``stats_*`` attributes on ``raw_ai``, or ``"stats"`` in a complete
+index). ``finalize_raw_to_h5`` takes the AD595 mean for ``Taux`` from them
+instead of a whole extra read pass, and :meth:`RawRecording.summary` gives a
+run summary without touching the samples.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Iterator, Optional
+
+import h5py
+import numpy as np
+
+from pioner.shared.sample_codec import SampleCodec
+
+#: Suffix of the segment index written next to the requested raw path.
+SEGMENT_INDEX_SUFFIX = ".segments.json"
+INDEX_VERSION = 1
+
+
+def segment_index_path(h5_path: str) -> str:
+    """Index path for a requested raw path: ``x_raw.h5`` -> ``x_raw.segments.json``."""
+    return os.path.splitext(str(h5_path))[0] + SEGMENT_INDEX_SUFFIX
+
+
+def segment_file_path(h5_path: str, number: int) -> str:
+    """Segment ``number`` for a requested raw path: ``x_raw.h5`` -> ``x_raw.seg0003.h5``."""
+    base, ext = os.path.splitext(str(h5_path))
+    return f"{base}.seg{int(number):04d}{ext or '.h5'}"
+
+
+def write_segment_index(index_path: str, index: dict) -> None:
+    """Atomically replace ``index_path`` with ``index`` (readers never see a torn file)."""
+    tmp = f"{index_path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=1)
+    os.replace(tmp, index_path)
+
+
+def read_segment_index(index_path: str) -> dict:
+    with open(index_path, "r", encoding="utf-8") as f:
+        index = json.load(f)
+    if int(index.get("version", 0)) != INDEX_VERSION:
+        raise ValueError(f"{index_path}: unsupported segment index version {index.get('version')!r}")
+    return index
+
+
+class ChannelStats:
+    """Running per-channel accumulators over drained rows (stored units).
+
+    :meth:`update` takes chunks in the ring's storage dtype (cheap: no
+    decode on the drain path); :meth:`to_volts` applies the codec's affine
+    ``scale`` / ``offset`` to the sums once, at the end.
+    """
+
+    _KEYS = ("count", "sum", "sumsq", "min", "max", "baseline_count", "baseline_sum")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.sum: Optional[np.ndarray] = None
+        self.sumsq: Optional[np.ndarray] = None
+        self.min: Optional[np.ndarray] = None
+        self.max: Optional[np.ndarray] = None
+        self.baseline_count = 0
+        self.baseline_sum: Optional[np.ndarray] = None
+
+    def update(self, chunk: np.ndarray) -> None:
+        x = np.asarray(chunk, dtype=np.float64)
+        if x.size == 0:
+            return
+        if self.sum is None:
+            n_channels = x.shape[1]
+            self.sum = np.zeros(n_channels)
+            self.sumsq = np.zeros(n_channels)
+            self.min = np.full(n_channels, np.inf)
+            self.max = np.full(n_channels, -np.inf)
+        self.count += int(x.shape[0])
+        self.sum += x.sum(axis=0)
+        self.sumsq += np.einsum("ij,ij->j", x, x)
+        np.minimum(self.min, x.min(axis=0), out=self.min)
+        np.maximum(self.max, x.max(axis=0), out=self.max)
+
+    def mark(self) -> None:
+        """Freeze the baseline (everything accumulated so far) at ``mark_start``."""
+        self.baseline_count = self.count
+        self.baseline_sum = None if self.sum is None else self.sum.copy()
+
+    def to_volts(self, codec: Optional[SampleCodec] = None) -> dict[str, Any]:
+        """JSON / attribute-ready stats in volts (empty when nothing was seen)."""
+        if self.sum is None:
+            return {}
+        n, nb = float(self.count), float(self.baseline_count)
+        total, sumsq = self.sum, self.sumsq
+        lo, hi = self.min, self.max
+        base = self.baseline_sum if self.baseline_sum is not None else np.zeros_like(total)
+        if codec is not None and codec.dtype == "int16":
+            a, b = codec.scale, codec.offset  # v = a * c + b, a > 0
+            sumsq = a * a * sumsq + 2 * a * b * total + b * b * n
+            total, base = a * total + b * n, a * base + b * nb
+            lo, hi = a * lo + b, a * hi + b
+        return {
+            "count": int(self.count),
+            "sum": np.asarray(total, dtype=float).tolist(),
+            "sumsq": np.asarray(sumsq, dtype=float).tolist(),
+            "min": np.asarray(lo, dtype=float).tolist(),
+            "max": np.asarray(hi, dtype=float).tolist(),
+            "baseline_count": int(self.baseline_count),
+            "baseline_sum": np.asarray(base, dtype=float).tolist(),
+        }
+
+    @classmethod
+    def attrs_from(cls, stats: dict[str, Any]) -> dict[str, Any]:
+        """``to_volts`` output as ``stats_*`` HDF5 attributes."""
+        return {f"stats_{k}": (np.asarray(v) if isinstance(v, list) else v)
+                for k, v in stats.items()}
+
+    @classmethod
+    def from_attrs(cls, attrs: Any) -> Optional[dict[str, Any]]:
+        """Inverse of :meth:`attrs_from`; ``None`` for recordings without stats."""
+        if "stats_count" not in attrs:
+            return None
+        out: dict[str, Any] = {}
+        for k in cls._KEYS:
+            v = attrs[f"stats_{k}"]
+            out[k] = int(v) if k.endswith("count") else np.asarray(v, dtype=float)
+        return out
+
+
+class RawRecording:
+    """Row-addressed reader over a monolithic or segmented raw recording.
+
+    ``path`` is either a raw HDF5 file (the single-file layout) or a
+    ``*.segments.json`` index. Rows come back in the stored dtype; decode
+    them with ``SampleCodec.from_attrs(recording.attrs)``. Use as a context
+    manager; :meth:`refresh` picks up rows written since opening (tailing a
+    live recording).
+    """
+
+    def __init__(self, path: str, dataset: str = "raw_ai") -> None:
+        self._path = str(path)
+        self._dataset = str(dataset)
+        self._segmented = self._path.endswith(SEGMENT_INDEX_SUFFIX)
+        self._file: Optional[h5py.File] = None
+        self._open_number: Optional[int] = None
+        self._dset: Optional[h5py.Dataset] = None
+        # (absolute file, start row, stop row or None for the active segment)
+        self._segments: list[tuple[str, int, Optional[int]]] = []
+        self._bounds: list[tuple[int, int]] = []
+        self.mark_index: int = -1
+        self.complete: bool = True
+        self.attrs: dict[str, Any] = {}
+        self.n_channels: int = 0
+        #: Volts stats from the recorder (``ChannelStats`` keys), or ``None``.
+        self.stats: Optional[dict[str, Any]] = None
+        self.refresh()
+
+    # -- layout --------------------------------------------------------
+    @property
+    def segmented(self) -> bool:
+        return self._segmented
+
+    @property
+    def rows(self) -> int:
+        return self._bounds[-1][1] if self._bounds else 0
+
+    @property
+    def segment_count(self) -> int:
+        return len(self._bounds)
+
+    def refresh(self) -> None:
+        """Re-read the index / dataset shapes (new segments, SWMR growth)."""
+        if not self._segmented:
+            self._refresh_single()
+            return
+        index = read_segment_index(self._path)
+        self._dataset = index.get("dataset", self._dataset)
+        self.mark_index = int(index.get("mark_index", -1))
+        self.complete = bool(index.get("complete", False))
+        if index.get("stats"):
+            self.stats = ChannelStats.from_attrs(
+                {f"stats_{k}": v for k, v in index["stats"].items()}
+            )
+        folder = os.path.dirname(os.path.abspath(self._path))
+        self._segments = [
+            (os.path.join(folder, seg["file"]), int(seg["start"]),
+             None if seg.get("stop") is None else int(seg["stop"]))
+            for seg in index.get("segments", [])
+        ]
+        self._bounds = []
+        for number, (_, start, stop) in enumerate(self._segments):
+            if stop is None:
+                stop = start + int(self._segment(number).shape[0])
+            self._bounds.append((start, stop))
+        if self._segments and not self.attrs:
+            dset = self._segment(0)
+            self.attrs = dict(dset.attrs)
+            self.n_channels = int(dset.shape[1])
+
+    def _refresh_single(self) -> None:
+        if self._file is None:
+            self._file = h5py.File(self._path, "r")
+            self._open_number = 0
+            self.mark_index = int(self._file.attrs.get("mark_index", -1))
+            if self._dataset in self._file:
+                self._dset = self._file[self._dataset]
+                self.attrs = dict(self._dset.attrs)
+                self.n_channels = int(self._dset.shape[1])
+                self.stats = ChannelStats.from_attrs(self._dset.attrs)
+        self._bounds = [(0, int(self._dset.shape[0]))] if self._dset is not None else []
+
+    def _segment(self, number: int) -> h5py.Dataset:
+        """Dataset of segment ``number``, keeping at most one segment open."""
+        if self._open_number != number:
+            self._close_file()
+            self._file = h5py.File(self._segments[number][0], "r", swmr=True)
+            self._dset = self._file[self._dataset]
+            self._open_number = number
+        assert self._dset is not None
+        if self._segments[number][2] is None:
+            self._dset.refresh()  # active segment: see the writer's latest flush
+        return self._dset
+
+    def summary(self) -> Optional[dict[str, Any]]:
+        """Per-channel mean / std / min / max, baseline and run means (volts).
+
+        From the recorder's stats alone -- no sample is read. ``None`` for a
+        recording without stats (older files, an interrupted run).
+        """
+        st = self.stats
+        if st is None or st["count"] == 0:
+            return None
+        n, nb = st["count"], st["baseline_count"]
+        mean = st["sum"] / n
+        var = np.maximum(st["sumsq"] / n - mean * mean, 0.0)
+        run_n = n - nb
+        nan = np.full_like(mean, np.nan)
+        return {
+            "rows": n,
+            "mark_index": self.mark_index,
+            "mean": mean,
+            "std": np.sqrt(var),
+            "min": st["min"],
+            "max": st["max"],
+            "baseline_mean": st["baseline_sum"] / nb if nb else nan,
+            "run_mean": (st["sum"] - st["baseline_sum"]) / run_n if run_n else nan,
+        }
+
+    # -- reading -------------------------------------------------------
+    def read(self, start: int, stop: int, column: Optional[int] = None) -> np.ndarray:
+        """Rows ``[start, stop)`` (clipped to :attr:`rows`); one column if given."""
+        start, stop = max(0, int(start)), min(int(stop), self.rows)
+        parts = []
+        for number, (lo, hi) in enumerate(self._bounds):
+            if hi <= start or lo >= stop:
+                continue
+            dset = self._segment(number) if self._segmented else self._dset
+            a, b = max(start, lo) - lo, min(stop, hi) - lo
+            parts.append(dset[a:b] if column is None else dset[a:b, column])
+        if not parts:
+            shape = (0,) if column is not None else (0, self.n_channels)
+            return np.empty(shape, dtype=self._dset.dtype if self._dset is not None else float)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts, axis=0)
+
+    def iter_blocks(
+        self, block_rows: int, column: Optional[int] = None
+    ) -> Iterator[tuple[int, np.ndarray]]:
+        """Yield ``(start_row, rows)`` blocks of at most ``block_rows`` in order."""
+        block_rows = max(1, int(block_rows))
+        for s in range(0, self.rows, block_rows):
+            yield s, self.read(s, s + block_rows, column)
+
+    # -- lifecycle -----------------------------------------------------
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._dset = None
+        self._open_number = None
+
+    def close(self) -> None:
+        self._close_file()
+
+    def __enter__(self) -> "RawRecording":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+__all__ = [
+    "ChannelStats",
+    "INDEX_VERSION",
+    "RawRecording",
+    "SEGMENT_INDEX_SUFFIX",
+    "read_segment_index",
+    "segment_file_path",
+    "segment_index_path",
+    "write_segment_index",
+]
@@ -0,0 +1,190 @@
+"""A sample ring in ``multiprocessing.shared_memory`` (one writer, N readers).
+
+Used by the out-of-process acquisition engine: the engine process appends
+every ingested chunk, the GUI process copies rows out of the same pages with
+no pickling on the way. Layout of the block::
+
+    [ header: int64 x 8 ][ data: dtype (capacity, n_channels) ]
+      header = seq, total_written, capacity, n_channels, dtype code, 0, 0, 0
+
+``total_written`` is the monotonic write index -- the same convention as
+``ExperimentManager._ring_total_samples``. ``seq`` is a seqlock word: the
+writer makes it odd before it touches the data or the index and even again
+once both are in place. A reader only accepts a copy taken while ``seq`` was
+even and unchanged across the copy, and retries otherwise, so it never pairs
+an index with rows that were still being written (or being overwritten by a
+lapping writer). A writer that dies mid-write leaves ``seq`` odd; readers give
+up after ``timeout`` seconds instead of spinning forever.
+"""
+
+from __future__ import annotations
+
+import time
+from multiprocessing import shared_memory
+from typing import Optional
+
+import numpy as np
+
+_HEADER_WORDS = 8
+_HEADER_BYTES = _HEADER_WORDS * np.dtype(np.int64).itemsize
+_SEQ, _TOTAL, _CAPACITY, _CHANNELS, _DTYPE = range(5)
+
+#: Default bound on how long a reader waits for a consistent copy (s).
+READ_TIMEOUT_S = 1.0
+
+
+class SharedRing:
+    """View over one shared-memory ring; use :meth:`create` / :meth:`attach`."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool) -> None:
+        self._shm = shm
+        self._owner = owner
+        self._header: np.ndarray = np.ndarray(
+            (_HEADER_WORDS,), dtype=np.int64, buffer=shm.buf
+        )
+        capacity, n_channels = int(self._header[_CAPACITY]), int(self._header[_CHANNELS])
+        self._data: Optional[np.ndarray] = np.ndarray(
+            (capacity, n_channels),
+            dtype=np.dtype(chr(int(self._header[_DTYPE]))),
+            buffer=shm.buf,
+            offset=_HEADER_BYTES,
+        )
+
+    @classmethod
+    def create(cls, capacity: int, n_channels: int, dtype=np.float64) -> "SharedRing":
+        """Allocate a new zeroed ring; the creator owns (unlinks) it."""
+        if capacity < 1 or n_channels < 1:
+            raise ValueError(
+                f"SharedRing needs capacity, n_channels >= 1, got {capacity}, {n_channels}"
+            )
+        dtype = np.dtype(dtype)
+        size = _HEADER_BYTES + int(capacity) * int(n_channels) * dtype.itemsize
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        header = np.ndarray((_HEADER_WORDS,), dtype=np.int64, buffer=shm.buf)
+        header[:] = 0
+        header[_CAPACITY] = int(capacity)
+        header[_CHANNELS] = int(n_channels)
+        header[_DTYPE] = ord(dtype.char)
+        del header
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedRing":
+        """Map an existing ring by name (the writer process side)."""
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    # -- introspection -------------------------------------------------
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def capacity(self) -> int:
+        return int(self._header[_CAPACITY])
+
+    @property
+    def n_channels(self) -> int:
+        return int(self._header[_CHANNELS])
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype(chr(int(self._header[_DTYPE])))
+
+    def total_written(self, timeout: float = READ_TIMEOUT_S) -> int:
+        """Consistent snapshot of the write index."""
+        deadline = None
+        while True:
+            seq = int(self._header[_SEQ])
+            total = int(self._header[_TOTAL])
+            if not seq & 1 and int(self._header[_SEQ]) == seq:
+                return total
+            deadline = self._wait(deadline, timeout)
+
+    # -- writer --------------------------------------------------------
+    def write(self, rows: np.ndarray) -> int:
+        """Append ``rows`` (``(n, n_channels)``, storage dtype); return the new index."""
+        assert self._data is not None
+        capacity = self._data.shape[0]
+        seq = int(self._header[_SEQ])
+        total = int(self._header[_TOTAL])
+        n = int(rows.shape[0])
+        if n > capacity:
+            # Only the newest ``capacity`` rows can survive anyway.
+            total += n - capacity
+            rows = rows[-capacity:]
+            n = capacity
+        self._header[_SEQ] = seq + 1
+        lo = total % capacity
+        first = min(n, capacity - lo)
+        self._data[lo:lo + first] = rows[:first]
+        if first < n:
+            self._data[:n - first] = rows[first:]
+        self._header[_TOTAL] = total + n
+        self._header[_SEQ] = seq + 2
+        return total + n
+
+    # -- readers -------------------------------------------------------
+    def read(
+        self, start: int, stop: Optional[int] = None, timeout: float = READ_TIMEOUT_S
+    ) -> tuple[np.ndarray, int, int]:
+        """Copy rows ``[start, stop)`` of the stream.
+
+        ``stop=None`` reads up to the current head; a ``stop`` past the head is
+        clamped to it. Returns ``(rows, head, lost)``: ``head`` is the write
+        index the copy is consistent with, and ``lost`` counts the rows before
+        ``start + lost`` that were already overwritten (``start`` older than
+        the ring holds is advanced to the oldest row). Raises
+        :class:`TimeoutError` if no consistent copy was possible within
+        ``timeout`` seconds.
+        """
+        data = self._data
+        assert data is not None
+        capacity = data.shape[0]
+        deadline = None
+        while True:
+            seq = int(self._header[_SEQ])
+            if not seq & 1:
+                head = int(self._header[_TOTAL])
+                end = head if stop is None else min(int(stop), head)
+                lost = max(0, (head - capacity) - start)
+                first = start + lost
+                if first >= end:
+                    rows = np.empty((0, data.shape[1]), dtype=data.dtype)
+                else:
+                    lo = first % capacity
+                    hi = lo + (end - first)
+                    if hi <= capacity:
+                        rows = data[lo:hi].copy()
+                    else:
+                        rows = np.concatenate((data[lo:], data[:hi - capacity]), axis=0)
+                if int(self._header[_SEQ]) == seq:
+                    return rows, head, lost
+            deadline = self._wait(deadline, timeout)
+
+    @staticmethod
+    def _wait(deadline: Optional[float], timeout: float) -> float:
+        """Back off before a retry; raise once ``timeout`` has passed."""
+        now = time.monotonic()
+        if deadline is None:
+            return now + timeout
+        if now > deadline:
+            raise TimeoutError(
+                f"shared ring writer did not finish a write within {timeout:.1f} s"
+            )
+        time.sleep(0)
+        return deadline
+
+    def close(self) -> None:
+        """Unmap (and, for the creator, unlink) the block."""
+        # Views into shm.buf must be gone before SharedMemory.close().
+        self._data = None
+        self._header = np.zeros(_HEADER_WORDS, dtype=np.int64)
+        self._shm.close()
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+__all__ = ["READ_TIMEOUT_S", "SharedRing"]
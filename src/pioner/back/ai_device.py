@@ -10,13 +10,19 @@ Two important details that differ from the previous implementation:
 2. We support both finite (``BLOCKIO`` / ``DEFAULTIO``) and continuous scans.
    For finite acquisitions the loop in :class:`ExperimentManager` waits for
    the scan to terminate; for continuous scans it polls ``current_index``.
+3. The DMA buffer is also exposed as a NumPy view (:meth:`get_buffer_view`)
+   over the same memory. Slicing the ctypes array directly would box every
+   sample into a Python float first; slicing the view is a plain memcpy.
 """
 
 from __future__ import annotations
 
 import logging
-from typing import MutableSequence, Protocol, Tuple, cast
+from typing import MutableSequence, Optional, Protocol, Tuple, cast
 
+import numpy as np
+
+from .ao_device import _RANGE_MAX_VOLTAGE
 from .mock_uldaq import uldaq as ul
 
 logger = logging.getLogger(__name__)
@@ -27,10 +33,12 @@ class _TransferStatus(Protocol):
 
     Real ``uldaq.TransferStatus`` and the mock's ``MockTransferStatus`` both
     expose ``current_index`` (sample offset of the writer head in the AI
-    buffer); the experiment manager only relies on that field.
+    buffer) and ``current_scan_count`` (monotonic number of whole scans
+    transferred); the experiment manager only relies on those fields.
     """
 
     current_index: int
+    current_scan_count: int
 
 
 class AiParams:
@@ -51,6 +59,10 @@ class AiParams:
     def channel_count(self) -> int:
         return self.high_channel - self.low_channel + 1
 
+    def full_scale_volts(self) -> Optional[float]:
+        """Peak ``|V|`` of the configured bipolar range (None if unknown)."""
+        return _RANGE_MAX_VOLTAGE.get(self.range_id)
+
 
 class AiDeviceHandler:
     """Wrap an ``uldaq.AiDevice`` and pre-allocate its read buffer."""
@@ -61,10 +73,11 @@ class AiDeviceHandler:
 
         self._ai_device = ai_device
         self._params = params
-        # Real uldaq returns a ctypes Array[c_double], mock returns List[float];
-        # both satisfy MutableSequence[float] (indexable, sliceable, len-able), which
-        # is all the experiment manager needs.
+        # Real uldaq and the mock both return a ctypes Array[c_double]; it is
+        # what ``a_in_scan`` fills. ``_buffer_view`` is a ``(samples, channels)``
+        # NumPy view over the same memory for the host-side readers.
         self._buffer: MutableSequence[float] = []
+        self._buffer_view: np.ndarray = np.empty((0, 0), dtype=float)
         self._buffer_samples_per_channel: int = 0
 
         info = ai_device.get_info()
@@ -94,17 +107,29 @@ class AiDeviceHandler:
         if n_chans <= 0:
             raise ValueError("AI channel range is invalid")
         self._buffer_samples_per_channel = samples_per_channel
-        # Real uldaq returns ctypes Array[c_double] (invariant, not a Sequence
-        # subclass in stubs); the mock returns List[float]. Cast — both are
-        # indexable/sliceable, which is all the experiment manager needs.
+        # ctypes Array[c_double] is invariant and not a Sequence subclass in
+        # the stubs; cast -- it is indexable/sliceable, and only ``a_in_scan``
+        # touches it directly.
         self._buffer = cast(
             MutableSequence[float], ul.create_float_buffer(n_chans, samples_per_channel)
         )
+        # Zero-copy: shares memory with the DMA target, rows are scans.
+        self._buffer_view = np.ctypeslib.as_array(self._buffer).reshape(
+            samples_per_channel, n_chans
+        )
         return self._buffer
 
     def get_buffer(self) -> MutableSequence[float]:
         return self._buffer
 
+    def get_buffer_view(self) -> np.ndarray:
+        """``(samples_per_channel, channels)`` view over the live DMA buffer.
+
+        No copy is made: the driver keeps writing into this memory, so slice
+        and ``.copy()`` only the rows it has finished with.
+        """
+        return self._buffer_view
+
     @property
     def samples_per_channel(self) -> int:
         return self._buffer_samples_per_channel
@@ -86,23 +86,14 @@ class ScanDataGenerator:
         self._buffer = self._build_buffer()
 
     def _build_buffer(self) -> MutableSequence[float]:
-        # Real uldaq returns ctypes Array[c_double]; mock returns List[float].
-        # Both support indexing/slicing, which is all the consumers need.
+        # Real uldaq and the mock both return a ctypes Array[c_double].
         buf = cast(MutableSequence[float], ul.create_float_buffer(self._n_chans, self._buffer_size))
-        # Build the interleaved buffer in numpy, then push it into ``buf``.
-        # ``buf`` is a Python list (mock) or a ctypes float array (real
-        # uldaq); both support slice assignment from a Python list.
+        # Build the interleaved buffer in numpy, then copy it into ``buf``
+        # through a view over the same memory (one memcpy, no list).
         matrix = np.column_stack([
             self._profiles[k] for k in _channel_keys(self._low, self._high)
         ])  # shape: (samples, channels)
-        flat = matrix.reshape(-1).tolist()
-        try:
-            buf[:] = flat
-        except (TypeError, ValueError):
-            # Older ctypes arrays may not accept full-slice assignment;
-            # fall back to per-element assignment.
-            for i, value in enumerate(flat):
-                buf[i] = float(value)
+        np.ctypeslib.as_array(buf)[:] = matrix.reshape(-1)
         return buf
 
     def get_buffer(self) -> MutableSequence[float]:
@@ -15,6 +15,8 @@ logger = logging.getLogger(__name__)
 # :meth:`AoDeviceHandler.set_voltage` and ``scan`` so a programmer error that
 # bypasses the chip-specific ``safe_voltage`` clamp (e.g. ``em.ao_set(1, 50)``)
 # fails loudly instead of silently saturating the DAC on real hardware.
+# The AI side shares the enum, so ``AiParams.full_scale_volts`` reads it too
+# (one LSB of int16 raw-sample storage is derived from it).
 _RANGE_MAX_VOLTAGE = {
     0: 60.0,   # BIP60VOLTS
     1: 30.0,   # BIP30VOLTS
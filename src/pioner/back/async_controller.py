@@ -0,0 +1,177 @@
+"""asyncio facade over a :class:`DeviceController`.
+
+The controller surface is blocking by design -- ``run()`` returns when the
+experiment is over, the health reports read a live window -- which costs a
+thread per concern (the GUI's ``_RunWorker``, the Tango command thread). A
+script or a network service that wants several live streams, monitoring and
+control in one event loop wraps the controller instead::
+
+    async with AsyncDeviceController(LocalDeviceController(settings)) as dev:
+        await dev.arm("slow", programs_json)
+        run = asyncio.create_task(dev.run())
+        async for chunk in dev.stream("scope"):
+            ...                      # live AI while the run records
+            if done: await dev.stop_run()
+        result = await run
+
+Blocking calls go to a small thread pool (more than one worker, so
+``stop_run`` can land while ``run`` is in flight). :meth:`stream` is push, not
+poll: it subscribes to the ring (``DeviceController.subscribe``) and the ring
+worker hands chunks to the loop with ``call_soon_threadsafe``. A stream whose
+consumer falls ``maxsize`` chunks behind drops the oldest and counts it in
+:attr:`AsyncDeviceController.dropped_chunks`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Optional
+
+import numpy as np
+
+from pioner.back.device_controller import DeviceController, RunResult
+from pioner.back.subscription import OverflowPolicy
+from pioner.shared.channels import UMOD_AI
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDeviceController:
+    """Awaitable lifecycle / reports plus ``async for`` AI streams.
+
+    Parameters
+    ----------
+    controller
+        The blocking controller to drive (normally ``LocalDeviceController``).
+    executor
+        Pool for the blocking calls; by default a private 4-thread pool,
+        shut down by :meth:`aclose`.
+    """
+
+    def __init__(
+        self,
+        controller: DeviceController,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ) -> None:
+        self._controller = controller
+        self._own_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="pioner-async"
+        )
+        self.dropped_chunks = 0
+
+    @property
+    def controller(self) -> DeviceController:
+        """The wrapped blocking controller (for cheap sync reads)."""
+        return self._controller
+
+    async def _call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    # -- lifecycle -----------------------------------------------------
+    async def connect(self) -> None:
+        await self._call(self._controller.connect)
+
+    async def disconnect(self) -> None:
+        await self._call(self._controller.disconnect)
+
+    async def aclose(self) -> None:
+        """Disconnect and release the private executor."""
+        await self.disconnect()
+        if self._own_executor:
+            self._executor.shutdown(wait=False)
+
+    async def __aenter__(self) -> "AsyncDeviceController":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    # -- experiment ----------------------------------------------------
+    async def arm(self, mode_name: str, programs_json: str) -> None:
+        await self._call(self._controller.arm, mode_name, programs_json)
+
+    async def run(self) -> Optional[RunResult]:
+        """Run the armed mode; resolves with its :class:`RunResult`."""
+        return await self._call(self._controller.run)
+
+    async def stop_run(self) -> None:
+        await self._call(self._controller.stop_run)
+
+    async def start_iso_hold(self) -> None:
+        await self._call(self._controller.start_iso_hold)
+
+    # -- reports -------------------------------------------------------
+    async def heater_health_report(self, window_seconds: float = 0.5) -> dict:
+        return await self._call(self._controller.heater_health_report, window_seconds)
+
+    async def rhcorr_report(self, window_seconds: float = 1.0) -> dict:
+        return await self._call(self._controller.rhcorr_report, window_seconds)
+
+    async def chip_presence_report(self) -> dict:
+        return await self._call(self._controller.chip_presence_report)
+
+    async def acquisition_metrics(self) -> dict:
+        return await self._call(self._controller.acquisition_metrics)
+
+    async def live_readout(self, window_seconds: float = 1.0) -> dict:
+        return await self._call(self._controller.live_readout, window_seconds)
+
+    async def live_modulation(
+        self,
+        frequency: float,
+        window_seconds: float = 1.0,
+        harmonics: tuple = (1,),
+        channel: int = UMOD_AI,
+    ) -> dict:
+        return await self._call(
+            self._controller.live_modulation, frequency, window_seconds, harmonics, channel
+        )
+
+    # -- streaming -----------------------------------------------------
+    async def stream(self, consumer_id: str, maxsize: int = 64) -> AsyncIterator[np.ndarray]:
+        """Yield every AI chunk the ring ingests from now on.
+
+        Each chunk is a read-only ``(rows, channels)`` float64 array shared
+        with other subscribers. Breaking out of the ``async for`` (or
+        cancelling the task) unsubscribes. A backend that cannot stream AI
+        (``subscribe`` returns ``None``) yields nothing; the stream ends at
+        once with a warning.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[np.ndarray] = asyncio.Queue(maxsize)
+
+        def put_latest(chunk: np.ndarray) -> None:  # runs on the loop
+            if queue.full():
+                queue.get_nowait()
+                self.dropped_chunks += 1
+            queue.put_nowait(chunk)
+
+        def deliver(chunk: np.ndarray) -> None:  # runs on the ring worker
+            try:
+                loop.call_soon_threadsafe(put_latest, chunk)
+            except RuntimeError:
+                pass  # loop already closed; the finally below unsubscribes
+
+        sub = self._controller.subscribe(
+            consumer_id, policy=OverflowPolicy.DROP_OLDEST, callback=deliver
+        )
+        if sub is None:
+            logger.warning(
+                "Stream %s: %s does not stream AI (not supported or not connected)",
+                consumer_id, type(self._controller).__name__,
+            )
+            return
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._controller.unsubscribe(sub)
+
+
+__all__ = ["AsyncDeviceController"]
@@ -33,16 +33,26 @@ import abc
 import json
 import logging
 import os
+import threading
 from dataclasses import dataclass
-from typing import Any, Optional, Sequence
+from typing import Any, Callable, Optional, Sequence
 
 import numpy as np
 import pandas as pd
 
-from pioner.back.acquisition import AIProvider, DiskRecorder, create_ai_provider
+from pioner.back.acquisition import (
+    AIProvider,
+    AcquisitionEngine,
+    AcquisitionMode,
+    DiskRecorder,
+    create_ai_provider,
+)
 from pioner.back.daq_device import DaqDeviceHandler
 from pioner.back.experiment_manager import ExperimentManager
+from pioner.back.live_readout import LiveReadout
 from pioner.back.mock_uldaq import DAQ_AVAILABLE
+from pioner.back.subscription import OverflowPolicy, Subscription
+from pioner.back.telemetry import MetricsDumper
 from pioner.back.modes import (
     apply_calibration,
     create_mode,
@@ -51,11 +61,13 @@ from pioner.back.modes import (
     save_run_to_h5,
 )
 from pioner.shared.calibration import Calibration
+from pioner.shared.channels import UMOD_AI
 from pioner.shared.constants import (
     CALIBRATION_FILE_REL_PATH,
     DEFAULT_CALIBRATION_FILE_REL_PATH,
     EXP_DATA_FILE_REL_PATH,
 )
+from pioner.shared.modulation import SlidingDFT
 from pioner.shared.settings import BackSettings
 
 logger = logging.getLogger(__name__)
@@ -68,7 +80,9 @@ class RunResult:
     The full dataset lives **on disk**, never returned as an in-RAM frame, so a
     multi-hour run cannot exhaust memory. ``cal_path`` is the calibrated (T)
     ``exp_data.h5``; ``raw_path`` is the raw (U) recorder file for the streaming
-    modes (``None`` for fast, which is single-shot and not ring-based). Read the
+    modes -- its ``*.segments.json`` index when recordings are segmented, read
+    with :class:`~pioner.back.acquisition.raw_recording.RawRecording` --
+    (``None`` for fast, which is single-shot and not ring-based). Read the
     result for display with :func:`pioner.back.modes.read_calibrated_h5`
     (decimated). ``mark_index`` is the baseline|run boundary row; ``aborted`` is
     True if a Stop interrupted the run (partial data).
@@ -207,11 +221,55 @@ class DeviceController(abc.ABC):
     def is_streaming(self) -> bool:
         return False
 
+    def subscribe(
+        self,
+        name: str,
+        maxsize: int = 8,
+        policy: OverflowPolicy | str = OverflowPolicy.DROP_OLDEST,
+        callback: Optional[Callable[[np.ndarray], None]] = None,
+    ) -> Optional[Subscription]:
+        """Push delivery of ingested AI chunks (see ``AIProvider.subscribe``).
+
+        ``None`` when this backend does not stream AI (or is not connected).
+        """
+        return None
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscription.close()
+
     @property
     def ai_sample_rate(self) -> float:
         """AI sample rate in Hz (0.0 when unknown)."""
         return 0.0
 
+    def acquisition_counters(self) -> dict:
+        """Poll count / CPU use of the acquisition workers; ``{}`` if unknown."""
+        return {}
+
+    def acquisition_metrics(self) -> dict:
+        """Ingest latency, consumer lag / losses, lock holds; ``{}`` if unknown."""
+        return {}
+
+    def live_readout(self, window_seconds: float = 1.0) -> dict:
+        """Engineering-unit live values (last / windowed mean, Taux).
+
+        See :class:`~pioner.back.live_readout.LiveReadout` for the layout.
+        """
+        return {"available": False, "reason": "not supported by this backend"}
+
+    def live_modulation(
+        self,
+        frequency: float,
+        window_seconds: float = 1.0,
+        harmonics: Sequence[int] = (1,),
+        channel: int = UMOD_AI,
+    ) -> dict:
+        """Amplitude / phase of the modulation harmonics over the newest AI window.
+
+        See :meth:`LocalDeviceController.live_modulation` for the layout.
+        """
+        return {"available": False, "reason": "not supported by this backend"}
+
     # ------------------------------------------------------------------
     # Backend identity (real DAQ vs mock) -- consumed by the GUI status
     # readout so the operator can tell a live board from the mock.
@@ -259,7 +317,9 @@ class LocalDeviceController(DeviceController):
     ----------
     settings
         Parsed :class:`BackSettings` (DAQ / AI / AO / modulation +
-        ``AcquisitionMode``).
+        ``AcquisitionMode``). With ``"process"`` the DAQ and the manager
+        live in an acquisition process and ``_em`` is its
+        :class:`AcquisitionEngine` proxy.
     calibration_path
         Calibration file to load on :meth:`apply_calibration`. Defaults
         to the bundled default until the GUI applies a user file.
@@ -271,6 +331,10 @@ class LocalDeviceController(DeviceController):
     # Ring consumer-id for the DiskRecorder that streams a slow / finite-iso run
     # to disk (distinct from the live-plot and any other consumer cursors).
     _STREAM_RECORDER = "local_controller_stream_recorder"
+    # Ring subscription feeding the incremental live readout.
+    _LIVE_READOUT = "local_controller_live_readout"
+    # Ring subscription feeding the sliding-DFT modulation readout.
+    _LIVE_MODULATION = "local_controller_live_modulation"
 
     def __init__(
         self,
@@ -284,7 +348,10 @@ class LocalDeviceController(DeviceController):
 
         self._calibration = Calibration()
         self._daq: Optional[DaqDeviceHandler] = None
-        self._em: Optional[ExperimentManager] = None
+        self._em: Optional[ExperimentManager | AcquisitionEngine] = None
+        # Set (and the same object as ``_em``) in AcquisitionMode "process";
+        # ``_daq`` then stays None, the child process owns the device.
+        self._engine: Optional[AcquisitionEngine] = None
         self._provider: Optional[AIProvider] = None
         self._mode: Any = None
         self._mode_name: str = ""
@@ -298,15 +365,33 @@ class LocalDeviceController(DeviceController):
         self._stop_requested: bool = False
         # True while an eternal iso hold (start_iso_hold) is driving AO.
         self._iso_holding: bool = False
+        # Periodic JSONL telemetry dump (Acquisition.TelemetryFile), if set.
+        self._metrics_dumper: Optional[MetricsDumper] = None
+        # Values-sidebar aggregates, fed from a ring subscription taken on the
+        # first live_readout() call (no cost until someone asks).
+        self._live_lock = threading.Lock()
+        self._live = LiveReadout()
+        self._live_sub: Optional[Subscription] = None
+        # Live modulation bins (live_modulation), rebuilt whenever the
+        # (rate, frequency, window, harmonics, channel) key changes.
+        self._mod_lock = threading.Lock()
+        self._mod_sub: Optional[Subscription] = None
+        self._mod_dft: Optional[SlidingDFT] = None
+        self._mod_key: Optional[tuple] = None
 
     # -- connection ----------------------------------------------------
     def connect(self) -> None:
         if self.is_connected():
             logger.warning("LocalDeviceController.connect called while connected; ignoring")
             return
-        self._daq = DaqDeviceHandler(self._settings.daq_params)
-        self._daq.try_connect()
-        self._em = ExperimentManager(self._daq, self._settings)
+        if AcquisitionMode.from_string(self._settings.acquisition_mode) is AcquisitionMode.PROCESS:
+            self._engine = AcquisitionEngine(self._settings)
+            self._engine.start()
+            self._em = self._engine
+        else:
+            self._daq = DaqDeviceHandler(self._settings.daq_params)
+            self._daq.try_connect()
+            self._em = ExperimentManager(self._daq, self._settings)
         self._provider = create_ai_provider(
             self._settings.acquisition_mode,
             self._em,
@@ -319,6 +404,14 @@ class LocalDeviceController(DeviceController):
             )
         )
         self._provider.on_connect(self._ai_channels)
+        acquisition = self._settings.acquisition
+        if acquisition.telemetry_file:
+            self._metrics_dumper = MetricsDumper(
+                self._provider.metrics_snapshot,
+                acquisition.telemetry_file,
+                interval=acquisition.telemetry_interval,
+            )
+            self._metrics_dumper.start()
         # Default to the bundled calibration so derived live values
         # (R, I, T) are computable immediately after connect.
         self.apply_default_calibration()
@@ -333,6 +426,22 @@ class LocalDeviceController(DeviceController):
                 self._em.zero_ao()
             except Exception:
                 logger.exception("Failed to zero AO on disconnect")
+        if self._metrics_dumper is not None:
+            try:
+                self._metrics_dumper.stop()  # final line before the ring goes
+            except Exception:
+                logger.exception("Telemetry dumper stop failed")
+            self._metrics_dumper = None
+        # End the live subscriptions on the provider that fed them.
+        with self._live_lock:
+            live_sub, self._live_sub = self._live_sub, None
+            self._live.reset()
+        with self._mod_lock:
+            mod_sub, self._mod_sub = self._mod_sub, None
+            self._mod_key = None
+        for sub in (live_sub, mod_sub):
+            if sub is not None:
+                self.unsubscribe(sub)
         if self._provider is not None:
             try:
                 self._provider.on_disconnect()
@@ -343,6 +452,11 @@ class LocalDeviceController(DeviceController):
                 self._em.stop()
             except Exception:
                 logger.exception("ExperimentManager.stop failed")
+        if self._engine is not None:
+            try:
+                self._engine.shutdown()
+            except Exception:
+                logger.exception("Acquisition process shutdown failed")
         if self._daq is not None:
             try:
                 self._daq.quit()
@@ -350,12 +464,15 @@ class LocalDeviceController(DeviceController):
                 logger.exception("DAQ quit failed")
         self._provider = None
         self._em = None
+        self._engine = None
         self._daq = None
         self._mode = None
         self._iso_holding = False
         logger.info("LocalDeviceController disconnected")
 
     def is_connected(self) -> bool:
+        if self._engine is not None:
+            return self._engine.is_connected()
         return self._daq is not None and self._daq.is_connected()
 
     # -- calibration ---------------------------------------------------
@@ -370,16 +487,22 @@ class LocalDeviceController(DeviceController):
 
     def apply_calibration(self) -> None:
         self._calibration.read(self._calibration_path)
+        self._reset_live()
         logger.info("Applied calibration from %s", self._calibration_path)
 
     def apply_default_calibration(self) -> None:
         self._calibration.read(DEFAULT_CALIBRATION_FILE_REL_PATH)
         self._calibration_path = DEFAULT_CALIBRATION_FILE_REL_PATH
+        self._reset_live()
         logger.info("Applied default calibration")
 
     def get_calibration(self) -> dict:
         return json.loads(self._calibration.get_str())
 
+    def _reset_live(self) -> None:
+        with self._live_lock:
+            self._live.reset()
+
     # -- sample rate ---------------------------------------------------
     def _validate_rate(self, rate: int) -> None:
         """Fail loud on a sample rate the pipeline cannot honour (P1-31).
@@ -394,7 +517,10 @@ class LocalDeviceController(DeviceController):
             raise ValueError(f"sample rate must be positive, got {rate}")
         if rate % 2 != 0:
             raise ValueError(f"sample rate must be even (half-buffer flip), got {rate}")
-        f_mod = float(getattr(self._settings.modulation, "frequency", 0.0) or 0.0)
+        modulation = self._settings.modulation
+        f_mod = float(getattr(modulation, "frequency", 0.0) or 0.0)
+        # A multi-tone drive is bounded by its highest tone.
+        f_mod = max([f_mod] + [f for f, _ in getattr(modulation, "tones", ())])
         if f_mod > 0 and rate <= 2 * f_mod:
             raise ValueError(
                 f"sample rate {rate} Hz is below the lock-in Nyquist for "
@@ -405,6 +531,7 @@ class LocalDeviceController(DeviceController):
         rate = int(rate)
         self._settings.ai_params.sample_rate = rate
         self._settings.ao_params.sample_rate = rate
+        self._reset_live()
         logger.info("Sample rate set to %d Hz", rate)
         # The ring buffer was armed at the previous rate; restart it so the
         # live display's time axis stays consistent with the new rate
@@ -421,6 +548,7 @@ class LocalDeviceController(DeviceController):
     def reset_sample_rate(self) -> None:
         self._settings.parse_ai_params()
         self._settings.parse_ao_params()
+        self._reset_live()
 
     def get_sample_rate(self) -> int:
         return int(self._settings.ai_params.sample_rate)
@@ -452,7 +580,7 @@ class LocalDeviceController(DeviceController):
 
     # -- experiment ----------------------------------------------------
     def arm(self, mode_name: str, programs_json: str) -> None:
-        if self._daq is None:
+        if self._em is None:
             raise RuntimeError("LocalDeviceController is not connected")
         programs = json.loads(programs_json)
         self._mode_name = mode_name.lower().strip()
@@ -520,7 +648,9 @@ class LocalDeviceController(DeviceController):
         # live ring around it and resume afterwards.
         self._pause_stream()
         try:
-            df = self._mode.run()
+            # In process mode only the engine can reach the DAQ, so the scan
+            # runs there instead of on a private manager.
+            df = self._mode.run() if self._engine is None else self._mode.run(em=self._engine)
         finally:
             # Fast ran at 20 kHz; restore the pre-fast monitor rate before the
             # ring is brought back up so live monitoring resumes at the rate
@@ -564,7 +694,18 @@ class LocalDeviceController(DeviceController):
             raise RuntimeError("LocalDeviceController is not connected")
         em = self._em
         raw_path = self._raw_path_for(cal_path)
-        recorder = DiskRecorder(em, raw_path, consumer_id=self._STREAM_RECORDER)
+        acq = self._settings.acquisition
+        sample_rate = float(self._settings.ai_params.sample_rate)
+        recorder = DiskRecorder(
+            em, raw_path,
+            consumer_id=self._STREAM_RECORDER,
+            codec=em.sample_codec,
+            sample_rate=sample_rate,
+            compression=acq.record_compression,
+            segment_seconds=acq.record_segment_seconds,
+            segment_bytes=(None if acq.record_segment_megabytes is None
+                           else int(acq.record_segment_megabytes * 1024 * 1024)),
+        )
         recorder.start()
         try:
             recorder.mark_start()                    # program t=0 boundary
@@ -576,15 +717,17 @@ class LocalDeviceController(DeviceController):
             if self._stop_requested:
                 em.zero_ao()
         mark = recorder.mark_index or 0
+        raw_path = recorder.path  # the segment index when segmented
         summary = finalize_raw_to_h5(
             raw_path, cal_path,
-            sample_rate=float(self._settings.ai_params.sample_rate),
+            sample_rate=sample_rate,
             calibration=self._calibration,
             settings=self._settings,
             voltage_profiles=self._mode.voltage_profiles,
             programs=self._last_programs,
             ai_channels=self._ai_channels,
-            modulation=self._settings.modulation,
+            # Iso reports the tones as driven (snapped onto AO-buffer bins).
+            modulation=getattr(self._mode, "modulation", self._settings.modulation),
             program_offset=mark,
             tile_profile=tile_profile,
         )
@@ -662,10 +805,129 @@ class LocalDeviceController(DeviceController):
     def is_streaming(self) -> bool:
         return self._provider is not None and self._provider.is_active()
 
+    def subscribe(
+        self,
+        name: str,
+        maxsize: int = 8,
+        policy: OverflowPolicy | str = OverflowPolicy.DROP_OLDEST,
+        callback: Optional[Callable[[np.ndarray], None]] = None,
+    ) -> Optional[Subscription]:
+        if self._provider is None:
+            return None
+        return self._provider.subscribe(name, maxsize=maxsize, policy=policy, callback=callback)
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        if self._provider is not None:
+            self._provider.unsubscribe(subscription)
+        else:
+            subscription.close()
+
     @property
     def ai_sample_rate(self) -> float:
         return float(self._settings.ai_params.sample_rate)
 
+    def acquisition_counters(self) -> dict:
+        if self._em is None:
+            return {}
+        return self._em.worker_counters()
+
+    def acquisition_metrics(self) -> dict:
+        if self._provider is None:
+            return {}
+        return self._provider.metrics_snapshot()
+
+    def live_readout(self, window_seconds: float = 1.0) -> dict:
+        """Calibrate only the AI rows ingested since the last call; return aggregates.
+
+        The first call subscribes to the ring (drop-oldest queue, so the ring
+        worker only enqueues); every call drains it and folds the new rows
+        into the :class:`LiveReadout`. A different ``window_seconds`` restarts
+        the aggregates.
+        """
+        provider = self._provider
+        if provider is None:
+            return {"available": False, "reason": "not connected"}
+        with self._live_lock:
+            if self._live_sub is None:
+                self._live_sub = provider.subscribe(
+                    self._LIVE_READOUT, maxsize=64, policy=OverflowPolicy.DROP_OLDEST
+                )
+            if window_seconds != self._live.window_seconds:
+                self._live.reset(window_seconds)
+            self._live.update(
+                self._live_sub.drain(),
+                float(self._settings.ai_params.sample_rate),
+                self._calibration,
+            )
+            return self._live.snapshot()
+
+    def live_modulation(
+        self,
+        frequency: float,
+        window_seconds: float = 1.0,
+        harmonics: Sequence[int] = (1,),
+        channel: int = UMOD_AI,
+    ) -> dict:
+        """Harmonic bins of ``channel`` over the newest ``window_seconds``, O(new rows).
+
+        Replaces an FFT of the whole scope window per refresh tick: a
+        :class:`~pioner.shared.modulation.SlidingDFT` is advanced with only
+        the rows a ring subscription delivered since the previous call, so
+        every row enters the window exactly once. Changing any argument (or
+        the sample rate) restarts it from the rows that arrive afterwards.
+        The window is trimmed to whole modulation cycles, as
+        :func:`~pioner.shared.modulation.fft_demodulate` does, so both read
+        the same amplitude for a stationary drive.
+
+        Returns ``{"available", "frequency", "channel", "window_samples",
+        "samples", "harmonics": {h: {"amplitude", "phase"}}}``; amplitudes are
+        in volts of ``channel``, phases in the lag convention referenced to
+        the first sample after the (re-)seed. ``available`` is False (with a
+        ``reason``) until a whole window has been seen.
+        """
+        if self._provider is None:
+            return {"available": False, "reason": "not connected"}
+        rate = float(self._settings.ai_params.sample_rate)
+        key = (rate, float(frequency), float(window_seconds), tuple(harmonics), int(channel))
+        with self._mod_lock:
+            if self._mod_sub is None:
+                self._mod_sub = self._provider.subscribe(
+                    self._LIVE_MODULATION, maxsize=64, policy=OverflowPolicy.DROP_OLDEST
+                )
+            if key != self._mod_key:
+                try:
+                    self._mod_dft = SlidingDFT(
+                        rate, frequency, int(round(window_seconds * rate)), harmonics
+                    )
+                except ValueError as exc:
+                    self._mod_key = None
+                    return {"available": False, "reason": str(exc)}
+                self._mod_key = key
+                # Seed from the subscription alone: rows queued before the
+                # re-key are stale, and a peek of the ring would overlap
+                # whatever the worker publishes after this drain.
+                self._mod_sub.drain()
+            new = self._mod_sub.drain()
+            dft = self._mod_dft
+            if new.size and channel < new.shape[1]:
+                dft.push(new[:, channel])
+            result: dict = {
+                "available": dft.filled,
+                "frequency": dft.frequency,
+                "channel": int(channel),
+                "window_samples": dft.window,
+                "samples": dft.samples,
+            }
+            if not dft.filled:
+                result["reason"] = "window not filled yet"
+                result["harmonics"] = {}
+                return result
+            result["harmonics"] = {
+                h.harmonic: {"amplitude": h.amplitude, "phase": h.phase}
+                for h in dft.harmonics()
+            }
+            return result
+
     @property
     def is_mock(self) -> bool:
         # Single source of truth: the mock layer flips DAQ_AVAILABLE to False
@@ -825,6 +1087,7 @@ class LocalDeviceController(DeviceController):
             os.makedirs(calib_dir, exist_ok=True)
         self._calibration.write(CALIBRATION_FILE_REL_PATH)
         self._calibration_path = CALIBRATION_FILE_REL_PATH
+        self._reset_live()
         rep["written_to"] = CALIBRATION_FILE_REL_PATH
         logger.info(
             "R-correction auto-zero: thtrcorr %.6g -> %.6g (residual %.4g C, "
@@ -911,6 +1174,9 @@ class TangoDeviceController(DeviceController):
     def get_sample_rate(self) -> int:
         return int(self._device.get_sample_rate[1][0]["value"])
 
+    def acquisition_metrics(self) -> dict:
+        return json.loads(self._device.acquisition_metrics or "{}")
+
     def arm(self, mode_name: str, programs_json: str) -> None:
         self._device.select_mode(mode_name.lower().strip())
         self._device.arm(programs_json)
@@ -24,9 +24,17 @@ Implementation notes
   flips between the lower and upper half of the buffer based on the actual
   ``current_index`` returned by the driver, which makes it robust against
   slow callers (we will detect a "skipped" half by index comparison and
-  copy both halves before re-arming).
+  copy both halves before re-arming). The ring worker can instead ingest
+  incrementally (``Acquisition.Ingestion = Incremental``): each poll copies
+  every scan completed since the previous one, so the live ring lags the
+  hardware by a few ms rather than up to half a buffer.
 * For finite scans we wait for the AO scan to terminate before stopping AI,
   then drain whatever was still in the AI buffer.
+* The acquisition workers are event-paced, not spin-polled: after each
+  status call they sleep (on their stop / cancel event) until the next chunk
+  is expected to be complete, derived from the sample rate and the writer's
+  distance to the next boundary. Poll count and worker CPU time are kept in
+  :class:`WorkerCounters` (see :meth:`ExperimentManager.worker_counters`).
 * Data on disk goes through ``pandas.HDFStore``; we trigger the lazy
   initialisation of ``to_hdf`` once at startup so that the first acquisition
   buffer is not lost to the ~1 s setup delay.
@@ -34,14 +42,14 @@ Implementation notes
 
 from __future__ import annotations
 
+import contextlib
 import glob
 import logging
 import os
 import threading
 import time
-from collections import deque
-from dataclasses import dataclass
-from typing import Iterable, List, Optional, Sequence
+from dataclasses import asdict, dataclass
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence
 
 import numpy as np
 import pandas as pd
@@ -54,14 +62,71 @@ from pioner.shared.constants import (
     RAW_DATA_FILE_REL_PATH,
     RAW_DATA_FOLDER_REL_PATH,
 )
-from pioner.shared.settings import BackSettings
+from pioner.shared.sample_codec import SampleCodec
+from pioner.shared.settings import AcquisitionConfig, BackSettings
 from pioner.back.ai_device import AiDeviceHandler, AiParams
 from pioner.back.ao_data_generators import ScanDataGenerator
 from pioner.back.ao_device import AoDeviceHandler, AoParams
 from pioner.back.daq_device import DaqDeviceHandler
+from pioner.back.subscription import OverflowPolicy, Subscription
+from pioner.back.telemetry import AcquisitionMetrics
 
 logger = logging.getLogger(__name__)
 
+# Bounds on the acquisition workers' status-poll period (seconds). The floor
+# keeps a worker from spinning when a chunk is due imminently; the ceiling
+# caps how stale a misestimate can make us (well under any half-buffer).
+POLL_PERIOD_MIN = 0.001
+POLL_PERIOD_MAX = 0.1
+
+
+def _poll_period(rows_ahead: int, sample_rate: float) -> float:
+    """Seconds until ``rows_ahead`` more scans land at ``sample_rate``, clamped."""
+    if sample_rate <= 0:
+        return POLL_PERIOD_MIN
+    return min(POLL_PERIOD_MAX, max(POLL_PERIOD_MIN, rows_ahead / float(sample_rate)))
+
+
+def _rows_to_next_half(current_index: int, n_chans: int, samples_per_channel: int) -> int:
+    """Scans until the writer reaches the next half-buffer boundary (>= 1)."""
+    writer_row = current_index // max(n_chans, 1)
+    half = samples_per_channel // 2
+    boundary = half if writer_row < half else samples_per_channel
+    return max(1, boundary - writer_row)
+
+
+@dataclass
+class WorkerCounters:
+    """Poll count and CPU use of one acquisition worker session.
+
+    ``cpu_seconds`` is the worker thread's own CPU time (``time.thread_time``)
+    and ``wall_seconds`` its elapsed time, so ``cpu_fraction`` is the share of
+    one core the worker used -- the figure to watch on the Pi during long
+    slow runs.
+    """
+
+    polls: int = 0
+    cpu_seconds: float = 0.0
+    wall_seconds: float = 0.0
+
+    @property
+    def cpu_fraction(self) -> float:
+        return self.cpu_seconds / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+
+class _WorkerClock:
+    """Accumulates :class:`WorkerCounters` from inside the worker thread."""
+
+    def __init__(self, counters: WorkerCounters) -> None:
+        self._counters = counters
+        self._cpu0 = time.thread_time()
+        self._wall0 = time.monotonic()
+
+    def tick(self) -> None:
+        self._counters.polls += 1
+        self._counters.cpu_seconds = time.thread_time() - self._cpu0
+        self._counters.wall_seconds = time.monotonic() - self._wall0
+
 
 @dataclass
 class ScanResult:
@@ -80,6 +145,8 @@ class ExperimentManager:
         self._daq_device_handler = daq_device_handler
         self._ai_params: AiParams = settings.ai_params
         self._ao_params: AoParams = settings.ao_params
+        # Ring-ingestion strategy (half-buffer flip vs incremental span copy).
+        self._acquisition: AcquisitionConfig = settings.acquisition
 
         self._ai_handler: Optional[AiDeviceHandler] = None
         self._ao_handler: Optional[AoDeviceHandler] = None
@@ -96,10 +163,17 @@ class ExperimentManager:
         self._ring_thread: Optional[threading.Thread] = None
         self._ring_stop = threading.Event()
         self._ring_lock = threading.Lock()
-        self._ring_data: deque[np.ndarray] = deque()
+        # Preallocated ``(capacity, n_channels)`` circular store, sized in
+        # ``start_ring_buffer``. Row ``i`` of the stream (monotonic index) lives
+        # at ``i % capacity``; ``None`` until the first ring session.
+        self._ring_buf: Optional[np.ndarray] = None
+        # How ``_ring_buf`` holds samples (float64 / float32 / int16 counts,
+        # per ``Acquisition.StorageDtype``); rebuilt at each ring start.
+        # Public readers decode back to float64 volts.
+        self._ring_codec = SampleCodec()
         self._ring_max_seconds: float = 10.0
-        # Total samples ever appended to the ring buffer (monotonic counter,
-        # incremented in ``_ring_loop``). Used as the cursor space for
+        # Total samples ever appended to the ring buffer (monotonic write
+        # index, advanced in ``_ring_loop``). Used as the cursor space for
         # ``read_new_samples``.
         self._ring_total_samples: int = 0
         # Per-consumer cursors for ``read_new_samples`` -- maps an opaque
@@ -107,6 +181,20 @@ class ExperimentManager:
         # its last successful read. Guarded by ``_ring_lock``.
         self._ring_cursors: dict[str, int] = {}
 
+        # Push subscribers fed by ``_ring_loop`` with each ingested chunk.
+        # Own lock so publishing never holds ``_ring_lock``.
+        self._subscribers: list[Subscription] = []
+        self._subscribers_lock = threading.Lock()
+
+        # Ingest latency / consumer lag / lock-hold telemetry (see
+        # ``pioner.back.telemetry``); reset at each ring start.
+        self.metrics = AcquisitionMetrics()
+
+        # Poll / CPU counters of the most recent session of each worker
+        # ("ring" = _ring_loop, "finite" = finite_scan collectors). Written
+        # only by the owning worker thread.
+        self._worker_counters: dict[str, WorkerCounters] = {}
+
         self._prime_pandas()
 
     # ------------------------------------------------------------------
@@ -342,6 +430,13 @@ class ExperimentManager:
                 f"AI sample_rate must be even (got {self._ai_params.sample_rate}); "
                 "the half-buffer flip protocol requires an even buffer length."
             )
+        # Resolve the storage codec before touching the scan so a bad
+        # StorageDtype / range combination fails without side effects.
+        codec = SampleCodec.for_storage(
+            self._acquisition.storage_dtype,
+            len(ai_channels),
+            self._ai_params.full_scale_volts(),
+        )
         # If a previous ``ao_modulated`` armed AO with ``EXTTRIGGER`` (because
         # ``hardware_trigger`` is on), arm AI the same way and fire the shared
         # trigger after both scans are gated. This gives iso AC a clean t=0 on
@@ -360,10 +455,18 @@ class ExperimentManager:
             self._daq_device_handler.fire_software_trigger()
 
         self._ring_max_seconds = float(max_seconds)
+        # Depth in rows: never less than one half-buffer, so a single flip
+        # always fits without overwriting itself.
+        capacity = max(
+            self._ai_buffer_samples_per_channel // 2,
+            int(round(self._ring_max_seconds * self._ai_params.sample_rate)),
+        )
+        self.metrics.reset()
         with self._ring_lock:
-            self._ring_data.clear()
-            # New scan: reset the monotonic sample counter and any stale
-            # consumer cursors from a previous session.
+            # New scan: fresh store, reset the monotonic sample counter and
+            # any stale consumer cursors from a previous session.
+            self._ring_codec = codec
+            self._ring_buf = np.zeros((capacity, len(ai_channels)), dtype=codec.dtype)
             self._ring_total_samples = 0
             self._ring_cursors.clear()
         self._ring_stop.clear()
@@ -383,12 +486,19 @@ class ExperimentManager:
         if self._ai_handler is not None:
             self._ai_handler.stop()
 
+    @property
+    def sample_codec(self) -> SampleCodec:
+        """Storage codec of the current ring session (see ``read_new_samples``)."""
+        return self._ring_codec
+
     def snapshot_ring_buffer(self) -> np.ndarray:
         """Return a copy of all samples currently held in the ring buffer."""
-        with self._ring_lock:
-            if not self._ring_data:
+        with self._timed_ring_lock("snapshot"):
+            head = self._ring_total_samples
+            buffered = self._ring_buffered_samples_locked()
+            if buffered == 0:
                 return np.empty((0, 0), dtype=float)
-            return np.concatenate(list(self._ring_data), axis=0)
+            return self._ring_codec.decode(self._ring_slice_locked(head - buffered, head))
 
     # ------------------------------------------------------------------
     # Ring buffer extensions for the AIProvider layer.
@@ -402,91 +512,195 @@ class ExperimentManager:
     #   cursor.
     #
     # Cursors are expressed in terms of total samples ever appended to the
-    # ring buffer (``_ring_total_samples``). That counter is incremented in
-    # ``_ring_loop`` as each half-buffer is copied into ``_ring_data``.
-    # Samples that have already fallen off the front of the deque (because
-    # ``max_chunks`` was exceeded) are gone -- a consumer that fell that
-    # far behind sees the gap reported as ``samples_lost`` in the metadata
-    # of the next ``read_new_samples`` call.
+    # ring buffer (``_ring_total_samples``), i.e. the monotonic write index
+    # into the preallocated ``_ring_buf``. Both reads are O(requested rows):
+    # at most two slice copies across the wrap point, no walk over history.
+    # Samples older than ``capacity`` rows have been overwritten -- a
+    # consumer that fell that far behind sees the gap reported as
+    # ``samples_lost`` by the next ``read_new_samples`` call.
     # ------------------------------------------------------------------
-    def peek_last_samples(self, samples: int) -> np.ndarray:
+    def peek_last_samples(self, samples: int, copy: bool = True) -> np.ndarray:
         """Return the most recent ``samples`` rows from the ring buffer.
 
         Read-only: no cursor is advanced. If fewer than ``samples`` rows
         are available, returns whatever is in the ring (possibly empty).
+
+        With ``copy=False`` a read-only view into the ring is returned when
+        the window does not straddle the wrap point (a copy otherwise). The
+        view is only valid until the writer laps it -- consume it at once.
+        Only float64 storage can be viewed; compact storage is always
+        decoded into a fresh float64 array.
         """
         if samples <= 0:
             return np.empty((0, 0), dtype=float)
-        with self._ring_lock:
-            if not self._ring_data:
+        with self._timed_ring_lock("peek"):
+            head = self._ring_total_samples
+            take = min(int(samples), self._ring_buffered_samples_locked())
+            if take == 0:
                 return np.empty((0, 0), dtype=float)
-            collected: List[np.ndarray] = []
-            remaining = int(samples)
-            # Walk chunks from the back (newest) to the front, take the
-            # tail of each as needed.
-            for chunk in reversed(self._ring_data):
-                if remaining <= 0:
-                    break
-                take = min(len(chunk), remaining)
-                collected.append(chunk[-take:])
-                remaining -= take
-            collected.reverse()
-            return np.concatenate(collected, axis=0)
-
-    def read_new_samples(self, consumer_id: str) -> np.ndarray:
+            return self._ring_codec.decode(
+                self._ring_slice_locked(head - take, head, copy=copy)
+            )
+
+    def read_new_samples(self, consumer_id: str, decode: bool = True) -> np.ndarray:
         """Return everything appended since this consumer's previous call.
 
         Advances the consumer's private cursor. First call for a given
         ``consumer_id`` returns whatever is currently in the ring buffer
         (the consumer effectively "joins" at the current head).
+
+        ``decode=False`` returns the rows in the ring's storage dtype
+        (:attr:`sample_codec`) -- for the disk recorder, which writes them
+        as-is and records the codec next to the data.
         """
-        with self._ring_lock:
+        with self._timed_ring_lock("read_new"):
             head = int(self._ring_total_samples)
+            # Oldest sample still held; anything before it was overwritten.
+            oldest_available = head - self._ring_buffered_samples_locked()
             last_seen = self._ring_cursors.get(consumer_id)
-            if last_seen is None:
-                # First read for this consumer: start from the oldest
-                # sample currently in the ring.
-                start = head - self._ring_buffered_samples_locked()
-            else:
-                start = int(last_seen)
+            # First read for this consumer: start from the oldest sample
+            # currently in the ring.
+            start = oldest_available if last_seen is None else int(last_seen)
+            lag = head - start
             # If the consumer fell behind further than the ring holds,
             # the oldest still-available sample is the best we can do.
-            oldest_available = head - self._ring_buffered_samples_locked()
             samples_lost = max(0, oldest_available - start)
             start = max(start, oldest_available)
-            if start >= head:
-                self._ring_cursors[consumer_id] = head
-                return np.empty((0, 0), dtype=float)
-
-            # Walk chunks from the front. Need to skip ``start - oldest_available``
-            # rows from the head of the visible ring.
-            skip = max(0, start - oldest_available)
-            collected: List[np.ndarray] = []
-            for chunk in self._ring_data:
-                if skip >= len(chunk):
-                    skip -= len(chunk)
-                    continue
-                if skip > 0:
-                    collected.append(chunk[skip:])
-                    skip = 0
-                else:
-                    collected.append(chunk)
             self._ring_cursors[consumer_id] = head
-            if samples_lost:
-                logger.warning(
-                    "Ring buffer consumer %s fell behind by %d samples (dropped from ring)",
-                    consumer_id, samples_lost,
-                )
-            return np.concatenate(collected, axis=0) if collected else np.empty((0, 0), dtype=float)
+            if start >= head:
+                rows = None
+            else:
+                rows = self._ring_slice_locked(start, head)
+                if decode:
+                    rows = self._ring_codec.decode(rows)
+        self.metrics.record_read(consumer_id, lag, samples_lost)
+        if samples_lost:
+            logger.warning(
+                "Ring buffer consumer %s fell behind by %d samples (dropped from ring)",
+                consumer_id, samples_lost,
+            )
+        return np.empty((0, 0), dtype=float) if rows is None else rows
 
     def reset_ring_cursor(self, consumer_id: str) -> None:
         """Drop the cursor for ``consumer_id``. Next read starts at head."""
         with self._ring_lock:
             self._ring_cursors.pop(consumer_id, None)
 
+    def subscribe(
+        self,
+        name: str,
+        maxsize: int = 8,
+        policy: OverflowPolicy | str = OverflowPolicy.DROP_OLDEST,
+        callback: Optional[Callable[[np.ndarray], None]] = None,
+    ) -> Subscription:
+        """Register a push consumer of ring chunks (see :mod:`..subscription`).
+
+        Every chunk ``_ring_loop`` ingests from now on is delivered once, as
+        the same read-only float64 array to all subscribers. Subscriptions
+        outlive ring restarts; end one with :meth:`unsubscribe`.
+        """
+        sub = Subscription(name, maxsize=maxsize, policy=policy, callback=callback)
+        with self._subscribers_lock:
+            self._subscribers.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        """Stop delivering to ``sub`` and close it (queued chunks stay drainable)."""
+        with self._subscribers_lock:
+            if sub in self._subscribers:
+                self._subscribers.remove(sub)
+        sub.close()
+
+    def subscription_stats(self) -> list[dict]:
+        """Per-subscriber lag / delivered / dropped counters."""
+        with self._subscribers_lock:
+            subs = list(self._subscribers)
+        return [sub.stats() for sub in subs]
+
+    def _publish(self, chunk: np.ndarray) -> None:
+        """Hand ``chunk`` to every subscriber. Ring worker thread only."""
+        with self._subscribers_lock:
+            subs = list(self._subscribers)
+        if not subs:
+            return
+        chunk.flags.writeable = False
+        for sub in subs:
+            sub._offer(chunk)
+
+    def metrics_snapshot(self) -> dict:
+        """JSON-ready telemetry: :attr:`metrics` plus worker / subscriber counters."""
+        snap = self.metrics.snapshot()
+        snap["workers"] = self.worker_counters()
+        snap["subscribers"] = self.subscription_stats()
+        return snap
+
+    def worker_counters(self) -> dict:
+        """Poll count and CPU use of the latest ring / finite worker sessions.
+
+        ``{"ring": {"polls", "cpu_seconds", "wall_seconds", "cpu_fraction"},
+        "finite": {...}}``; a worker that has not run yet is absent.
+        """
+        return {
+            name: {**asdict(c), "cpu_fraction": c.cpu_fraction}
+            for name, c in list(self._worker_counters.items())
+        }
+
+    @contextlib.contextmanager
+    def _timed_ring_lock(self, op: str) -> Iterator[None]:
+        """Hold ``_ring_lock``; record the hold time under ``op`` after release."""
+        self._ring_lock.acquire()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            held = time.perf_counter() - t0
+            self._ring_lock.release()
+            self.metrics.record_lock_hold(op, held)
+
     def _ring_buffered_samples_locked(self) -> int:
-        """Sum of rows currently in the ring deque. Caller holds ``_ring_lock``."""
-        return sum(len(chunk) for chunk in self._ring_data)
+        """Rows currently held in the ring. Caller holds ``_ring_lock``."""
+        if self._ring_buf is None:
+            return 0
+        return min(self._ring_total_samples, self._ring_buf.shape[0])
+
+    def _ring_slice_locked(self, start: int, stop: int, copy: bool = True) -> np.ndarray:
+        """Rows ``[start, stop)`` of the stream (monotonic indices).
+
+        Caller holds ``_ring_lock`` and guarantees the span is still held.
+        A span that crosses the wrap point is stitched from two slices.
+        """
+        assert self._ring_buf is not None
+        capacity = self._ring_buf.shape[0]
+        lo = start % capacity
+        hi = lo + (stop - start)
+        if hi <= capacity:
+            out = self._ring_buf[lo:hi]
+            if copy:
+                return out.copy()
+            out = out.view()
+            out.flags.writeable = False
+            return out
+        return np.concatenate(
+            (self._ring_buf[lo:], self._ring_buf[:hi - capacity]), axis=0
+        )
+
+    def _ring_append_locked(self, rows: np.ndarray) -> None:
+        """Encode ``rows`` (volts) in at the write index. Caller holds ``_ring_lock``."""
+        assert self._ring_buf is not None
+        rows = self._ring_codec.encode(rows)
+        capacity = self._ring_buf.shape[0]
+        n = int(rows.shape[0])
+        if n > capacity:
+            # Only the newest ``capacity`` rows can survive anyway.
+            self._ring_total_samples += n - capacity
+            rows = rows[-capacity:]
+            n = capacity
+        lo = self._ring_total_samples % capacity
+        first = min(n, capacity - lo)
+        self._ring_buf[lo:lo + first] = rows[:first]
+        if first < n:
+            self._ring_buf[:n - first] = rows[first:]
+        self._ring_total_samples += n
 
     def stop(self) -> None:
         """Abort any running scans and clean up workers.
@@ -562,18 +776,21 @@ class ExperimentManager:
             )
         total_samples_per_channel = int(round(sample_rate * seconds))
 
-        buf = ai_handler.get_buffer()
+        # Zero-copy ``(samples_per_channel, n_chans)`` view over the DMA buffer;
+        # each half copy below is a single memcpy.
+        view = ai_handler.get_buffer_view()
         # Derive ``half_buf_len`` from the channel-aligned half so that the
-        # reshape below is always exact. Computing it as ``len(buf) // 2`` is
-        # only correct when ``samples_per_channel`` is even AND ``len(buf)``
-        # is divisible by ``n_ai_chans`` — both true today (20000 samples /
-        # 6 channels) but easily violated with a different sample rate or a
-        # different AI channel range.
+        # comparison against the driver's flat ``current_index`` is exact.
+        # Computing it as ``len(buf) // 2`` is only correct when
+        # ``samples_per_channel`` is even AND ``len(buf)`` is divisible by
+        # ``n_ai_chans`` — both true today (20000 samples / 6 channels) but
+        # easily violated with a different sample rate or a different AI
+        # channel range.
         half_buf_len = half_per_channel * n_ai_chans
 
         # Naming convention used below:
-        #   "lower half" = ``buf[:half_buf_len]``  (samples 0 .. half-1)
-        #   "upper half" = ``buf[half_buf_len:]``  (samples half .. end)
+        #   "lower half" = ``view[:half_per_channel]``  (samples 0 .. half-1)
+        #   "upper half" = ``view[half_per_channel:]``  (samples half .. end)
         # We snapshot the lower half once ``current_index`` has moved into the
         # upper half (the lower half is full and stable) and snapshot the upper
         # half once ``current_index`` has wrapped back into the lower half.
@@ -583,6 +800,9 @@ class ExperimentManager:
         upper_half_collected = False
         deadline = time.monotonic() + seconds + 5.0  # generous safety margin
 
+        self._worker_counters["finite"] = WorkerCounters()
+        clock = _WorkerClock(self._worker_counters["finite"])
+
         collected = 0
         while collected < total_samples_per_channel:
             if self._cancel.is_set():
@@ -604,11 +824,7 @@ class ExperimentManager:
                 and current_index >= half_buf_len
                 and last_index < half_buf_len
             ):
-                chunks.append(
-                    np.asarray(buf[:half_buf_len], dtype=float)
-                    .reshape(half_per_channel, n_ai_chans)
-                    .copy()
-                )
+                chunks.append(view[:half_per_channel].copy())
                 collected += half_per_channel
                 lower_half_collected = True
                 upper_half_collected = False
@@ -620,17 +836,19 @@ class ExperimentManager:
                 and current_index < last_index
                 and last_index >= half_buf_len
             ):
-                chunks.append(
-                    np.asarray(buf[half_buf_len:], dtype=float)
-                    .reshape(half_per_channel, n_ai_chans)
-                    .copy()
-                )
+                chunks.append(view[half_per_channel:].copy())
                 collected += half_per_channel
                 upper_half_collected = True
                 lower_half_collected = False
 
             last_index = current_index
-            time.sleep(0.001)
+            clock.tick()
+            # Sleep until the writer should reach the next half boundary; a
+            # request_stop wakes us immediately.
+            self._cancel.wait(_poll_period(
+                _rows_to_next_half(current_index, n_ai_chans, samples_per_channel),
+                sample_rate,
+            ))
 
         # Observability (todo P0-5 / P1-17): on real hardware a pacer underrun
         # or a missed half-buffer flip shows up as a frame shorter than the
@@ -676,18 +894,24 @@ class ExperimentManager:
         CONTINUOUS half-flip path (todo P1-30). We only poll the scan status;
         we do not read or copy the buffer until the scan is done.
         """
-        n_ai_chans = self._ai_params.channel_count()
         deadline = time.monotonic() + seconds + 5.0  # generous safety margin
+        sample_rate = self._ai_params.sample_rate
+        self._worker_counters["finite"] = WorkerCounters()
+        clock = _WorkerClock(self._worker_counters["finite"])
         completed = False
         while time.monotonic() < deadline:
             if self._cancel.is_set():
                 logger.info("AI single-shot scan cancelled by request_stop")
                 break
-            ai_status, _ = ai_handler.status()
+            ai_status, transfer = ai_handler.status()
             if ai_status != ul.ScanStatus.RUNNING:
                 completed = True
                 break
-            time.sleep(0.002)
+            clock.tick()
+            # Nothing to copy until the scan ends: sleep towards the expected
+            # end (capped, so the deadline / cancel stay responsive).
+            remaining = total_samples_per_channel - int(transfer.current_scan_count)
+            self._cancel.wait(_poll_period(remaining, sample_rate))
 
         if completed:
             logger.info(
@@ -701,12 +925,9 @@ class ExperimentManager:
                 total_samples_per_channel,
             )
 
-        expected = total_samples_per_channel * n_ai_chans
-        buf = np.asarray(ai_handler.get_buffer(), dtype=float)[:expected]
-        # Reshape to (samples, channels); a short buffer (deadline hit) is
-        # trimmed to whole rows so the DataFrame stays rectangular.
-        rows = buf.size // n_ai_chans
-        full = buf[: rows * n_ai_chans].reshape(rows, n_ai_chans)
+        # The view is already (samples, channels); copy out of the DMA buffer
+        # so the frame survives the next scan re-using it.
+        full = ai_handler.get_buffer_view()[:total_samples_per_channel].copy()
 
         all_channels = list(
             range(self._ai_params.low_channel, self._ai_params.high_channel + 1)
@@ -721,27 +942,35 @@ class ExperimentManager:
         n_ai_chans = self._ai_params.channel_count()
         samples_per_channel = ai_handler.samples_per_channel
         half_per_channel = samples_per_channel // 2
-        # ``max_chunks`` is the depth of history kept in memory: each chunk
-        # holds half of the AI buffer (= 0.5 s of samples), so the ring keeps
-        # roughly ``ring_max_seconds`` of data.
-        max_chunks = max(1, int(self._ring_max_seconds * 2))
 
         all_channels = list(
             range(self._ai_params.low_channel, self._ai_params.high_channel + 1)
         )
         keep_indices = [all_channels.index(ch) for ch in ai_channels]
 
-        buf = ai_handler.get_buffer()
+        view = ai_handler.get_buffer_view()
         # Channel-aligned half (see _collect_finite_ai for the same reasoning).
         half_buf_len = half_per_channel * n_ai_chans
 
+        # ``incremental`` copies every completed span since the previous poll
+        # (few-ms latency); the default half-buffer flip waits for a whole
+        # half (up to 0.5 s with the 1 s buffer).
+        incremental = self._acquisition.ingestion == "incremental"
+        min_chunk = max(1, int(self._acquisition.min_chunk_samples))
+        consumed = 0  # scans copied off the DMA buffer (incremental mode)
+        sample_rate = self._ai_params.sample_rate
+        counters = WorkerCounters()
+        self._worker_counters["ring"] = counters
+        clock = _WorkerClock(counters)
+
         last_index = 0
         lower_half_collected = False
         upper_half_collected = False
-        appended = 0  # half-buffer chunks copied during this ring session
+        appended = 0  # samples per channel copied during this ring session
         driver_stopped = False
 
         while not self._ring_stop.is_set():
+            polled = time.perf_counter()
             ai_status, transfer = ai_handler.status()
             if ai_status != ul.ScanStatus.RUNNING:
                 driver_stopped = True
@@ -749,16 +978,17 @@ class ExperimentManager:
             current_index = transfer.current_index
 
             chunk: Optional[np.ndarray] = None
-            if (
+            if incremental:
+                chunk, consumed = self._take_completed_span(
+                    view, int(transfer.current_scan_count), consumed,
+                    min_chunk, keep_indices,
+                )
+            elif (
                 not lower_half_collected
                 and current_index >= half_buf_len
                 and last_index < half_buf_len
             ):
-                chunk = (
-                    np.asarray(buf[:half_buf_len], dtype=float)
-                    .reshape(half_per_channel, n_ai_chans)[:, keep_indices]
-                    .copy()
-                )
+                chunk = view[:half_per_channel, keep_indices]
                 lower_half_collected = True
                 upper_half_collected = False
             elif (
@@ -766,24 +996,34 @@ class ExperimentManager:
                 and current_index < last_index
                 and last_index >= half_buf_len
             ):
-                chunk = (
-                    np.asarray(buf[half_buf_len:], dtype=float)
-                    .reshape(half_per_channel, n_ai_chans)[:, keep_indices]
-                    .copy()
-                )
+                chunk = view[half_per_channel:, keep_indices]
                 upper_half_collected = True
                 lower_half_collected = False
 
             if chunk is not None:
                 appended += int(chunk.shape[0])
-                with self._ring_lock:
-                    self._ring_data.append(chunk)
-                    self._ring_total_samples += int(chunk.shape[0])
-                    while len(self._ring_data) > max_chunks:
-                        self._ring_data.popleft()
+                with self._timed_ring_lock("append"):
+                    self._ring_append_locked(chunk)
+                self._publish(chunk)
+                self.metrics.record_ingest(
+                    int(chunk.shape[0]),
+                    time.perf_counter() - polled,
+                    int(transfer.current_scan_count),
+                    appended,
+                )
 
             last_index = current_index
-            time.sleep(0.001)
+            clock.tick()
+            # Pace on the next expected chunk instead of spinning: the
+            # scans still missing for ``min_chunk`` (incremental) or the
+            # writer's distance to the next half boundary (flip).
+            if incremental:
+                rows_ahead = min_chunk - (int(transfer.current_scan_count) - consumed)
+            else:
+                rows_ahead = _rows_to_next_half(
+                    current_index, n_ai_chans, samples_per_channel
+                )
+            self._ring_stop.wait(_poll_period(rows_ahead, sample_rate))
 
         # Observability: a clean stop exits because ``_ring_stop`` was set; an
         # unexpected exit (driver no longer RUNNING) usually means an underrun.
@@ -795,9 +1035,54 @@ class ExperimentManager:
             )
         else:
             logger.info(
-                "Ring buffer worker stopped cleanly after %d samples per channel",
-                appended,
+                "Ring buffer worker stopped cleanly after %d samples per channel "
+                "(%d polls, %.2f s CPU over %.1f s)",
+                appended, counters.polls, counters.cpu_seconds, counters.wall_seconds,
+            )
+
+    @staticmethod
+    def _take_completed_span(
+        view: np.ndarray,
+        scan_count: int,
+        consumed: int,
+        min_chunk: int,
+        keep_indices: Sequence[int],
+    ) -> tuple[Optional[np.ndarray], int]:
+        """Copy the scans completed since ``consumed`` off the circular DMA buffer.
+
+        ``view`` is the ``(samples_per_channel, channels)`` buffer view and
+        ``scan_count`` the driver's monotonic ``current_scan_count`` (whole
+        scans transferred), so a span exactly one buffer long is never
+        mistaken for "nothing new" the way a bare ``current_index`` compare
+        would be. Returns ``(rows, consumed)`` with only ``keep_indices``
+        columns; ``rows`` is ``None`` while fewer than ``min_chunk`` scans are
+        pending. A span that crosses the end of the buffer is stitched from
+        its tail and head.
+        """
+        samples_per_channel = view.shape[0]
+        pending = scan_count - consumed
+        if pending < min_chunk:
+            return None, consumed
+        if pending > samples_per_channel:
+            # The writer lapped us: those scans were overwritten in the DMA
+            # buffer before we could copy them (FIFO overrun on hardware).
+            lost = pending - samples_per_channel
+            logger.warning(
+                "Ring ingestion fell behind the AI scan; %d samples per channel lost",
+                lost,
             )
+            consumed += lost
+            pending = samples_per_channel
+        lo = consumed % samples_per_channel
+        hi = lo + pending
+        if hi <= samples_per_channel:
+            rows = view[lo:hi, keep_indices]
+        else:
+            rows = np.concatenate((
+                view[lo:, keep_indices],
+                view[:hi - samples_per_channel, keep_indices],
+            ))
+        return rows, consumed + pending
 
     # ------------------------------------------------------------------
     # Helper used by tests / Tango layer
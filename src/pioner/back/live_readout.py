@@ -0,0 +1,175 @@
+"""Incrementally calibrated live readout (the GUI's "Values" sidebar).
+
+The sidebar used to re-calibrate the whole scope window -- up to ``x_scale``
+seconds of rows -- on every refresh tick and then read one row of it. A
+:class:`LiveReadout` instead calibrates each AI chunk once, as it arrives, and
+keeps only short aggregates:
+
+* ``last`` -- the newest calibrated value per column;
+* ``mean`` -- the mean over the trailing ``window_seconds`` (NaN samples, e.g.
+  ``Thtr`` at idle, are skipped; a column that is NaN throughout is NaN);
+* ``Taux`` -- from the AD595 mean over the same window, which is what
+  ``apply_calibration`` does for a whole window, so ``temp`` is directly
+  comparable with the old per-tick readout.
+
+The window is a deque of per-chunk partial sums (a few dozen entries), so a
+readout costs one small reduction regardless of the sample rate. Feeding is
+pull-based: :meth:`LocalDeviceController.live_readout` drains a ring
+subscription and passes the new rows to :meth:`LiveReadout.update` on the
+caller's thread, so the ring worker only enqueues chunks.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Optional
+
+import numpy as np
+
+from pioner.back.modes import calibrate_array
+from pioner.shared.calibration import Calibration
+from pioner.shared.channels import AD595_AI
+
+#: Columns averaged over the window (``Taux`` is derived, ``time`` is not
+#: a readout).
+READOUT_COLUMNS = ("temp", "temp-hr", "Thtr")
+
+
+@dataclass
+class _ChunkSums:
+    """Partial sums of one calibrated chunk inside the window."""
+
+    rows: int
+    ad595_sum: float
+    ad595_count: int
+    sums: np.ndarray    # per READOUT_COLUMNS, NaN-skipping
+    counts: np.ndarray  # finite samples per READOUT_COLUMNS
+
+
+def _finite_sum(values: np.ndarray) -> tuple[float, int]:
+    total = float(values.sum())
+    if not np.isnan(total):
+        return total, int(values.size)
+    finite = ~np.isnan(values)
+    return float(values[finite].sum()), int(np.count_nonzero(finite))
+
+
+class LiveReadout:
+    """Running engineering-unit aggregates over the newest AI rows.
+
+    Parameters
+    ----------
+    window_seconds
+        Span of the ``mean`` / ``Taux`` aggregates.
+
+    All methods are thread-safe; :meth:`reset` is called whenever the
+    calibration or the sample rate changes.
+    """
+
+    def __init__(self, window_seconds: float = 1.0) -> None:
+        if window_seconds <= 0:
+            raise ValueError(f"window_seconds must be > 0, got {window_seconds}")
+        self._window_seconds = float(window_seconds)
+        self._lock = threading.Lock()
+        self.reset()
+
+    @property
+    def window_seconds(self) -> float:
+        return self._window_seconds
+
+    def reset(self, window_seconds: Optional[float] = None) -> None:
+        """Forget every aggregate (optionally with a new window length)."""
+        with self._lock:
+            if window_seconds is not None:
+                if window_seconds <= 0:
+                    raise ValueError(f"window_seconds must be > 0, got {window_seconds}")
+                self._window_seconds = float(window_seconds)
+            self._chunks: Deque[_ChunkSums] = deque()
+            self._window_rows = 0
+            self._rows_total = 0
+            self._last: dict[str, float] = {}
+
+    def update(self, raw: np.ndarray, sample_rate: float, calibration: Calibration) -> None:
+        """Calibrate the rows appended since the previous call and fold them in.
+
+        ``raw`` is ``(rows, channels)`` AI volts with column ``i`` = channel
+        ``i`` (as ``calibrate_window`` assumes). Only the newest window of
+        ``raw`` is calibrated: older rows could not reach any aggregate.
+        """
+        if raw.size == 0 or sample_rate <= 0:
+            return
+        channels = list(range(raw.shape[1]))
+        with self._lock:
+            limit = max(1, int(round(self._window_seconds * sample_rate)))
+            self._rows_total += int(raw.shape[0])
+            if raw.shape[0] > limit:
+                raw = raw[-limit:]
+            n = int(raw.shape[0])
+
+            ad_sum, ad_count = (
+                _finite_sum(raw[:, AD595_AI]) if AD595_AI < raw.shape[1] else (0.0, 0)
+            )
+            chunk = _ChunkSums(
+                n, ad_sum, ad_count,
+                np.zeros(len(READOUT_COLUMNS)), np.zeros(len(READOUT_COLUMNS), dtype=np.int64),
+            )
+            self._chunks.append(chunk)
+            self._window_rows += n
+            while self._window_rows - self._chunks[0].rows >= limit:
+                self._window_rows -= self._chunks.popleft().rows
+
+            taux = self._taux_locked(calibration) if AD595_AI < raw.shape[1] else 0.0
+            columns, values = calibrate_array(
+                raw, channels, sample_rate, calibration, taux_override=taux
+            )
+            self._last = {"Taux": taux}
+            for name, row in zip(columns, values):
+                if name in READOUT_COLUMNS:
+                    i = READOUT_COLUMNS.index(name)
+                    chunk.sums[i], chunk.counts[i] = _finite_sum(row)
+                    self._last[name] = float(row[-1])
+
+    def _taux_locked(self, calibration: Calibration) -> float:
+        count = sum(c.ad595_count for c in self._chunks)
+        if count == 0:
+            return float("nan")
+        mean = sum(c.ad595_sum for c in self._chunks) / count
+        return calibration.hardware.correct_ad595(100.0 * mean)
+
+    def snapshot(self) -> dict:
+        """``{"available", "rows", "window_seconds", "window_rows", "last", "mean"}``.
+
+        ``available`` is False until the first rows arrive. ``last`` / ``mean``
+        hold only the columns the scan can produce (no heater channels -> no
+        ``Thtr``); ``mean["Taux"]`` equals ``last["Taux"]`` (it already is a
+        window mean).
+        """
+        with self._lock:
+            if not self._chunks:
+                return {
+                    "available": False,
+                    "rows": self._rows_total,
+                    "window_seconds": self._window_seconds,
+                    "window_rows": 0,
+                    "last": {},
+                    "mean": {},
+                }
+            sums = np.sum([c.sums for c in self._chunks], axis=0)
+            counts = np.sum([c.counts for c in self._chunks], axis=0)
+            mean = {"Taux": self._last["Taux"]}
+            for i, name in enumerate(READOUT_COLUMNS):
+                if name in self._last:
+                    mean[name] = float(sums[i] / counts[i]) if counts[i] else float("nan")
+            return {
+                "available": True,
+                "rows": self._rows_total,
+                "window_seconds": self._window_seconds,
+                "window_rows": self._window_rows,
+                "last": dict(self._last),
+                "mean": mean,
+            }
+
+
+__all__ = ["LiveReadout", "READOUT_COLUMNS"]
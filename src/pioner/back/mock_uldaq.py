@@ -12,9 +12,11 @@ Design decisions for the mock:
   (status polling alone exceeds any throttle in seconds). The mock is a
   drop-in stub: same names, same shapes, no policy.
 * **Shared buffer semantics.** The real driver fills the buffer in place via
-  DMA. The mock implements the same: a worker thread mutates the actual list
-  passed to :func:`a_in_scan`, so callers can poll ``buffer[i]`` and watch
-  the data appear. Returning a copy from ``get_buffer`` would silently break
+  DMA. The mock implements the same: :func:`create_float_buffer` returns the
+  same ctypes ``c_double`` array type as real uldaq, and a worker thread
+  mutates the actual array passed to :func:`a_in_scan`, so callers can poll
+  ``buffer[i]`` (or a ``np.ctypeslib.as_array`` view) and watch the data
+  appear. Returning a copy from ``get_buffer`` would silently break
   the half-buffer reading loop in :class:`ExperimentManager`.
 * **Index progression.** ``current_scan_count``/``current_index`` advance
   with wall-clock time so that loops which wait for a buffer to fill actually
@@ -27,6 +29,7 @@ Design decisions for the mock:
 
 from __future__ import annotations
 
+import ctypes
 import logging
 import math
 import threading
@@ -119,11 +122,15 @@ except (ImportError, OSError) as exc:  # pragma: no cover - normal on dev hosts
     # -----------------------------------------------------------------------
     # Helpers
     # -----------------------------------------------------------------------
-    def create_float_buffer(channel_count: int, samples_per_channel: int) -> List[float]:
-        """Create a flat float buffer of size ``channels * samples_per_channel``."""
+    def create_float_buffer(channel_count: int, samples_per_channel: int):
+        """Create a zeroed flat ``c_double`` array of ``channels * samples_per_channel``.
+
+        Same type as real ``uldaq.create_float_buffer``, so NumPy views
+        (``np.ctypeslib.as_array``) behave identically on both backends.
+        """
         if channel_count <= 0 or samples_per_channel <= 0:
             raise ValueError("channel_count and samples_per_channel must be > 0")
-        return [0.0] * (channel_count * samples_per_channel)
+        return (ctypes.c_double * (channel_count * samples_per_channel))()
 
     @dataclass
     class MockTransferStatus:
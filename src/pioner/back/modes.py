@@ -29,8 +29,8 @@ from __future__ import annotations
 import abc
 import logging
 import threading
-from dataclasses import dataclass
-from typing import Callable, Dict, List, Optional, Sequence, cast
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, List, Optional, Sequence, cast
 
 import numpy as np
 import pandas as pd
@@ -49,16 +49,28 @@ from pioner.shared.channels import (
 )
 from pioner.shared.modulation import (
     AOPeriodReport,
+    BlockLockIn,
+    FFTDemodResult,
+    FFTFrames,
     ModulationParams,
+    ToneBins,
+    align_tones,
     apply_modulation,
     check_ao_period_integrity,
     fft_demodulate,
+    fft_demodulate_frames,
+    fft_demodulate_tones,
+    lockin_decimation,
     lockin_demodulate,
+    lockin_demodulate_decimated,
+    seamless_buffer_length,
 )
+from pioner.shared.sample_codec import SampleCodec
 from pioner.shared.settings import BackSettings, ExperimentLimits
 from pioner.shared.utils import temperature_to_voltage
 from pioner.back.daq_device import DaqDeviceHandler
 from pioner.back.experiment_manager import ExperimentManager, ScanResult
+from pioner.back.telemetry import AcquisitionMetrics
 
 logger = logging.getLogger(__name__)
 
@@ -402,20 +414,180 @@ def heater_resistance(df: pd.DataFrame, calibration: Calibration) -> pd.Series:
     """
     if HEATER_CURRENT_AI not in df.columns or UHTR_AI not in df.columns:
         return pd.Series(np.full(len(df), np.nan), index=df.index)
-    ih = cast(
-        pd.Series,
-        calibration.ihtr0 + df[HEATER_CURRENT_AI] * calibration.ihtr1,
-    )
-    nz = ih.abs() > 1e-9
-    rhtr = pd.Series(np.full(len(df), np.nan), index=df.index)
-    rhtr.loc[nz] = (
-        (df.loc[nz, UHTR_AI] - df.loc[nz, HEATER_CURRENT_AI] + calibration.uhtr0)
-        * calibration.uhtr1
-        / ih.loc[nz]
+    rhtr = _heater_resistance_array(
+        df[HEATER_CURRENT_AI].to_numpy(dtype=np.float64),
+        df[UHTR_AI].to_numpy(dtype=np.float64),
+        calibration,
     )
+    return pd.Series(rhtr, index=df.index)
+
+
+def _heater_resistance_array(
+    ch0: np.ndarray,
+    ch5: np.ndarray,
+    calibration: Calibration,
+    out: Optional[np.ndarray] = None,
+    scratch: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """NumPy core of :func:`heater_resistance`: ``Rhtr`` per sample, NaN at idle.
+
+    ``out`` receives the result and ``scratch`` holds ``ih`` (both length
+    ``len(ch0)`` float64); either is allocated when not given. Fresh pages
+    cost more than the arithmetic at block sizes, hence the buffers.
+    """
+    # ``out`` may alias ``ch0`` (the kernel stages ch0 there to read the
+    # strided column once): ``ih`` is taken before ``rhtr`` overwrites it.
+    ih = np.multiply(ch0, calibration.ihtr1, out=scratch)
+    ih += calibration.ihtr0
+    rhtr = np.subtract(ch5, ch0, out=out)
+    rhtr += calibration.uhtr0
+    rhtr *= calibration.uhtr1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rhtr /= ih
+    np.abs(ih, out=ih)
+    np.copyto(rhtr, np.nan, where=ih <= 1e-9)
     return rhtr
 
 
+#: Engineering-unit columns :func:`calibrate_array` can produce, in output order.
+CALIBRATED_COLUMNS = ("time", "Taux", "temp", "temp-hr", "Thtr", "Uref")
+# Rows per cache tile when :func:`calibrate_array` reads a row-major block.
+_CALIBRATE_TILE_ROWS = 8192
+# AI channels :func:`calibrate_array` reads.
+_CALIBRATION_CHANNELS = frozenset(
+    (AD595_AI, UTPL_AI, UMOD_AI, UHTR_AI, HEATER_CURRENT_AI)
+)
+
+
+def calibrate_array(
+    data: np.ndarray,
+    channels: Sequence[int],
+    sample_rate: float,
+    calibration: Calibration,
+    uref_profile: Optional[np.ndarray] = None,
+    taux_override: Optional[float] = None,
+    sample_offset: int = 0,
+) -> tuple[list[str], np.ndarray]:
+    """Calibration kernel: ``(rows, channels)`` raw volts -> engineering units.
+
+    The NumPy-only core of :func:`apply_calibration`, also called directly by
+    the chunked finalise. ``channels[i]`` is the AI channel held in
+    ``data[:, i]``. Returns ``(columns, values)``: ``values`` is one
+    preallocated ``(len(columns), rows)`` float64 array whose row ``i`` is
+    column ``columns[i]`` (a subset of :data:`CALIBRATED_COLUMNS`, in that
+    order). Each row is computed in place -- ``np.multiply(..., out=row)``
+    then in-place adds, polynomials in Horner form -- so the only temporaries
+    are one scratch row and the idle mask of the heater resistance; no
+    DataFrame, no per-column Series, no boolean ``.loc`` assignment.
+
+    The physics (gains, AD595 correction, ``Thtr`` polynomial) is documented
+    on :func:`apply_calibration`, which is a thin DataFrame wrapper over this.
+    ``uref_profile`` is the heater AO trace (``voltage_profiles[HEATER_AO]``);
+    None means no ``Uref`` column. ``data`` is never modified. Either memory
+    order works: a row-major block is processed in cache-sized row tiles.
+    """
+    data = np.asarray(data)
+    n = int(data.shape[0])
+    col = {c: i for i, c in enumerate(channels)}
+    hw = calibration.hardware
+
+    columns = ["time", "Taux"]
+    if UTPL_AI in col:
+        columns.append("temp")
+    if UMOD_AI in col:
+        columns.append("temp-hr")
+    if UHTR_AI in col and HEATER_CURRENT_AI in col:
+        columns.append("Thtr")
+    if uref_profile is not None:
+        columns.append("Uref")
+    values = np.empty((len(columns), n), dtype=np.float64)
+    out = dict(zip(columns, values))
+
+    # Time scale in ms (offset by the block's first-sample index).
+    t = out["time"]
+    t[:] = np.arange(sample_offset, sample_offset + n, dtype=np.float64)
+    t *= 1000.0
+    t /= sample_rate
+
+    # Taux: whole-frame AD595 mean (NaN-skipping, like ``Series.mean``) unless
+    # the caller passes the whole-scan value for a block.
+    if taux_override is not None:
+        taux = float(taux_override)
+    elif AD595_AI in col and n:
+        u_aux = data[:, col[AD595_AI]]
+        mean = float(u_aux.sum()) / n
+        if np.isnan(mean):
+            finite = ~np.isnan(u_aux)
+            count = int(np.count_nonzero(finite))
+            mean = float(u_aux[finite].sum()) / count if count else float("nan")
+        taux = hw.correct_ad595(100.0 * mean)
+    else:
+        taux = 0.0
+    out["Taux"].fill(taux)
+
+    # A row-major block (finalise reads C-order blocks from HDF5) keeps each
+    # sample's channels on one cache line, so a per-channel pass over the
+    # whole block drags every channel through memory again. Tiles of
+    # ``_CALIBRATE_TILE_ROWS`` stay in cache across the passes; a column-major
+    # frame (``DataFrame.to_numpy``) is contiguous per channel already and runs
+    # as one tile.
+    def thermopile(
+        row: np.ndarray, u: np.ndarray, gain: float, offset: float, scratch: np.ndarray
+    ) -> None:
+        # ax = U * (1000 / gain) + utpl0 [mV];  T = ax * (ttpl0 + ttpl1 * ax) + offset
+        np.multiply(u, 1000.0 / gain, out=row)
+        row += calibration.utpl0
+        np.multiply(row, calibration.ttpl1, out=scratch)
+        np.add(scratch, calibration.ttpl0, out=scratch)
+        row *= scratch
+        if offset:
+            row += offset
+
+    tile = n if data.flags.f_contiguous else _CALIBRATE_TILE_ROWS
+    scratch_buf = np.empty(min(tile, n), dtype=np.float64)
+    for start in range(0, n, max(tile, 1)):
+        stop = min(start + tile, n)
+        block = data[start:stop]
+        scratch = scratch_buf[: stop - start]
+
+        if "temp" in out:
+            thermopile(out["temp"][start:stop], block[:, col[UTPL_AI]],
+                       hw.gain_utpl, taux, scratch)
+        if "temp-hr" in out:
+            thermopile(out["temp-hr"][start:stop], block[:, col[UMOD_AI]],
+                       hw.gain_umod, 0.0, scratch)
+
+        if "Thtr" in out:
+            # Stage the strided ch0 column once; the resistance reads it twice.
+            ch0 = out["Thtr"][start:stop]
+            ch0[:] = block[:, col[HEATER_CURRENT_AI]]
+            thtr = _heater_resistance_array(
+                ch0, block[:, col[UHTR_AI]], calibration, out=ch0, scratch=scratch
+            )
+            # x = Rhtr + thtrcorr;  Thtr = thtr0 + x * (thtr1 + thtr2 * x)
+            thtr += calibration.thtrcorr
+            np.multiply(thtr, calibration.thtr2, out=scratch)
+            scratch += calibration.thtr1
+            thtr *= scratch
+            thtr += calibration.thtr0
+
+    if uref_profile is not None:
+        uref = out["Uref"]
+        ref = np.asarray(uref_profile, dtype=np.float64).ravel()
+        if ref.size == 0:
+            uref.fill(np.nan)
+        elif ref.size >= n:
+            uref[:] = ref[:n]
+        else:
+            # Iso/CONTINUOUS AO replays the same buffer indefinitely (and a DC
+            # iso profile is a single sample): tile it over the AI length.
+            full, rest = divmod(n, ref.size)
+            uref[: full * ref.size].reshape(full, ref.size)[:] = ref
+            uref[full * ref.size:] = ref[:rest]
+
+    return columns, values
+
+
 def apply_calibration(
     raw: pd.DataFrame,
     sample_rate: float,
@@ -438,15 +610,15 @@ def apply_calibration(
     ``taux_override`` so every block agrees. ``sample_offset`` is the block's
     first-sample index so the ``time`` column is continuous across blocks. The
     defaults reproduce the original whole-frame behaviour exactly.
-    """
-    df = raw.copy()
-    if df.empty:
-        return df
 
-    # Time scale in ms (offset by the block's first-sample index).
-    df["time"] = ((sample_offset + np.arange(len(df))) * 1000.0) / sample_rate
-
-    hw = calibration.hardware
+    The arithmetic lives in :func:`calibrate_array`; this wrapper only picks
+    the calibration channels out of ``raw`` and wraps the kernel's output
+    block as a DataFrame (no copy) on ``raw``'s index. Columns of ``raw`` that
+    are not in ``ai_channels`` are kept, ahead of the calibrated ones, and may
+    be of any dtype.
+    """
+    if raw.empty:
+        return raw.copy()
 
     # AD595 cold-junction temperature (channel 3, scaled 100 °C/V then
     # corrected below -12 °C).
@@ -458,38 +630,11 @@ def apply_calibration(
     # the apply_calibration diagnostics so 50/60 Hz mains pickup on the cold
     # junction is visible quantitatively. Cheap to add (one np.fft.rfft per
     # scan); see ``shared.modulation.fft_demodulate`` for the pattern.
-    if taux_override is not None:
-        # Block-wise finalise: the caller computed the whole-scan AD595 mean in
-        # a streaming first pass and passes it here so every block agrees.
-        df["Taux"] = taux_override
-    elif AD595_AI in df.columns:
-        u_aux = float(cast(pd.Series, df[AD595_AI]).mean())
-        t_aux = 100.0 * u_aux
-        t_aux = hw.correct_ad595(t_aux)
-        df["Taux"] = t_aux
-    else:
-        df["Taux"] = 0.0
-
+    #
     # Thermopile temperature on the standard channel (Utpl) and on the
-    # high-resolution modulation channel (Umod).
-    # Work from local variables rather than overwriting the raw ``df[N]``
-    # columns in place: the raw integer-named columns stay untouched until the
-    # final ``df.drop``, so this block is no longer order-sensitive (a reorder
-    # cannot silently feed an already-scaled column back into another step).
-    if UTPL_AI in df.columns:
-        u_tpl_mv = df[UTPL_AI] * (1000.0 / hw.gain_utpl)  # mV at front-end
-        ax = u_tpl_mv + calibration.utpl0
-        df["temp"] = (
-            calibration.ttpl0 * ax + calibration.ttpl1 * (ax**2)
-        )
-        df["temp"] += df["Taux"]
-    if UMOD_AI in df.columns:
-        u_mod_mv = df[UMOD_AI] * (1000.0 / hw.gain_umod)
-        ax_hr = u_mod_mv + calibration.utpl0
-        df["temp-hr"] = (
-            calibration.ttpl0 * ax_hr + calibration.ttpl1 * (ax_hr**2)
-        )
-
+    # high-resolution modulation channel (Umod); ``temp`` includes Taux,
+    # ``temp-hr`` does not. The raw channels are read, never overwritten.
+    #
     # Heater temperature derived from V_heater / ih.
     #
     # AI ch0 (HEATER_CURRENT_AI): node between the series resistor and the
@@ -506,38 +651,38 @@ def apply_calibration(
     #
     # The Thtr polynomial (thtr0=-1069.7, thtr1=0.78336, thtr2=-8.67e-5)
     # was fitted against proxy Rhtr (V/V), NOT physical ohms.
-    # At idle (ih ~ 0) Rhtr is undefined; mark NaN (see nz guard below).
-    if UHTR_AI in df.columns and HEATER_CURRENT_AI in df.columns:
-        # Single source of truth for the proxy heater resistance (V/V), NaN at
-        # idle. Reused by the in-situ R-correction auto-zero (P1-33).
-        rhtr = heater_resistance(df, calibration)
-        thtr = (
-            calibration.thtr0
-            + calibration.thtr1 * (rhtr + calibration.thtrcorr)
-            + calibration.thtr2 * ((rhtr + calibration.thtrcorr) ** 2)
-        )
-        df["Thtr"] = thtr
-
-    # Provide the heater AO trace for context.
-    if HEATER_AO in voltage_profiles:
-        ref = np.asarray(voltage_profiles[HEATER_AO], dtype=float)
-        if ref.size == 0:
-            df["Uref"] = np.full(len(df), np.nan)
-        elif ref.size >= len(df):
-            df["Uref"] = ref[: len(df)]
-        else:
-            # Iso/CONTINUOUS AO replays the same buffer indefinitely (and a
-            # DC iso profile is just a single sample). Tile the commanded
-            # voltage to match the AI length so Uref reflects what the AO
-            # was actually putting out at every AI sample, not just the
-            # first second.
-            repeats = int(np.ceil(len(df) / ref.size))
-            df["Uref"] = np.tile(ref, repeats)[: len(df)]
+    # At idle (ih ~ 0) Rhtr is undefined; marked NaN (heater_resistance, the
+    # single source of truth reused by the in-situ R-correction, P1-33).
+    #
+    # Uref: the heater AO trace for context, tiled when shorter than the scan.
+    #
+    # The kernel reads only the calibration channels. An all-float64 frame is
+    # one column-major block, so ``to_numpy`` of the whole frame is a zero-copy
+    # view with contiguous channel columns; any other frame (extra columns of
+    # another dtype, possibly non-numeric) hands over just those channels.
+    if all(dtype == np.float64 for dtype in raw.dtypes):
+        channels = list(raw.columns)
+        data = raw.to_numpy()
+    else:
+        channels = [c for c in raw.columns if c in _CALIBRATION_CHANNELS]
+        data = raw[channels].to_numpy(dtype=np.float64)
+    columns, values = calibrate_array(
+        data,
+        channels,
+        sample_rate=sample_rate,
+        calibration=calibration,
+        uref_profile=voltage_profiles.get(HEATER_AO),
+        taux_override=taux_override,
+        sample_offset=sample_offset,
+    )
+    cal = pd.DataFrame(values.T, columns=columns, index=raw.index, copy=False)
 
     # Drop the raw integer-named columns; the engineering-unit columns are the
     # public output.
-    df = df.drop(columns=[c for c in ai_channels if c in df.columns])
-    return df
+    kept = [c for c in raw.columns if c not in set(ai_channels) and c not in cal.columns]
+    if not kept:
+        return cal
+    return pd.concat([raw[kept], cal], axis=1)
 
 
 def _lockin_reference(raw_df: pd.DataFrame, params) -> Optional[np.ndarray]:
@@ -577,6 +722,178 @@ def _kamp_divide(
     return out
 
 
+# exp_data group holding the decimated lock-in outputs (Modulation.
+# LockinOutputRate > 0), and its datasets: the outputs' own time axis plus the
+# same names the per-sample ``data`` columns use.
+LOCKIN_GROUP = "lockin"
+_LOCKIN_COLUMNS = ("time", "temp-hr_amp", "temp-hr_phase", "temp-hr_valid")
+
+
+@dataclass(eq=False)
+class DecimatedLockIn:
+    """Decimated lock-in trace of a run, kept on ``df.attrs[LOCKIN_GROUP]``.
+
+    ``columns`` maps the :data:`_LOCKIN_COLUMNS` names to 1-D arrays of equal
+    length. Compared by identity (``eq=False``): pandas compares ``attrs``
+    with ``==`` when it propagates them, which arrays cannot answer.
+    """
+
+    columns: Dict[str, np.ndarray]
+    sample_rate: float          # achieved output rate, Hz
+    decimation: int             # AI samples per output
+
+    def __len__(self) -> int:
+        return int(self.columns["time"].size)
+
+
+def _decimated_lockin(
+    df: pd.DataFrame,
+    raw_df: pd.DataFrame,
+    params: ModulationParams,
+    sample_rate: float,
+    calibration: Calibration,
+) -> DecimatedLockIn:
+    """Lock-in of ``df["temp-hr"]`` at ``params.lockin_output_rate``.
+
+    Stashed by the modes on ``df.attrs[LOCKIN_GROUP]`` and written as its own
+    group by :func:`save_run_to_h5`. The P1-32 ``kamp`` divider uses ``Thtr``
+    at the raw sample nearest each output time.
+    """
+    time, amp, phase, valid = lockin_demodulate_decimated(
+        df["temp-hr"].to_numpy(),
+        sample_rate=sample_rate,
+        frequency=params.frequency,
+        output_rate=params.lockin_output_rate,
+        reference=_lockin_reference(raw_df, params),  # P1-34 (opt-in)
+    )
+    if calibration.amplitude_correction_enabled and "Thtr" in df.columns and amp.size:
+        nearest = np.clip(np.rint(time * sample_rate).astype(np.int64), 0, len(df) - 1)
+        amp = _kamp_divide(amp, df["Thtr"].to_numpy()[nearest], calibration)
+    q = lockin_decimation(sample_rate, params.frequency, params.lockin_output_rate)
+    return DecimatedLockIn(
+        columns=dict(zip(_LOCKIN_COLUMNS, (time, amp, phase, valid))),
+        sample_rate=float(sample_rate) / q,
+        decimation=q,
+    )
+
+
+# exp_data group holding the iso short-time FFT series (Modulation.
+# FftFrameCycles > 0): frame-centre ``time``, per-frame ``leakage`` and
+# ``(frames, harmonics)`` ``amplitude`` / ``phase`` matrices.
+FFT_FRAMES_GROUP = "fft_frames"
+
+# Harmonics the iso FFT estimators read (scalars and frames alike).
+_ISO_HARMONICS = (1, 2, 3)
+
+
+def _fft_frames(
+    temp_hr: np.ndarray,
+    params: ModulationParams,
+    sample_rate: float,
+    thtr: Optional[np.ndarray],
+    calibration: Calibration,
+    start_index: int = 0,
+) -> FFTFrames:
+    """Short-time FFT series of ``temp-hr`` at the ``Modulation.Fft*`` layout.
+
+    Stashed by IsoMode on ``df.attrs[FFT_FRAMES_GROUP]``. With ``thtr`` given
+    (the P1-32 ``kamp`` divider opted in) each frame's amplitudes are divided
+    by ``kamp`` at the ``Thtr`` sample nearest the frame centre -- the
+    drift-resolved counterpart of the single ``kamp(Thtr_op)`` the scalars use.
+    """
+    frames = fft_demodulate_frames(
+        temp_hr,
+        sample_rate=sample_rate,
+        frequency=params.frequency,
+        harmonics=_ISO_HARMONICS,
+        frame_cycles=params.fft_frame_cycles,
+        hop_cycles=params.fft_hop_cycles or None,
+        start_index=start_index,
+    )
+    if thtr is None or not len(frames):
+        return frames
+    nearest = np.clip(
+        np.rint(frames.time * sample_rate).astype(np.int64) - start_index, 0, thtr.size - 1
+    )
+    k = thtr[nearest]
+    amplitude = np.column_stack(
+        [_kamp_divide(frames.amplitude[:, j], k, calibration) for j in range(len(frames.harmonics))]
+    )
+    return replace(frames, amplitude=amplitude)
+
+
+# exp_data group holding a multi-tone iso run's per-tone results
+# (Modulation.Tones): ``frequency`` / ``drive_amplitude`` per tone and
+# ``(tones, harmonics)`` ``amplitude`` / ``phase`` matrices.
+FFT_TONES_GROUP = "fft_tones"
+
+
+def _tone_harmonics_fallback(build: Callable[[Sequence[int]], Any]) -> Any:
+    """``build(_ISO_HARMONICS)``, or ``build((1,))`` when harmonics share bins.
+
+    A sweep with one tone at twice another (37.5 / 75 Hz) puts the 2f of the
+    first on the second's bin; the fundamentals are still separable, so the
+    run keeps those instead of losing every tone.
+    """
+    try:
+        return build(_ISO_HARMONICS)
+    except ValueError as exc:
+        if "share FFT bin" not in str(exc):
+            raise
+        logger.warning("Multi-tone demod: %s; reading the fundamentals only", exc)
+        return build((1,))
+
+
+def _tone_attrs(
+    params: ModulationParams, results: Sequence[FFTDemodResult], kamp: float = 1.0
+) -> dict:
+    """``df.attrs`` entries of a multi-tone demodulation (``temp-hr_fft_tones*``).
+
+    Keyed like the single-tone ``temp-hr_fft`` scalars, one level up:
+    ``{frequency: {harmonic: {"amplitude", "phase"}}}``, amplitudes divided
+    by ``kamp`` (P1-32; 1.0 when off).
+    """
+    return {
+        "temp-hr_fft_tones": {
+            f: {h.harmonic: {"amplitude": h.amplitude / kamp, "phase": h.phase}
+                for h in result.harmonics}
+            for (f, _), result in zip(params.all_tones, results)
+        },
+        "temp-hr_fft_tones_drive": dict(params.all_tones),
+        "temp-hr_fft_tones_leakage": results[0].leakage_fraction,
+        "temp-hr_fft_tones_window_samples": results[0].window_samples,
+    }
+
+
+def _write_fft_tones(group, attrs: dict) -> None:
+    """Fill an ``fft_tones`` group from :func:`_tone_attrs` entries."""
+    tones = attrs["temp-hr_fft_tones"]
+    frequencies = list(tones)
+    harmonics = sorted(next(iter(tones.values())))
+    group.create_dataset("frequency", data=np.asarray(frequencies, dtype=float))
+    group.create_dataset("drive_amplitude", data=np.asarray(
+        [attrs["temp-hr_fft_tones_drive"][f] for f in frequencies], dtype=float
+    ))
+    for key in ("amplitude", "phase"):
+        group.create_dataset(key, data=np.asarray(
+            [[tones[f][h][key] for h in harmonics] for f in frequencies], dtype=float
+        ))
+    group.attrs["harmonics"] = np.asarray(harmonics, dtype=np.int64)
+    group.attrs["leakage"] = attrs["temp-hr_fft_tones_leakage"]
+    group.attrs["window_samples"] = attrs["temp-hr_fft_tones_window_samples"]
+
+
+def _write_fft_frames(group, frames: FFTFrames) -> None:
+    """Fill an ``fft_frames`` group from one :class:`FFTFrames`."""
+    group.create_dataset("time", data=frames.time)
+    group.create_dataset("amplitude", data=frames.amplitude)
+    group.create_dataset("phase", data=frames.phase)
+    group.create_dataset("leakage", data=frames.leakage)
+    group.attrs["harmonics"] = np.asarray(frames.harmonics, dtype=np.int64)
+    group.attrs["frame_samples"] = frames.frame_samples
+    group.attrs["hop_samples"] = frames.hop_samples
+
+
 # ---------------------------------------------------------------------------
 # Base mode and concrete implementations
 # ---------------------------------------------------------------------------
@@ -606,6 +923,9 @@ class BaseMode(abc.ABC):
         # ExperimentManager of an in-flight run(), exposed so stop() can abort
         # it from another thread (P1-17 step 3). None when no run is active.
         self._active_em: Optional[ExperimentManager] = None
+        # Telemetry of the ExperimentManager this mode ran on last, kept past
+        # the run so the Tango ``acquisition_metrics`` attribute can read it.
+        self._metrics: Optional[AcquisitionMetrics] = None
 
     # ------------------------------------------------------------------
     # Arming / introspection
@@ -673,6 +993,10 @@ class BaseMode(abc.ABC):
         if em is not None:
             em.request_stop()
 
+    def metrics_snapshot(self) -> dict:
+        """Telemetry of this mode's latest run (``{}`` before the first one)."""
+        return self._metrics.snapshot() if self._metrics is not None else {}
+
     # ------------------------------------------------------------------
     # Execution
     # ------------------------------------------------------------------
@@ -686,24 +1010,22 @@ class FastHeat(BaseMode):
 
     name = "fast"
 
-    def run(self) -> pd.DataFrame:
+    def run(self, em: Optional[ExperimentManager] = None) -> pd.DataFrame:
+        """Run the armed single-shot scan and return a calibrated DataFrame.
+
+        By default the scan runs on a private :class:`ExperimentManager`. A
+        caller whose manager owns the DAQ (the acquisition engine of
+        ``AcquisitionMode = "process"``) passes it as ``em`` instead; the scan
+        then runs there and the caller keeps owning it.
+        """
         if not self.is_armed():
             raise RuntimeError("FastHeat is not armed; call arm() first")
 
-        with ExperimentManager(self._daq, self._settings) as em:
-            # Fast-heat uses the single-shot DEFAULTIO full-buffer scan: the
-            # host reads once at the end, so the ballistic high-rate scan cannot
-            # hit a FIFO OVERRUN (todo P1-30). Slow keeps the CONTINUOUS path.
-            self._active_em = em  # expose for stop() while the scan runs
-            try:
-                result = em.finite_scan(
-                    self._voltage_profiles,
-                    self._ai_channels,
-                    seconds=self.duration_seconds,
-                    single_shot=True,
-                )
-            finally:
-                self._active_em = None
+        if em is not None:
+            result = self._scan(em)
+        else:
+            with ExperimentManager(self._daq, self._settings) as owned:
+                result = self._scan(owned)
         return apply_calibration(
             result.data,
             sample_rate=result.ai_rate,
@@ -712,6 +1034,22 @@ class FastHeat(BaseMode):
             ai_channels=self._ai_channels,
         )
 
+    def _scan(self, em: ExperimentManager) -> ScanResult:
+        # Fast-heat uses the single-shot DEFAULTIO full-buffer scan: the host
+        # reads once at the end, so the ballistic high-rate scan cannot hit a
+        # FIFO OVERRUN (todo P1-30). Slow keeps the CONTINUOUS path.
+        self._active_em = em  # expose for stop() while the scan runs
+        self._metrics = em.metrics
+        try:
+            return em.finite_scan(
+                self._voltage_profiles,
+                self._ai_channels,
+                seconds=self.duration_seconds,
+                single_shot=True,
+            )
+        finally:
+            self._active_em = None
+
 
 class SlowMode(BaseMode):
     """Slow ramp + AC modulation on the heater channel.
@@ -798,6 +1136,7 @@ class SlowMode(BaseMode):
     def _run_owned(self) -> pd.DataFrame:
         with ExperimentManager(self._daq, self._settings) as em:
             self._active_em = em  # expose for stop() while the scan runs
+            self._metrics = em.metrics
             try:
                 result = em.finite_scan(
                     self._voltage_profiles,
@@ -812,6 +1151,7 @@ class SlowMode(BaseMode):
         self, em: ExperimentManager, snapshot: Optional[Callable[[], np.ndarray]]
     ) -> pd.DataFrame:
         self._stop_event.clear()
+        self._metrics = em.metrics
         rate = self._settings.ai_params.sample_rate
         total = int(round(rate * self.duration_seconds))
         try:
@@ -848,7 +1188,17 @@ class SlowMode(BaseMode):
         # because the DC base ramps, so the natural observable is per-sample
         # ``amp(t), phi(t)``.
         params = self._modulation or self._settings.modulation
-        if params.lockin_capable and "temp-hr" in df.columns:
+        if (
+            params.lockin_capable
+            and params.lockin_output_rate > 0
+            and "temp-hr" in df.columns
+        ):
+            # Decimated outputs with their own time axis (``lockin`` group)
+            # instead of per-sample columns oversampled ~100x.
+            df.attrs[LOCKIN_GROUP] = _decimated_lockin(
+                df, raw_df, params, sample_rate, self._calibration
+            )
+        elif params.lockin_capable and "temp-hr" in df.columns:
             amp, phase, valid = lockin_demodulate(
                 df["temp-hr"].to_numpy(),
                 sample_rate=sample_rate,
@@ -920,6 +1270,22 @@ class IsoMode(BaseMode):
         # AO buffer integrity diagnostic, populated by _build_profiles when AC
         # modulation is enabled. ``None`` means either DC-only or not armed.
         self._ao_period_report: Optional[AOPeriodReport] = None
+        # Modulation as driven: the extra tones snapped onto AO-buffer bins
+        # (and, with SnapFrequency, the primary moved onto a seamless
+        # frequency) by _build_profiles. ``None`` until armed with AC.
+        self._driven_modulation: Optional[ModulationParams] = None
+
+    @property
+    def modulation(self) -> ModulationParams:
+        """Modulation as driven (extra tones on AO-buffer bins once armed)."""
+        return (
+            self._driven_modulation or self._modulation or self._settings.modulation
+        )
+
+    @property
+    def ao_buffer_samples(self) -> int:
+        """Length of the armed AO buffer per channel (0 until armed)."""
+        return max((len(p) for p in self._voltage_profiles.values()), default=0)
 
     def stop(self) -> None:
         """Request a clean shutdown of the running scan from another thread."""
@@ -947,12 +1313,47 @@ class IsoMode(BaseMode):
                 ch: _program_to_voltage(prog, 1, self._calibration)
                 for ch, prog in self._programs.items()
             }
-        # AC modulation: build a single period repeated enough times to fill
-        # the AO buffer of one second's worth of samples (CONTINUOUS scan).
+        # AC modulation: the AO scan is CONTINUOUS, so the buffer only has to
+        # hold the shortest whole-cycle span of the drive -- 1600 samples (3
+        # cycles) for 37.5 Hz at 20 kHz rather than one second that wraps
+        # half a cycle off. It is capped at the historical one-second buffer:
+        # a frequency without a whole-cycle span that short keeps the full
+        # second (and the warning below) unless SnapFrequency moves it to the
+        # nearest one that has. A shorter buffer also shrinks the interleaved
+        # ScanDataGenerator buffer and the Uref tile in calibration/finalize.
         rate = self._settings.ao_params.sample_rate
-        # One second of samples; AO scan is CONTINUOUS so the buffer keeps repeating.
         n = rate
+        if params.lockin_capable:
+            n, frequency = seamless_buffer_length(
+                float(rate), params.frequency, rate,
+                tones=[f for f, _ in params.tones], snap=params.snap_frequency,
+            )
+            if frequency != params.frequency:
+                logger.warning(
+                    "IsoMode f_mod %.6g Hz moved to %.6g Hz: no whole-cycle AO "
+                    "buffer of at most %d samples (SnapFrequency)",
+                    params.frequency, frequency, rate,
+                )
+                params = replace(params, frequency=frequency)
+        logger.info(
+            "IsoMode AO buffer: %d samples (%.4g ms, %.6g cycles of %.6g Hz)",
+            n, 1e3 * n / rate, n * params.frequency / rate, params.frequency,
+        )
         time_s = np.arange(n) / float(rate)
+        if params.tones:
+            # Multi-tone drive: every extra tone goes on a bin of the buffer,
+            # so it wraps seamlessly and lands on one FFT bin of the capture.
+            aligned = align_tones([f for f, _ in params.tones], float(rate), n)
+            for (f, _), snapped in zip(params.tones, aligned):
+                if snapped != f:
+                    logger.info(
+                        "IsoMode tone %.4g Hz moved to %.4g Hz (bin of the %d-sample AO buffer)",
+                        f, snapped, n,
+                    )
+            params = replace(
+                params, tones=tuple((f, a) for f, (_, a) in zip(aligned, params.tones))
+            )
+        self._driven_modulation = params
         profiles: Dict[str, np.ndarray] = {}
         for ch, prog in self._programs.items():
             base = np.full(n, _program_to_voltage(prog, n, self._calibration)[0])
@@ -963,15 +1364,18 @@ class IsoMode(BaseMode):
             profiles[ch] = base
         # Sanity check: the AO buffer is replayed CONTINUOUS, so a non-integer
         # number of AC cycles in the buffer would inject a phase jump at every
-        # wrap (and visible spectral sidebands on the chip drive). With the
-        # default 1-second buffer at f_mod=37.5 Hz this is exactly what
-        # happens (37.5 cycles -> pi rad jump per wrap). We log a warning
-        # rather than raise: the experiment still runs, just with biased C_p.
-        # The fix in production is either to choose f_mod such that
-        # ``rate / f_mod`` is rational with a small denominator that divides
-        # ``n``, or to size the AO buffer to the smallest integer-cycle
-        # length (see :func:`_integer_cycle_length` in shared.modulation).
+        # wrap (and visible spectral sidebands on the chip drive). The buffer
+        # is sized to whole cycles above, so this only fires for a frequency
+        # with no whole-cycle span within one second (37.3 Hz at 20 kHz) and
+        # SnapFrequency off. We log a warning rather than raise: the
+        # experiment still runs, just with biased C_p.
         ac_profile = profiles.get(self._modulation_channel)
+        if ac_profile is not None and params.tones:
+            # The extra tones are on bins by construction; judge the primary
+            # on its own (the others would read as leakage).
+            ac_profile = apply_modulation(
+                time_s, np.zeros(n), replace(params, tones=(), offset=0.0)
+            )
         if ac_profile is not None:
             report = check_ao_period_integrity(
                 ac_profile, sample_rate=float(rate), frequency=params.frequency
@@ -982,9 +1386,9 @@ class IsoMode(BaseMode):
                     "IsoMode AO modulation buffer is NOT seamless: "
                     "%.3f cycles in buffer (drift %+.3f cycles -> "
                     "%+.4f rad phase jump per wrap), spectral leakage %.2f%%. "
-                    "Choose f_mod so that buffer_samples * f_mod / sample_rate "
-                    "is an integer (e.g. for fs=%.0f Hz pick f_mod from "
-                    "{1, 2, 4, 5, 8, 10, 16, 20, 25, 40, 50, ...} Hz instead).",
+                    "Choose an f_mod whose f_mod / sample_rate reduces to a "
+                    "denominator of at most one second of samples (fs=%.0f Hz), "
+                    "or set Modulation.SnapFrequency to move it there.",
                     report.cycles,
                     report.cycles_drift,
                     report.phase_jump_rad,
@@ -1052,7 +1456,7 @@ class IsoMode(BaseMode):
         if not self.is_armed():
             raise RuntimeError("IsoMode is not armed; call arm() first")
 
-        params = self._modulation or self._settings.modulation
+        params = self.modulation
         if duration_seconds is None and self.duration_seconds < 1.0:
             # Falling back to the armed duration is the legacy behaviour for
             # callers that did not specify one. ``< 1 s`` clearly was a default
@@ -1068,6 +1472,7 @@ class IsoMode(BaseMode):
         injected = em is not None
         if not injected:
             em = ExperimentManager(self._daq, self._settings)
+        self._metrics = em.metrics
         try:
             self._drive_ao(em)
 
@@ -1109,23 +1514,31 @@ class IsoMode(BaseMode):
             # the time-domain phase; the FFT path below still uses the synthetic
             # reference (its window-offset phase handling needs separate bench
             # validation before adopting a measured reference there).
-            amp, phase, valid = lockin_demodulate(
-                temp_hr, sample_rate=ai_rate, frequency=params.frequency,
-                reference=_lockin_reference(raw_df, params),
-                return_valid=True,
-            )
-            df["temp-hr_amp"] = amp
-            df["temp-hr_phase"] = phase
-            df["temp-hr_valid"] = valid  # False over the settling edges (P1-9)
+            # With Modulation.LockinOutputRate set, the trace is decimated
+            # and kept apart from the per-sample frame (``lockin`` group).
             # P1-32: amplitude correction divider, opt-in. Applied to the
-            # per-sample trace here and to the FFT scalars below.
+            # trace here and to the FFT scalars below.
             amp_corr = self._calibration.amplitude_correction_enabled and "Thtr" in df.columns
-            if amp_corr:
-                df["temp-hr_amp"] = _kamp_divide(
-                    df["temp-hr_amp"].to_numpy(),
-                    df["Thtr"].to_numpy(),
-                    self._calibration,
+            if params.lockin_output_rate > 0:
+                df.attrs[LOCKIN_GROUP] = _decimated_lockin(
+                    df, raw_df, params, ai_rate, self._calibration
+                )
+            else:
+                amp, phase, valid = lockin_demodulate(
+                    temp_hr, sample_rate=ai_rate, frequency=params.frequency,
+                    reference=_lockin_reference(raw_df, params),
+                    return_valid=True,
                 )
+                df["temp-hr_amp"] = amp
+                df["temp-hr_phase"] = phase
+                df["temp-hr_valid"] = valid  # False over the settling edges (P1-9)
+                if amp_corr:
+                    df["temp-hr_amp"] = _kamp_divide(
+                        df["temp-hr_amp"].to_numpy(),
+                        df["Thtr"].to_numpy(),
+                        self._calibration,
+                    )
+            if amp_corr:
                 # Representative operating-point gain for the scalar FFT
                 # amplitudes (Thtr is ~stationary in iso). NaN if undefined.
                 thtr_op = float(np.nanmean(df["Thtr"].to_numpy())) if len(df) else float("nan")
@@ -1150,7 +1563,7 @@ class IsoMode(BaseMode):
                     temp_hr,
                     sample_rate=ai_rate,
                     frequency=params.frequency,
-                    harmonics=(1, 2, 3),
+                    harmonics=_ISO_HARMONICS,
                 )
                 # Stash on df.attrs so callers can pick up the scalars
                 # without bloating the per-sample DataFrame. (df.attrs does
@@ -1178,6 +1591,36 @@ class IsoMode(BaseMode):
                 # crash the run -- the time-domain lock-in still produced
                 # something usable.
                 logger.warning("IsoMode FFT demod skipped: %s", exc)
+            # Multi-tone drive: every tone (and its 2f / 3f) from one rfft of
+            # the same capture -- one hold instead of one per frequency.
+            # Persisted as the ``fft_tones`` group by save_run_to_h5.
+            if params.tones:
+                try:
+                    tone_results = _tone_harmonics_fallback(
+                        lambda harmonics: fft_demodulate_tones(
+                            temp_hr, ai_rate, [f for f, _ in params.all_tones], harmonics
+                        )
+                    )
+                    df.attrs.update(_tone_attrs(params, tone_results, kamp_op))
+                except ValueError as exc:
+                    logger.warning("IsoMode multi-tone FFT demod skipped: %s", exc)
+            # Short-time FFT over the same capture: amplitude / phase /
+            # leakage per whole-cycle frame, so a drift during a long hold
+            # is resolved rather than averaged into the scalars above.
+            # Persisted as the ``fft_frames`` group by save_run_to_h5.
+            if params.fft_frame_cycles > 0:
+                frames = _fft_frames(
+                    temp_hr, params, ai_rate,
+                    df["Thtr"].to_numpy() if amp_corr else None,
+                    self._calibration,
+                )
+                if len(frames):
+                    df.attrs[FFT_FRAMES_GROUP] = frames
+                    first, last = frames.harmonic(1)[0][[0, -1]]
+                    logger.info(
+                        "IsoMode FFT frames: %d x %d samples (hop %d); 1f A %.4g -> %.4g",
+                        len(frames), frames.frame_samples, frames.hop_samples, first, last,
+                    )
         return df
 
 
@@ -1239,7 +1682,15 @@ def save_run_to_h5(
     ``data`` group. We persist the same shape :class:`fastheat.FastHeat` and
     :class:`slow_mode.SlowMode` historically did (for backward compatibility),
     plus the AC lock-in columns when present (``temp-hr_amp`` / ``temp-hr_phase``
-    / ``temp-hr_valid``, the last marking the lock-in settling edges).
+    / ``temp-hr_valid``, the last marking the lock-in settling edges). A
+    decimated lock-in (``Modulation.LockinOutputRate``; a
+    :class:`DecimatedLockIn` on ``df.attrs["lockin"]``) goes to its own
+    ``lockin`` group instead, with its ``time`` axis and ``sample_rate`` /
+    ``decimation`` attributes. An iso run's short-time FFT series
+    (``Modulation.FftFrameCycles``; an :class:`FFTFrames` on
+    ``df.attrs["fft_frames"]``) goes to the ``fft_frames`` group, and a
+    multi-tone run's per-tone results (``temp-hr_fft_tones*`` attrs) to the
+    ``fft_tones`` group.
 
     The Tango server calls this from ``run()`` — without it, ``run_fast_heat``
     completes silently but the file the front-end expects never appears.
@@ -1253,6 +1704,18 @@ def save_run_to_h5(
         for col in _EXP_DATA_COLUMNS:
             if col in df.columns:
                 data.create_dataset(col, data=np.asarray(df[col]))
+        lockin = df.attrs.get(LOCKIN_GROUP)
+        if lockin is not None:
+            group = f.create_group(LOCKIN_GROUP)
+            for col in _LOCKIN_COLUMNS:
+                group.create_dataset(col, data=np.asarray(lockin.columns[col]))
+            group.attrs["sample_rate"] = lockin.sample_rate
+            group.attrs["decimation"] = lockin.decimation
+        frames = df.attrs.get(FFT_FRAMES_GROUP)
+        if frames is not None:
+            _write_fft_frames(f.create_group(FFT_FRAMES_GROUP), frames)
+        if "temp-hr_fft_tones" in df.attrs:
+            _write_fft_tones(f.create_group(FFT_TONES_GROUP), df.attrs)
         f.create_dataset("calibration", data=calibration.get_str())
         f.create_dataset("settings", data=settings.get_str())
         prog_group = f.create_group("temp_volt_programs")
@@ -1291,25 +1754,37 @@ def finalize_raw_to_h5(
     """Chunked calibrate: raw (U) recorder file -> separate calibrated (T) file.
 
     Streaming finalise (P1-17 step 4c-1): the multi-channel **raw AI (U, ADC
-    volts)** is read from ``raw_h5_path`` in blocks of ``block_rows`` and written
-    to a **separate** ``out_h5_path`` (the ``exp_data.h5`` layout) in engineering
-    units, so the full multi-channel scan is **never held in RAM** -- only one
-    block at a time. The raw (U) file is left intact for re-calibration.
+    volts)** is read from ``raw_h5_path`` -- a raw file or a segment index, via
+    :class:`~pioner.back.acquisition.raw_recording.RawRecording` -- in blocks
+    of ``block_rows`` and written to a **separate** ``out_h5_path`` (the
+    ``exp_data.h5`` layout) in engineering units, so the full multi-channel
+    scan is **never held in RAM** -- only one block at a time. The raw (U)
+    file is left intact for re-calibration.
 
     Two streaming passes:
 
     * **pass 1** accumulates the AD595 (cold-junction) mean over the whole scan
-      (the only whole-scan quantity) -> ``Taux``;
+      (the only whole-scan quantity) -> ``Taux``. Skipped when the recorder
+      stored its run statistics (``RawRecording.stats``): the mean is already
+      known, so finalise reads the raw data exactly once;
     * **pass 2** calibrates each block with that ``Taux`` and a per-block
       ``Uref`` slice (the heater profile in ``voltage_profiles`` aligned to the
       raw via ``program_offset`` -- the ramp begins at raw row ``program_offset``,
       earlier rows are baseline with ``Uref = NaN``), appending the per-sample
       columns to extendable datasets.
 
-    The AC lock-in (``temp-hr_amp/phase/valid``) needs the whole signal, so it
-    runs once at the end over the (1-D) ``temp-hr`` column read back from the
-    output -- the only non-bounded array here. Truly multi-day runs want a
-    block-wise zero-phase lock-in instead (flagged refinement, P1-17).
+    The AC lock-in (``temp-hr_amp/phase/valid``) runs alongside pass 2: each
+    block's ``temp-hr`` goes into a :class:`~pioner.shared.modulation.BlockLockIn`
+    (zero-phase, overlap-save backward pass) and whatever it releases is
+    appended, so memory stays flat for any run length. It matches the
+    whole-signal ``lockin_demodulate`` to ~1e-8 of the modulation amplitude.
+    With ``modulation.lockin_output_rate`` > 0 the lock-in decimates first
+    and its outputs (with their own ``time``) go to the ``lockin`` group, as
+    in :func:`save_run_to_h5`. An iso run (``tile_profile``) with
+    ``modulation.fft_frame_cycles`` > 0 also gets the ``fft_frames`` group,
+    computed block by block with the unfinished frame carried over, and a
+    multi-tone one (``modulation.tones``) the ``fft_tones`` group, its bins
+    summed block by block (:class:`~pioner.shared.modulation.ToneBins`).
 
     ``program_offset`` is the raw row where the AO program starts -- the
     DiskRecorder ``mark_index``. ``tile_profile`` selects how the heater profile
@@ -1323,8 +1798,11 @@ def finalize_raw_to_h5(
     result lives on disk), or ``None`` if the raw file holds no samples.
     """
     import os
+
     import h5py
 
+    from pioner.back.acquisition.raw_recording import RawRecording
+
     if os.path.abspath(raw_h5_path) == os.path.abspath(out_h5_path):
         raise ValueError(
             "finalize_raw_to_h5: raw (U) and calibrated (T) paths must differ "
@@ -1338,29 +1816,36 @@ def finalize_raw_to_h5(
     per_sample = [c for c in _EXP_DATA_COLUMNS if not c.startswith("temp-hr_")]
 
     os.makedirs(os.path.dirname(os.path.abspath(out_h5_path)) or ".", exist_ok=True)
-    with h5py.File(raw_h5_path, "r") as rf:
-        if dataset not in rf:
+    with RawRecording(raw_h5_path, dataset) as rds:
+        if rds.segment_count == 0:
             logger.warning("finalize_raw_to_h5: no '%s' dataset in %s (empty run)",
                            dataset, raw_h5_path)
             return None
-        rds = cast("h5py.Dataset", rf[dataset])
-        n = int(rds.shape[0])
+        n = rds.rows
         if n == 0:
             return None
-        if int(rds.shape[1]) != nchan:
+        if rds.n_channels != nchan:
             raise ValueError(
-                f"finalize_raw_to_h5: raw has {rds.shape[1]} channels but "
+                f"finalize_raw_to_h5: raw has {rds.n_channels} channels but "
                 f"ai_channels has {nchan} ({channels})"
             )
 
-        # Pass 1: streaming AD595 mean -> Taux (the only whole-scan quantity).
+        # Compact recordings (float32 / int16 counts) decode per block.
+        codec = SampleCodec.from_attrs(rds.attrs)
+
+        # Pass 1: streaming AD595 mean -> Taux (the only whole-scan quantity),
+        # unless the recorder already accumulated it while draining.
         if AD595_AI in channels:
             pos = channels.index(AD595_AI)
-            ssum, cnt = 0.0, 0
-            for s in range(0, n, block_rows):
-                col = np.asarray(rds[s:s + block_rows, pos], dtype=float)
-                ssum += float(col.sum())
-                cnt += int(col.shape[0])
+            stats = rds.stats
+            if stats is not None and stats["count"] == n:
+                ssum, cnt = float(stats["sum"][pos]), n
+            else:
+                ssum, cnt = 0.0, 0
+                for _, stored in rds.iter_blocks(block_rows, column=pos):
+                    col = codec.decode(stored, pos)
+                    ssum += float(col.sum())
+                    cnt += int(col.shape[0])
             taux = float(calibration.hardware.correct_ad595(100.0 * (ssum / cnt))) if cnt else 0.0
         else:
             taux = 0.0
@@ -1370,57 +1855,149 @@ def finalize_raw_to_h5(
             data = of.create_group("data")
             dsets: Dict[str, "h5py.Dataset"] = {}
             written = 0
-            for s in range(0, n, block_rows):
-                block = np.asarray(rds[s:s + block_rows], dtype=float)
+
+            def append(col: str, arr: np.ndarray, start: int, group=data) -> None:
+                key = f"{group.name}/{col}"
+                if key not in dsets:
+                    dsets[key] = group.create_dataset(
+                        col, shape=(0,), maxshape=(None,), chunks=True, dtype="float64"
+                    )
+                dsets[key].resize(start + arr.size, axis=0)
+                dsets[key][start:start + arr.size] = arr
+
+            lockin = None
+            lockin_rows = 0
+            lockin_group = data
+            if modulation is not None and modulation.lockin_capable:
+                q = lockin_decimation(
+                    sample_rate, modulation.frequency, modulation.lockin_output_rate
+                )
+                lockin = BlockLockIn(sample_rate, modulation.frequency, decimate=q)
+                if modulation.lockin_output_rate > 0:
+                    lockin_group = of.create_group(LOCKIN_GROUP)
+                    lockin_group.attrs["sample_rate"] = lockin.output_rate
+                    lockin_group.attrs["decimation"] = q
+
+            def append_lockin(out: tuple) -> None:
+                nonlocal lockin_rows
+                amp, phase, valid = out
+                if amp.size == 0:
+                    return
+                if lockin_group is not data:
+                    times = lockin.output_times(lockin_rows, amp.size)
+                    append("time", times, lockin_rows, lockin_group)
+                append("temp-hr_amp", amp, lockin_rows, lockin_group)
+                append("temp-hr_phase", phase, lockin_rows, lockin_group)
+                append("temp-hr_valid", np.asarray(valid, dtype="float64"), lockin_rows,
+                       lockin_group)
+                lockin_rows += amp.size
+
+            # Iso short-time FFT: the samples of the unfinished frame carry
+            # over to the next block (``skip`` covers a hop longer than a
+            # frame), so the series equals one fft_demodulate_frames call.
+            frames_on = (
+                tile_profile
+                and modulation is not None
+                and modulation.lockin_capable
+                and modulation.fft_frame_cycles > 0
+            )
+            frame_parts: List[FFTFrames] = []
+            pending = np.empty(0)
+            pending_start = 0
+            skip = 0
+            # Multi-tone iso: the run length is known, so the integer-cycle
+            # window and its bins are too -- sum them block by block.
+            tone_bins = None
+            if tile_profile and modulation is not None and (
+                modulation.lockin_capable and modulation.tones
+            ):
+                try:
+                    tone_bins = _tone_harmonics_fallback(
+                        lambda harmonics: ToneBins(
+                            sample_rate, [f for f, _ in modulation.all_tones], n, harmonics
+                        )
+                    )
+                except ValueError as exc:
+                    logger.warning("finalize_raw_to_h5: multi-tone demod skipped: %s", exc)
+
+            def push_frames(x: np.ndarray) -> None:
+                nonlocal pending, pending_start, skip
+                if skip:
+                    dropped = min(skip, x.size)
+                    x, skip = x[dropped:], skip - dropped
+                pending = np.concatenate((pending, x))
+                frames = _fft_frames(
+                    pending, modulation, sample_rate, None, calibration, pending_start
+                )
+                if len(frames):
+                    frame_parts.append(frames)
+                    consumed = len(frames) * frames.hop_samples
+                    skip = max(0, consumed - pending.size)
+                    pending = pending[consumed:]
+                    pending_start += consumed
+
+            def write_block(m: int, cols: Dict[str, np.ndarray]) -> None:
+                # Append one calibrated block and feed the streaming analyses.
+                nonlocal written
+                for col in per_sample:
+                    if col in cols:
+                        append(col, cols[col], written)
+                if lockin is not None and "temp-hr" in cols:
+                    append_lockin(lockin.push(cols["temp-hr"]))
+                if frames_on and "temp-hr" in cols:
+                    push_frames(cols["temp-hr"])
+                if tone_bins is not None and "temp-hr" in cols:
+                    tone_bins.push(cols["temp-hr"])
+                written += m
+
+            def block_uref(s: int, m: int) -> Optional[np.ndarray]:
+                if not has_ref:
+                    return None
+                idx = np.arange(s, s + m) - program_offset
+                uref = np.full(m, np.nan)
+                if ref.size:
+                    if tile_profile:
+                        # iso: short AO buffer replayed CONTINUOUS -> tile.
+                        ok = idx >= 0
+                        uref[ok] = ref[idx[ok] % ref.size]
+                    else:
+                        # slow ramp: profile spans the run -> slice.
+                        ok = (idx >= 0) & (idx < ref.size)
+                        uref[ok] = ref[idx[ok]]
+                return uref
+
+            for s, stored in rds.iter_blocks(block_rows):
+                block = codec.decode(stored)
                 m = int(block.shape[0])
-                block_profiles: Dict[str, np.ndarray] = {}
-                if has_ref:
-                    idx = np.arange(s, s + m) - program_offset
-                    uref = np.full(m, np.nan)
-                    if ref.size:
-                        if tile_profile:
-                            # iso: short AO buffer replayed CONTINUOUS -> tile.
-                            ok = idx >= 0
-                            uref[ok] = ref[idx[ok] % ref.size]
-                        else:
-                            # slow ramp: profile spans the run -> slice.
-                            ok = (idx >= 0) & (idx < ref.size)
-                            uref[ok] = ref[idx[ok]]
-                    block_profiles[HEATER_AO] = uref
-                cal = apply_calibration(
-                    pd.DataFrame(block, columns=channels),
+                names, values = calibrate_array(
+                    block,
+                    channels,
                     sample_rate=sample_rate,
                     calibration=calibration,
-                    voltage_profiles=block_profiles,
-                    ai_channels=channels,
+                    uref_profile=block_uref(s, m),
                     taux_override=taux,
                     sample_offset=s,
                 )
-                for col in per_sample:
-                    if col not in cal.columns:
-                        continue
-                    arr = np.asarray(cal[col], dtype="float64")
-                    if col not in dsets:
-                        dsets[col] = data.create_dataset(
-                            col, shape=(0,), maxshape=(None,), chunks=True, dtype="float64"
-                        )
-                    dsets[col].resize(written + m, axis=0)
-                    dsets[col][written:written + m] = arr
-                written += m
-
-            # AC lock-in over the 1-D temp-hr column (read back once).
-            if modulation is not None and modulation.lockin_capable and "temp-hr" in dsets:
-                temphr = np.asarray(dsets["temp-hr"][:], dtype=float)
-                amp, phase, valid = lockin_demodulate(
-                    temphr, sample_rate=sample_rate,
-                    frequency=modulation.frequency, return_valid=True,
-                )
-                for col, arr in (
-                    ("temp-hr_amp", amp),
-                    ("temp-hr_phase", phase),
-                    ("temp-hr_valid", np.asarray(valid, dtype=float)),
-                ):
-                    data.create_dataset(col, data=np.asarray(arr, dtype="float64"))
+                write_block(m, {c: row for c, row in zip(names, values) if c in per_sample})
+
+            # Release the lock-in's look-ahead tail (exact sosfiltfilt end).
+            if lockin is not None:
+                append_lockin(lockin.finish())
+            if frame_parts:
+                _write_fft_frames(of.create_group(FFT_FRAMES_GROUP), replace(
+                    frame_parts[0],
+                    time=np.concatenate([fr.time for fr in frame_parts]),
+                    amplitude=np.concatenate([fr.amplitude for fr in frame_parts]),
+                    phase=np.concatenate([fr.phase for fr in frame_parts]),
+                    leakage=np.concatenate([fr.leakage for fr in frame_parts]),
+                ))
+            if tone_bins is not None:
+                try:
+                    tone_attrs = _tone_attrs(modulation, tone_bins.result())
+                except ValueError as exc:  # no temp-hr column -> nothing summed
+                    logger.warning("finalize_raw_to_h5: multi-tone demod skipped: %s", exc)
+                else:
+                    _write_fft_tones(of.create_group(FFT_TONES_GROUP), tone_attrs)
 
             # Metadata groups (mirror save_run_to_h5).
             of.create_dataset("calibration", data=calibration.get_str())
@@ -1449,6 +2026,7 @@ def read_calibrated_h5(
     columns: Optional[Sequence[str]] = None,
     step: int = 1,
     max_points: Optional[int] = None,
+    group: str = "data",
 ) -> Dict[str, np.ndarray]:
     """Read **decimated** columns from a calibrated (T) exp_data file (P1-17 4c-2).
 
@@ -1459,16 +2037,19 @@ def read_calibrated_h5(
     simple; min/max-per-bin decimation that preserves narrow spikes is a future
     fidelity option.)
 
+    ``group="lockin"`` reads the decimated lock-in outputs instead (their own
+    ``time`` axis; see ``Modulation.LockinOutputRate``).
+
     Returns a dict of column name -> 1-D array (empty if the file has no
-    ``data`` group or none of the requested columns).
+    such group or none of the requested columns).
     """
     import h5py
 
     result: Dict[str, np.ndarray] = {}
     with h5py.File(path, "r") as f:
-        if "data" not in f:
+        if group not in f:
             return result
-        data = cast("h5py.Group", f["data"])
+        data = cast("h5py.Group", f[group])
         avail = list(data.keys())
         cols = [c for c in (list(columns) if columns is not None else avail) if c in avail]
         if not cols:
@@ -1490,9 +2071,14 @@ __all__ = [
     "IsoMode",
     "create_mode",
     "apply_calibration",
+    "calibrate_array",
     "save_run_to_h5",
     "finalize_raw_to_h5",
     "read_calibrated_h5",
+    "LOCKIN_GROUP",
+    "DecimatedLockIn",
+    "FFT_FRAMES_GROUP",
+    "FFT_TONES_GROUP",
     "segments_to_program",
     "ChannelProgram",
 ]
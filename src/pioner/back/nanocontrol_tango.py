@@ -94,11 +94,14 @@ class NanoControl(Device):  # type: ignore[misc]
         # (see docs/live-streaming.md section 3). The Tango server was
         # designed around per-call ExperimentManager construction and is
         # incompatible with a shared persistent AI session. Refuse to start
-        # rather than silently fight the GUI for the DAQ device.
-        if getattr(self._settings, "acquisition_mode", "persistent").strip().lower() == "persistent":
+        # rather than silently fight the GUI for the DAQ device. The
+        # out-of-process mode holds the device for the GUI the same way.
+        if getattr(self._settings, "acquisition_mode", "persistent").strip().lower() in (
+            "persistent", "process",
+        ):
             raise RuntimeError(
-                "Tango server is disabled when AcquisitionMode='persistent' "
-                "(see docs/live-streaming.md). Switch settings.json to "
+                "Tango server is disabled when AcquisitionMode is 'persistent' "
+                "or 'process' (see docs/live-streaming.md). Switch settings.json to "
                 "\"AcquisitionMode\": \"per_experiment\" before running the "
                 "Tango server, or run only the GUI in persistent mode."
             )
@@ -203,6 +206,15 @@ class NanoControl(Device):  # type: ignore[misc]
         self._settings.parse_ai_params()
         self._settings.parse_ao_params()
 
+    # ------------------------------------------------------------------
+    # Acquisition telemetry
+    # ------------------------------------------------------------------
+    @attribute(dtype=str, label="Acquisition metrics (JSON)")
+    def acquisition_metrics(self) -> str:
+        """Telemetry of the armed mode's latest run (modes build one manager per run)."""
+        mode = self._mode
+        return json.dumps(mode.metrics_snapshot() if mode is not None else {})
+
     # ------------------------------------------------------------------
     # Mode selection
     # ------------------------------------------------------------------
@@ -0,0 +1,285 @@
+"""Push delivery of ingested AI chunks to ring subscribers.
+
+The pull API (``peek_last_samples`` / ``read_new_samples``) makes every
+consumer poll on its own timer, copy its slice out of the ring and contend for
+``_ring_lock``. A :class:`Subscription` is the push alternative: the ring
+worker hands each chunk it ingests to every subscriber exactly once -- the
+same read-only float64 array, no per-consumer copy -- either by calling a
+callback on the worker thread or by placing it on a bounded queue.
+
+The ring worker never waits on a subscriber. When a subscriber's queue is full
+the :class:`OverflowPolicy` decides:
+
+* ``block`` -- the chunk goes to the subscriber's own handoff thread, which
+  waits for room at most ``block_timeout`` seconds and then drops the oldest
+  queued chunk; the handoff inbox is as deep as the queue and drops its own
+  oldest chunk when the consumer is stalled for longer than that;
+* ``drop_oldest`` -- discard the oldest queued chunk (live display: only the
+  newest data matter);
+* ``coalesce`` -- append the chunk onto the newest queued one, so the
+  consumer receives fewer, larger chunks (recorders). The parts are joined
+  once, when the consumer takes them, and at most ``coalesce_max_rows`` rows
+  are held; past that the oldest queued chunk is dropped as for
+  ``drop_oldest``.
+
+Callbacks run inline on the ring worker, so they must be cheap (hand the
+chunk to another thread or event loop). A call longer than
+``callback_budget`` seconds is counted in ``slow_callbacks`` and logged.
+
+Drops are counted per subscriber (``dropped_chunks`` / ``dropped_samples``)
+and ``lag`` reports rows queued but not yet taken, so falling behind is
+visible as it happens instead of as ``samples_lost`` warnings afterwards.
+"""
+
+from __future__ import annotations
+
+import enum
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Coalesced rows one subscriber may hold: ~50 s of 6 channels at 20 kHz.
+_COALESCE_MAX_ROWS = 1 << 20
+# Longest a callback may hold the ring worker before it is reported.
+_CALLBACK_BUDGET = 0.005
+
+
+class OverflowPolicy(str, enum.Enum):
+    """What a full subscriber queue does with the next chunk."""
+
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
+
+
+def _join(parts: list[np.ndarray]) -> np.ndarray:
+    if len(parts) == 1:
+        return parts[0]
+    out = np.concatenate(parts, axis=0)
+    out.flags.writeable = False
+    return out
+
+
+class Subscription:
+    """One consumer's feed of ingested ring chunks.
+
+    Created by ``ExperimentManager.subscribe`` / ``AIProvider.subscribe``;
+    consumers only use :meth:`get`, :meth:`drain`, :meth:`stats` and
+    :meth:`close`. Chunks are read-only ``(rows, channels)`` float64 volts
+    shared with every other subscriber.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        maxsize: int = 8,
+        policy: OverflowPolicy | str = OverflowPolicy.DROP_OLDEST,
+        callback: Optional[Callable[[np.ndarray], None]] = None,
+        block_timeout: float = 0.5,
+        coalesce_max_rows: int = _COALESCE_MAX_ROWS,
+        callback_budget: float = _CALLBACK_BUDGET,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError(f"Subscription maxsize must be >= 1, got {maxsize}")
+        self._name = str(name)
+        self._maxsize = int(maxsize)
+        self._policy = OverflowPolicy(policy)
+        self._callback = callback
+        self._block_timeout = float(block_timeout)
+        self._coalesce_max_rows = int(coalesce_max_rows)
+        self._callback_budget = float(callback_budget)
+        # Each queue entry is a list of parts; only COALESCE grows one past a
+        # single chunk, and the parts are joined when the entry is taken.
+        self._queue: Deque[list[np.ndarray]] = deque()
+        self._queued_rows = 0
+        # BLOCK only: chunks the worker handed over, not yet queued by the
+        # handoff thread.
+        self._inbox: Deque[np.ndarray] = deque()
+        self._inbox_rows = 0
+        # One condition guards queue, inbox and counters; it wakes consumers
+        # waiting in get() and the handoff thread waiting for room.
+        self._cond = threading.Condition()
+        self._closed = False
+        self.delivered_chunks = 0
+        self.delivered_samples = 0
+        self.dropped_chunks = 0
+        self.dropped_samples = 0
+        self.coalesced_chunks = 0
+        self.slow_callbacks = 0
+        self.callback_max_seconds = 0.0
+        self._handoff: Optional[threading.Thread] = None
+        if self._policy is OverflowPolicy.BLOCK and callback is None:
+            self._handoff = threading.Thread(
+                target=self._handoff_loop, name=f"subscription-{self._name}", daemon=True
+            )
+            self._handoff.start()
+
+    # -- introspection -------------------------------------------------
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def policy(self) -> OverflowPolicy:
+        return self._policy
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def lag(self) -> int:
+        """Rows delivered to the subscriber but not yet taken by the consumer."""
+        with self._cond:
+            return self._queued_rows + self._inbox_rows
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "name": self._name,
+                "policy": self._policy.value,
+                "lag": self._queued_rows + self._inbox_rows,
+                "delivered_chunks": self.delivered_chunks,
+                "delivered_samples": self.delivered_samples,
+                "dropped_chunks": self.dropped_chunks,
+                "dropped_samples": self.dropped_samples,
+                "coalesced_chunks": self.coalesced_chunks,
+                "slow_callbacks": self.slow_callbacks,
+                "callback_max_seconds": self.callback_max_seconds,
+            }
+
+    # -- consumer side -------------------------------------------------
+    def get(self, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        """Next chunk, waiting up to ``timeout`` s; ``None`` on timeout / close."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._queue or self._closed, timeout):
+                return None
+            if not self._queue:
+                return None
+            parts = self._queue.popleft()
+            chunk = _join(parts)
+            self._queued_rows -= int(chunk.shape[0])
+            self._cond.notify_all()
+            return chunk
+
+    def drain(self) -> np.ndarray:
+        """Everything queued, concatenated; empty ``(0, 0)`` when nothing is."""
+        with self._cond:
+            parts = [part for entry in self._queue for part in entry]
+            self._queue.clear()
+            self._queued_rows = 0
+            self._cond.notify_all()
+        if not parts:
+            return np.empty((0, 0), dtype=float)
+        return _join(parts)
+
+    def close(self) -> None:
+        """Stop receiving; wakes any waiter. Queued chunks stay drainable."""
+        with self._cond:
+            self._closed = True
+            # Whatever the handoff thread had not queued yet stays drainable too.
+            while self._inbox:
+                self._queue.append([self._inbox.popleft()])
+            self._queued_rows += self._inbox_rows
+            self._inbox_rows = 0
+            self._cond.notify_all()
+        if self._handoff is not None and self._handoff is not threading.current_thread():
+            self._handoff.join(timeout=1.0)
+
+    # -- producer side (ring worker) ------------------------------------
+    def _offer(self, chunk: np.ndarray) -> None:
+        if self._closed:
+            return
+        n = int(chunk.shape[0])
+        if self._callback is not None:
+            self._call(chunk, n)
+            return
+        with self._cond:
+            if self._handoff is not None:
+                if len(self._inbox) >= self._maxsize:
+                    old = self._inbox.popleft()
+                    self._inbox_rows -= int(old.shape[0])
+                    self._count_drop(int(old.shape[0]))
+                self._inbox.append(chunk)
+                self._inbox_rows += n
+                self._cond.notify_all()
+                return
+            if (
+                self._policy is OverflowPolicy.COALESCE
+                and len(self._queue) >= self._maxsize
+                and self._queued_rows + n <= self._coalesce_max_rows
+            ):
+                self._queue[-1].append(chunk)
+                self._queued_rows += n
+                self.coalesced_chunks += 1
+                self.delivered_chunks += 1
+                self.delivered_samples += n
+                self._cond.notify_all()
+                return
+            self._enqueue_locked(chunk)
+
+    def _call(self, chunk: np.ndarray, n: int) -> None:
+        started = time.perf_counter()
+        try:
+            self._callback(chunk)
+        except Exception:
+            logger.exception("Ring subscriber %s callback failed", self._name)
+            return
+        finally:
+            elapsed = time.perf_counter() - started
+            self.callback_max_seconds = max(self.callback_max_seconds, elapsed)
+            if elapsed > self._callback_budget:
+                self.slow_callbacks += 1
+                # First overrun and then every power of two: visible, not a flood.
+                if self.slow_callbacks & (self.slow_callbacks - 1) == 0:
+                    logger.warning(
+                        "Ring subscriber %s callback took %.1f ms on the ring "
+                        "worker (budget %.1f ms, %d slow calls so far)",
+                        self._name, elapsed * 1e3, self._callback_budget * 1e3,
+                        self.slow_callbacks,
+                    )
+        self.delivered_chunks += 1
+        self.delivered_samples += n
+
+    def _count_drop(self, rows: int) -> None:
+        self.dropped_chunks += 1
+        self.dropped_samples += rows
+
+    def _enqueue_locked(self, chunk: np.ndarray) -> None:
+        """Queue ``chunk``, dropping the oldest entry if full. Holds ``_cond``."""
+        if len(self._queue) >= self._maxsize:
+            rows = sum(int(part.shape[0]) for part in self._queue.popleft())
+            self._queued_rows -= rows
+            self._count_drop(rows)
+        n = int(chunk.shape[0])
+        self._queue.append([chunk])
+        self._queued_rows += n
+        self.delivered_chunks += 1
+        self.delivered_samples += n
+        self._cond.notify_all()
+
+    def _handoff_loop(self) -> None:
+        """BLOCK: move inbox chunks to the queue, waiting (bounded) for room."""
+        with self._cond:
+            while True:
+                self._cond.wait_for(lambda: self._inbox or self._closed)
+                if self._closed:
+                    return
+                self._cond.wait_for(
+                    lambda: len(self._queue) < self._maxsize or self._closed,
+                    self._block_timeout,
+                )
+                if self._closed:
+                    return
+                chunk = self._inbox.popleft()
+                self._inbox_rows -= int(chunk.shape[0])
+                self._enqueue_locked(chunk)
+
+
+__all__ = ["OverflowPolicy", "Subscription"]
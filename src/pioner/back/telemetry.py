@@ -0,0 +1,191 @@
+"""Acquisition telemetry: ingest latency, consumer lag, drops, lock holds.
+
+Sizing ``ring_max_seconds`` and the recorder ``poll_interval`` needs numbers
+from real-hardware soaks, not a ``samples_lost`` warning after the fact. An
+:class:`AcquisitionMetrics` lives on every ``ExperimentManager`` and is fed by
+the ring worker and the ring readers:
+
+* ``ingest_latency_ms`` -- histogram of the host-side time from the status
+  poll that found a chunk to the chunk being in the ring and published;
+* ``consumers`` -- per ``read_new_samples`` consumer: reads, last / high-water
+  cursor lag (rows behind head at read time) and cumulative ``samples_lost``;
+* ``driver_scan_count`` vs ``host_ingested`` -- how far the host trails the
+  driver's completed scans;
+* ``lock_hold_ms`` -- ``_ring_lock`` hold-time histogram per operation.
+
+:meth:`AcquisitionMetrics.snapshot` is a JSON-ready dict; a
+:class:`MetricsDumper` appends one snapshot per interval to a JSONL file
+(``Acquisition.TelemetryFile``). Readers reach a metrics object through its
+owner: ``AIProvider.metrics_snapshot`` for the GUI controllers, and
+``BaseMode.metrics_snapshot`` for the Tango server, whose modes build their
+``ExperimentManager`` per run.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import asdict, dataclass
+from typing import Callable, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+#: Upper bucket edges (ms) shared by the latency and lock-hold histograms; the
+#: last bucket collects everything above the final edge.
+HISTOGRAM_EDGES_MS = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 50.0, 100.0, 500.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram with count / mean / max, values in ms."""
+
+    def __init__(self, edges: Sequence[float] = HISTOGRAM_EDGES_MS) -> None:
+        self._edges = tuple(float(e) for e in edges)
+        self.counts = [0] * (len(self._edges) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        self.counts[bisect_left(self._edges, value_ms)] += 1
+        self.count += 1
+        self.total += value_ms
+        if value_ms > self.max:
+            self.max = value_ms
+
+    def to_dict(self) -> dict:
+        return {
+            "edges_ms": list(self._edges),
+            "counts": list(self.counts),
+            "count": self.count,
+            "mean_ms": self.total / self.count if self.count else 0.0,
+            "max_ms": self.max,
+        }
+
+
+@dataclass
+class ConsumerStats:
+    """Cursor lag and losses of one ``read_new_samples`` consumer."""
+
+    reads: int = 0
+    last_lag: int = 0
+    max_lag: int = 0
+    samples_lost: int = 0
+
+
+class AcquisitionMetrics:
+    """Counters of one ``ExperimentManager``; all methods are thread-safe."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Start a fresh session (called when the ring starts)."""
+        with self._lock:
+            self._started = time.time()
+            self._ingest_latency = Histogram()
+            self._lock_hold: dict[str, Histogram] = {}
+            self._consumers: dict[str, ConsumerStats] = {}
+            self._chunks = 0
+            self._driver_scan_count = 0
+            self._host_ingested = 0
+
+    def record_ingest(
+        self, rows: int, latency_s: float, driver_scan_count: int, host_ingested: int
+    ) -> None:
+        with self._lock:
+            self._chunks += 1
+            self._ingest_latency.observe(latency_s * 1e3)
+            self._driver_scan_count = int(driver_scan_count)
+            self._host_ingested = int(host_ingested)
+
+    def record_read(self, consumer_id: str, lag: int, samples_lost: int) -> None:
+        with self._lock:
+            stats = self._consumers.setdefault(consumer_id, ConsumerStats())
+            stats.reads += 1
+            stats.last_lag = int(lag)
+            stats.max_lag = max(stats.max_lag, int(lag))
+            stats.samples_lost += int(samples_lost)
+
+    def record_lock_hold(self, op: str, seconds: float) -> None:
+        with self._lock:
+            hist = self._lock_hold.get(op)
+            if hist is None:
+                hist = self._lock_hold[op] = Histogram()
+            hist.observe(seconds * 1e3)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "timestamp": time.time(),
+                "started": self._started,
+                "chunks": self._chunks,
+                "driver_scan_count": self._driver_scan_count,
+                "host_ingested": self._host_ingested,
+                "ingest_backlog": self._driver_scan_count - self._host_ingested,
+                "ingest_latency_ms": self._ingest_latency.to_dict(),
+                "lock_hold_ms": {op: h.to_dict() for op, h in self._lock_hold.items()},
+                "consumers": {cid: asdict(c) for cid, c in self._consumers.items()},
+            }
+
+
+class MetricsDumper:
+    """Append a metrics snapshot to a JSONL file every ``interval`` seconds.
+
+    ``snapshot`` is any zero-argument callable returning a JSON-serialisable
+    dict (``ExperimentManager.metrics_snapshot``). A final line is written on
+    :meth:`stop`, so short sessions still leave a record.
+    """
+
+    def __init__(self, snapshot: Callable[[], dict], path: str, interval: float = 10.0) -> None:
+        self._snapshot = snapshot
+        self._path = str(path)
+        self._interval = float(interval)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self._path)) or ".", exist_ok=True)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="metrics-dumper", daemon=True)
+        self._thread.start()
+        logger.info("Acquisition telemetry -> %s every %.1f s", self._path, self._interval)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self.dump()
+
+    def dump(self) -> None:
+        """Append one snapshot line now."""
+        try:
+            line = json.dumps(self._snapshot())
+            with open(self._path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except Exception:
+            logger.exception("Failed to write acquisition telemetry to %s", self._path)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self._interval):
+            self.dump()
+
+
+__all__ = [
+    "AcquisitionMetrics",
+    "ConsumerStats",
+    "HISTOGRAM_EDGES_MS",
+    "Histogram",
+    "MetricsDumper",
+]
@@ -246,28 +246,55 @@ class mainWindow(mainWindowUi):
             )
 
     def _update_live_values(self, data, sample_rate):
-        # Engineering-unit readout via the controller's calibration.
-        calibrate = getattr(self.controller, "calibrate_window", None)
-        if calibrate is not None:
+        # Engineering-unit readout via the controller's calibration. Prefer
+        # the incremental readout (only rows new since the last tick are
+        # calibrated); re-calibrating the whole scope window is the fallback
+        # for backends without one.
+        last = None
+        readout = getattr(self.controller, "live_readout", None)
+        if readout is not None:
             try:
-                cal = calibrate(data)
+                rep = readout()
             except Exception:
-                cal = None
-            if cal is not None and not cal.empty:
-                last = cal.iloc[-1]
-                self.tauxValueLabel.setText(self._fmt(last.get("Taux")))
-                self.ttplValueLabel.setText(self._fmt(last.get("temp")))
-                # Thtr is heater-derived (Rhtr = U/i); only meaningful while a
-                # drive is active. During an iso hold the AO genuinely sustains
-                # the heater, so show it; at idle i ~ 0 makes Rhtr blow up to
-                # the ~-1071 sentinel (todo P0-3), so blank it.
-                thtr = last.get("Thtr") if self._heater_driven else None
-                self.thtrValueLabel.setText(self._fmt(thtr))
-                self.thtrdynValueLabel.setText(self._fmt(last.get("temp-hr")))
-
-        # Modulation frequency + Umod amplitude via FFT demod.
+                rep = {}
+            if rep.get("available"):
+                last = rep["last"]
+        if last is None:
+            calibrate = getattr(self.controller, "calibrate_window", None)
+            if calibrate is not None:
+                try:
+                    cal = calibrate(data)
+                except Exception:
+                    cal = None
+                if cal is not None and not cal.empty:
+                    last = cal.iloc[-1]
+        if last is not None:
+            self.tauxValueLabel.setText(self._fmt(last.get("Taux")))
+            self.ttplValueLabel.setText(self._fmt(last.get("temp")))
+            # Thtr is heater-derived (Rhtr = U/i); only meaningful while a
+            # drive is active. During an iso hold the AO genuinely sustains
+            # the heater, so show it; at idle i ~ 0 makes Rhtr blow up to
+            # the ~-1071 sentinel (todo P0-3), so blank it.
+            thtr = last.get("Thtr") if self._heater_driven else None
+            self.thtrValueLabel.setText(self._fmt(thtr))
+            self.thtrdynValueLabel.setText(self._fmt(last.get("temp-hr")))
+
+        # Modulation frequency + Umod amplitude. Prefer the controller's
+        # sliding DFT over the scope span (O(new rows) per tick); an FFT of
+        # the whole window is the fallback until it has filled, and for
+        # backends without one.
         freq = float(self.settings.modulation_frequency)
         self.frequencyValueLabel.setText(f"{freq:.1f}")
+        modulation = getattr(self.controller, "live_modulation", None)
+        if freq > 0 and modulation is not None:
+            try:
+                rep = modulation(freq, window_seconds=self.scopeControls.x_scale_seconds())
+            except Exception:
+                rep = {}
+            if rep.get("available"):
+                self.umodhtrValueLabel.setText(
+                    f"{rep['harmonics'][1]['amplitude'] * 1000.0:.3f}")
+                return
         if freq > 0 and data.shape[1] >= 2:
             samples_per_period = sample_rate / freq
             if data.shape[0] >= int(samples_per_period):
@@ -74,6 +74,18 @@ OFFSET_FIELD = "Offset"
 # Opt-in: lock-in references the measured heater current (AI ch0) for its phase
 # zero instead of the commanded synthetic sine (P1-34). Default off.
 MEASURED_REFERENCE_FIELD = "MeasuredReference"
+# Optional: lock-in amplitude / phase output rate in Hz (0 -> per AI sample).
+LOCKIN_OUTPUT_RATE_FIELD = "LockinOutputRate"
+# Optional: iso short-time FFT frames -- frame length and hop in modulation
+# periods (FftFrameCycles 0 -> off; FftHopCycles 0 -> one frame length).
+FFT_FRAME_CYCLES_FIELD = "FftFrameCycles"
+FFT_HOP_CYCLES_FIELD = "FftHopCycles"
+# Optional: extra modulation tones, a list of {"Frequency": Hz, "Amplitude": V}
+# driven on top of the primary one (multi-frequency iso holds).
+TONES_FIELD = "Tones"
+# Opt-in: IsoMode moves a primary frequency with no seamless AO buffer of at
+# most one second to the nearest one that has. Default off (warn instead).
+SNAP_FREQUENCY_FIELD = "SnapFrequency"
 
 # Optional operator safety limits block (TODO step 8 / P1-38). Absent -> defaults.
 LIMITS_FIELD = "Limits"
@@ -81,6 +93,9 @@ LIMITS_FIELD = "Limits"
 # Optional chip-presence detection block (P1-36). Absent -> disabled (no gating).
 CHIP_PRESENCE_FIELD = "ChipPresence"
 
+# Optional AI ring-ingestion tuning block. Absent -> legacy half-buffer flip.
+ACQUISITION_FIELD = "Acquisition"
+
 # Raw data constants
 # =================================================================================
 DATA_FOLDER = "data"
@@ -0,0 +1,77 @@
+"""Bounded, thread-safe memo cache shared by the numeric helpers.
+
+:class:`LRUCache` backs the demodulation tables in
+:mod:`pioner.shared.modulation` (sin/cos references, filter designs,
+integer-cycle periods) and the inverse heater table in
+:mod:`pioner.shared.utils`. Entries are capped both by count and by array
+bytes; array values are handed out read-only because every caller shares
+the same object.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Tuple
+
+import numpy as np
+
+
+class LRUCache:
+    """Thread-safe LRU map with an entry and a byte cap, plus hit / miss counts.
+
+    Values are computed by the ``factory`` passed to :meth:`get` on a miss.
+    Array values are counted by ``nbytes`` and made read-only, since every
+    caller shares them; a value larger than ``max_bytes`` is returned but not
+    kept.
+    """
+
+    def __init__(self, name: str, max_entries: int, max_bytes: int) -> None:
+        self.name = name
+        self.max_entries = int(max_entries)
+        self.max_bytes = int(max_bytes)
+        self._data: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        value = factory()  # outside the lock: building a long table is slow
+        size = int(value.nbytes) if isinstance(value, np.ndarray) else 0
+        if isinstance(value, np.ndarray):
+            value.flags.writeable = False
+        if size > self.max_bytes:
+            return value
+        with self._lock:
+            if key not in self._data:
+                self._data[key] = (value, size)
+                self._bytes += size
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._data.popitem(last=False)
+                self._bytes -= evicted
+        return value
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+            self.hits = self.misses = 0
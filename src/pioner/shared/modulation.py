@@ -13,10 +13,22 @@ This module deals with the *signal-processing* part:
 
 * :class:`ModulationParams` -- small dataclass for ``frequency``,
   ``amplitude``, and ``offset``.
-* :func:`apply_modulation`  -- superimpose AC on a base voltage profile.
+* :func:`apply_modulation`  -- superimpose AC on a base voltage profile
+  (one tone, or several with :attr:`ModulationParams.tones`);
+  :func:`align_tones` snaps extra tones onto bins of the AO buffer;
+  :func:`seamless_buffer_length` sizes that buffer to the fewest samples
+  holding whole cycles of every tone.
 * :func:`lockin_demodulate` -- single-frequency software lock-in (time-
   domain, sin/cos demod + Butterworth LP) returning a per-sample amplitude
   and phase trace. Used by SlowMode where the DC component varies in time.
+* :class:`BlockLockIn`     -- the same zero-phase lock-in fed block by block
+  with bounded memory (streaming finalise of multi-day recordings),
+  optionally decimating the I/Q products first so amplitude / phase come
+  out at a few times the bandwidth instead of the AI rate.
+* :func:`lockin_demodulate_decimated` -- whole-signal form of that decimated
+  lock-in, returning its own time axis.
+* :class:`StreamingLockIn` -- causal lock-in for live traces: carried filter
+  state and reference phase, O(new samples) per chunk, fixed group delay.
 * :func:`fft_demodulate`    -- single-shot FFT-based demodulator returning
   *scalar* amplitude and phase at the fundamental and at user-selected
   harmonics (default 1f/2f/3f), plus a spectral-leakage diagnostic. Used
@@ -24,6 +36,19 @@ This module deals with the *signal-processing* part:
   natural estimator and bonus harmonics come for free (relevant in AC
   calorimetry: 2f probes nonlinearities of C_p, 3f gives a sanity check
   on harmonic distortion of the heater drive).
+* :func:`fft_demodulate_frames` -- the same estimator over short
+  whole-cycle frames at a configurable hop (one batched ``rfft``), giving
+  amplitude / phase / leakage *series* that resolve drift during a hold.
+* :func:`fft_demodulate_tones` -- every tone of a multi-tone drive (and its
+  harmonics) from one capture and one ``rfft`` (frequency sweeps in a
+  single hold); :class:`ToneBins` is its block-wise form for finalise.
+* :class:`SlidingDFT`       -- the same harmonic bins over a sliding window
+  of a live stream, updated in O(new samples) (live modulation readout).
+* :func:`demod_cache_stats` / :func:`clear_demod_caches` -- the bounded LRU
+  caches behind the demodulators (reference tables, Butterworth SOS,
+  integer-cycle periods), so a live display calling them every tick with the
+  same (rate, frequency, length, bandwidth) stops re-paying ``sin`` / ``cos``
+  and ``butter``.
 * :func:`check_ao_period_integrity` -- verify that an AO modulation buffer
   intended for CONTINUOUS replay wraps without a phase discontinuity.
   Required because IsoMode plays the AO buffer indefinitely; if the
@@ -44,19 +69,111 @@ temperature response lags the heater drive). Phase is wrapped to
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import math
+from dataclasses import dataclass, replace
 from fractions import Fraction
-from typing import Iterable, Tuple
+from typing import Callable, Iterable, Tuple
 
 import numpy as np
 
+from pioner.shared.lru_cache import LRUCache
+
 try:
-    from scipy.signal import butter, sosfiltfilt
+    from scipy.signal import butter, firwin, sosfilt, sosfilt_zi, sosfiltfilt
     _HAVE_SCIPY = True
 except ImportError:  # pragma: no cover - scipy should always be present
     _HAVE_SCIPY = False
 
 
+# ---------------------------------------------------------------------------
+# Bounded caches for repeated demodulation (live GUI ticks)
+# ---------------------------------------------------------------------------
+# sin/cos tables keyed on (rate, frequency, length): ~3 MB per 200k-sample
+# pair, so the byte cap -- not the entry count -- is what bounds this one.
+_REFERENCE_CACHE = LRUCache("reference", max_entries=32, max_bytes=64 * 1024 * 1024)
+# Filter designs: Butterworth SOS and the decimating FIR (12 * q taps).
+_SOS_CACHE = LRUCache("sos", max_entries=64, max_bytes=1024 * 1024)
+_CYCLE_CACHE = LRUCache("integer_cycle", max_entries=256, max_bytes=0)
+
+
+def demod_cache_stats() -> dict:
+    """Hit / miss / size counters of the demodulation caches, by cache name."""
+    return {c.name: c.stats() for c in (_REFERENCE_CACHE, _SOS_CACHE, _CYCLE_CACHE)}
+
+
+def clear_demod_caches() -> None:
+    """Empty the demodulation caches and zero their counters."""
+    for cache in (_REFERENCE_CACHE, _SOS_CACHE, _CYCLE_CACHE):
+        cache.clear()
+
+
+def _cycle_period(sample_rate: float, frequency: float) -> int:
+    """Samples in the shortest whole-cycle span, ``q`` for ``f / fs = p / q``."""
+    def period() -> int:
+        ratio = (
+            Fraction(frequency).limit_denominator(10**6)
+            / Fraction(sample_rate).limit_denominator(10**6)
+        )
+        return int(ratio.denominator)
+    return _CYCLE_CACHE.get((float(sample_rate), float(frequency)), period)
+
+
+def _reference_table(sample_rate: float, frequency: float, n: int) -> np.ndarray:
+    """Read-only ``(2, n)`` array: ``sin(omega*t)`` and ``cos(omega*t)``, ``t = k / fs``.
+
+    When ``n`` spans at least two whole-cycle periods only one period is
+    evaluated and tiled (the values repeat exactly; the tiled table is, if
+    anything, more accurate than ``omega*t`` at large ``t``).
+    """
+    def build() -> np.ndarray:
+        omega = 2.0 * np.pi * frequency
+        q = _cycle_period(sample_rate, frequency)
+        m = q if 0 < q <= n // 2 else n
+        theta = omega * (np.arange(m) / sample_rate)
+        period = np.vstack((np.sin(theta), np.cos(theta)))
+        if m == n:
+            return period
+        reps = -(-n // m)
+        return np.tile(period, (1, reps))[:, :n].copy()
+    return _REFERENCE_CACHE.get((float(sample_rate), float(frequency), int(n)), build)
+
+
+def _butter_sos(sample_rate: float, bandwidth: float) -> np.ndarray:
+    """4th-order Butterworth low-pass SOS at ``bandwidth`` Hz (cached design).
+
+    Returns a private copy: scipy's ``sosfilt`` wants a writeable array and
+    the copy of a (2, 6) array is nothing next to ``butter``.
+    """
+    return _SOS_CACHE.get(
+        (float(sample_rate), float(bandwidth)),
+        lambda: butter(N=4, Wn=bandwidth / (sample_rate / 2.0), btype="low", output="sos"),
+    ).copy()
+
+
+# Taps per polyphase branch of the decimating FIR. With a Kaiser(7) window
+# 12 * q taps are flat (< 0.01 dB) to 0.33 * output rate and below -75 dB
+# from 0.8 * output rate on; at the default 4x bandwidth output rate the f
+# product of a DC offset sits at 1.25x and 2f at 2.5x (-100 dB and below).
+_DECIMATION_FIR_PHASES = 12
+_DECIMATION_FIR_BETA = 7.0
+
+
+def _decimation_fir(q: int) -> np.ndarray:
+    """Anti-alias FIR for decimation by ``q``, as ``(phases, q)`` polyphase rows.
+
+    Low-pass at the output Nyquist (``fs / (2 * q)``), unit DC gain,
+    symmetric -- so the filter is linear-phase with a delay of
+    ``(phases * q - 1) / 2`` input samples, which the decimated time axis
+    absorbs instead of the data.
+    """
+    return _SOS_CACHE.get(
+        ("fir", int(q)),
+        lambda: firwin(
+            _DECIMATION_FIR_PHASES * q, 1.0 / q, window=("kaiser", _DECIMATION_FIR_BETA)
+        ).reshape(_DECIMATION_FIR_PHASES, q),
+    )
+
+
 @dataclass(frozen=True)
 class ModulationParams:
     """AC modulation parameters loaded from settings.json."""
@@ -70,11 +187,33 @@ class ModulationParams:
     # command at higher f_mod). Off by default -- needs bench confirmation of
     # the phase-lag magnitude before becoming the default.
     use_measured_reference: bool = False
+    # Rate (Hz) of the lock-in amplitude / phase outputs. 0 keeps them per AI
+    # sample in the ``data`` columns; > 0 writes them decimated (see
+    # lockin_decimation) with their own time axis to the ``lockin`` group.
+    lockin_output_rate: float = 0.0
+    # IsoMode short-time FFT (fft_demodulate_frames): frame length and hop in
+    # modulation periods. 0 frame cycles skips it; 0 hop = back-to-back frames.
+    fft_frame_cycles: float = 0.0
+    fft_hop_cycles: float = 0.0
+    # Extra ``(frequency Hz, amplitude V peak)`` tones driven on top of the
+    # primary one, so one iso hold measures C_p at several frequencies
+    # (fft_demodulate_tones). IsoMode snaps them to bins of its AO buffer.
+    tones: Tuple[Tuple[float, float], ...] = ()
+    # IsoMode: when the primary frequency has no whole-cycle AO buffer of at
+    # most one second, move it to the nearest one that has (instead of
+    # replaying a buffer that wraps with a phase jump).
+    snap_frequency: bool = False
 
     @property
     def enabled(self) -> bool:
-        """``True`` if either amplitude or offset is non-zero."""
-        return self.amplitude > 0.0 or self.offset != 0.0
+        """``True`` if any tone amplitude or the offset is non-zero."""
+        return bool(self.all_tones) or self.offset != 0.0
+
+    @property
+    def all_tones(self) -> Tuple[Tuple[float, float], ...]:
+        """Every driven ``(frequency, amplitude)``: the primary tone, then :attr:`tones`."""
+        primary = ((self.frequency, self.amplitude),) if self.amplitude > 0.0 else ()
+        return primary + tuple((f, a) for f, a in self.tones if a > 0.0)
 
     @property
     def lockin_capable(self) -> bool:
@@ -82,9 +221,7 @@ class ModulationParams:
         return self.amplitude > 0.0 and self.frequency > 0.0
 
     def with_amplitude(self, amplitude: float) -> "ModulationParams":
-        return ModulationParams(
-            self.frequency, amplitude, self.offset, self.use_measured_reference
-        )
+        return replace(self, amplitude=amplitude)
 
 
 # ---------------------------------------------------------------------------
@@ -109,7 +246,8 @@ def apply_modulation(
     Returns
     -------
     np.ndarray
-        Modulated voltage profile, ``base_voltage + offset + A * sin(2*pi*f*t)``.
+        Modulated voltage profile, ``base_voltage + offset + A * sin(2*pi*f*t)``
+        (summed over :attr:`ModulationParams.all_tones` for a multi-tone drive).
     """
     time_s = np.asarray(time_s, dtype=float)
     base_voltage = np.asarray(base_voltage, dtype=float)
@@ -119,8 +257,94 @@ def apply_modulation(
     if not params.enabled:
         return base_voltage.copy()
 
-    ac = params.amplitude * np.sin(2.0 * np.pi * params.frequency * time_s)
-    return base_voltage + params.offset + ac
+    out = base_voltage + params.offset
+    for frequency, amplitude in params.all_tones:
+        out = out + amplitude * np.sin(2.0 * np.pi * frequency * time_s)
+    return out
+
+
+def align_tones(
+    frequencies: Iterable[float], sample_rate: float, buffer_samples: int
+) -> Tuple[float, ...]:
+    """Snap each frequency to the nearest bin ``k * sample_rate / buffer_samples``.
+
+    A tone on a bin of the AO buffer completes a whole number of cycles in
+    it, so it wraps seamlessly under CONTINUOUS replay (the multi-tone form of
+    :func:`check_ao_period_integrity`) and lands on a single FFT bin of any
+    capture that is a multiple of the buffer. Raises ``ValueError`` when a
+    tone would snap to DC / Nyquist or onto another tone's bin.
+    """
+    if sample_rate <= 0 or buffer_samples <= 0:
+        raise ValueError("sample_rate and buffer_samples must be positive")
+    resolution = sample_rate / buffer_samples
+    bins: list[int] = []
+    for frequency in frequencies:
+        k = int(round(frequency / resolution))
+        if k < 1 or 2 * k >= buffer_samples:
+            raise ValueError(
+                f"tone {frequency} Hz has no bin strictly between DC and Nyquist "
+                f"of a {buffer_samples}-sample buffer at {sample_rate} Hz"
+            )
+        if k in bins:
+            raise ValueError(
+                f"tone {frequency} Hz shares bin {k} ({k * resolution} Hz) with another tone"
+            )
+        bins.append(k)
+    return tuple(k * sample_rate / buffer_samples for k in bins)
+
+
+def seamless_buffer_length(
+    sample_rate: float,
+    frequency: float,
+    max_samples: int,
+    tones: Iterable[float] = (),
+    snap: bool = False,
+) -> Tuple[int, float]:
+    """Shortest AO buffer that wraps seamlessly: ``(samples, frequency)``.
+
+    With ``f / fs = p / q`` in lowest terms, ``q`` samples hold exactly ``p``
+    cycles of the primary tone, so a CONTINUOUS replay of a ``q``-sample
+    buffer has no phase jump at the wrap (the same reduced fraction behind
+    :func:`_integer_cycle_length`): 37.5 Hz at 20 kHz needs 1600 samples,
+    not a one-second buffer that wraps half a cycle off.
+
+    ``q`` is capped at ``max_samples``. A primary whose ``q`` is larger (an
+    "irrational" ratio such as 37.3 Hz at 20 kHz, ``q = 200000``) gets the
+    full ``max_samples`` buffer and its wrap error -- or, with ``snap``, is
+    moved to the nearest frequency that does fit: the closest ``p' / q'``
+    with ``q' <= max_samples`` (the returned frequency then differs from the
+    requested one).
+
+    Each extra tone in ``tones`` stretches the buffer to the common period
+    (``lcm`` of the ``q``) while that still fits; when one does not, the
+    buffer becomes the largest multiple of the period so far, which gives
+    :func:`align_tones` the finest bin grid to snap the remaining tones to.
+    """
+    if sample_rate <= 0 or max_samples < 1:
+        raise ValueError("sample_rate and max_samples must be positive")
+    if frequency <= 0 or 2 * frequency >= sample_rate:
+        raise ValueError(
+            f"frequency must be strictly between 0 and Nyquist ({sample_rate / 2} Hz), "
+            f"got {frequency}"
+        )
+    n = _cycle_period(sample_rate, frequency)
+    if n > max_samples:
+        if not snap:
+            return int(max_samples), float(frequency)
+        rate = Fraction(sample_rate).limit_denominator(10**6)
+        ratio = (Fraction(frequency).limit_denominator(10**6) / rate).limit_denominator(
+            max_samples
+        )
+        if ratio == 0:
+            ratio = Fraction(1, max_samples)
+        n, frequency = ratio.denominator, float(ratio * rate)
+    for tone in tones:
+        common = math.lcm(n, _cycle_period(sample_rate, tone))
+        if common > max_samples:
+            n *= max_samples // n
+            break
+        n = common
+    return int(n), float(frequency)
 
 
 # ---------------------------------------------------------------------------
@@ -139,11 +363,12 @@ def reference_phase(
     """
     reference = np.asarray(reference, dtype=float)
     n = reference.size
-    t = np.arange(n) / sample_rate
-    omega = 2.0 * np.pi * frequency
+    if n == 0:
+        return 0.0
+    sin_ref, cos_ref = _reference_table(sample_rate, frequency, n)
     ref_c = reference - reference.mean()
-    i_ref = float(np.sum(ref_c * np.sin(omega * t)))
-    q_ref = float(np.sum(ref_c * np.cos(omega * t)))
+    i_ref = float(ref_c @ sin_ref)
+    q_ref = float(ref_c @ cos_ref)
     if i_ref == 0.0 and q_ref == 0.0:
         return 0.0
     return float(-np.arctan2(q_ref, i_ref))
@@ -168,7 +393,11 @@ def lockin_demodulate(
     Parameters
     ----------
     signal
-        AI samples.
+        AI samples: 1-D, or 2-D ``(samples, channels)`` to demodulate every
+        column in one pass -- the sin/cos references and the SOS are built
+        once and all I/Q columns go through a single ``sosfiltfilt`` call, so
+        e.g. heater current, Umod, Utpl and heater voltage cost one batched
+        filter rather than four calls that each rebuild everything.
     sample_rate
         Sampling rate of ``signal`` in Hz.
     frequency
@@ -190,7 +419,7 @@ def lockin_demodulate(
         whole mask is ``False`` -- i.e. no sample is trustworthy.
     reference
         Optional measured reference (e.g. AI ch0, the heater-current proxy),
-        same length as ``signal``. When given, the reported phase is referenced
+        1-D with one sample per row of ``signal``. When given, the reported phase is referenced
         to this signal's fundamental instead of the synthetic ``sin(omega*t)``
         (P1-34): ``phase -> phase - reference_phase(reference)``. The amplitude
         is unchanged (the reference contributes phase only, matching Bondar's
@@ -201,12 +430,14 @@ def lockin_demodulate(
     -------
     (amplitude, phase) or (amplitude, phase, valid)
         ``amplitude`` is the AC amplitude of ``signal`` at ``frequency`` (same
-        units as ``signal``); ``phase`` is the phase lag in radians. ``valid``
-        is returned only when ``return_valid=True``.
+        units as ``signal``); ``phase`` is the phase lag in radians. Both have
+        the shape of ``signal`` (per-channel columns for 2-D input). ``valid``
+        is 1-D (one flag per sample, shared by all channels) and is returned
+        only when ``return_valid=True``.
     """
     signal = np.asarray(signal, dtype=float)
-    if signal.ndim != 1:
-        raise ValueError("signal must be 1-D")
+    if signal.ndim not in (1, 2):
+        raise ValueError("signal must be 1-D or 2-D (samples, channels)")
     if sample_rate <= 0:
         raise ValueError("sample_rate must be positive")
     if frequency <= 0:
@@ -219,38 +450,37 @@ def lockin_demodulate(
         raise ValueError("bandwidth must be below Nyquist")
     if reference is not None:
         reference = np.asarray(reference, dtype=float)
-        if reference.shape != signal.shape:
-            raise ValueError("reference must have the same shape as signal")
-
-    n = signal.size
-    t = np.arange(n) / sample_rate
-    omega = 2.0 * np.pi * frequency
-    sin_ref = np.sin(omega * t)
-    cos_ref = np.cos(omega * t)
-
-    in_phase = signal * sin_ref
-    quadrature = signal * cos_ref
-
-    if _HAVE_SCIPY:
+        if reference.shape != signal.shape[:1]:
+            raise ValueError("reference must have one sample per row of signal")
+
+    n = signal.shape[0]
+    x = signal.reshape(n, -1).T  # (channels, samples); a view
+    n_ch = x.shape[0]
+    sin_ref, cos_ref = _reference_table(sample_rate, frequency, n)
+
+    # I rows then Q rows of every channel, channel-major so each row is
+    # contiguous for the filter and the element-wise math: one filter call
+    # covers all of them.
+    iq = np.empty((2 * n_ch, n))
+    np.multiply(x, sin_ref, out=iq[:n_ch])
+    np.multiply(x, cos_ref, out=iq[n_ch:])
+
+    if _HAVE_SCIPY and n > 4 * 4 * 3:  # ≥ 4*order*3
         # 4th-order Butterworth low-pass, applied with sosfiltfilt for zero
         # phase-lag. This is what bench-top lock-in amplifiers do.
-        sos = butter(N=4, Wn=bandwidth / (sample_rate / 2.0), btype="low", output="sos")
         # ``sosfiltfilt`` has a minimum signal-length requirement; for tiny
-        # signals fall back to the moving-average path.
-        if signal.size > 4 * 4 * 3:  # ≥ 4*order*3
-            in_phase_lp = sosfiltfilt(sos, in_phase)
-            quadrature_lp = sosfiltfilt(sos, quadrature)
-        else:
-            in_phase_lp, quadrature_lp = _moving_average_demod(in_phase, quadrature, sample_rate, frequency, bandwidth)
+        # signals (or without scipy) fall back to the moving-average path.
+        iq_lp = sosfiltfilt(_butter_sos(sample_rate, bandwidth), iq, axis=-1)
     else:
-        in_phase_lp, quadrature_lp = _moving_average_demod(in_phase, quadrature, sample_rate, frequency, bandwidth)
+        iq_lp = _moving_average_lowpass(iq, sample_rate, frequency, bandwidth)
+    in_phase_lp, quadrature_lp = iq_lp[:n_ch], iq_lp[n_ch:]
 
     # Lock-in convention: signal = A * sin(omega*t - phi), phi = phase lag.
     # I_lp = A/2 * cos(phi); Q_lp = -A/2 * sin(phi). The phase lag is therefore
     # ``-arctan2(Q, I)`` so that a positive value means the signal trails the
     # reference (which is what physicists expect).
-    amplitude = 2.0 * np.sqrt(in_phase_lp**2 + quadrature_lp**2)
-    phase = -np.arctan2(quadrature_lp, in_phase_lp)
+    amplitude = (2.0 * np.sqrt(in_phase_lp**2 + quadrature_lp**2)).T.reshape(signal.shape)
+    phase = (-np.arctan2(quadrature_lp, in_phase_lp)).T.reshape(signal.shape)
     if reference is not None:
         # P1-34: re-reference the phase zero to the measured driving current.
         # Rotating the reference by phi_ref rotates (I, Q) by a constant angle
@@ -271,13 +501,410 @@ def lockin_demodulate(
     return amplitude, phase, valid
 
 
-def _moving_average_demod(in_phase, quadrature, sample_rate, frequency, bandwidth):
-    """Fallback low-pass when scipy is not available."""
+# Below this many samples lockin_demodulate takes the moving-average path
+# instead of sosfiltfilt (``signal.size > 4 * 4 * 3``).
+_SOSFILTFILT_MIN_SAMPLES = 4 * 4 * 3
+# BlockLockIn look-ahead, in periods of the low-pass cut-off. The slowest pole
+# of the 4th-order Butterworth decays as exp(-2*pi*sin(pi/8)*bandwidth*t), so
+# 8 cut-off periods leave ~exp(-19) ~ 5e-9 of a mis-started backward state.
+_BLOCK_MARGIN_BANDWIDTH_PERIODS = 8.0
+# Longest whole-cycle period BlockLockIn gathers its references from (one
+# cached table); beyond it sin/cos are evaluated per sample.
+_BLOCK_TABLE_MAX_PERIOD = 1 << 16
+
+
+class BlockLockIn:
+    """Zero-phase lock-in over a signal delivered in blocks, bounded memory.
+
+    Feeds :func:`lockin_demodulate`'s estimator (sin/cos products, 4th-order
+    Butterworth applied forward and backward) incrementally, for signals too
+    long to hold whole -- the ``temp-hr`` column of a week-long recording:
+
+    * the **forward** pass carries its ``sosfilt`` state across blocks and
+      starts from the same odd extension and steady-state ``zi`` as
+      ``sosfiltfilt``, so it is exact;
+    * the **backward** pass runs per :meth:`push` over the forward output still
+      pending, started from the steady-state ``zi`` at its newest sample, and
+      releases all but the last ``margin`` samples (overlap-save); the true
+      future the backward filter has not seen only reaches those through a
+      decay of ``exp(-2*pi*sin(pi/8)*bandwidth*margin/sample_rate)``;
+    * :meth:`finish` appends the end odd extension and runs the final backward
+      pass exactly as ``sosfiltfilt`` does.
+
+    With the default margin (8 low-pass periods) every output matches the
+    whole-signal ``lockin_demodulate(..., return_valid=True)`` to ~1e-8 of the
+    modulation amplitude; the head and the tail are bit-for-bit the same
+    filter arithmetic. Outputs lag the input by at most ``margin + block``
+    samples; memory is O(block + margin). Signals that end before reaching
+    ``sosfiltfilt``'s minimum length fall back to the moving-average low-pass
+    (as ``lockin_demodulate`` does). The measured-reference option (P1-34) is
+    whole-signal and not offered here.
+
+    ``decimate`` = ``q`` > 1 emits one output per ``q`` input samples, at
+    :attr:`output_rate` = ``sample_rate / q``. The I/Q products go through a
+    linear-phase polyphase FIR (low-pass at the output Nyquist, carried across
+    blocks) *before* the Butterworth, so the zero-phase low-pass -- designed
+    at the output rate -- runs on ``q`` times fewer samples. The FIR needs
+    ``12 * q`` inputs per output and consumes no padding, so the first output
+    sits ``(12 * q - 1) / 2`` input samples in; :meth:`output_times` gives
+    each output's time on the input's ``k / sample_rate`` axis. ``margin``
+    and the ``valid`` edges are counted in outputs.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float,
+        frequency: float,
+        bandwidth: float | None = None,
+        settle_periods: float = 10.0,
+        margin: int | None = None,
+        decimate: int = 1,
+    ) -> None:
+        if not _HAVE_SCIPY:  # pragma: no cover - scipy should always be present
+            raise RuntimeError("BlockLockIn needs scipy.signal")
+        if sample_rate <= 0:
+            raise ValueError("sample_rate must be positive")
+        if frequency <= 0:
+            raise ValueError("frequency must be positive")
+        if int(decimate) < 1:
+            raise ValueError("decimate must be a positive integer")
+        self.decimate = int(decimate)
+        self.output_rate = float(sample_rate) / self.decimate
+        if bandwidth is None:
+            bandwidth = frequency / 5.0
+        if bandwidth <= 0 or bandwidth >= self.output_rate / 2.0:
+            raise ValueError("bandwidth must be positive and below Nyquist")
+        self.sample_rate = float(sample_rate)
+        self.frequency = float(frequency)
+        self.bandwidth = float(bandwidth)
+        self._settle_periods = float(settle_periods)
+        self._omega = 2.0 * np.pi * self.frequency
+        self._sos = _butter_sos(self.output_rate, self.bandwidth)
+        n_sections = self._sos.shape[0]
+        # sosfiltfilt's default odd-extension length (3 * ntaps).
+        ntaps = 2 * n_sections + 1 - min(
+            int((self._sos[:, 2] == 0).sum()), int((self._sos[:, 5] == 0).sum())
+        )
+        self._edge = 3 * ntaps
+        self._zi = sosfilt_zi(self._sos)[:, None, :]  # (sections, 1, 2) -> broadcast over I/Q
+        if self.decimate > 1:
+            self._fir: np.ndarray | None = _decimation_fir(self.decimate)
+            self._centre = (self._fir.size - 1) / 2.0
+        else:
+            self._fir, self._centre = None, 0.0
+        self._fir_carry = np.empty((2, 0))  # products not yet consumed by the FIR
+        self._settle = int(np.ceil(self._settle_periods * self.output_rate / self.frequency))
+        default_margin = int(np.ceil(
+            _BLOCK_MARGIN_BANDWIDTH_PERIODS * self.output_rate / self.bandwidth
+        ))
+        # Near the output Nyquist (decimated) the bilinear design's slowest
+        # pole decays slower than the analogue estimate: reach the same
+        # exp(-19) from the actual pole radius.
+        radius = max(float(np.abs(np.roots(sec[3:])).max()) for sec in self._sos)
+        if 0.0 < radius < 1.0:
+            default_margin = max(default_margin, int(np.ceil(-19.0 / np.log(radius))))
+        # The margin also covers the end-of-signal invalid edge, so samples
+        # released before finish() never need their end-side valid flag.
+        self.margin = max(int(margin if margin is not None else default_margin), self._settle, 1)
+        self._head: list[np.ndarray] = []  # I/Q until sosfiltfilt length
+        self._head_rows = 0
+        self._received = 0                 # raw samples pushed so far
+        self._produced = 0                 # I/Q samples at the output rate so far
+        self._emitted = 0                  # outputs released so far
+        self._zf: np.ndarray | None = None
+        self._pending = np.empty((2, 0))   # forward-filtered I/Q not yet released
+        self._tail = np.empty((2, 0))      # last edge+1 I/Q products (end extension)
+
+    @property
+    def started(self) -> bool:
+        return self._zf is not None
+
+    def output_times(self, start: int, count: int) -> np.ndarray:
+        """Times (s) of outputs ``start .. start + count``, origin at input sample 0."""
+        k = np.arange(start, start + count, dtype=float)
+        return (k * self.decimate + self._centre) / self.sample_rate
+
+    def push(self, block: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Add samples; return ``(amplitude, phase, valid)`` now final (maybe empty)."""
+        x = np.asarray(block, dtype=float).ravel()
+        if x.size == 0:
+            return self._empty()
+        iq = self._products(x, self._received)
+        self._received += x.size
+        if self._fir is not None:
+            iq = self._decimate(iq)
+            if iq.shape[1] == 0:
+                return self._empty()
+        self._produced += iq.shape[1]
+        if not self.started:
+            self._head.append(iq)
+            self._head_rows += iq.shape[1]
+            if self._head_rows <= max(_SOSFILTFILT_MIN_SAMPLES, self._edge):
+                return self._empty()
+            iq = np.concatenate(self._head, axis=1)
+            self._head, self._head_rows = [], 0
+            front = 2.0 * iq[:, :1] - iq[:, self._edge:0:-1]
+            _, self._zf = sosfilt(self._sos, front, axis=-1, zi=self._zi * front[:, :1])
+        y, self._zf = sosfilt(self._sos, iq, axis=-1, zi=self._zf)
+        self._pending = np.concatenate((self._pending, y), axis=1)
+        self._tail = np.concatenate((self._tail, iq), axis=1)[:, -(self._edge + 1):]
+        release = self._pending.shape[1] - self.margin
+        if release <= 0:
+            return self._empty()
+        back = self._backward(self._pending)
+        self._pending = self._pending[:, release:]
+        return self._outputs(back[:, :release], end=None)
+
+    def finish(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Flush the remaining samples with ``sosfiltfilt``'s end handling."""
+        if not self.started:
+            if self._head_rows == 0:
+                return self._empty()
+            iq = np.concatenate(self._head, axis=1)
+            self._head, self._head_rows = [], 0
+            # Too short for sosfiltfilt: lockin_demodulate's fallback low-pass.
+            iq_lp = _moving_average_lowpass(
+                iq, self.output_rate, self.frequency, self.bandwidth
+            )
+            return self._outputs(iq_lp, end=self._produced)
+        tail = self._tail
+        back_ext = 2.0 * tail[:, -1:] - tail[:, -2:-(self._edge + 2):-1]
+        y_ext, _ = sosfilt(self._sos, back_ext, axis=-1, zi=self._zf)
+        pending = np.concatenate((self._pending, y_ext), axis=1)
+        back = self._backward(pending)[:, :-self._edge]
+        self._pending = np.empty((2, 0))
+        return self._outputs(back, end=self._produced)
+
+    # -- internals -----------------------------------------------------
+    def _products(self, x: np.ndarray, start: int) -> np.ndarray:
+        # Same time axis as the whole-signal path: index / rate, not a running phase.
+        q = _cycle_period(self.sample_rate, self.frequency)
+        if 0 < q <= _BLOCK_TABLE_MAX_PERIOD:
+            # Whole-cycle period: gather from the cached one-period table
+            # (what lockin_demodulate tiles) instead of sin/cos per sample.
+            table = _reference_table(self.sample_rate, self.frequency, q)
+            ref = table.take(np.arange(start, start + x.size) % q, axis=1)
+            ref *= x
+            return ref
+        t = np.arange(start, start + x.size) / self.sample_rate
+        return np.vstack((x * np.sin(self._omega * t), x * np.cos(self._omega * t)))
+
+    def _decimate(self, iq: np.ndarray) -> np.ndarray:
+        """Polyphase FIR + keep every ``q``-th: output ``k`` = ``sum_j h[j] iq[k*q + j]``."""
+        assert self._fir is not None
+        phases, q = self._fir.shape
+        buf = np.concatenate((self._fir_carry, iq), axis=1) if self._fir_carry.size else iq
+        blocks = buf.shape[1] // q
+        count = blocks - phases + 1
+        if count <= 0:
+            self._fir_carry = buf
+            return np.empty((2, 0))
+        rows = buf[:, :blocks * q].reshape(2, blocks, q)
+        out = rows[:, :count] @ self._fir[0]
+        for i in range(1, phases):
+            out += rows[:, i:i + count] @ self._fir[i]
+        self._fir_carry = buf[:, count * q:]
+        return out
+
+    def _backward(self, y: np.ndarray) -> np.ndarray:
+        rev, _ = sosfilt(self._sos, y[:, ::-1], axis=-1, zi=self._zi * y[:, -1:])
+        return rev[:, ::-1]
+
+    def _outputs(
+        self, iq_lp: np.ndarray, end: int | None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        i_lp, q_lp = iq_lp[0], iq_lp[1]
+        amplitude = 2.0 * np.sqrt(i_lp ** 2 + q_lp ** 2)
+        phase = -np.arctan2(q_lp, i_lp)
+        idx = np.arange(self._emitted, self._emitted + i_lp.size)
+        valid = idx >= self._settle
+        if end is not None and self._settle > 0:
+            valid &= idx < end - self._settle
+        self._emitted += i_lp.size
+        return amplitude, phase, valid
+
+    @staticmethod
+    def _empty() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return np.empty(0), np.empty(0), np.empty(0, dtype=bool)
+
+
+def lockin_decimation(
+    sample_rate: float,
+    frequency: float,
+    output_rate: float,
+    bandwidth: float | None = None,
+) -> int:
+    """Decimation factor for lock-in outputs at about ``output_rate`` Hz.
+
+    ``q = floor(sample_rate / output_rate)``, so the achieved rate
+    ``sample_rate / q`` is at or just above the request. It is capped so the
+    output rate stays above 2.5x the low-pass ``bandwidth`` (default
+    ``frequency / 5``): the Butterworth must be designable below the output
+    Nyquist with room for the FIR's transition band. ``output_rate <= 0``
+    means no decimation (``1``).
+    """
+    if output_rate <= 0 or sample_rate <= 0 or frequency <= 0:
+        return 1
+    if bandwidth is None:
+        bandwidth = frequency / 5.0
+    q = int(sample_rate // output_rate)
+    q_max = int(sample_rate // (2.5 * bandwidth))
+    return max(1, min(q, q_max))
+
+
+def lockin_demodulate_decimated(
+    signal: np.ndarray,
+    sample_rate: float,
+    frequency: float,
+    output_rate: float,
+    bandwidth: float | None = None,
+    settle_periods: float = 10.0,
+    reference: np.ndarray | None = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """:func:`lockin_demodulate` with outputs at ``output_rate`` instead of per sample.
+
+    The per-sample amplitude / phase traces are oversampled by
+    ``sample_rate / (4 * bandwidth)`` or so -- ~70x at 2 kHz and 37.5 Hz.
+    Here the I/Q products are FIR-decimated by
+    :func:`lockin_decimation` ``(sample_rate, frequency, output_rate)`` before
+    the zero-phase Butterworth (see :class:`BlockLockIn` ``decimate``), so the
+    filter also runs at the low rate. A stationary tone reads the same
+    amplitude and phase as the full-rate path; envelope changes within the
+    bandwidth agree to the difference of the two Butterworth designs.
+
+    ``signal`` is 1-D. ``reference`` (P1-34) re-references the phase as in
+    :func:`lockin_demodulate`. Returns ``(time, amplitude, phase, valid)``:
+    ``time`` in seconds on the input's ``k / sample_rate`` axis, ``valid``
+    False over ``settle_periods`` at each edge. A signal shorter than the FIR
+    (``12 * q`` samples) yields empty arrays.
+    """
+    signal = np.asarray(signal, dtype=float)
+    if signal.ndim != 1:
+        raise ValueError("signal must be 1-D")
+    q = lockin_decimation(sample_rate, frequency, output_rate, bandwidth)
+    lockin = BlockLockIn(
+        sample_rate, frequency, bandwidth=bandwidth,
+        settle_periods=settle_periods, decimate=q,
+    )
+    parts = [lockin.push(signal), lockin.finish()]
+    amplitude = np.concatenate([p[0] for p in parts])
+    phase = np.concatenate([p[1] for p in parts])
+    valid = np.concatenate([p[2] for p in parts])
+    if reference is not None:
+        reference = np.asarray(reference, dtype=float)
+        if reference.shape != signal.shape:
+            raise ValueError("reference must have one sample per row of signal")
+        phi_ref = reference_phase(reference, sample_rate, frequency)
+        phase = (phase - phi_ref + np.pi) % (2.0 * np.pi) - np.pi
+    return lockin.output_times(0, amplitude.size), amplitude, phase, valid
+
+
+class StreamingLockIn:
+    """Causal lock-in over an open-ended stream (live amplitude / phase traces).
+
+    :func:`lockin_demodulate` and :class:`BlockLockIn` are zero-phase and so
+    need the future of every sample; a live C_p trace during a slow ramp or
+    an iso hold cannot wait for it. This demodulator runs the same estimator
+    (sin/cos products, 4th-order Butterworth at ``bandwidth``) **forward
+    only**:
+
+    * the reference phase is carried across chunks (reduced modulo 2*pi per
+      chunk, so hours of streaming lose no precision) -- chunk boundaries are
+      invisible;
+    * the ``sosfilt`` state is carried across chunks, started from rest;
+    * chunks may have any size, including empty (``read_new`` between ring
+      writes) -- the outputs are identical to one :meth:`push` of the
+      concatenated signal;
+    * each :meth:`push` returns ``(amplitude, phase, valid)`` for exactly the
+      samples pushed, at O(chunk) cost.
+
+    The price of causality is a delay: the amplitude / phase *envelope* lags
+    the input by the low-pass group delay, :attr:`delay_samples` (about
+    ``2.61 / (2*pi*bandwidth)`` seconds at DC for the 4th-order Butterworth).
+    Output ``k`` describes the signal around input sample
+    ``k - delay_samples``; a stationary tone reads the same amplitude and
+    phase as the zero-phase path once settled. ``valid`` is False for the
+    first ``settle_periods`` modulation periods (the filter starting from
+    rest), like the leading edge of ``lockin_demodulate``'s mask. Same phase
+    convention as :func:`lockin_demodulate`; the measured-reference option
+    (P1-34) is whole-signal and not offered here.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float,
+        frequency: float,
+        bandwidth: float | None = None,
+        settle_periods: float = 10.0,
+    ) -> None:
+        if not _HAVE_SCIPY:  # pragma: no cover - scipy should always be present
+            raise RuntimeError("StreamingLockIn needs scipy.signal")
+        if sample_rate <= 0:
+            raise ValueError("sample_rate must be positive")
+        if frequency <= 0:
+            raise ValueError("frequency must be positive")
+        if bandwidth is None:
+            bandwidth = frequency / 5.0
+        if bandwidth <= 0 or bandwidth >= sample_rate / 2.0:
+            raise ValueError("bandwidth must be positive and below Nyquist")
+        self.sample_rate = float(sample_rate)
+        self.frequency = float(frequency)
+        self.bandwidth = float(bandwidth)
+        self._step = 2.0 * np.pi * self.frequency / self.sample_rate
+        self._sos = _butter_sos(self.sample_rate, self.bandwidth)
+        # DC group delay of the cascade = sum over its biquads; for one
+        # B(z)/A(z) at z=1 it is sum(k*b_k)/sum(b_k) - sum(k*a_k)/sum(a_k).
+        # Closed form per section stays well conditioned at low cut-offs.
+        k = np.arange(3)
+        self.delay_samples = float(sum(
+            sec[:3] @ k / sec[:3].sum() - sec[3:] @ k / sec[3:].sum() for sec in self._sos
+        ))
+        self._settle = int(np.ceil(settle_periods * self.sample_rate / self.frequency))
+        self.reset()
+
+    @property
+    def delay_seconds(self) -> float:
+        """Group delay of the amplitude / phase envelope, in seconds."""
+        return self.delay_samples / self.sample_rate
+
+    @property
+    def samples(self) -> int:
+        """Samples pushed since construction / :meth:`reset`."""
+        return self._received
+
+    def reset(self) -> None:
+        """Restart from rest at phase zero (e.g. after a gap in the stream)."""
+        self._zf = np.zeros((self._sos.shape[0], 2, 2))  # (sections, I/Q, 2)
+        self._phase = 0.0
+        self._received = 0
+
+    def push(self, chunk: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Demodulate the next ``chunk`` of the stream -> ``(amplitude, phase, valid)``."""
+        x = np.asarray(chunk, dtype=float).ravel()
+        n = x.size
+        if n == 0:
+            return BlockLockIn._empty()
+        theta = self._phase + self._step * np.arange(n)
+        iq = np.empty((2, n))
+        np.multiply(x, np.sin(theta), out=iq[0])
+        np.multiply(x, np.cos(theta), out=iq[1])
+        iq_lp, self._zf = sosfilt(self._sos, iq, axis=-1, zi=self._zf)
+        self._phase = (self._phase + self._step * n) % (2.0 * np.pi)
+        i_lp, q_lp = iq_lp[0], iq_lp[1]
+        amplitude = 2.0 * np.hypot(i_lp, q_lp)
+        phase = -np.arctan2(q_lp, i_lp)
+        valid = np.arange(self._received, self._received + n) >= self._settle
+        self._received += n
+        return amplitude, phase, valid
+
+
+def _moving_average_lowpass(rows, sample_rate, frequency, bandwidth):
+    """Fallback low-pass (no scipy / too short for ``sosfiltfilt``), per row."""
     samples_per_period = max(1, int(round(sample_rate / frequency)))
     win_len = max(samples_per_period, int(round(sample_rate / bandwidth)))
     win_len = max(samples_per_period, samples_per_period * round(win_len / samples_per_period))
     kernel = np.ones(win_len, dtype=float) / win_len
-    return _convolve_same(in_phase, kernel), _convolve_same(quadrature, kernel)
+    return np.apply_along_axis(_convolve_same, -1, rows, kernel)
 
 
 def _convolve_same(signal: np.ndarray, kernel: np.ndarray) -> np.ndarray:
@@ -330,6 +957,33 @@ class FFTDemodResult:
         raise KeyError("fundamental (1f) was not requested")
 
 
+@dataclass(frozen=True, eq=False)
+class FFTFrames:
+    """Output of :func:`fft_demodulate_frames`: one row per frame.
+
+    ``amplitude`` / ``phase`` are ``(frames, len(harmonics))`` with columns
+    in ``harmonics`` order; ``time`` is each frame's centre in seconds from
+    sample 0 of the input (plus ``start_index``). Compared by identity
+    (``eq=False``) so it can ride on ``DataFrame.attrs``.
+    """
+
+    time: np.ndarray
+    harmonics: Tuple[int, ...]
+    amplitude: np.ndarray
+    phase: np.ndarray
+    leakage: np.ndarray
+    frame_samples: int
+    hop_samples: int
+
+    def __len__(self) -> int:
+        return int(self.time.size)
+
+    def harmonic(self, h: int) -> Tuple[np.ndarray, np.ndarray]:
+        """``(amplitude, phase)`` series of harmonic ``h``."""
+        j = self.harmonics.index(h)
+        return self.amplitude[:, j], self.phase[:, j]
+
+
 def _integer_cycle_length(
     n_total: int, sample_rate: float, frequency: float
 ) -> int:
@@ -347,12 +1001,8 @@ def _integer_cycle_length(
         return 0
     # Express f / fs as a reduced fraction p/q. The smallest integer-cycle
     # window length is then ``q``; we round n_total down to the nearest
-    # multiple of q.
-    ratio = (
-        Fraction(frequency).limit_denominator(10**6)
-        / Fraction(sample_rate).limit_denominator(10**6)
-    )
-    q = ratio.denominator
+    # multiple of q. ``q`` is cached per (rate, frequency).
+    q = _cycle_period(sample_rate, frequency)
     if q == 0 or q > n_total:
         return int(n_total)
     return int((n_total // q) * q)
@@ -363,7 +1013,7 @@ def fft_demodulate(
     sample_rate: float,
     frequency: float,
     harmonics: Iterable[int] = (1, 2, 3),
-) -> FFTDemodResult:
+) -> FFTDemodResult | Tuple[FFTDemodResult, ...]:
     """FFT-based demodulator for stationary AC response (IsoMode).
 
     The function picks an integer-cycle window of the input, computes a real
@@ -375,8 +1025,10 @@ def fft_demodulate(
     Parameters
     ----------
     signal
-        AI samples (1-D). Should be long enough to contain at least one
-        modulation period at ``frequency``.
+        AI samples, 1-D or 2-D ``(samples, channels)``. Should be long enough
+        to contain at least one modulation period at ``frequency``. A 2-D
+        input goes through one batched ``rfft`` along the sample axis (one
+        window choice, one mean removal, one transform for all columns).
     sample_rate
         Sampling rate of ``signal`` in Hz.
     frequency
@@ -390,7 +1042,8 @@ def fft_demodulate(
     FFTDemodResult
         Per-harmonic ``(amplitude, phase)`` plus a leakage fraction
         diagnostic (fraction of total AC power *not* concentrated at the
-        requested harmonics).
+        requested harmonics). For 2-D input, a tuple with one result per
+        channel column.
 
     Notes
     -----
@@ -404,8 +1057,8 @@ def fft_demodulate(
     ``phi = -pi/2 - arg(X[k_f])`` (then wrapped to ``[-pi, pi]``).
     """
     signal = np.asarray(signal, dtype=float)
-    if signal.ndim != 1:
-        raise ValueError("signal must be 1-D")
+    if signal.ndim not in (1, 2):
+        raise ValueError("signal must be 1-D or 2-D (samples, channels)")
     if sample_rate <= 0:
         raise ValueError("sample_rate must be positive")
     if frequency <= 0:
@@ -413,71 +1066,567 @@ def fft_demodulate(
     if frequency >= sample_rate / 2.0:
         raise ValueError("frequency must be below Nyquist (sample_rate / 2)")
 
+    n_total = signal.shape[0]
     samples_per_period = sample_rate / frequency
-    if signal.size < int(np.ceil(samples_per_period)):
+    if n_total < int(np.ceil(samples_per_period)):
         raise ValueError(
             f"signal too short for one modulation period "
-            f"(have {signal.size} samples, need >= {int(np.ceil(samples_per_period))})"
+            f"(have {n_total} samples, need >= {int(np.ceil(samples_per_period))})"
         )
 
-    n = _integer_cycle_length(signal.size, sample_rate, frequency)
+    n = _integer_cycle_length(n_total, sample_rate, frequency)
     if n < int(np.ceil(samples_per_period)):
         # No integer-cycle slice fits in the signal; fall back to the whole
         # input. Leakage will be non-trivial but still a useful estimate.
-        n = signal.size
+        n = n_total
     # Use the *trailing* slice: in IsoMode the leading samples are the most
     # likely to contain a thermal start-up transient. We compensate for the
     # window offset below so the recovered phase still matches the lock-in
     # convention (referenced to sample 0 of the original input).
-    start_index = signal.size - n
-    s = signal[start_index:].astype(float, copy=True)
-    s -= s.mean()  # drop DC so the harmonic bins dominate the leakage metric
+    start_index = n_total - n
+    s = signal.reshape(n_total, -1)[start_index:].astype(float, copy=True)
+    s -= s.mean(axis=0)  # drop DC so the harmonic bins dominate the leakage metric
 
-    spectrum = np.fft.rfft(s)
+    spectrum = np.fft.rfft(s, axis=0)  # (bins, channels)
     cycles_in_window = int(round(n * frequency / sample_rate))
     # Phase shift to map "phi referenced to window start" back to
     # "phi referenced to original t=0". Each harmonic h experiences a shift
     # of ``h * omega * t_start``.
     omega_t_start = 2.0 * np.pi * frequency * start_index / sample_rate
 
-    harmonic_results = []
-    harmonic_power = 0.0
-    seen = set()
+    requested = []
     for h in harmonics:
         if h <= 0:
             raise ValueError(f"harmonic must be a positive integer, got {h}")
-        if h in seen:
-            continue
-        seen.add(h)
-        bin_idx = h * cycles_in_window
-        if bin_idx >= spectrum.size:
-            # h*f >= Nyquist -> aliased / unobservable. Report NaN.
-            harmonic_results.append(HarmonicAmplitude(h, float("nan"), float("nan")))
-            continue
-        x = spectrum[bin_idx]
-        amp = 2.0 * abs(x) / n
-        phase_window = -np.pi / 2.0 - np.angle(x)
-        phase = phase_window + h * omega_t_start
-        # wrap to (-pi, pi]
-        phase = (phase + np.pi) % (2 * np.pi) - np.pi
-        harmonic_results.append(HarmonicAmplitude(h, float(amp), float(phase)))
-        harmonic_power += float(abs(x)) ** 2
-
-    # Total AC power (DC bin already removed by mean-subtraction above).
-    # Parseval normalisation cancels out in the ratio.
-    total_power = float(np.sum(np.abs(spectrum) ** 2))
-    leakage = 1.0 - harmonic_power / total_power if total_power > 0 else 0.0
-    # Numerical guard: tiny negative values from float roundoff are rounded
-    # to 0; capping at 1.0 is defensive against pathological inputs.
-    leakage = float(min(max(leakage, 0.0), 1.0))
-
-    return FFTDemodResult(
-        harmonics=tuple(harmonic_results),
-        leakage_fraction=leakage,
-        window_samples=int(n),
+        if h not in requested:
+            requested.append(h)
+
+    # Total AC power per channel (DC bin already removed by mean-subtraction
+    # above). Parseval normalisation cancels out in the ratio.
+    total_power = np.sum(np.abs(spectrum) ** 2, axis=0)
+    results = []
+    for ch in range(spectrum.shape[1]):
+        harmonic_results = []
+        harmonic_power = 0.0
+        for h in requested:
+            bin_idx = h * cycles_in_window
+            if bin_idx >= spectrum.shape[0]:
+                # h*f >= Nyquist -> aliased / unobservable. Report NaN.
+                harmonic_results.append(HarmonicAmplitude(h, float("nan"), float("nan")))
+                continue
+            x = spectrum[bin_idx, ch]
+            amp = 2.0 * abs(x) / n
+            phase_window = -np.pi / 2.0 - np.angle(x)
+            phase = phase_window + h * omega_t_start
+            # wrap to (-pi, pi]
+            phase = (phase + np.pi) % (2 * np.pi) - np.pi
+            harmonic_results.append(HarmonicAmplitude(h, float(amp), float(phase)))
+            harmonic_power += float(abs(x)) ** 2
+
+        power = float(total_power[ch])
+        leakage = 1.0 - harmonic_power / power if power > 0 else 0.0
+        # Numerical guard: tiny negative values from float roundoff are rounded
+        # to 0; capping at 1.0 is defensive against pathological inputs.
+        leakage = float(min(max(leakage, 0.0), 1.0))
+        results.append(FFTDemodResult(
+            harmonics=tuple(harmonic_results),
+            leakage_fraction=leakage,
+            window_samples=int(n),
+        ))
+
+    return results[0] if signal.ndim == 1 else tuple(results)
+
+
+def _tone_layout(
+    n_total: int,
+    sample_rate: float,
+    frequencies: Iterable[float],
+    harmonics: Iterable[int],
+) -> Tuple[int, int, list, list]:
+    """Window and bins shared by :func:`fft_demodulate_tones` and :class:`ToneBins`.
+
+    Returns ``(n, start_index, tones, slots)``: the trailing window of ``n``
+    samples starting at ``start_index``, the tone frequencies, and per tone a
+    list of ``(harmonic, bin or None)`` (``None`` above Nyquist).
+    """
+    if sample_rate <= 0:
+        raise ValueError("sample_rate must be positive")
+    tones = [float(f) for f in frequencies]
+    if not tones:
+        raise ValueError("at least one frequency is required")
+    for f in tones:
+        if f <= 0 or f >= sample_rate / 2.0:
+            raise ValueError(f"frequency {f} Hz must be positive and below Nyquist")
+    requested: list[int] = []
+    for h in harmonics:
+        if int(h) <= 0:
+            raise ValueError(f"harmonic must be a positive integer, got {h}")
+        if int(h) not in requested:
+            requested.append(int(h))
+    longest = int(np.ceil(sample_rate / min(tones)))
+    if n_total < longest:
+        raise ValueError(
+            f"signal too short for one period of the lowest tone "
+            f"(have {n_total} samples, need >= {longest})"
+        )
+    # Whole cycles of every tone: a multiple of the lcm of their periods.
+    common = 1
+    for f in tones:
+        q = _cycle_period(sample_rate, f)
+        common = 0 if q == 0 or common == 0 else int(np.lcm(common, q))
+        if common > n_total:
+            common = 0
+    n = (n_total // common) * common if common else n_total
+    used: dict[int, Tuple[float, int]] = {}
+    slots = []
+    for f in tones:
+        row = []
+        for h in requested:
+            b = int(round(h * f * n / sample_rate))
+            if h * f >= sample_rate / 2.0 or b > n // 2:
+                row.append((h, None))
+                continue
+            if b in used:
+                other_f, other_h = used[b]
+                raise ValueError(f"{h}f of {f} Hz and {other_h}f of {other_f} Hz share FFT bin {b}")
+            used[b] = (f, h)
+            row.append((h, b))
+        slots.append(row)
+    return n, n_total - n, tones, slots
+
+
+def _tone_results(
+    bins: Callable[[int], complex],
+    n: int,
+    start_index: int,
+    sample_rate: float,
+    tones: list,
+    slots: list,
+    total_power: float,
+) -> Tuple[FFTDemodResult, ...]:
+    """Convert the ``(tone, harmonic)`` bins to :class:`FFTDemodResult` (see fft_demodulate)."""
+    kept = 0.0
+    out = []
+    for f, row in zip(tones, slots):
+        omega_t_start = 2.0 * np.pi * f * start_index / sample_rate
+        results = []
+        for h, b in row:
+            if b is None:
+                results.append(HarmonicAmplitude(h, float("nan"), float("nan")))
+                continue
+            x = bins(b)
+            kept += abs(x) ** 2
+            phase = -np.pi / 2.0 - np.angle(x) + h * omega_t_start
+            results.append(HarmonicAmplitude(
+                h, float(2.0 * abs(x) / n), float((phase + np.pi) % (2 * np.pi) - np.pi)
+            ))
+        out.append(results)
+    if total_power > 0:
+        leakage = float(min(max(1.0 - kept / total_power, 0.0), 1.0))
+    else:
+        leakage = 0.0
+    return tuple(
+        FFTDemodResult(harmonics=tuple(r), leakage_fraction=leakage, window_samples=int(n))
+        for r in out
+    )
+
+
+def fft_demodulate_tones(
+    signal: np.ndarray,
+    sample_rate: float,
+    frequencies: Iterable[float],
+    harmonics: Iterable[int] = (1,),
+) -> Tuple[FFTDemodResult, ...]:
+    """:func:`fft_demodulate` of several simultaneous tones from one ``rfft``.
+
+    The multi-tone drive (:attr:`ModulationParams.tones`) puts every
+    frequency of a sweep into one iso hold; this reads all of them, and the
+    requested harmonics of each, from a single transform. The window is the
+    trailing slice whose length is a whole number of cycles of *every* tone
+    (a multiple of the least common multiple of their integer-cycle periods),
+    so each ``(tone, harmonic)`` falls on its own bin; when no such slice fits
+    the whole input is used and some leakage is accepted.
+
+    Returns one :class:`FFTDemodResult` per tone, in ``frequencies`` order,
+    with the same amplitude / phase conventions as :func:`fft_demodulate`
+    (phase referenced to sample 0 of ``signal``). Their ``leakage_fraction``
+    is shared: the AC power outside *all* requested bins, so the other tones
+    do not count as leakage. Raises ``ValueError`` when two requested
+    ``(tone, harmonic)`` pairs fall on the same bin (e.g. 2f of one tone on
+    another tone) -- their responses could not be told apart.
+    """
+    signal = np.asarray(signal, dtype=float)
+    if signal.ndim != 1:
+        raise ValueError("signal must be 1-D")
+    n, start, tones, slots = _tone_layout(signal.size, sample_rate, frequencies, harmonics)
+    window = signal[start:] - signal[start:].mean()
+    spectrum = np.fft.rfft(window)
+    total = float(np.sum(np.abs(spectrum) ** 2))
+    return _tone_results(
+        lambda b: complex(spectrum[b]), n, start, sample_rate, tones, slots, total
     )
 
 
+class ToneBins:
+    """:func:`fft_demodulate_tones` accumulated block by block.
+
+    For a streamed run whose length is known up front (finalise reads
+    ``rows`` before pass 2) the window -- and so every requested bin -- is
+    fixed before the first sample, so the bins can be summed as the blocks go
+    by instead of holding the record for one ``rfft``. Angles are exact
+    (``b * k mod n`` in integers); the mean never touches a bin ``b > 0`` of
+    an ``n``-point DFT, and the one-sided power the leakage needs follows
+    from Parseval plus the Nyquist bin, so :meth:`result` equals the one-shot
+    function to rounding.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float,
+        frequencies: Iterable[float],
+        total_samples: int,
+        harmonics: Iterable[int] = (1,),
+    ) -> None:
+        self.sample_rate = float(sample_rate)
+        self._n, self._start, self._tones, self._slots = _tone_layout(
+            int(total_samples), self.sample_rate, frequencies, harmonics
+        )
+        self._bins = np.array(
+            sorted(b for row in self._slots for _, b in row if b is not None), dtype=np.int64
+        )
+        self._sums = np.zeros(self._bins.size, dtype=complex)
+        self._seen = 0
+        # Power accumulators about a pivot (the first windowed sample), which
+        # keeps sum(x^2) - n*mean^2 from cancelling on a large DC level.
+        self._pivot: float | None = None
+        self._dev_sum = 0.0
+        self._dev_sq = 0.0
+        self._alt_sum = 0.0
+
+    def push(self, chunk: np.ndarray) -> None:
+        """Fold the next samples of the stream in (samples before the window are skipped)."""
+        x = np.asarray(chunk, dtype=float).ravel()
+        first = self._seen
+        self._seen += x.size
+        skip = max(0, self._start - first)
+        if skip >= x.size:
+            return
+        x = x[skip:]
+        k = np.arange(first + skip - self._start, first + skip - self._start + x.size,
+                      dtype=np.int64)
+        if self._bins.size:
+            angle = ((self._bins[:, None] * k) % self._n) * (-2.0 * np.pi / self._n)
+            self._sums += (np.cos(angle) + 1j * np.sin(angle)) @ x
+        if self._pivot is None:
+            self._pivot = float(x[0])
+        d = x - self._pivot
+        self._dev_sum += float(d.sum())
+        self._dev_sq += float(d @ d)
+        self._alt_sum += float(np.where(k % 2 == 0, d, -d).sum())
+
+    def result(self) -> Tuple[FFTDemodResult, ...]:
+        """The per-tone results; call once every sample has been pushed."""
+        if self._seen < self._start + self._n:
+            raise ValueError(
+                f"ToneBins expected {self._start + self._n} samples, got {self._seen}"
+            )
+        n = self._n
+        centred_sq = self._dev_sq - self._dev_sum ** 2 / n  # sum (x - mean)^2
+        total = n * centred_sq
+        if n % 2 == 0:
+            # X[n/2] of the mean-removed window: sum (-1)^k (x - mean); the
+            # mean term vanishes for even n.
+            total += self._alt_sum ** 2
+        lookup = dict(zip(self._bins.tolist(), self._sums))
+        return _tone_results(
+            lambda b: complex(lookup[b]), n, self._start, self.sample_rate,
+            self._tones, self._slots, total / 2.0,
+        )
+
+
+# Frames per batched rfft in fft_demodulate_frames, sized so one batch holds
+# about this many samples (the mean-removed copy plus its spectrum).
+_FRAME_BATCH_SAMPLES = 1 << 22
+
+
+def fft_demodulate_frames(
+    signal: np.ndarray,
+    sample_rate: float,
+    frequency: float,
+    harmonics: Iterable[int] = (1, 2, 3),
+    frame_cycles: float = 20.0,
+    hop_cycles: float | None = None,
+    start_index: int = 0,
+) -> FFTFrames:
+    """Short-time :func:`fft_demodulate`: amplitude / phase / leakage per frame.
+
+    A single :func:`fft_demodulate` over a long iso hold averages any drift
+    away; the per-sample lock-in shows it but is noisy and costs a filter
+    pass per sample. This cuts ``signal`` into frames of a whole number of
+    modulation cycles, ``hop_cycles`` apart, and reads the harmonic bins of
+    every frame:
+
+    * frames are a strided view (``sliding_window_view(...)[::hop]``), so
+      nothing is copied before the per-frame mean removal;
+    * the frames go through one batched ``rfft`` along the sample axis (in
+      batches of ~``_FRAME_BATCH_SAMPLES`` so a multi-hour hold stays in
+      bounded memory);
+    * each bin is converted exactly as in :func:`fft_demodulate`, including
+      the phase re-reference to sample 0 of the input, so the phase series of
+      a stationary tone is flat and every frame agrees with a single
+      :func:`fft_demodulate` over the same samples.
+
+    Parameters
+    ----------
+    signal
+        1-D AI samples.
+    sample_rate, frequency, harmonics
+        As for :func:`fft_demodulate`.
+    frame_cycles
+        Frame length in modulation periods; trimmed down to the longest
+        whole-cycle length (``_integer_cycle_length``), or used as is (with
+        some leakage) when no whole-cycle length fits.
+    hop_cycles
+        Distance between frame starts in periods; ``None`` = one frame
+        length (back-to-back frames).
+    start_index
+        Absolute index of ``signal[0]`` in a longer stream. Shifts ``time``
+        and the phase reference, so a stream demodulated chunk by chunk
+        (carrying the samples of the unfinished frame over) yields the same
+        frames as one call.
+
+    Returns
+    -------
+    FFTFrames
+        Empty (zero frames, same layout) when ``signal`` is shorter than one
+        frame.
+    """
+    signal = np.asarray(signal, dtype=float)
+    if signal.ndim != 1:
+        raise ValueError("signal must be 1-D")
+    if sample_rate <= 0:
+        raise ValueError("sample_rate must be positive")
+    if frequency <= 0 or frequency >= sample_rate / 2.0:
+        raise ValueError("frequency must be positive and below Nyquist (sample_rate / 2)")
+    if frame_cycles <= 0:
+        raise ValueError("frame_cycles must be positive")
+    requested: list[int] = []
+    for h in harmonics:
+        if int(h) <= 0:
+            raise ValueError(f"harmonic must be a positive integer, got {h}")
+        if int(h) not in requested:
+            requested.append(int(h))
+
+    samples_per_period = sample_rate / frequency
+    period = int(np.ceil(samples_per_period))
+    target = max(period, int(round(frame_cycles * samples_per_period)))
+    frame = _integer_cycle_length(target, sample_rate, frequency)
+    if frame < period:
+        frame = target
+    hop = frame if hop_cycles is None else max(1, int(round(hop_cycles * samples_per_period)))
+
+    n_frames = 0 if signal.size < frame else (signal.size - frame) // hop + 1
+    starts = np.arange(n_frames, dtype=np.int64) * hop
+    amplitude = np.full((n_frames, len(requested)), np.nan)
+    phase = np.full((n_frames, len(requested)), np.nan)
+    leakage = np.zeros(n_frames)
+    if n_frames:
+        cycles = int(round(frame * frequency / sample_rate))
+        bins = np.array([h * cycles for h in requested])
+        observable = bins < frame // 2 + 1
+        orders = np.array(requested, dtype=float)[observable]
+        frames = np.lib.stride_tricks.sliding_window_view(signal, frame)[::hop]
+        batch = max(1, _FRAME_BATCH_SAMPLES // frame)
+        for lo in range(0, n_frames, batch):
+            block = frames[lo:lo + batch]
+            block = block - block.mean(axis=1, keepdims=True)
+            spectrum = np.fft.rfft(block, axis=1)
+            x = spectrum[:, bins[observable]]
+            omega_t = (
+                2.0 * np.pi * frequency
+                * (start_index + starts[lo:lo + batch])[:, None] / sample_rate
+            )
+            ph = -np.pi / 2.0 - np.angle(x) + orders * omega_t
+            amplitude[lo:lo + batch, observable] = 2.0 * np.abs(x) / frame
+            phase[lo:lo + batch, observable] = (ph + np.pi) % (2 * np.pi) - np.pi
+            total = np.sum(np.abs(spectrum) ** 2, axis=1)
+            kept = np.sum(np.abs(x) ** 2, axis=1)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                frac = np.where(total > 0, 1.0 - kept / total, 0.0)
+            leakage[lo:lo + batch] = np.clip(frac, 0.0, 1.0)
+
+    return FFTFrames(
+        time=(start_index + starts + (frame - 1) / 2.0) / sample_rate,
+        harmonics=tuple(requested),
+        amplitude=amplitude,
+        phase=phase,
+        leakage=leakage,
+        frame_samples=int(frame),
+        hop_samples=int(hop),
+    )
+
+
+class SlidingDFT:
+    """Harmonic bins of the newest ``window`` samples of a stream, O(new) per push.
+
+    :func:`fft_demodulate` over a live scope window re-transforms the whole
+    window on every refresh to read one or three bins. This keeps the same
+    bins as running sums instead (a sliding DFT -- the recursive
+    single-bin estimator also known as sliding Goertzel):
+
+    * ``I_h = sum x[k] sin(h*omega*k)``, ``Q_h = sum x[k] cos(h*omega*k)``
+      over the window, with ``k`` the absolute sample index since
+      :meth:`reset`; each :meth:`push` adds the new samples' terms and
+      subtracts those of the samples leaving the window (kept in a
+      ``window``-long circular buffer);
+    * the reference angles are exact: with ``f / fs = p / q`` the angle of
+      sample ``k`` is ``2*pi * (h*p*k mod q) / q`` in integer arithmetic, so
+      hours of streaming lose no phase precision;
+    * every ``window`` samples the sums are recomputed from the buffer, which
+      bounds the round-off of the running update at O(1) amortised cost;
+    * the window mean is removed (its leakage into the bins is subtracted
+      through the running sums of the references), as ``fft_demodulate``
+      does.
+
+    ``window_samples`` is trimmed to a whole number of modulation cycles when
+    one fits (``_integer_cycle_length``), so a stationary tone reads exactly
+    the amplitude and phase of ``fft_demodulate`` over the same samples.
+    Phases are referenced to sample 0 of the stream (same lag convention).
+    Not thread-safe; the owner serialises :meth:`push` / :meth:`harmonics`.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float,
+        frequency: float,
+        window_samples: int,
+        harmonics: Iterable[int] = (1,),
+    ) -> None:
+        if sample_rate <= 0:
+            raise ValueError("sample_rate must be positive")
+        if frequency <= 0 or frequency >= sample_rate / 2.0:
+            raise ValueError("frequency must be positive and below Nyquist (sample_rate / 2)")
+        requested: list[int] = []
+        for h in harmonics:
+            if int(h) <= 0:
+                raise ValueError(f"harmonic must be a positive integer, got {h}")
+            if int(h) not in requested:
+                requested.append(int(h))
+        if not requested:
+            raise ValueError("at least one harmonic is required")
+        self.sample_rate = float(sample_rate)
+        self.frequency = float(frequency)
+        self.harmonic_orders = tuple(requested)
+        period = int(np.ceil(self.sample_rate / self.frequency))
+        n = max(int(window_samples), period)
+        whole = _integer_cycle_length(n, self.sample_rate, self.frequency)
+        self.window = whole if whole >= period else n
+        ratio = (
+            Fraction(self.frequency).limit_denominator(10**6)
+            / Fraction(self.sample_rate).limit_denominator(10**6)
+        )
+        self._q = int(ratio.denominator)
+        # h * p mod q per harmonic: the angle step in units of 2*pi/q.
+        self._steps = np.array(
+            [(h * ratio.numerator) % self._q for h in requested], dtype=np.int64
+        )[:, None]
+        self._observable = np.array(
+            [h * self.frequency < self.sample_rate / 2.0 for h in requested]
+        )
+        self.reset()
+
+    @property
+    def samples(self) -> int:
+        """Samples pushed since construction / :meth:`reset`."""
+        return self._total
+
+    @property
+    def filled(self) -> bool:
+        """True once a whole window has been pushed."""
+        return self._total >= self.window
+
+    def reset(self) -> None:
+        """Empty the window and restart the sample index at 0."""
+        self._buf = np.zeros(self.window)
+        self._total = 0
+        self._since_sync = 0
+        self._sums = np.zeros((len(self.harmonic_orders), 2))      # (I, Q) per harmonic
+        self._ref_sums = np.zeros((len(self.harmonic_orders), 2))  # sin, cos sums
+        self._x_sum = 0.0
+
+    def push(self, chunk: np.ndarray) -> None:
+        """Slide the window over the next samples of the stream."""
+        x = np.asarray(chunk, dtype=float).ravel()
+        n = x.size
+        if n == 0:
+            return
+        w = self.window
+        if n >= w:
+            x = x[-w:]
+            start = self._total + n - w
+            self._write(start, x)
+            self._total += n
+            self._resync()
+            return
+        start = self._total
+        old_start = max(0, start - w)
+        old_stop = start + n - w  # indices [old_start, old_stop) leave the window
+        if old_stop > old_start:
+            leaving = self._buf[np.arange(old_start, old_stop) % w]
+            ref = self._references(old_start, leaving.size)
+            self._sums -= ref @ leaving
+            self._ref_sums -= ref.sum(axis=-1)
+            self._x_sum -= float(leaving.sum())
+        ref = self._references(start, n)
+        self._sums += ref @ x
+        self._ref_sums += ref.sum(axis=-1)
+        self._x_sum += float(x.sum())
+        self._write(start, x)
+        self._total += n
+        self._since_sync += n
+        if self._since_sync >= w:
+            self._resync()
+
+    def harmonics(self) -> Tuple[HarmonicAmplitude, ...]:
+        """Per-harmonic ``(amplitude, phase)`` of the window; empty until :attr:`filled`.
+
+        Harmonics at or above Nyquist report NaN, as in :func:`fft_demodulate`.
+        """
+        if not self.filled:
+            return ()
+        w = self.window
+        # Mean removal: sum (x - mean) * ref = sum x * ref - mean * sum ref.
+        iq = self._sums - (self._x_sum / w) * self._ref_sums
+        amp = 2.0 * np.hypot(iq[:, 0], iq[:, 1]) / w
+        phase = -np.arctan2(iq[:, 1], iq[:, 0])
+        return tuple(
+            HarmonicAmplitude(h, float(a), float(p)) if ok
+            else HarmonicAmplitude(h, float("nan"), float("nan"))
+            for h, a, p, ok in zip(self.harmonic_orders, amp, phase, self._observable)
+        )
+
+    # -- internals -----------------------------------------------------
+    def _references(self, start: int, n: int) -> np.ndarray:
+        """``(harmonics, 2, n)`` sin / cos of samples ``start .. start + n``."""
+        k = np.arange(start, start + n, dtype=np.int64) % self._q
+        theta = ((self._steps * k) % self._q) * (2.0 * np.pi / self._q)
+        return np.stack((np.sin(theta), np.cos(theta)), axis=1)
+
+    def _write(self, start: int, x: np.ndarray) -> None:
+        self._buf[np.arange(start, start + x.size) % self.window] = x
+
+    def _resync(self) -> None:
+        """Recompute the sums from the buffer (bounds running round-off)."""
+        first = max(0, self._total - self.window)
+        count = self._total - first
+        values = self._buf[np.arange(first, self._total) % self.window]
+        ref = self._references(first, count)
+        self._sums = ref @ values
+        self._ref_sums = ref.sum(axis=-1)
+        self._x_sum = float(values.sum())
+        self._since_sync = 0
+
+
 # ---------------------------------------------------------------------------
 # AO modulation buffer integrity (IsoMode CONTINUOUS replay)
 # ---------------------------------------------------------------------------
@@ -593,11 +1742,24 @@ def check_ao_period_integrity(
 __all__ = [
     "ModulationParams",
     "apply_modulation",
+    "align_tones",
+    "seamless_buffer_length",
     "lockin_demodulate",
+    "BlockLockIn",
+    "lockin_decimation",
+    "lockin_demodulate_decimated",
+    "StreamingLockIn",
     "reference_phase",
     "fft_demodulate",
+    "fft_demodulate_frames",
+    "fft_demodulate_tones",
+    "ToneBins",
+    "SlidingDFT",
     "check_ao_period_integrity",
     "FFTDemodResult",
+    "FFTFrames",
     "HarmonicAmplitude",
     "AOPeriodReport",
+    "demod_cache_stats",
+    "clear_demod_caches",
 ]
@@ -0,0 +1,118 @@
+"""Compact storage of raw AI samples: float64, float32 or int16 ADC counts.
+
+The DAQ delivers 16-bit ADC readings already scaled to volts as float64, so
+storing them as float64 spends 4x the information content. A
+:class:`SampleCodec` describes how raw AI is *held* (the in-RAM ring, the
+``DiskRecorder`` ``raw_ai`` dataset) and converts to / from volts:
+
+* ``float64`` -- identity, the legacy layout;
+* ``float32`` -- half the size, ~7 significant digits (far below the ADC LSB);
+* ``int16`` -- quarter the size: ``volts = counts * scale + offset`` per
+  channel, with ``scale`` = one LSB of the configured bipolar input range.
+  Encoding rounds to the nearest count and saturates at the int16 limits.
+
+Decoding is lazy: the stored array is only turned back into float64 volts by
+:meth:`SampleCodec.decode` at read time. On disk the codec travels as dataset
+attributes (:meth:`SampleCodec.attrs` / :meth:`SampleCodec.from_attrs`), so a
+raw file is self-describing; a dataset without them decodes as plain volts.
+
+Pure (no h5py / no DAQ) so it is unit-testable on its own.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+import numpy as np
+
+#: Storage dtypes accepted by ``Acquisition.StorageDtype``.
+STORAGE_DTYPES = ("float64", "float32", "int16")
+
+_INT16_MIN = np.iinfo(np.int16).min
+_INT16_MAX = np.iinfo(np.int16).max
+# One LSB of a 16-bit bipolar converter spanning [-full_scale, +full_scale].
+_ADC_CODES = 2 ** 16
+
+
+@dataclass(frozen=True)
+class SampleCodec:
+    """Storage dtype plus per-channel ``scale`` / ``offset`` (int16 only)."""
+
+    dtype: str = "float64"
+    scale: Optional[np.ndarray] = None
+    offset: Optional[np.ndarray] = None
+
+    @classmethod
+    def for_storage(
+        cls, dtype: str, n_channels: int, full_scale_volts: Optional[float] = None
+    ) -> "SampleCodec":
+        """Codec for ``dtype`` over ``n_channels`` sharing one input range.
+
+        ``full_scale_volts`` (the ``+/-V`` of the AI range) is required for
+        ``int16`` and ignored otherwise.
+        """
+        if dtype not in STORAGE_DTYPES:
+            raise ValueError(f"storage dtype must be one of {STORAGE_DTYPES}, got {dtype!r}")
+        if dtype != "int16":
+            return cls(dtype=dtype)
+        if full_scale_volts is None or not full_scale_volts > 0:
+            raise ValueError(
+                f"int16 storage needs the AI full-scale voltage, got {full_scale_volts!r}"
+            )
+        lsb = 2.0 * float(full_scale_volts) / _ADC_CODES
+        return cls(
+            dtype="int16",
+            scale=np.full(int(n_channels), lsb),
+            offset=np.zeros(int(n_channels)),
+        )
+
+    @classmethod
+    def from_attrs(cls, attrs: Mapping) -> "SampleCodec":
+        """Codec recorded on a dataset; plain float data when absent."""
+        if "storage_dtype" not in attrs:
+            return cls()
+        dtype = attrs["storage_dtype"]
+        if isinstance(dtype, bytes):
+            dtype = dtype.decode()
+        if str(dtype) != "int16":
+            return cls(dtype=str(dtype))
+        return cls(
+            dtype="int16",
+            scale=np.asarray(attrs["scale"], dtype=float),
+            offset=np.asarray(attrs["offset"], dtype=float),
+        )
+
+    @property
+    def itemsize(self) -> int:
+        return np.dtype(self.dtype).itemsize
+
+    def attrs(self) -> dict:
+        """Dataset attributes that let :meth:`from_attrs` rebuild this codec."""
+        out: dict = {"storage_dtype": self.dtype}
+        if self.dtype == "int16":
+            out["scale"] = np.asarray(self.scale, dtype=float)
+            out["offset"] = np.asarray(self.offset, dtype=float)
+        return out
+
+    def encode(self, volts: np.ndarray) -> np.ndarray:
+        """Volts ``(rows, channels)`` -> stored representation."""
+        if self.dtype == "float64":
+            return np.asarray(volts, dtype=np.float64)
+        if self.dtype == "float32":
+            return np.asarray(volts, dtype=np.float32)
+        counts = np.rint((np.asarray(volts, dtype=float) - self.offset) / self.scale)
+        return np.clip(counts, _INT16_MIN, _INT16_MAX).astype(np.int16)
+
+    def decode(self, stored: np.ndarray, columns=slice(None)) -> np.ndarray:
+        """Stored ``(rows, channels)`` -> float64 volts.
+
+        ``columns`` selects which channels ``stored`` holds (an index or a
+        slice into the codec's channel axis) when it is a column subset.
+        """
+        if self.dtype != "int16":
+            return np.asarray(stored, dtype=np.float64)
+        return stored * self.scale[columns] + self.offset[columns]
+
+
+__all__ = ["STORAGE_DTYPES", "SampleCodec"]
@@ -14,6 +14,7 @@ import json
 import logging
 import os
 from dataclasses import dataclass
+from typing import Optional
 
 # DAQ parameter classes are needed only by ``BackSettings``. Importing them
 # requires (mock) ``uldaq``, so we tolerate failures silently and re-raise
@@ -33,6 +34,7 @@ except Exception as exc:  # pragma: no cover - depends on host
     )
 
 from pioner.shared.utils import is_int_or_raise, list_bitwise_or
+from pioner.shared.sample_codec import STORAGE_DTYPES
 from pioner.shared.constants import *  # noqa: F401,F403 - intentional re-export of field names
 
 
@@ -194,17 +196,18 @@ def _normalize_chip_presence_strategy(value) -> str:
 
 
 #: Map an AcquisitionMode spelling (CamelCase ``Persistent`` / ``PerExperiment``
-#: or the internal lowercase form) to the internal canonical.
+#: / ``Process`` or the internal lowercase form) to the internal canonical.
 _ACQUISITION_MODE_BY_NORM = {
-    "persistent": "persistent", "perexperiment": "per_experiment",
+    "persistent": "persistent", "perexperiment": "per_experiment", "process": "process",
 }
 
 
 def _normalize_acquisition_mode(value) -> str:
     """Normalise the AcquisitionMode value to the internal lowercase canonical.
 
-    Accepts ``Persistent`` / ``PerExperiment`` (or the internal form). Unknown
-    values pass through; :meth:`AcquisitionMode.from_string` then falls back.
+    Accepts ``Persistent`` / ``PerExperiment`` / ``Process`` (or the internal
+    form). Unknown values pass through; :meth:`AcquisitionMode.from_string`
+    then falls back.
     """
     if value is None:
         return ACQUISITION_MODE_DEFAULT
@@ -271,6 +274,127 @@ def parse_chip_presence_config(value: dict | None) -> ChipPresenceConfig:
     )
 
 
+#: Ways ``ExperimentManager._ring_loop`` moves samples off the AI DMA buffer.
+#: ``half_buffer`` copies a whole half once the writer crosses the midpoint
+#: (0.5 s lumps with the 1 s buffer); ``incremental`` copies whatever span the
+#: driver has completed since the previous poll, handling the wrap.
+INGESTION_MODES = ("half_buffer", "incremental")
+
+_INGESTION_MODE_BY_NORM = {"halfbuffer": "half_buffer", "incremental": "incremental"}
+
+#: Filters for the recorder's ``raw_ai`` dataset (``Acquisition.RecordCompression``);
+#: ``lzf`` / ``gzip`` are applied with the byte-shuffle filter.
+RECORD_COMPRESSIONS = ("none", "lzf", "gzip")
+
+
+@dataclass
+class AcquisitionConfig:
+    """Config for the AI ring ingestion (optional ``Acquisition`` block).
+
+    ``ingestion`` defaults to the legacy ``half_buffer`` flip until the
+    incremental path has been soaked on real hardware. ``min_chunk_samples``
+    (per channel) only applies to ``incremental``: smaller spans are left in
+    the DMA buffer until the next poll, which bounds the per-copy overhead.
+
+    ``storage_dtype`` is how raw AI is held in the ring and the recorder's
+    ``raw_ai`` dataset (see :mod:`pioner.shared.sample_codec`): ``float64``
+    (legacy), ``float32`` or ``int16`` ADC counts with per-channel
+    scale/offset. Readers always get float64 volts back.
+
+    ``telemetry_file`` (off when ``None``) is a JSONL file the local
+    controller appends an acquisition-metrics snapshot to every
+    ``telemetry_interval`` seconds (see :mod:`pioner.back.telemetry`).
+
+    ``record_compression`` is the HDF5 filter of streamed ``raw_ai``
+    recordings (``none`` keeps the legacy uncompressed layout).
+    ``record_segment_seconds`` / ``record_segment_megabytes`` (both ``None``:
+    one file) roll a recording over into SWMR segment files plus an index
+    (see :mod:`pioner.back.acquisition.raw_recording`).
+    """
+
+    ingestion: str = "half_buffer"
+    min_chunk_samples: int = 16
+    storage_dtype: str = "float64"
+    telemetry_file: Optional[str] = None
+    telemetry_interval: float = 10.0
+    record_compression: str = "none"
+    record_segment_seconds: Optional[float] = None
+    record_segment_megabytes: Optional[float] = None
+
+
+def parse_acquisition_config(value: dict | None) -> AcquisitionConfig:
+    """Build :class:`AcquisitionConfig` from the optional ``Acquisition`` block.
+
+    Missing block / keys fall back to the defaults. Keys: ``Ingestion``
+    (``HalfBuffer`` / ``Incremental``, CamelCase or internal form),
+    ``MinChunkSamples``, ``StorageDtype`` (``Float64`` / ``Float32`` /
+    ``Int16``, case-insensitive), ``TelemetryFile`` (path or ``null``),
+    ``TelemetryInterval`` (seconds, > 0), ``RecordCompression``
+    (``None`` / ``Lzf`` / ``Gzip``, case-insensitive) and
+    ``RecordSegmentSeconds`` / ``RecordSegmentMegabytes`` (> 0 or ``null``).
+    """
+    d = value or {}
+    defaults = AcquisitionConfig()
+
+    ingestion_raw = d.get("Ingestion", defaults.ingestion)
+    norm = str(ingestion_raw).replace("_", "").lower()
+    ingestion = _INGESTION_MODE_BY_NORM.get(norm, str(ingestion_raw))
+    if ingestion not in INGESTION_MODES:
+        raise ValueError(
+            f"Acquisition.Ingestion must be one of {INGESTION_MODES}, got {ingestion_raw!r}"
+        )
+    min_chunk = d.get("MinChunkSamples", defaults.min_chunk_samples)
+    if isinstance(min_chunk, bool) or not isinstance(min_chunk, int) or min_chunk < 1:
+        raise ValueError(
+            f"Acquisition.MinChunkSamples must be a positive int, got {min_chunk!r}"
+        )
+    storage_raw = d.get("StorageDtype", defaults.storage_dtype)
+    storage = str(storage_raw).lower()
+    if storage not in STORAGE_DTYPES:
+        raise ValueError(
+            f"Acquisition.StorageDtype must be one of {STORAGE_DTYPES}, got {storage_raw!r}"
+        )
+
+    telemetry_file = d.get("TelemetryFile", defaults.telemetry_file)
+    if telemetry_file is not None and not isinstance(telemetry_file, str):
+        raise ValueError(
+            f"Acquisition.TelemetryFile must be a path string or null, got {telemetry_file!r}"
+        )
+    interval = d.get("TelemetryInterval", defaults.telemetry_interval)
+    if isinstance(interval, bool) or not isinstance(interval, (int, float)) or interval <= 0:
+        raise ValueError(
+            f"Acquisition.TelemetryInterval must be a positive number, got {interval!r}"
+        )
+
+    compression_raw = d.get("RecordCompression", defaults.record_compression)
+    compression = str(compression_raw or "none").lower()
+    if compression not in RECORD_COMPRESSIONS:
+        raise ValueError(
+            f"Acquisition.RecordCompression must be one of {RECORD_COMPRESSIONS}, "
+            f"got {compression_raw!r}"
+        )
+
+    segment_limits = {}
+    for key, field in (("RecordSegmentSeconds", "record_segment_seconds"),
+                       ("RecordSegmentMegabytes", "record_segment_megabytes")):
+        limit = d.get(key, getattr(defaults, field))
+        if limit is not None and (
+            isinstance(limit, bool) or not isinstance(limit, (int, float)) or limit <= 0
+        ):
+            raise ValueError(f"Acquisition.{key} must be a positive number or null, got {limit!r}")
+        segment_limits[field] = None if limit is None else float(limit)
+
+    return AcquisitionConfig(
+        ingestion=ingestion,
+        min_chunk_samples=int(min_chunk),
+        storage_dtype=storage,
+        telemetry_file=telemetry_file or None,
+        telemetry_interval=float(interval),
+        record_compression=compression,
+        **segment_limits,
+    )
+
+
 class JsonReader:
     """Reads a JSON configuration file."""
 
@@ -354,12 +478,14 @@ class BackSettings:
         self.parse_acquisition_mode(json_dict)
         self.parse_limits()
         self.parse_chip_presence()
+        self.parse_acquisition()
         self.check_invalid_fields()
 
     def parse_acquisition_mode(self, json_dict: dict) -> None:
         """Pull the top-level ``AcquisitionMode`` field, default if missing.
 
-        Valid values are ``"persistent"`` (default) and ``"per_experiment"``.
+        Valid values are ``"persistent"`` (default), ``"per_experiment"`` and
+        ``"process"`` (DAQ and manager in a separate acquisition process).
         Unknown values are accepted at this layer (the AIProvider factory
         validates and falls back to ``persistent``); the field is purely
         a string here.
@@ -372,11 +498,44 @@ class BackSettings:
         from pioner.shared.modulation import ModulationParams  # avoid cycle
 
         mod = self._exp_settings_dict.get(MODULATION_FIELD, {})
+
+        def non_negative(field: str) -> float:
+            value = mod.get(field) or 0.0
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                raise ValueError(
+                    f"Modulation.{field} must be a non-negative number or null, got {value!r}"
+                )
+            return float(value)
+
+        frequency = float(mod.get(FREQUENCY_FIELD, 0.0))
+        tones = []
+        for tone in mod.get(TONES_FIELD) or []:
+            pair = (
+                (tone.get(FREQUENCY_FIELD), tone.get(AMPLITUDE_FIELD))
+                if isinstance(tone, dict) else ()
+            )
+            if len(pair) != 2 or not all(
+                isinstance(v, (int, float)) and not isinstance(v, bool) and v > 0 for v in pair
+            ):
+                raise ValueError(
+                    f"Modulation.{TONES_FIELD} entries must be "
+                    f"{{\"{FREQUENCY_FIELD}\": Hz > 0, \"{AMPLITUDE_FIELD}\": V > 0}}, got {tone!r}"
+                )
+            if float(pair[0]) == frequency or float(pair[0]) in [f for f, _ in tones]:
+                raise ValueError(
+                    f"Modulation.{TONES_FIELD}: frequency {pair[0]} Hz is driven twice"
+                )
+            tones.append((float(pair[0]), float(pair[1])))
         self.modulation = ModulationParams(
-            frequency=float(mod.get(FREQUENCY_FIELD, 0.0)),
+            frequency=frequency,
             amplitude=float(mod.get(AMPLITUDE_FIELD, 0.0)),
             offset=float(mod.get(OFFSET_FIELD, 0.0)),
             use_measured_reference=bool(mod.get(MEASURED_REFERENCE_FIELD, False)),
+            lockin_output_rate=non_negative(LOCKIN_OUTPUT_RATE_FIELD),
+            fft_frame_cycles=non_negative(FFT_FRAME_CYCLES_FIELD),
+            fft_hop_cycles=non_negative(FFT_HOP_CYCLES_FIELD),
+            tones=tuple(tones),
+            snap_frequency=bool(mod.get(SNAP_FREQUENCY_FIELD, False)),
         )
 
     def parse_limits(self) -> None:
@@ -404,6 +563,12 @@ class BackSettings:
             self._exp_settings_dict.get(CHIP_PRESENCE_FIELD)
         )
 
+    def parse_acquisition(self) -> None:
+        """Pull the optional AI ring-ingestion block; absent -> half-buffer flip."""
+        self.acquisition = parse_acquisition_config(
+            self._exp_settings_dict.get(ACQUISITION_FIELD)
+        )
+
     def parse_daq_params(self):
         """Parses all necessary DAQ parameters and fills DaqParams instance."""
         self.daq_params = DaqParams()
@@ -665,11 +830,25 @@ class FrontSettings:
             self.modulation_measured_reference = self._exp_settings_dict[MODULATION_FIELD].get(
                 MEASURED_REFERENCE_FIELD
             )
-            # Carry the optional Limits / ChipPresence blocks verbatim so a GUI
-            # save round-trips them (the front-end doesn't otherwise consume
-            # them). None if absent.
+            self.modulation_lockin_output_rate = self._exp_settings_dict[MODULATION_FIELD].get(
+                LOCKIN_OUTPUT_RATE_FIELD
+            )
+            self.modulation_fft_frame_cycles = self._exp_settings_dict[MODULATION_FIELD].get(
+                FFT_FRAME_CYCLES_FIELD
+            )
+            self.modulation_fft_hop_cycles = self._exp_settings_dict[MODULATION_FIELD].get(
+                FFT_HOP_CYCLES_FIELD
+            )
+            self.modulation_tones = self._exp_settings_dict[MODULATION_FIELD].get(TONES_FIELD)
+            self.modulation_snap_frequency = self._exp_settings_dict[MODULATION_FIELD].get(
+                SNAP_FREQUENCY_FIELD
+            )
+            # Carry the optional Limits / ChipPresence / Acquisition blocks
+            # verbatim so a GUI save round-trips them (the front-end doesn't
+            # otherwise consume them). None if absent.
             self.limits_raw = self._exp_settings_dict.get(LIMITS_FIELD)
             self.chip_presence_raw = self._exp_settings_dict.get(CHIP_PRESENCE_FIELD)
+            self.acquisition_raw = self._exp_settings_dict.get(ACQUISITION_FIELD)
 
     def get_exp_settings(self):
         out = {PATHS_FIELD: {
@@ -689,13 +868,29 @@ class FrontSettings:
         measured_ref = getattr(self, "modulation_measured_reference", None)
         if measured_ref is not None:
             out[MODULATION_FIELD][MEASURED_REFERENCE_FIELD] = measured_ref
-        # Preserve the optional Limits / ChipPresence blocks on save (don't drop).
+        lockin_rate = getattr(self, "modulation_lockin_output_rate", None)
+        if lockin_rate is not None:
+            out[MODULATION_FIELD][LOCKIN_OUTPUT_RATE_FIELD] = lockin_rate
+        for field, attr in (
+            (FFT_FRAME_CYCLES_FIELD, "modulation_fft_frame_cycles"),
+            (FFT_HOP_CYCLES_FIELD, "modulation_fft_hop_cycles"),
+            (TONES_FIELD, "modulation_tones"),
+            (SNAP_FREQUENCY_FIELD, "modulation_snap_frequency"),
+        ):
+            value = getattr(self, attr, None)
+            if value is not None:
+                out[MODULATION_FIELD][field] = value
+        # Preserve the optional Limits / ChipPresence / Acquisition blocks on
+        # save (don't drop).
         limits_raw = getattr(self, "limits_raw", None)
         if limits_raw is not None:
             out[LIMITS_FIELD] = limits_raw
         chip_presence_raw = getattr(self, "chip_presence_raw", None)
         if chip_presence_raw is not None:
             out[CHIP_PRESENCE_FIELD] = chip_presence_raw
+        acquisition_raw = getattr(self, "acquisition_raw", None)
+        if acquisition_raw is not None:
+            out[ACQUISITION_FIELD] = acquisition_raw
         return out
 
     def check_invalid_fields(self):
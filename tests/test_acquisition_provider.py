@@ -8,6 +8,7 @@ during the arm/end-of-experiment hooks.
 
 from __future__ import annotations
 
+import os
 import time
 
 import numpy as np
@@ -15,9 +16,11 @@ import pytest
 
 from pioner.back.acquisition import (
     AIProvider,
+    AcquisitionEngine,
     AcquisitionMode,
     PersistentAIProvider,
     PerExperimentAIProvider,
+    ProcessAIProvider,
     create_ai_provider,
 )
 from pioner.back.experiment_manager import ExperimentManager
@@ -39,6 +42,7 @@ class TestAcquisitionModeParser:
     def test_known_values(self):
         assert AcquisitionMode.from_string("persistent") is AcquisitionMode.PERSISTENT
         assert AcquisitionMode.from_string("per_experiment") is AcquisitionMode.PER_EXPERIMENT
+        assert AcquisitionMode.from_string("process") is AcquisitionMode.PROCESS
 
     def test_whitespace_and_case_tolerant(self):
         assert AcquisitionMode.from_string(" Persistent ") is AcquisitionMode.PERSISTENT
@@ -58,6 +62,13 @@ class TestFactory:
         assert isinstance(provider, PerExperimentAIProvider)
         assert provider.mode is AcquisitionMode.PER_EXPERIMENT
 
+    def test_process_mode_needs_an_engine(self, connected_daq, settings):
+        provider = create_ai_provider("process", AcquisitionEngine(settings))
+        assert isinstance(provider, ProcessAIProvider)
+        assert provider.mode is AcquisitionMode.PROCESS
+        with pytest.raises(TypeError):
+            create_ai_provider("process", ExperimentManager(connected_daq, settings))
+
     def test_falls_back_on_unknown_string(self, connected_daq, settings):
         em = ExperimentManager(connected_daq, settings)
         provider = create_ai_provider("garbage", em)
@@ -67,7 +78,7 @@ class TestFactory:
 # ---------------------------------------------------------------------------
 # Shared behaviour
 # ---------------------------------------------------------------------------
-def _wait_for_active(provider: AIProvider, timeout: float = 2.0) -> None:
+def _wait_for_active(provider: AIProvider, timeout: float = 5.0) -> None:
     deadline = time.monotonic() + timeout
     while time.monotonic() < deadline:
         data = provider.peek_last(1000)
@@ -77,10 +88,14 @@ def _wait_for_active(provider: AIProvider, timeout: float = 2.0) -> None:
     raise TimeoutError("provider did not produce any samples within the timeout")
 
 
-@pytest.fixture(params=["persistent", "per_experiment"])
-def provider(request, connected_daq, settings):
-    """Parametrised fixture: each test runs against both providers."""
-    em = ExperimentManager(connected_daq, settings)
+@pytest.fixture(params=["persistent", "per_experiment", "process"])
+def provider(request, settings):
+    """Parametrised fixture: each test runs against every provider."""
+    if request.param == "process":
+        em = AcquisitionEngine(settings)
+        em.start()
+    else:
+        em = ExperimentManager(request.getfixturevalue("connected_daq"), settings)
     p = create_ai_provider(request.param, em, ring_max_seconds=1.0)
     p.on_connect(ai_channels=[0, 1, 2, 3, 4, 5])
     _wait_for_active(p)
@@ -89,10 +104,12 @@ def provider(request, connected_daq, settings):
     finally:
         p.on_disconnect()
         em.stop()
+        if isinstance(em, AcquisitionEngine):
+            em.shutdown()
 
 
 class TestSharedBehaviour:
-    """Tests that must pass for both providers."""
+    """Tests that must pass for every provider."""
 
     def test_peek_returns_2d_with_six_channels(self, provider):
         data = provider.peek_last(200)
@@ -168,3 +185,64 @@ class TestPerExperimentArmPausesAndResumes:
         finally:
             provider.on_disconnect()
             em.stop()
+
+
+class TestProcessEngine:
+    """The acquisition process owns the DAQ; the GUI side is a proxy."""
+
+    @pytest.fixture
+    def engine(self, settings):
+        engine = AcquisitionEngine(settings)
+        engine.start()
+        try:
+            yield engine
+        finally:
+            engine.shutdown()
+
+    def test_subscription_and_recorder_surface(self, engine):
+        p = create_ai_provider("process", engine, ring_max_seconds=1.0)
+        sub = p.subscribe("plot", maxsize=64)
+        p.on_connect(ai_channels=[0, 1, 2, 3, 4, 5])
+        try:
+            chunk = sub.get(timeout=3.0)
+            assert chunk is not None and chunk.shape[1] == 6
+            assert not chunk.flags.writeable
+            engine.reset_ring_cursor("rec")
+            rows = engine.read_new_samples("rec", decode=False)
+            assert rows.shape[1] == 6 and rows.dtype == engine.sample_codec.dtype
+        finally:
+            p.on_disconnect()
+
+    def test_metrics_are_forwarded_from_the_child(self, engine):
+        p = create_ai_provider("process", engine, ring_max_seconds=1.0)
+        p.on_connect(ai_channels=[0, 1, 2, 3, 4, 5])
+        try:
+            _wait_for_active(p)
+            p.read_new("plot")
+            snap = p.metrics_snapshot()
+        finally:
+            p.on_disconnect()
+        assert snap["engine"]["pid"] not in (None, os.getpid())
+        assert snap["chunks"] > 0 and snap["host_ingested"] > 0
+        assert "ring" in snap["workers"]
+        assert snap["consumers"]["plot"]["reads"] == 1
+        assert engine.metrics.snapshot()["chunks"] >= snap["chunks"]
+
+    def test_child_errors_are_raised_in_the_parent(self, engine, settings):
+        settings.ai_params.sample_rate += 1  # odd: the half-buffer flip refuses it
+        with pytest.raises(ValueError, match="must be even"):
+            engine.start_ring_buffer([0, 1], max_seconds=1.0)
+        settings.ai_params.sample_rate -= 1
+        engine.start_ring_buffer([0, 1], max_seconds=1.0)
+        engine.stop_ring_buffer()
+
+    def test_calls_fail_once_the_child_is_gone(self, engine):
+        engine._process.terminate()
+        engine._process.join(timeout=5.0)
+        deadline = time.monotonic() + 5.0
+        while engine.is_connected() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not engine.is_connected()
+        with pytest.raises(RuntimeError, match="not running"):
+            engine.stop_ao()
+        engine.zero_ao()  # best-effort: logged, not raised
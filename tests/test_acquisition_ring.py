@@ -12,7 +12,13 @@ import time
 import numpy as np
 import pytest
 
-from pioner.back.experiment_manager import ExperimentManager
+from pioner.back.experiment_manager import (
+    POLL_PERIOD_MAX,
+    POLL_PERIOD_MIN,
+    ExperimentManager,
+    _poll_period,
+    _rows_to_next_half,
+)
 
 
 def _wait_for_chunks(em: ExperimentManager, min_samples: int, timeout: float = 3.0) -> None:
@@ -20,7 +26,7 @@ def _wait_for_chunks(em: ExperimentManager, min_samples: int, timeout: float = 3
     deadline = time.monotonic() + timeout
     while time.monotonic() < deadline:
         with em._ring_lock:
-            current = sum(len(c) for c in em._ring_data)
+            current = em._ring_buffered_samples_locked()
         if current >= min_samples:
             return
         time.sleep(0.05)
@@ -105,3 +111,160 @@ def test_reset_ring_cursor(streaming_em):
     # After reset the consumer joins at the current head (i.e. the
     # currently buffered samples again, not "nothing new").
     assert second.shape[0] > 0
+
+
+# ---------------------------------------------------------------------------
+# Preallocated circular store: wrap-around bookkeeping, driven directly
+# (no scan) so the expected rows are exact.
+# ---------------------------------------------------------------------------
+@pytest.fixture
+def bare_ring(connected_daq, settings):
+    """Manager with a tiny 10-row x 2-channel ring and no worker thread."""
+    em = ExperimentManager(connected_daq, settings)
+    em._ring_buf = np.zeros((10, 2), dtype=float)
+    return em
+
+
+def _rows(start: int, stop: int) -> np.ndarray:
+    """Rows whose values are their own monotonic index (both channels)."""
+    idx = np.arange(start, stop, dtype=float)
+    return np.column_stack([idx, -idx])
+
+
+def _append(em: ExperimentManager, start: int, stop: int) -> None:
+    with em._ring_lock:
+        em._ring_append_locked(_rows(start, stop))
+
+
+def test_peek_last_across_wrap(bare_ring):
+    _append(bare_ring, 0, 7)
+    _append(bare_ring, 7, 14)  # wraps: physical rows 7..9 then 0..3
+    np.testing.assert_array_equal(bare_ring.peek_last_samples(6), _rows(8, 14))
+    np.testing.assert_array_equal(bare_ring.snapshot_ring_buffer(), _rows(4, 14))
+
+
+def test_peek_last_view_is_read_only(bare_ring):
+    _append(bare_ring, 0, 5)
+    view = bare_ring.peek_last_samples(3, copy=False)
+    np.testing.assert_array_equal(view, _rows(2, 5))
+    assert not view.flags.writeable
+    assert np.shares_memory(view, bare_ring._ring_buf)
+
+
+def test_read_new_reports_overwritten_rows(bare_ring, caplog):
+    _append(bare_ring, 0, 4)
+    np.testing.assert_array_equal(bare_ring.read_new_samples("c"), _rows(0, 4))
+    _append(bare_ring, 4, 20)  # laps the consumer: rows 4..9 are gone
+    with caplog.at_level("WARNING"):
+        out = bare_ring.read_new_samples("c")
+    np.testing.assert_array_equal(out, _rows(10, 20))
+    assert "fell behind by 6 samples" in caplog.text
+    assert bare_ring.read_new_samples("c").shape == (0, 0)
+
+
+def test_oversized_append_keeps_newest_rows(bare_ring):
+    _append(bare_ring, 0, 25)
+    np.testing.assert_array_equal(bare_ring.snapshot_ring_buffer(), _rows(15, 25))
+    assert bare_ring._ring_total_samples == 25
+
+
+# ---------------------------------------------------------------------------
+# Incremental ingestion: copy whatever the driver completed since the last
+# poll instead of waiting for the half-buffer flip.
+# ---------------------------------------------------------------------------
+def _dma_view(spc: int, n_chans: int) -> np.ndarray:
+    """``(spc, n_chans)`` buffer where row r holds (2r, 2r+1, ...)."""
+    return np.arange(spc * n_chans, dtype=float).reshape(spc, n_chans)
+
+
+def test_take_completed_span_handles_wrap():
+    """A span crossing the end of the DMA buffer is stitched tail + head."""
+    rows, consumed = ExperimentManager._take_completed_span(
+        _dma_view(8, 2), scan_count=11, consumed=5, min_chunk=1, keep_indices=[0, 1],
+    )
+    assert consumed == 11
+    np.testing.assert_array_equal(rows[:, 0], [10, 12, 14, 0, 2, 4])
+
+
+def test_take_completed_span_respects_min_chunk():
+    rows, consumed = ExperimentManager._take_completed_span(
+        _dma_view(8, 2), scan_count=3, consumed=0, min_chunk=4, keep_indices=[0, 1],
+    )
+    assert rows is None and consumed == 0
+
+
+def test_take_completed_span_skips_overwritten_scans(caplog):
+    """More pending scans than the buffer holds: keep the newest buffer-full."""
+    with caplog.at_level("WARNING"):
+        rows, consumed = ExperimentManager._take_completed_span(
+            _dma_view(8, 2), scan_count=20, consumed=0, min_chunk=1, keep_indices=[1],
+        )
+    assert rows.shape == (8, 1) and consumed == 20
+    assert "12 samples per channel lost" in caplog.text
+
+
+def test_incremental_ingestion_streams_small_chunks(connected_daq, settings):
+    """Incremental mode fills the ring well before the first half-buffer flip."""
+    settings.acquisition.ingestion = "incremental"
+    em = ExperimentManager(connected_daq, settings)
+    em.start_ring_buffer([0, 1, 2, 3, 4, 5], max_seconds=2.0)
+    try:
+        # The half-buffer flip would deliver nothing before 0.5 s.
+        _wait_for_chunks(em, min_samples=settings.ai_params.sample_rate // 10, timeout=0.4)
+        first = em.read_new_samples("inc")
+        time.sleep(0.1)
+        second = em.read_new_samples("inc")
+        assert first.shape[1] == 6 and 0 < second.shape[0] < settings.ai_params.sample_rate // 2
+    finally:
+        em.stop()
+
+
+def test_poll_period_tracks_sample_rate_and_clamps():
+    """The worker sleeps for the time the missing scans need, within bounds."""
+    assert _poll_period(500, 20000) == pytest.approx(0.025)
+    assert _poll_period(1, 20000) == POLL_PERIOD_MIN
+    assert _poll_period(10**6, 20000) == POLL_PERIOD_MAX
+    assert _poll_period(10, 0) == POLL_PERIOD_MIN
+
+
+def test_rows_to_next_half_targets_the_next_boundary():
+    """Distance (in scans) from the flat writer index to the next half edge."""
+    assert _rows_to_next_half(0, 2, 100) == 50
+    assert _rows_to_next_half(2 * 30, 2, 100) == 20
+    assert _rows_to_next_half(2 * 50, 2, 100) == 50
+    assert _rows_to_next_half(2 * 99, 2, 100) == 1
+
+
+def test_ring_worker_counters_show_paced_polling(connected_daq, settings):
+    """The ring worker reports its polls / CPU and no longer spins at ~1 kHz."""
+    em = ExperimentManager(connected_daq, settings)
+    assert em.worker_counters() == {}
+    em.start_ring_buffer([0, 1, 2, 3, 4, 5], max_seconds=2.0)
+    try:
+        _wait_for_chunks(em, min_samples=settings.ai_params.sample_rate // 2)
+    finally:
+        em.stop()
+    ring = em.worker_counters()["ring"]
+    assert ring["polls"] > 0 and ring["wall_seconds"] > 0
+    assert 0.0 <= ring["cpu_fraction"] <= 1.0
+    assert ring["polls"] < ring["wall_seconds"] / (5 * POLL_PERIOD_MIN)
+
+
+@pytest.mark.parametrize("dtype, itemsize", [("float32", 4), ("int16", 2)])
+def test_compact_ring_storage_decodes_on_read(connected_daq, settings, dtype, itemsize):
+    """Compact storage shrinks the ring; readers still get float64 volts."""
+    settings.acquisition.storage_dtype = dtype
+    em = ExperimentManager(connected_daq, settings)
+    em.start_ring_buffer([0, 1, 2, 3, 4, 5], max_seconds=2.0)
+    try:
+        _wait_for_chunks(em, min_samples=settings.ai_params.sample_rate // 4)
+        assert em._ring_buf is not None and em._ring_buf.dtype.itemsize == itemsize
+        assert em.sample_codec.dtype == dtype
+        peek = em.peek_last_samples(100, copy=False)
+        assert peek.dtype == np.float64 and peek.shape == (100, 6)
+        raw = em.read_new_samples("raw", decode=False)
+        assert raw.dtype == np.dtype(dtype)
+        decoded = em.sample_codec.decode(raw)
+        assert decoded.dtype == np.float64 and np.all(np.abs(decoded) <= 10.0)
+    finally:
+        em.stop()
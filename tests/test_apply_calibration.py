@@ -24,9 +24,11 @@ from pioner.back.modes import (
     _kamp_divide,
     _lockin_reference,
     apply_calibration,
+    calibrate_array,
     heater_resistance,
 )
 from pioner.shared.calibration import Calibration
+from pioner.shared.channels import HEATER_AO
 from pioner.shared.modulation import ModulationParams
 
 
@@ -246,3 +248,94 @@ def test_heater_resistance_all_nan_when_channels_absent():
     out = heater_resistance(df, cal)
     assert len(out) == 10
     assert out.isna().all()
+
+
+def _production_like_calibration() -> Calibration:
+    cal = Calibration()
+    cal.utpl0, cal.ttpl0, cal.ttpl1 = 0.1, 25.0, -0.3
+    cal.ihtr0, cal.ihtr1, cal.uhtr0, cal.uhtr1 = 0.0, 1.0, 0.05, 1.2
+    cal.thtr0, cal.thtr1, cal.thtr2, cal.thtrcorr = -1069.7, 0.78336, -8.67e-5, 3.0
+    return cal
+
+
+def test_calibrate_array_matches_reference_formulas():
+    """The in-place kernel reproduces the textbook expressions, idle -> NaN."""
+    cal = _production_like_calibration()
+    hw = cal.hardware
+    rng = np.random.default_rng(3)
+    n, sr, offset = 5000, 20000.0, 700
+    data = rng.uniform(-0.5, 0.5, size=(n, 6))
+    data[::7, 0] = 0.0                        # idle heater current
+    data[5, 3] = np.nan                       # Series.mean skips NaN
+    profile = np.linspace(0.0, 1.0, 1234)
+    before = data.copy()
+
+    columns, values = calibrate_array(
+        data, list(range(6)), sr, cal, uref_profile=profile, sample_offset=offset
+    )
+    out = dict(zip(columns, values))
+    np.testing.assert_array_equal(data, before)
+    assert columns == ["time", "Taux", "temp", "temp-hr", "Thtr", "Uref"]
+    assert values.shape == (6, n)
+
+    taux = hw.correct_ad595(100.0 * np.nanmean(data[:, 3]))
+    ax = data[:, 4] * (1000.0 / hw.gain_utpl) + cal.utpl0
+    ax_hr = data[:, 1] * (1000.0 / hw.gain_umod) + cal.utpl0
+    ih = cal.ihtr0 + data[:, 0] * cal.ihtr1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = (data[:, 5] - data[:, 0] + cal.uhtr0) * cal.uhtr1 / ih
+    r[np.abs(ih) <= 1e-9] = np.nan
+    x = r + cal.thtrcorr
+
+    np.testing.assert_allclose(out["time"], (offset + np.arange(n)) * 1000.0 / sr)
+    np.testing.assert_allclose(out["Taux"], taux)
+    np.testing.assert_allclose(out["temp"], cal.ttpl0 * ax + cal.ttpl1 * ax**2 + taux, rtol=1e-12)
+    np.testing.assert_allclose(out["temp-hr"], cal.ttpl0 * ax_hr + cal.ttpl1 * ax_hr**2, rtol=1e-12)
+    np.testing.assert_allclose(
+        out["Thtr"], cal.thtr0 + cal.thtr1 * x + cal.thtr2 * x**2, rtol=1e-12
+    )
+    assert np.isnan(out["Thtr"][::7]).all()
+    np.testing.assert_allclose(out["Uref"], np.tile(profile, 5)[:n])
+
+
+def test_apply_calibration_wraps_kernel_keeping_index_and_extra_columns():
+    cal = _production_like_calibration()
+    rng = np.random.default_rng(4)
+    raw = pd.DataFrame(rng.uniform(0.1, 0.5, size=(300, 6)), index=np.arange(1000, 1300))
+    raw["flag"] = 1.0                          # not an AI channel: kept, first
+    out = apply_calibration(
+        raw, sample_rate=1000.0, calibration=cal,
+        voltage_profiles={HEATER_AO: np.full(10, 0.25)}, ai_channels=list(range(6)),
+    )
+    columns, values = calibrate_array(
+        raw[list(range(6))].to_numpy(), list(range(6)), 1000.0, cal,
+        uref_profile=np.full(10, 0.25),
+    )
+    assert list(out.columns) == ["flag", *columns]
+    pd.testing.assert_index_equal(out.index, raw.index)
+    np.testing.assert_array_equal(out[columns].to_numpy(), values.T)
+
+
+def test_apply_calibration_accepts_non_numeric_extra_columns():
+    cal = _production_like_calibration()
+    rng = np.random.default_rng(5)
+    raw = pd.DataFrame(rng.uniform(0.1, 0.5, size=(200, 6)))
+    numeric = apply_calibration(raw, 1000.0, cal, {}, ai_channels=list(range(6)))
+    raw["segment"] = "baseline"                # a label column, not AI
+    out = apply_calibration(raw, 1000.0, cal, {}, ai_channels=list(range(6)))
+    assert list(out.columns) == ["segment", *numeric.columns]
+    pd.testing.assert_frame_equal(out[numeric.columns], numeric)
+
+
+def test_calibrate_array_row_major_tiles_match_column_major():
+    """A C-order block (tiled) calibrates exactly like its F-order copy."""
+    cal = _production_like_calibration()
+    rng = np.random.default_rng(6)
+    data = rng.uniform(-0.5, 0.5, size=(20_011, 6))   # not a whole number of tiles
+    data[::9, 0] = 0.0
+    c_cols, c_values = calibrate_array(data, list(range(6)), 20000.0, cal,
+                                       uref_profile=np.linspace(0, 1, 333))
+    f_cols, f_values = calibrate_array(np.asfortranarray(data), list(range(6)), 20000.0,
+                                       cal, uref_profile=np.linspace(0, 1, 333))
+    assert c_cols == f_cols
+    np.testing.assert_array_equal(c_values, f_values)
@@ -0,0 +1,103 @@
+"""Tests for AsyncDeviceController -- the asyncio facade on the mock DAQ.
+
+Each test drives its own event loop with ``asyncio.run`` (no pytest-asyncio
+dependency): streams multiplexed with control, and a slow run stopped from
+the loop while chunks keep arriving.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+from pioner.back.async_controller import AsyncDeviceController
+from pioner.back.device_controller import DeviceController, LocalDeviceController
+from pioner.shared.channels import HEATER_CURRENT_AI
+from pioner.shared.constants import DEFAULT_SETTINGS_FILE_REL_PATH
+from pioner.shared.settings import BackSettings
+
+
+def _controller() -> LocalDeviceController:
+    settings = BackSettings(DEFAULT_SETTINGS_FILE_REL_PATH)
+    settings.modulation = settings.modulation.with_amplitude(0.0)  # quiet AC
+    return LocalDeviceController(settings, ring_max_seconds=2.0)
+
+
+async def _take(dev: AsyncDeviceController, consumer_id: str, n: int) -> list:
+    chunks = []
+    async for chunk in dev.stream(consumer_id):
+        chunks.append(chunk)
+        if len(chunks) == n:
+            break
+    return chunks
+
+
+def test_two_streams_and_reports_share_one_loop():
+    async def main():
+        async with AsyncDeviceController(_controller()) as dev:
+            a, b, health = await asyncio.wait_for(
+                asyncio.gather(_take(dev, "a", 2), _take(dev, "b", 2),
+                               dev.heater_health_report()),
+                timeout=5.0,
+            )
+            # Both streams received the same shared chunks.
+            assert a[0] is b[0] and a[0].shape[1] == 6
+            assert "available" in health
+            # Breaking out of ``async for`` released the subscriptions.
+            assert dev.controller.acquisition_metrics()["subscribers"] == []
+
+    asyncio.run(main())
+
+
+def test_live_modulation_forwards_the_channel():
+    async def main():
+        async with AsyncDeviceController(_controller()) as dev:
+            rep = await dev.live_modulation(37.5, 0.5, (1,), channel=HEATER_CURRENT_AI)
+            assert rep["channel"] == HEATER_CURRENT_AI
+
+    asyncio.run(main())
+
+
+def test_run_and_stop_from_the_loop(tmp_path, monkeypatch):
+    import pioner.back.device_controller as dc
+
+    monkeypatch.setattr(dc, "EXP_DATA_FILE_REL_PATH", str(tmp_path / "exp.h5"))
+
+    async def main():
+        async with AsyncDeviceController(_controller()) as dev:
+            await dev.arm(
+                "slow",
+                '{"ch0": {"time": [0, 5000], "volt": [0.1, 0.1]}, '
+                '"ch1": {"time": [0, 5000], "volt": [0, 1]}}',
+            )
+            run = asyncio.create_task(dev.run())
+            chunks = await asyncio.wait_for(_take(dev, "live", 1), timeout=3.0)
+            await dev.stop_run()
+            result = await asyncio.wait_for(run, timeout=4.0)
+            assert chunks and result is not None and result.aborted
+
+    asyncio.run(main())
+
+
+def test_stream_ends_cleanly_on_a_backend_without_ai(caplog):
+    class Bare(DeviceController):
+        def connect(self): ...
+        def disconnect(self): ...
+        def is_connected(self): return True
+        def load_calibration(self, str_calib): ...
+        def apply_calibration(self): ...
+        def apply_default_calibration(self): ...
+        def get_calibration(self): return {}
+        def set_sample_rate(self, rate): ...
+        def reset_sample_rate(self): ...
+        def get_sample_rate(self): return 0
+        def arm(self, mode_name, programs_json): ...
+        def run(self): return None
+
+    async def main():
+        dev = AsyncDeviceController(Bare())
+        assert await asyncio.wait_for(_take(dev, "x", 1), timeout=1.0) == []
+        await dev.aclose()
+
+    with caplog.at_level("WARNING", logger="pioner.back.async_controller"):
+        asyncio.run(main())
+    assert "does not stream AI" in caplog.text
@@ -224,6 +224,86 @@ def test_front_settings_round_trips_measured_reference(tmp_path: Path):
     assert BackSettings(str(p)).modulation.use_measured_reference is True
 
 
+def test_lockin_output_rate_parsed_and_round_tripped(tmp_path: Path):
+    from pioner.shared.constants import LOCKIN_OUTPUT_RATE_FIELD, MODULATION_FIELD
+    from pioner.shared.settings import BackSettings, FrontSettings
+
+    assert BackSettings(DEFAULT_SETTINGS_FILE_REL_PATH).modulation.lockin_output_rate == 0.0
+    data = json.loads(Path(DEFAULT_SETTINGS_FILE_REL_PATH).read_text())
+    data["ExperimentSettings"][MODULATION_FIELD][LOCKIN_OUTPUT_RATE_FIELD] = 30
+    p = tmp_path / "settings.json"
+    p.write_text(json.dumps(data))
+    assert BackSettings(str(p)).modulation.lockin_output_rate == 30.0
+    assert FrontSettings(str(p)).get_exp_settings()[MODULATION_FIELD][LOCKIN_OUTPUT_RATE_FIELD] == 30
+
+    data["ExperimentSettings"][MODULATION_FIELD][LOCKIN_OUTPUT_RATE_FIELD] = -1
+    p.write_text(json.dumps(data))
+    with pytest.raises(ValueError, match=LOCKIN_OUTPUT_RATE_FIELD):
+        BackSettings(str(p))
+
+
+def test_modulation_tones_parsed_validated_and_round_tripped(tmp_path: Path):
+    from pioner.shared.constants import MODULATION_FIELD, TONES_FIELD
+    from pioner.shared.settings import BackSettings, FrontSettings
+
+    assert BackSettings(DEFAULT_SETTINGS_FILE_REL_PATH).modulation.tones == ()
+    data = json.loads(Path(DEFAULT_SETTINGS_FILE_REL_PATH).read_text())
+    tones = [{"Frequency": 75, "Amplitude": 0.05}, {"Frequency": 151.0, "Amplitude": 0.02}]
+    data["ExperimentSettings"][MODULATION_FIELD][TONES_FIELD] = tones
+    p = tmp_path / "settings.json"
+    p.write_text(json.dumps(data))
+    modulation = BackSettings(str(p)).modulation
+    assert modulation.tones == ((75.0, 0.05), (151.0, 0.02))
+    assert modulation.all_tones[0] == (modulation.frequency, modulation.amplitude)
+    assert FrontSettings(str(p)).get_exp_settings()[MODULATION_FIELD][TONES_FIELD] == tones
+
+    for bad in ([{"Frequency": 75}], [{"Frequency": 37.5, "Amplitude": 0.1}], [75.0]):
+        data["ExperimentSettings"][MODULATION_FIELD][TONES_FIELD] = bad
+        p.write_text(json.dumps(data))
+        with pytest.raises(ValueError, match=TONES_FIELD):
+            BackSettings(str(p))
+
+
+def test_snap_frequency_parsed_and_round_tripped(tmp_path: Path):
+    from pioner.shared.constants import MODULATION_FIELD, SNAP_FREQUENCY_FIELD
+    from pioner.shared.settings import BackSettings, FrontSettings
+
+    assert BackSettings(DEFAULT_SETTINGS_FILE_REL_PATH).modulation.snap_frequency is False
+    data = json.loads(Path(DEFAULT_SETTINGS_FILE_REL_PATH).read_text())
+    data["ExperimentSettings"][MODULATION_FIELD][SNAP_FREQUENCY_FIELD] = True
+    p = tmp_path / "settings.json"
+    p.write_text(json.dumps(data))
+    assert BackSettings(str(p)).modulation.snap_frequency is True
+    assert FrontSettings(str(p)).get_exp_settings()[MODULATION_FIELD][SNAP_FREQUENCY_FIELD] is True
+
+
+def test_fft_frame_layout_parsed_and_round_tripped(tmp_path: Path):
+    from pioner.shared.constants import (
+        FFT_FRAME_CYCLES_FIELD,
+        FFT_HOP_CYCLES_FIELD,
+        MODULATION_FIELD,
+    )
+    from pioner.shared.settings import BackSettings, FrontSettings
+
+    modulation = BackSettings(DEFAULT_SETTINGS_FILE_REL_PATH).modulation
+    assert (modulation.fft_frame_cycles, modulation.fft_hop_cycles) == (20.0, 10.0)
+    data = json.loads(Path(DEFAULT_SETTINGS_FILE_REL_PATH).read_text())
+    del data["ExperimentSettings"][MODULATION_FIELD][FFT_HOP_CYCLES_FIELD]
+    data["ExperimentSettings"][MODULATION_FIELD][FFT_FRAME_CYCLES_FIELD] = 8
+    p = tmp_path / "settings.json"
+    p.write_text(json.dumps(data))
+    modulation = BackSettings(str(p)).modulation
+    assert (modulation.fft_frame_cycles, modulation.fft_hop_cycles) == (8.0, 0.0)
+    exp = FrontSettings(str(p)).get_exp_settings()[MODULATION_FIELD]
+    assert exp[FFT_FRAME_CYCLES_FIELD] == 8
+    assert FFT_HOP_CYCLES_FIELD not in exp
+
+    data["ExperimentSettings"][MODULATION_FIELD][FFT_HOP_CYCLES_FIELD] = "x"
+    p.write_text(json.dumps(data))
+    with pytest.raises(ValueError, match=FFT_HOP_CYCLES_FIELD):
+        BackSettings(str(p))
+
+
 # --- CamelCase config keys/values (capitalized in settings.json) -----------
 
 def test_rate_map_accepts_capitalized_keys(tmp_path: Path):
@@ -261,5 +341,74 @@ def test_acquisition_mode_camelcase(tmp_path: Path):
     out = tmp_path / "settings.json"
     out.write_text(json.dumps(cfg))
     assert BackSettings(str(out)).acquisition_mode == "per_experiment"
+    cfg["AcquisitionMode"] = "Process"
+    out.write_text(json.dumps(cfg))
+    assert BackSettings(str(out)).acquisition_mode == "process"
     # The committed default uses the capitalized "Persistent".
     assert BackSettings(DEFAULT_SETTINGS_FILE_REL_PATH).acquisition_mode == "persistent"
+
+
+# --- AI ring ingestion (Acquisition block) ---------------------------------
+
+def test_default_acquisition_uses_half_buffer():
+    s = BackSettings(DEFAULT_SETTINGS_FILE_REL_PATH)
+    assert s.acquisition.ingestion == "half_buffer"
+    assert s.acquisition.min_chunk_samples == 16
+
+
+def test_acquisition_config_parsing():
+    from pioner.shared.settings import parse_acquisition_config
+    assert parse_acquisition_config(None).ingestion == "half_buffer"
+    cfg = parse_acquisition_config({"Ingestion": "Incremental", "MinChunkSamples": 4})
+    assert cfg.ingestion == "incremental" and cfg.min_chunk_samples == 4
+    with pytest.raises(ValueError):
+        parse_acquisition_config({"Ingestion": "Sometimes"})
+    with pytest.raises(ValueError):
+        parse_acquisition_config({"MinChunkSamples": 0})
+
+
+def test_acquisition_storage_dtype_parsing():
+    from pioner.shared.settings import parse_acquisition_config
+    assert BackSettings(DEFAULT_SETTINGS_FILE_REL_PATH).acquisition.storage_dtype == "float64"
+    assert parse_acquisition_config({"StorageDtype": "Int16"}).storage_dtype == "int16"
+    assert parse_acquisition_config({"StorageDtype": "float32"}).storage_dtype == "float32"
+    with pytest.raises(ValueError):
+        parse_acquisition_config({"StorageDtype": "Float16"})
+
+
+def test_acquisition_record_compression_parsing():
+    from pioner.shared.settings import parse_acquisition_config
+    assert BackSettings(DEFAULT_SETTINGS_FILE_REL_PATH).acquisition.record_compression == "none"
+    assert parse_acquisition_config({"RecordCompression": "Lzf"}).record_compression == "lzf"
+    assert parse_acquisition_config({"RecordCompression": None}).record_compression == "none"
+    with pytest.raises(ValueError):
+        parse_acquisition_config({"RecordCompression": "Zstd"})
+
+
+def test_acquisition_record_segment_parsing():
+    from pioner.shared.settings import parse_acquisition_config
+    cfg = BackSettings(DEFAULT_SETTINGS_FILE_REL_PATH).acquisition
+    assert cfg.record_segment_seconds is None and cfg.record_segment_megabytes is None
+    cfg = parse_acquisition_config({"RecordSegmentSeconds": 3600, "RecordSegmentMegabytes": 512})
+    assert (cfg.record_segment_seconds, cfg.record_segment_megabytes) == (3600.0, 512.0)
+    with pytest.raises(ValueError):
+        parse_acquisition_config({"RecordSegmentSeconds": 0})
+
+
+def test_acquisition_telemetry_parsing():
+    from pioner.shared.settings import parse_acquisition_config
+    default = BackSettings(DEFAULT_SETTINGS_FILE_REL_PATH).acquisition
+    assert default.telemetry_file is None and default.telemetry_interval == 10.0
+    cfg = parse_acquisition_config({"TelemetryFile": "logs/acq.jsonl", "TelemetryInterval": 2})
+    assert cfg.telemetry_file == "logs/acq.jsonl" and cfg.telemetry_interval == 2.0
+    with pytest.raises(ValueError):
+        parse_acquisition_config({"TelemetryInterval": 0})
+    with pytest.raises(ValueError):
+        parse_acquisition_config({"TelemetryFile": 5})
+
+
+def test_front_settings_round_trips_acquisition_block():
+    from pioner.shared.constants import ACQUISITION_FIELD
+    from pioner.shared.settings import FrontSettings
+    exp = FrontSettings(DEFAULT_SETTINGS_FILE_REL_PATH).get_exp_settings()
+    assert exp[ACQUISITION_FIELD]["Ingestion"] == "HalfBuffer"
@@ -130,6 +130,43 @@ def test_production_calibration_polynomial_inverts():
     assert sub_zero[0] == 0.0
 
 
+def test_inverse_table_cached_per_fingerprint_and_rebuilt_on_change():
+    """Re-arming reuses the T -> V table; editing the polynomial rebuilds it."""
+    from pioner.shared.utils import _INVERSE_CACHE
+
+    cal = Calibration()
+    cal.theater0, cal.theater1, cal.theater2 = -2.425, 8.0393, -0.42986
+    cal._add_params()
+    _INVERSE_CACHE.clear()
+    first = temperature_to_voltage(np.array([50.0, 150.0]), cal)
+    np.testing.assert_array_equal(temperature_to_voltage(np.array([50.0, 150.0]), cal), first)
+    assert (_INVERSE_CACHE.stats()["misses"], _INVERSE_CACHE.stats()["hits"]) == (1, 1)
+
+    cal.theater1 = 9.0  # mutated in place (calibration window / file reload)
+    cal._add_params()
+    changed = temperature_to_voltage(np.array([50.0, 150.0]), cal)
+    assert _INVERSE_CACHE.stats()["misses"] == 2
+    assert np.all(changed < first)
+    np.testing.assert_allclose(voltage_to_temperature(changed, cal), [50.0, 150.0], atol=0.01)
+
+
+@pytest.mark.parametrize(
+    "coeffs",
+    [(-2.425, 8.0393, -0.42986), (1.0, 0.0, 0.0), (2.0, 3.0, 0.0), (10.0, -0.5, 0.05)],
+)
+def test_analytic_inverse_matches_table(coeffs):
+    """Closed-form cubic + Newton: same root as the table, without its grid step."""
+    cal = Calibration()
+    cal.theater0, cal.theater1, cal.theater2 = coeffs
+    cal._add_params()
+    temps = np.linspace(0.0, cal.max_temp, 10_001)
+    analytic = temperature_to_voltage(temps, cal, analytic=True)
+    np.testing.assert_allclose(analytic, temperature_to_voltage(temps, cal), atol=1.01e-4)
+    hot = temps > 1.0  # past the production polynomial's sub-zero dip
+    np.testing.assert_allclose(voltage_to_temperature(analytic, cal)[hot], temps[hot], atol=1e-9)
+    assert temperature_to_voltage(np.array([-1.0]), cal, analytic=True)[0] == 0.0
+
+
 def test_default_calibration_pins_identity_constants():
     """Pin the bundled default calibration to its identity coefficients.
 
@@ -9,6 +9,7 @@ CI/dev boxes); its surface is a thin pass-through to a DeviceProxy.
 from __future__ import annotations
 
 import json
+import threading
 import time
 
 import numpy as np
@@ -19,6 +20,7 @@ from pioner.back.device_controller import (
     LocalDeviceController,
 )
 from pioner.back.modes import read_calibrated_h5
+from pioner.back.subscription import OverflowPolicy, Subscription
 from pioner.shared.constants import DEFAULT_SETTINGS_FILE_REL_PATH
 from pioner.shared.settings import BackSettings
 
@@ -40,6 +42,27 @@ def _ao_shared(controller):
     return controller._daq.get_ao_device()._shared  # type: ignore[union-attr]
 
 
+class _ScriptedProvider:
+    """Ring stand-in that publishes only when told to (deterministic feeds)."""
+
+    def __init__(self) -> None:
+        self.ring = np.empty((0, 8))
+        self.subs: list[Subscription] = []
+
+    def subscribe(self, name, maxsize=8, policy=OverflowPolicy.DROP_OLDEST, callback=None):
+        sub = Subscription(name, maxsize=maxsize, policy=policy, callback=callback)
+        self.subs.append(sub)
+        return sub
+
+    def publish(self, rows: np.ndarray) -> None:
+        self.ring = np.vstack([self.ring, rows])
+        for sub in self.subs:
+            sub._offer(rows)
+
+    def peek_last(self, samples: int) -> np.ndarray:
+        return self.ring[-samples:]
+
+
 def _wait_for_stream(controller: DeviceController, timeout: float = 2.0) -> np.ndarray:
     deadline = time.monotonic() + timeout
     while time.monotonic() < deadline:
@@ -188,6 +211,126 @@ class TestChipPresence:
         assert local_controller.chip_present() is False
 
 
+class TestLiveReadout:
+    """Incremental Values-sidebar readout off a ring subscription."""
+
+    def _wait_available(self, controller, timeout: float = 2.0) -> dict:
+        deadline = time.monotonic() + timeout
+        rep = controller.live_readout(window_seconds=0.5)
+        while not rep["available"] and time.monotonic() < deadline:
+            time.sleep(0.05)
+            rep = controller.live_readout(window_seconds=0.5)
+        return rep
+
+    def test_unavailable_when_disconnected(self):
+        controller = LocalDeviceController(BackSettings(DEFAULT_SETTINGS_FILE_REL_PATH))
+        assert controller.live_readout()["available"] is False
+
+    def test_accumulates_only_new_rows(self, local_controller):
+        rep = self._wait_available(local_controller)
+        assert rep["available"] is True
+        assert {"Taux", "temp", "temp-hr", "Thtr"} <= set(rep["last"])
+        first = rep["rows"]
+        deadline = time.monotonic() + 2.0
+        while rep["rows"] == first and time.monotonic() < deadline:
+            time.sleep(0.05)
+            rep = local_controller.live_readout(window_seconds=0.5)
+        assert rep["rows"] > first
+        assert rep["window_rows"] <= 0.5 * local_controller.ai_sample_rate
+
+    def test_calibration_change_restarts_aggregates(self, local_controller):
+        self._wait_available(local_controller)
+        local_controller.apply_default_calibration()
+        assert local_controller._live.snapshot()["rows"] == 0
+
+    def test_concurrent_first_calls_share_one_subscription(self, local_controller):
+        start = threading.Barrier(8)
+
+        def call():
+            start.wait()
+            local_controller.live_readout(window_seconds=0.5)
+
+        threads = [threading.Thread(target=call) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        names = [s["name"] for s in local_controller._em.subscription_stats()]
+        assert names.count(LocalDeviceController._LIVE_READOUT) == 1
+
+    def test_disconnect_unsubscribes_live_feeds(self):
+        controller = LocalDeviceController(BackSettings(DEFAULT_SETTINGS_FILE_REL_PATH))
+        controller.connect()
+        controller.live_readout()
+        controller.live_modulation(37.5)
+        em = controller._em
+        subs = (controller._live_sub, controller._mod_sub)
+        assert len(em.subscription_stats()) == 2
+        controller.disconnect()
+        assert em.subscription_stats() == []
+        assert all(sub is not None and sub.closed for sub in subs)
+
+
+class TestLiveModulation:
+    """Sliding-DFT Umod readout off a ring subscription."""
+
+    def _wait_available(self, controller, timeout: float = 3.0) -> dict:
+        deadline = time.monotonic() + timeout
+        rep = controller.live_modulation(37.5, window_seconds=0.5)
+        while not rep["available"] and time.monotonic() < deadline:
+            time.sleep(0.05)
+            rep = controller.live_modulation(37.5, window_seconds=0.5)
+        return rep
+
+    def test_unavailable_when_disconnected(self):
+        controller = LocalDeviceController(BackSettings(DEFAULT_SETTINGS_FILE_REL_PATH))
+        assert controller.live_modulation(37.5)["available"] is False
+
+    def test_advances_with_new_rows(self, local_controller):
+        rep = self._wait_available(local_controller)
+        assert rep["available"] is True
+        assert rep["window_samples"] <= 0.5 * local_controller.ai_sample_rate
+        assert set(rep["harmonics"]) == {1}
+        assert np.isfinite(rep["harmonics"][1]["amplitude"])
+        first = rep["samples"]
+        deadline = time.monotonic() + 2.0
+        while rep["samples"] == first and time.monotonic() < deadline:
+            time.sleep(0.05)
+            rep = local_controller.live_modulation(37.5, window_seconds=0.5)
+        assert rep["samples"] > first
+
+    def test_sample_rate_change_reseeds(self, local_controller):
+        assert self._wait_available(local_controller)["available"] is True
+        rate = local_controller.get_sample_rate() // 2
+        local_controller.set_sample_rate(rate)
+        rep = local_controller.live_modulation(37.5, window_seconds=0.5)
+        assert rep["available"] is False
+        assert local_controller._mod_key[0] == rate
+
+    def test_rows_published_during_reseed_count_once(self):
+        controller = LocalDeviceController(BackSettings(DEFAULT_SETTINGS_FILE_REL_PATH))
+        provider = _ScriptedProvider()
+        controller._provider = provider
+        provider.publish(np.ones((400, 8)))  # history from before the call
+        sub = provider.subscribe(LocalDeviceController._LIVE_MODULATION)
+        real_drain = sub.drain
+        state = {"first": True}
+
+        def drain_then_publish():
+            rows = real_drain()
+            if state.pop("first", False):
+                # The worker publishes right after the re-seed drain.
+                provider.publish(np.ones((50, 8)))
+            return rows
+
+        sub.drain = drain_then_publish
+        controller._mod_sub = sub
+        controller.live_modulation(37.5, window_seconds=0.5)
+        provider.publish(np.ones((30, 8)))
+        rep = controller.live_modulation(37.5, window_seconds=0.5)
+        assert rep["samples"] == 80
+
+
 class TestConnection:
     def test_connects_and_streams(self, local_controller):
         assert local_controller.is_connected()
@@ -208,6 +351,23 @@ class TestConnection:
     def test_ai_sample_rate_reported(self, local_controller):
         assert local_controller.ai_sample_rate > 0
 
+    def test_telemetry_dumped_to_jsonl(self, tmp_path):
+        settings = BackSettings(DEFAULT_SETTINGS_FILE_REL_PATH)
+        path = tmp_path / "telemetry.jsonl"
+        settings.acquisition.telemetry_file = str(path)
+        settings.acquisition.telemetry_interval = 0.1
+        controller = LocalDeviceController(settings)
+        controller.connect()
+        try:
+            _wait_for_stream(controller)
+            live = controller.acquisition_metrics()
+            assert live["chunks"] > 0 and "workers" in live
+        finally:
+            controller.disconnect()
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert len(lines) >= 2  # periodic + the final line on disconnect
+        assert lines[-1]["host_ingested"] > 0
+
     def test_reports_mock_backend(self):
         # The real uldaq is absent on the dev/CI host, so the controller must
         # self-report as the mock backend. This is the truth source the GUI
@@ -487,3 +647,57 @@ class TestIsoHold:
         controller.disconnect()
         # zero_ao ran before release, so the last commanded heater value is 0.
         assert shared.iso_voltages.get(1) == 0.0
+
+
+class TestProcessMode:
+    """AcquisitionMode "process": the DAQ and the manager live in a child
+    process, the controller drives them through the AcquisitionEngine."""
+
+    @pytest.fixture
+    def process_controller(self, tmp_path, monkeypatch):
+        import pioner.back.device_controller as dc
+        monkeypatch.setattr(dc, "EXP_DATA_FILE_REL_PATH", str(tmp_path / "exp.h5"))
+        settings = BackSettings(DEFAULT_SETTINGS_FILE_REL_PATH)
+        settings.modulation = settings.modulation.with_amplitude(0.0)
+        settings.acquisition_mode = "process"
+        controller = LocalDeviceController(settings, ring_max_seconds=2.0)
+        controller.connect()
+        try:
+            yield controller
+        finally:
+            controller.disconnect()
+
+    def test_runs_go_through_the_acquisition_process(self, process_controller):
+        import os
+        controller = process_controller
+        assert controller.is_connected() and controller._daq is None
+        assert _wait_for_stream(controller, timeout=5.0).shape[0] > 0
+        controller.arm(
+            "slow",
+            '{"ch0": {"time": [0, 500], "volt": [0.1, 0.1]}, '
+            '"ch1": {"time": [0, 500], "volt": [0, 1]}}',
+        )
+        slow = controller.run()
+        assert slow is not None and slow.rows > 0 and os.path.exists(slow.raw_path)
+        assert controller.is_streaming()
+        controller.arm_fast_heat(TestExperiment._FAST)
+        fast = controller.run_fast_heat()
+        assert fast is not None and fast.rows > 0
+        assert "Uref" in read_calibrated_h5(fast.cal_path)
+        assert controller.is_streaming()
+        assert _wait_for_stream(controller, timeout=5.0).shape[0] > 0
+        metrics = controller.acquisition_metrics()
+        assert metrics["engine"]["pid"] != os.getpid() and metrics["chunks"] > 0
+        assert "ring" in controller.acquisition_counters()
+
+    def test_iso_hold_then_disconnect_ends_the_child(self, process_controller):
+        controller = process_controller
+        controller.arm("iso", json.dumps({"ch1": {"volt": 0.5}}))
+        controller.start_iso_hold()
+        assert controller.is_holding and controller.is_streaming()
+        controller.stop_run()
+        assert not controller.is_holding
+        process = controller._engine._process
+        controller.disconnect()
+        assert not process.is_alive()
+        assert not controller.is_connected()
@@ -12,8 +12,10 @@ background thread's timing -- ``mark_start`` and ``stop`` each drain explicitly.
 from __future__ import annotations
 
 import threading
+import time
 
 import h5py
+import pytest
 import numpy as np
 
 from pioner.back.acquisition.disk_recorder import DiskRecorder
@@ -141,3 +143,110 @@ def test_chunk_order_preserved_across_many_feeds(tmp_path):
     assert rows == 60
     expected = np.repeat(np.arange(20, dtype=float), 3).reshape(-1, 1)
     assert np.array_equal(raw, expected)
+
+
+def test_chunk_rows_tracks_rate_within_byte_bounds():
+    from pioner.back.acquisition.disk_recorder import chunk_rows_for
+
+    assert chunk_rows_for(2000.0, 6, 8) == 2000              # ~1 s at 2 kHz
+    assert chunk_rows_for(1e6, 6, 8) == (1024 * 1024) // 48  # capped at 1 MiB
+    assert chunk_rows_for(10.0, 6, 8) == (64 * 1024) // 48   # at least 64 KiB
+    assert chunk_rows_for(None, 6, 2) == (64 * 1024) // 12   # unknown rate
+
+
+@pytest.mark.parametrize("compression", [None, "lzf", "gzip"])
+def test_staged_blocks_round_trip_with_compression(tmp_path, compression):
+    # chunk_rows_for(100 Hz, 2 ch) = 4096 rows, so 20 feeds of 1000 rows cross
+    # several staging blocks and geometric resizes before the final trim.
+    ring = FakeRing(channels=2)
+    rec = DiskRecorder(ring, str(tmp_path / "raw.h5"), consumer_id="t",
+                       poll_interval=0.01, sample_rate=100.0, compression=compression)
+    rec.start()
+    for i in range(20):
+        ring.feed(1000, float(i))
+        if i == 7:
+            rec.mark_start()
+    path = rec.stop()
+
+    raw, rows, mark = _read(path)
+    assert rows == 20_000 and raw.shape == (20_000, 2)
+    assert mark == 8000
+    assert np.array_equal(raw[:, 0], np.repeat(np.arange(20, dtype=float), 1000))
+    with h5py.File(path, "r") as f:
+        dset = f["raw_ai"]
+        assert dset.chunks == (4096, 2)
+        assert dset.compression == compression
+        assert dset.shuffle == (compression is not None)
+
+
+def test_unknown_compression_rejected(tmp_path):
+    with pytest.raises(ValueError, match="compression"):
+        DiskRecorder(FakeRing(), str(tmp_path / "raw.h5"), compression="zstd")
+
+
+def test_run_statistics_split_at_mark(tmp_path):
+    from pioner.back.acquisition.raw_recording import RawRecording
+
+    ring = FakeRing(channels=2)
+    rec = _recorder(ring, tmp_path)
+    rec.start()
+    ring.feed(40, 1.0)
+    rec.mark_start()
+    ring.feed(60, 3.0)
+    path = rec.stop()
+
+    with RawRecording(path) as raw:
+        summary = raw.summary()
+    assert summary is not None and summary["rows"] == 100
+    np.testing.assert_allclose(summary["mean"], 2.2)
+    np.testing.assert_allclose(summary["std"], np.std([1.0] * 40 + [3.0] * 60))
+    np.testing.assert_allclose(summary["min"], 1.0)
+    np.testing.assert_allclose(summary["max"], 3.0)
+    np.testing.assert_allclose(summary["baseline_mean"], 1.0)
+    np.testing.assert_allclose(summary["run_mean"], 3.0)
+
+
+def test_slow_writer_never_blocks_the_drain(tmp_path):
+    ring = FakeRing(channels=3)
+    rec = _recorder(ring, tmp_path)
+    release = threading.Event()
+    write = rec._write_block
+
+    def slow_write(rows):
+        release.wait(timeout=5.0)
+        write(rows)
+
+    rec._write_block = slow_write
+    rec.start()
+    block_rows = 4 * 2730  # _STAGE_CHUNKS chunks of 64 KiB at 3 float64 channels
+    for i in range(12):
+        ring.feed(block_rows, float(i))
+    rec.mark_start()  # stages 12 blocks while the writer is stuck on the first
+    assert rec.writer_overflows > 0 and rec.writer_backlog_max > 8
+    release.set()
+    raw, rows, mark = _read(rec.stop())
+    assert rows == mark == raw.shape[0] == 12 * block_rows
+    assert np.array_equal(raw[::block_rows, 0], np.arange(12, dtype=float))
+
+
+def test_failed_write_is_raised_and_stops_recording(tmp_path):
+    ring = FakeRing(channels=3)
+    rec = _recorder(ring, tmp_path)
+
+    def broken_write(rows):
+        raise OSError("disk full")
+
+    rec._write_block = broken_write
+    rec.start()
+    ring.feed(4 * 2730, 1.0)  # exactly one staging block
+    rec.mark_start()
+    deadline = time.monotonic() + 2.0
+    while rec._write_error is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    ring.feed(10, 2.0)
+    with pytest.raises(RuntimeError, match="failed") as info:
+        rec.mark_start()
+    assert isinstance(info.value.__cause__, OSError)
+    with pytest.raises(RuntimeError):
+        rec.stop()
+    assert not rec.is_recording
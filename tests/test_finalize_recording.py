@@ -22,9 +22,17 @@ from pioner.back.modes import (
     finalize_raw_to_h5,
     read_calibrated_h5,
 )
+from pioner.shared.modulation import (
+    fft_demodulate_frames,
+    fft_demodulate_tones,
+    lockin_demodulate,
+    lockin_demodulate_decimated,
+)
 from pioner.shared.calibration import Calibration
+from pioner.shared.channels import AD595_AI
 from pioner.shared.constants import DEFAULT_SETTINGS_FILE_REL_PATH
 from pioner.shared.modulation import ModulationParams
+from pioner.shared.sample_codec import SampleCodec
 from pioner.shared.settings import BackSettings
 
 
@@ -49,9 +57,24 @@ class FakeRing:
         return out
 
 
-def _write_raw(path: str, raw: np.ndarray) -> None:
-    ring = FakeRing(raw.shape[1])
-    rec = DiskRecorder(ring, path, consumer_id="t", poll_interval=0.01)
+class CodecRing(FakeRing):
+    """FakeRing holding rows in a codec's storage dtype, like the real ring."""
+
+    def __init__(self, channels: int, codec: SampleCodec):
+        super().__init__(channels)
+        self.codec = codec
+
+    def read_new_samples(self, consumer_id: str, decode: bool = True) -> np.ndarray:
+        out = super().read_new_samples(consumer_id)
+        if out.size == 0:
+            return out
+        stored = self.codec.encode(out)
+        return self.codec.decode(stored) if decode else stored
+
+
+def _write_raw(path: str, raw: np.ndarray, codec: SampleCodec | None = None) -> None:
+    ring = FakeRing(raw.shape[1]) if codec is None else CodecRing(raw.shape[1], codec)
+    rec = DiskRecorder(ring, path, consumer_id="t", poll_interval=0.01, codec=codec)
     rec.start()
     ring.feed(raw)
     rec.stop()
@@ -149,6 +172,121 @@ def test_finalize_lockin_columns_with_modulation(tmp_path):
     for col in ("temp-hr_amp", "temp-hr_phase", "temp-hr_valid"):
         assert col in cols
         assert len(_read_col(out_path, col)) == n
+    # Streamed block-wise, yet equal to the whole-signal lock-in of temp-hr.
+    amp, _, valid = lockin_demodulate(
+        _read_col(out_path, "temp-hr"), sample_rate=2000.0, frequency=100.0, return_valid=True
+    )
+    np.testing.assert_allclose(_read_col(out_path, "temp-hr_amp"), amp, rtol=1e-6, atol=1e-9)
+    np.testing.assert_array_equal(_read_col(out_path, "temp-hr_valid"), valid.astype(float))
+
+
+def test_finalize_decimated_lockin_group(tmp_path):
+    """LockinOutputRate > 0: lock-in outputs go to their own decimated group."""
+    raw_path = str(tmp_path / "raw.h5")
+    out_path = str(tmp_path / "cal.h5")
+    n = 20_000
+    raw = np.random.default_rng(5).uniform(0.1, 1.0, size=(n, len(DEFAULT_AI_CHANNELS)))
+    _write_raw(raw_path, raw)
+    finalize_raw_to_h5(
+        raw_path, out_path,
+        sample_rate=2000.0,
+        calibration=Calibration(),
+        settings=BackSettings(DEFAULT_SETTINGS_FILE_REL_PATH),
+        voltage_profiles={"ch1": np.linspace(0.0, 1.0, n)},
+        programs={"ch1": {"time": [0, 10_000], "volt": [0, 1]}},
+        ai_channels=DEFAULT_AI_CHANNELS,
+        modulation=ModulationParams(
+            frequency=37.5, amplitude=0.1, offset=0.0, lockin_output_rate=30.0
+        ),
+        block_rows=1500,
+    )
+    assert not any(c.startswith("temp-hr_") for c in _read_cols(out_path))
+    lockin = read_calibrated_h5(out_path, group="lockin")
+    assert set(lockin) == {"time", "temp-hr_amp", "temp-hr_phase", "temp-hr_valid"}
+    with h5py.File(out_path, "r") as f:
+        attrs = dict(f["lockin"].attrs)
+    assert attrs["decimation"] == 66
+    assert attrs["sample_rate"] == pytest.approx(2000.0 / 66)
+    # Block-wise, yet equal to the whole-signal decimated lock-in of temp-hr.
+    time, amp, _, valid = lockin_demodulate_decimated(
+        _read_col(out_path, "temp-hr"), sample_rate=2000.0, frequency=37.5, output_rate=30.0
+    )
+    np.testing.assert_allclose(lockin["time"], time)
+    np.testing.assert_allclose(lockin["temp-hr_amp"], amp, rtol=1e-6, atol=1e-9)
+    np.testing.assert_array_equal(lockin["temp-hr_valid"], valid.astype(float))
+
+
+@pytest.mark.parametrize("hop_cycles", [2.0, 0.0, 7.0])
+def test_finalize_iso_fft_frames_group(tmp_path, hop_cycles):
+    """Iso finalise: block-wise frames equal one fft_demodulate_frames call."""
+    raw_path = str(tmp_path / "raw.h5")
+    out_path = str(tmp_path / "cal.h5")
+    n = 20_000
+    raw = np.random.default_rng(6).uniform(0.1, 1.0, size=(n, len(DEFAULT_AI_CHANNELS)))
+    _write_raw(raw_path, raw)
+    finalize_raw_to_h5(
+        raw_path, out_path,
+        sample_rate=2000.0,
+        calibration=Calibration(),
+        settings=BackSettings(DEFAULT_SETTINGS_FILE_REL_PATH),
+        voltage_profiles={"ch1": np.full(200, 0.5)},
+        programs={"ch1": {"volt": 0.5}},
+        ai_channels=DEFAULT_AI_CHANNELS,
+        modulation=ModulationParams(
+            frequency=37.5, amplitude=0.1, offset=0.0,
+            fft_frame_cycles=5.0, fft_hop_cycles=hop_cycles,
+        ),
+        block_rows=1500,
+        tile_profile=True,
+    )
+    whole = fft_demodulate_frames(
+        _read_col(out_path, "temp-hr"), 2000.0, 37.5,
+        frame_cycles=5.0, hop_cycles=hop_cycles or None,
+    )
+    with h5py.File(out_path, "r") as f:
+        group = cast(h5py.Group, f["fft_frames"])
+        np.testing.assert_array_equal(cast(h5py.Dataset, group["time"])[:], whole.time)
+        np.testing.assert_allclose(cast(h5py.Dataset, group["amplitude"])[:], whole.amplitude,
+                                   rtol=1e-9)
+        np.testing.assert_allclose(cast(h5py.Dataset, group["phase"])[:], whole.phase, atol=1e-9)
+        assert group.attrs["hop_samples"] == whole.hop_samples
+
+
+def test_finalize_iso_multi_tone_group(tmp_path):
+    """Iso finalise with extra tones: block-summed bins equal one rfft of temp-hr."""
+    raw_path = str(tmp_path / "raw.h5")
+    out_path = str(tmp_path / "cal.h5")
+    n = 20_123
+    raw = np.random.default_rng(7).uniform(0.1, 1.0, size=(n, len(DEFAULT_AI_CHANNELS)))
+    _write_raw(raw_path, raw)
+    modulation = ModulationParams(
+        frequency=37.5, amplitude=0.1, offset=0.0, tones=((61.0, 0.05), (151.0, 0.02))
+    )
+    finalize_raw_to_h5(
+        raw_path, out_path,
+        sample_rate=2000.0,
+        calibration=Calibration(),
+        settings=BackSettings(DEFAULT_SETTINGS_FILE_REL_PATH),
+        voltage_profiles={"ch1": np.full(200, 0.5)},
+        programs={"ch1": {"volt": 0.5}},
+        ai_channels=DEFAULT_AI_CHANNELS,
+        modulation=modulation,
+        block_rows=1500,
+        tile_profile=True,
+    )
+    whole = fft_demodulate_tones(
+        _read_col(out_path, "temp-hr"), 2000.0, [37.5, 61.0, 151.0], harmonics=(1, 2, 3)
+    )
+    with h5py.File(out_path, "r") as f:
+        group = cast(h5py.Group, f["fft_tones"])
+        np.testing.assert_array_equal(cast(h5py.Dataset, group["frequency"])[:],
+                                      [37.5, 61.0, 151.0])
+        np.testing.assert_allclose(
+            cast(h5py.Dataset, group["amplitude"])[:],
+            [[h.amplitude for h in r.harmonics] for r in whole], rtol=1e-8,
+        )
+        assert group.attrs["window_samples"] == whole[0].window_samples
+        assert group.attrs["leakage"] == pytest.approx(whole[0].leakage_fraction, rel=1e-6)
 
 
 def test_finalize_program_offset_marks_baseline_uref_nan(tmp_path):
@@ -270,3 +408,147 @@ def test_finalize_empty_raw_returns_none(tmp_path):
         ai_channels=DEFAULT_AI_CHANNELS,
     )
     assert summary is None
+
+
+@pytest.mark.parametrize("dtype", ["float32", "int16"])
+def test_finalize_decodes_compact_raw(tmp_path, dtype):
+    """A float32 / int16-count recording finalises like its float64 volts."""
+    n = 1500
+    raw = np.random.default_rng(3).uniform(0.1, 1.0, size=(n, len(DEFAULT_AI_CHANNELS)))
+    codec = SampleCodec.for_storage(dtype, raw.shape[1], full_scale_volts=10.0)
+    compact_path = str(tmp_path / "compact_raw.h5")
+    _write_raw(compact_path, raw, codec=codec)
+    with h5py.File(compact_path, "r") as f:
+        rds = cast(h5py.Dataset, f["raw_ai"])
+        assert rds.dtype == np.dtype(dtype)
+        assert rds.attrs["storage_dtype"] == dtype
+
+    # Reference: the same (quantised) volts stored as plain float64.
+    plain_path = str(tmp_path / "plain_raw.h5")
+    _write_raw(plain_path, codec.decode(codec.encode(raw)))
+    settings = BackSettings(DEFAULT_SETTINGS_FILE_REL_PATH)
+    kwargs = dict(
+        sample_rate=2000.0,
+        calibration=Calibration(),
+        settings=settings,
+        voltage_profiles={"ch1": np.linspace(0.0, 1.0, n)},
+        programs={"ch1": {"time": [0, 750], "volt": [0, 1]}},
+        block_rows=400,
+    )
+    finalize_raw_to_h5(compact_path, str(tmp_path / "compact.h5"), **kwargs)
+    finalize_raw_to_h5(plain_path, str(tmp_path / "plain.h5"), **kwargs)
+    for col in ("Taux", "Thtr", "temp"):
+        np.testing.assert_allclose(
+            _read_col(str(tmp_path / "compact.h5"), col),
+            _read_col(str(tmp_path / "plain.h5"), col),
+        )
+
+
+def test_finalize_reads_segmented_recording(tmp_path):
+    """A segment index finalises to the same file as the monolithic raw."""
+    n = 9000
+    raw = np.random.default_rng(4).uniform(0.1, 1.0, size=(n, len(DEFAULT_AI_CHANNELS)))
+    plain_path = str(tmp_path / "plain_raw.h5")
+    _write_raw(plain_path, raw)
+    ring = FakeRing(raw.shape[1])
+    # 64 KiB segments of 6 x float64 rows -> 1365 rows each, 7 segments.
+    rec = DiskRecorder(ring, str(tmp_path / "seg_raw.h5"), consumer_id="t",
+                       poll_interval=0.01, segment_bytes=64 * 1024)
+    rec.start()
+    ring.feed(raw)
+    index_path = rec.stop()
+    assert index_path.endswith(".segments.json")
+
+    kwargs = dict(
+        sample_rate=2000.0,
+        calibration=Calibration(),
+        settings=BackSettings(DEFAULT_SETTINGS_FILE_REL_PATH),
+        voltage_profiles={"ch1": np.linspace(0.0, 1.0, n)},
+        programs={"ch1": {"time": [0, 4500], "volt": [0, 1]}},
+        ai_channels=DEFAULT_AI_CHANNELS,
+        block_rows=1000,  # blocks straddle segment boundaries
+    )
+    seg = finalize_raw_to_h5(index_path, str(tmp_path / "seg.h5"), **kwargs)
+    plain = finalize_raw_to_h5(plain_path, str(tmp_path / "plain.h5"), **kwargs)
+    assert seg is not None and plain is not None and seg["rows"] == plain["rows"] == n
+    for col in ("temp", "Uref", "Thtr"):
+        np.testing.assert_array_equal(
+            _read_col(str(tmp_path / "seg.h5"), col), _read_col(str(tmp_path / "plain.h5"), col)
+        )
+
+
+def test_finalize_takes_taux_from_recorded_stats(tmp_path, monkeypatch):
+    """Recorder stats (int16 counts -> volts) replace the AD595 pass 1."""
+    from pioner.back.acquisition.raw_recording import RawRecording
+
+    n = 3000
+    raw = np.random.default_rng(5).uniform(0.1, 1.0, size=(n, len(DEFAULT_AI_CHANNELS)))
+    codec = SampleCodec.for_storage("int16", raw.shape[1], full_scale_volts=10.0)
+    with_stats = str(tmp_path / "stats_raw.h5")
+    _write_raw(with_stats, raw, codec)
+    no_stats = str(tmp_path / "nostats_raw.h5")
+    _write_raw(no_stats, raw, codec)
+    with h5py.File(no_stats, "a") as f:
+        for key in [k for k in f["raw_ai"].attrs if k.startswith("stats_")]:
+            del f["raw_ai"].attrs[key]
+
+    with RawRecording(with_stats) as rec:
+        decoded = codec.decode(rec.read(0, n))
+        assert rec.stats is not None
+        np.testing.assert_allclose(rec.stats["sum"], decoded.sum(axis=0), rtol=1e-12)
+        np.testing.assert_allclose(rec.stats["min"], decoded.min(axis=0))
+
+    column_reads = []
+    real_iter = RawRecording.iter_blocks
+
+    def spy(self, block_rows, column=None):
+        column_reads.append(column)
+        return real_iter(self, block_rows, column)
+
+    monkeypatch.setattr(RawRecording, "iter_blocks", spy)
+    kwargs = dict(
+        sample_rate=2000.0,
+        calibration=Calibration(),
+        settings=BackSettings(DEFAULT_SETTINGS_FILE_REL_PATH),
+        voltage_profiles={"ch1": np.linspace(0.0, 1.0, n)},
+        programs={"ch1": {"time": [0, 1500], "volt": [0, 1]}},
+        ai_channels=DEFAULT_AI_CHANNELS,
+    )
+    fast = finalize_raw_to_h5(with_stats, str(tmp_path / "fast.h5"), **kwargs)
+    assert column_reads == [None]            # one pass: no AD595 column scan
+    slow = finalize_raw_to_h5(no_stats, str(tmp_path / "slow.h5"), **kwargs)
+    assert column_reads[1:] == [DEFAULT_AI_CHANNELS.index(AD595_AI), None]
+    assert fast is not None and slow is not None
+    assert fast["taux"] == pytest.approx(slow["taux"], rel=1e-12)
+
+
+@pytest.mark.parametrize("tile", [False, True])
+def test_finalize_output_does_not_depend_on_block_size(tmp_path, tile):
+    """Uref slicing / tiling and the per-sample columns are block-invariant."""
+    n = 5000
+    raw = np.random.default_rng(6).uniform(0.1, 1.0, size=(n, len(DEFAULT_AI_CHANNELS)))
+    raw_path = str(tmp_path / "raw.h5")
+    _write_raw(raw_path, raw)
+    kwargs = dict(
+        sample_rate=2000.0,
+        calibration=Calibration(),
+        settings=BackSettings(DEFAULT_SETTINGS_FILE_REL_PATH),
+        voltage_profiles={"ch1": np.linspace(0.0, 1.0, 400 if tile else n)},
+        programs={"ch1": {"time": [0, 2500], "volt": [0, 1]}},
+        ai_channels=DEFAULT_AI_CHANNELS,
+        modulation=ModulationParams(frequency=100.0, amplitude=0.1, offset=0.0),
+        program_offset=700,
+        tile_profile=tile,
+    )
+    whole = finalize_raw_to_h5(raw_path, str(tmp_path / "whole.h5"), block_rows=n, **kwargs)
+    small = finalize_raw_to_h5(raw_path, str(tmp_path / "small.h5"), block_rows=600, **kwargs)
+    assert whole == {**small, "path": whole["path"]}
+    cols = _read_cols(str(tmp_path / "whole.h5"))
+    assert cols == _read_cols(str(tmp_path / "small.h5"))
+    for col in cols:
+        got = _read_col(str(tmp_path / "small.h5"), col)
+        want = _read_col(str(tmp_path / "whole.h5"), col)
+        if col.startswith("temp-hr_"):  # the block lock-in: overlap-save round-off
+            np.testing.assert_allclose(got, want, rtol=1e-6, atol=1e-7)
+        else:
+            np.testing.assert_array_equal(got, want)
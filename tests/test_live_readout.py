@@ -0,0 +1,89 @@
+"""Tests for the incremental live readout (:class:`LiveReadout`).
+
+The readout must agree with what the sidebar used to compute -- the last row
+of ``apply_calibration`` over the trailing window -- while calibrating each
+chunk only once.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pioner.back.live_readout import LiveReadout
+from pioner.back.modes import apply_calibration
+from pioner.shared.calibration import Calibration
+
+SR = 1000.0
+
+
+def _chunks(n_chunks: int, rows: int, seed: int = 0) -> list[np.ndarray]:
+    rng = np.random.default_rng(seed)
+    out = []
+    for _ in range(n_chunks):
+        chunk = rng.uniform(0.1, 0.5, size=(rows, 6))
+        chunk[: rows // 4, 0] = 0.0  # idle heater current -> NaN Thtr
+        out.append(chunk)
+    return out
+
+
+def _window_frame(data: np.ndarray, cal: Calibration) -> pd.DataFrame:
+    return apply_calibration(
+        pd.DataFrame(data, columns=list(range(6))), SR, cal, {}, ai_channels=list(range(6))
+    )
+
+
+def test_unavailable_until_rows_arrive():
+    live = LiveReadout(window_seconds=0.5)
+    snap = live.snapshot()
+    assert snap["available"] is False and snap["last"] == {}
+    live.update(np.empty((0, 0)), SR, Calibration())
+    assert live.snapshot()["available"] is False
+
+
+def test_matches_whole_window_calibration():
+    cal = Calibration()
+    live = LiveReadout(window_seconds=0.5)   # 500 rows = 5 chunks of 100
+    chunks = _chunks(8, 100)
+    for chunk in chunks:
+        live.update(chunk, SR, cal)
+    snap = live.snapshot()
+    assert snap["available"] and snap["rows"] == 800 and snap["window_rows"] == 500
+
+    ref = _window_frame(np.concatenate(chunks[-5:]), cal)
+    assert snap["last"]["Taux"] == pytest.approx(ref["Taux"].iloc[-1])
+    assert snap["last"]["temp"] == pytest.approx(ref["temp"].iloc[-1])
+    assert snap["last"]["temp-hr"] == pytest.approx(ref["temp-hr"].iloc[-1])
+    assert snap["last"]["Thtr"] == pytest.approx(ref["Thtr"].iloc[-1])
+    assert snap["mean"]["temp-hr"] == pytest.approx(ref["temp-hr"].mean())
+    assert snap["mean"]["Thtr"] == pytest.approx(ref["Thtr"].mean())  # NaN-skipping
+
+
+def test_oversized_update_keeps_only_the_window():
+    live = LiveReadout(window_seconds=0.2)
+    data = np.concatenate(_chunks(3, 150))
+    live.update(data, SR, Calibration())
+    snap = live.snapshot()
+    assert snap["rows"] == 450 and snap["window_rows"] == 200
+    ref = _window_frame(data[-200:], Calibration())
+    assert snap["mean"]["temp"] == pytest.approx(ref["temp"].mean())
+
+
+def test_reset_forgets_and_changes_window():
+    live = LiveReadout(window_seconds=0.5)
+    live.update(_chunks(1, 100)[0], SR, Calibration())
+    live.reset(window_seconds=2.0)
+    snap = live.snapshot()
+    assert snap["available"] is False and snap["rows"] == 0
+    assert snap["window_seconds"] == 2.0
+    with pytest.raises(ValueError):
+        live.reset(window_seconds=0.0)
+
+
+def test_no_heater_channels_no_thtr():
+    live = LiveReadout()
+    live.update(np.full((50, 5), 0.2), SR, Calibration())  # ch0..ch4, no ch5
+    snap = live.snapshot()
+    assert "Thtr" not in snap["last"] and "Thtr" not in snap["mean"]
+    assert "temp" in snap["last"]
@@ -214,6 +214,29 @@ def test_thtr_shown_when_driven(window):
     assert window.thtrValueLabel.text() == "123.00"
 
 
+def test_incremental_readout_preferred_over_window_calibration(window):
+    class ReadoutController(FakeController):
+        def live_readout(self, window_seconds=1.0):
+            return {"available": True, "last": {"Taux": 1.0, "temp": 2.0, "temp-hr": 3.0}}
+
+    window.controller = ReadoutController(cal_df=_cal_df())
+    window._update_live_values(np.zeros((4, 6)), 2000.0)
+    assert window.tauxValueLabel.text() == "1.00"
+    assert window.ttplValueLabel.text() == "2.00"
+    assert window.thtrdynValueLabel.text() == "3.00"
+
+
+def test_sliding_modulation_readout_preferred_over_fft(window):
+    class ModulationController(FakeController):
+        def live_modulation(self, frequency, window_seconds=1.0, harmonics=(1,), channel=1):
+            return {"available": True, "harmonics": {1: {"amplitude": 0.0125, "phase": 0.0}}}
+
+    window.controller = ModulationController(cal_df=_cal_df())
+    window.settings.modulation_frequency = 37.5
+    window._update_live_values(np.zeros((4, 6)), 2000.0)
+    assert window.umodhtrValueLabel.text() == "12.500"
+
+
 # --- Iso Set / Off -----------------------------------------------------------
 
 def test_iso_eternal_hold_drives_and_marks(window):
@@ -11,8 +11,10 @@ e2e tests.
 # Array[float] vs list[float], etc.). Tests are runtime-verified.
 from __future__ import annotations
 
+import ctypes
 import time
 
+import numpy as np
 import pytest
 
 from pioner.back.mock_uldaq import DAQ_AVAILABLE, uldaq
@@ -41,10 +43,19 @@ def test_lifecycle():
 
 def test_create_float_buffer_shape():
     buf = uldaq.create_float_buffer(4, 100)
-    assert isinstance(buf, list)
+    # Same type as real uldaq: a flat ctypes c_double array.
+    assert isinstance(buf, ctypes.Array) and buf._type_ is ctypes.c_double
     assert len(buf) == 400
 
 
+def test_float_buffer_numpy_view_shares_memory():
+    """``np.ctypeslib.as_array`` is a zero-copy view the scan writes through."""
+    buf = uldaq.create_float_buffer(2, 10)
+    view = np.ctypeslib.as_array(buf)
+    buf[3] = 1.5
+    assert view[3] == 1.5
+
+
 def test_ai_scan_progresses_and_stops():
     dev = _make_device()
     dev.connect()
@@ -76,9 +87,9 @@ def test_ai_buffer_is_shared_not_copied():
     time.sleep(0.5)
     ai.scan_stop()
     ao.scan_stop()
-    # ``ai.get_buffer`` should hand back the same list object we passed in.
+    # ``ai.get_buffer`` should hand back the same array object we passed in.
     assert ai.get_buffer() is buf
-    # The list must have been mutated in place; not all entries should be 0.
+    # The array must have been mutated in place; not all entries should be 0.
     assert any(abs(v) > 1e-9 for v in buf)
 
 
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import dataclasses
 import threading
 import time
 
+import h5py
 import numpy as np
 import pandas as pd
 import pytest
@@ -16,6 +18,7 @@ from pioner.back.modes import (
     SafeVoltageError,
     SlowMode,
     create_mode,
+    save_run_to_h5,
 )
 from pioner.shared.modulation import ModulationParams
 from pioner.shared.settings import ExperimentLimits
@@ -42,6 +45,20 @@ def test_fast_mode_no_point_loss(connected_daq, settings, calibration, fast_prog
         assert col in df.columns, f"missing column {col}"
 
 
+def test_mode_metrics_belong_to_the_mode_that_ran(
+    connected_daq, settings, calibration, fast_programs
+):
+    settings.modulation = settings.modulation.with_amplitude(0.0)
+    ran = FastHeat(connected_daq, settings, calibration, fast_programs)
+    idle = FastHeat(connected_daq, settings, calibration, fast_programs)
+    assert ran.metrics_snapshot() == {}
+    ran.arm()
+    ran.run()
+    snap = ran.metrics_snapshot()
+    assert "ingest_latency_ms" in snap and "lock_hold_ms" in snap
+    assert idle.metrics_snapshot() == {}
+
+
 def test_slow_mode_produces_lockin_columns(
     connected_daq, settings, calibration, fast_programs
 ):
@@ -61,6 +78,34 @@ def test_slow_mode_produces_lockin_columns(
     assert "temp-hr_phase" in df.columns
 
 
+def test_slow_mode_decimated_lockin_goes_to_its_own_group(
+    connected_daq, settings, calibration, tmp_path
+):
+    programs = {
+        "ch0": {"time": [0, 2000], "volt": [0.1, 0.1]},
+        "ch1": {"time": [0, 2000], "volt": [0, 1]},
+    }
+    settings.modulation = dataclasses.replace(
+        settings.modulation.with_amplitude(0.1), lockin_output_rate=30.0
+    )
+    mode = SlowMode(connected_daq, settings, calibration, programs)
+    mode.arm()
+    df = mode.run()
+    assert "temp-hr_amp" not in df.columns
+    lockin = df.attrs["lockin"]
+    assert 0 < len(lockin) < len(df) // 30
+    assert lockin.sample_rate >= 30.0
+
+    path = str(tmp_path / "exp_data.h5")
+    save_run_to_h5(df, mode.voltage_profiles, programs, calibration, settings, path)
+    with h5py.File(path, "r") as f:
+        assert "temp-hr_amp" not in f["data"]
+        np.testing.assert_array_equal(
+            f["lockin/temp-hr_amp"][:], lockin.columns["temp-hr_amp"]
+        )
+        assert f["lockin"].attrs["decimation"] == lockin.decimation
+
+
 def test_slow_mode_amplitude_correction_divides_reported_amplitude(
     connected_daq, settings, calibration, fast_programs
 ):
@@ -185,38 +230,37 @@ def test_iso_mode_streams_into_dataframe(
     assert 0.4 * settings.ai_params.sample_rate <= len(df) <= 1.2 * settings.ai_params.sample_rate
 
 
-def test_iso_mode_with_modulation_emits_fft_attrs_and_warns_on_non_seamless(
+def test_iso_mode_with_modulation_emits_fft_attrs_on_a_seamless_buffer(
     connected_daq, settings, calibration, caplog
 ):
-    """IsoMode + AC modulation: FFT scalars in df.attrs and AO warning logged.
+    """IsoMode + AC modulation: whole-cycle AO buffer and FFT scalars in df.attrs.
 
-    The default settings (f=37.5 Hz at fs=20 kHz, 1 s buffer) are NOT
-    seamless on the AO wrap, so the IsoMode arm step must log a warning
-    and ``run()`` must still produce both the per-sample lock-in columns
-    and the scalar FFT attrs.
+    The default f=37.5 Hz is 3 cycles in ``0.08 s`` of samples (1600 at
+    20 kHz), so the armed AO buffer is just those (not a one-second buffer
+    that wraps half a cycle off), no wrap warning is logged, and ``run()``
+    still produces both the per-sample lock-in columns and the scalar FFT
+    attrs.
     """
     import logging
 
-    # Pick an integer-cycle f to keep the AC test deterministic but rely
-    # on the default fs=20000 Hz which gives 40 cycles -> seamless.
     settings.modulation = settings.modulation.with_amplitude(0.1)
     iso = IsoMode(
         connected_daq, settings, calibration, {"ch1": {"volt": 0.4}},
         ring_buffer_seconds=2.0,
     )
-    with caplog.at_level(logging.WARNING, logger="pioner.back.modes"):
+    with caplog.at_level(logging.INFO, logger="pioner.back.modes"):
         iso.arm()
-    # Default f_mod is 37.5 Hz (see settings/settings.json); the default
-    # buffer is 1 s; cycles=37.5 -> non-seamless -> warning expected.
-    if abs((settings.ai_params.sample_rate * settings.modulation.frequency)
-           % settings.ai_params.sample_rate) > 0:
-        assert any("not seamless" in rec.message.lower() for rec in caplog.records), (
-            "Expected a non-seamless AO warning at default 37.5 Hz / 20 kHz / 1 s"
-        )
+    assert settings.modulation.frequency == 37.5
+    period = int(0.08 * settings.ao_params.sample_rate)
+    assert iso.ao_buffer_samples == period
+    assert all(p.size == period for p in iso.voltage_profiles.values())
+    assert any(f"AO buffer: {period} samples" in rec.message for rec in caplog.records)
+    assert not any("not seamless" in rec.message.lower() for rec in caplog.records)
 
     # AO integrity report is exposed for callers that want to introspect it.
     assert iso._ao_period_report is not None
-    assert iso._ao_period_report.cycles == pytest.approx(37.5)
+    assert iso._ao_period_report.seamless
+    assert iso._ao_period_report.cycles == pytest.approx(3.0)
 
     df = iso.run(duration_seconds=1.0)
     # Per-sample lock-in columns survive (existing contract).
@@ -235,6 +279,104 @@ def test_iso_mode_with_modulation_emits_fft_attrs_and_warns_on_non_seamless(
     assert df.attrs["temp-hr_fft_window_samples"] > 0
 
 
+def test_iso_mode_without_seamless_buffer_warns_or_snaps_frequency(
+    connected_daq, settings, calibration, caplog
+):
+    """37.3 Hz at 20 kHz needs 200000 samples for whole cycles.
+
+    By default IsoMode keeps the one-second buffer and warns about the wrap;
+    with SnapFrequency it drives the nearest frequency that does fit one
+    second, and demodulation follows the driven frequency.
+    """
+    import logging
+
+    settings.modulation = dataclasses.replace(
+        settings.modulation.with_amplitude(0.1), frequency=37.3
+    )
+    iso = IsoMode(connected_daq, settings, calibration, {"ch1": {"volt": 0.4}})
+    with caplog.at_level(logging.WARNING, logger="pioner.back.modes"):
+        iso.arm()
+    assert iso.ao_buffer_samples == settings.ao_params.sample_rate
+    assert not iso._ao_period_report.seamless
+    assert any("not seamless" in rec.message.lower() for rec in caplog.records)
+
+    caplog.clear()
+    settings.modulation = dataclasses.replace(settings.modulation, snap_frequency=True)
+    iso = IsoMode(connected_daq, settings, calibration, {"ch1": {"volt": 0.4}})
+    with caplog.at_level(logging.WARNING, logger="pioner.back.modes"):
+        iso.arm()
+    driven = iso.modulation.frequency
+    assert driven != 37.3 and driven == pytest.approx(37.3, abs=1e-3)
+    assert iso.ao_buffer_samples <= settings.ao_params.sample_rate
+    assert iso._ao_period_report.seamless
+    assert any("moved to" in rec.message for rec in caplog.records)
+    assert not any("not seamless" in rec.message.lower() for rec in caplog.records)
+
+
+def test_iso_mode_multi_tone_demodulates_every_tone(
+    connected_daq, settings, calibration, tmp_path, caplog
+):
+    """Modulation.Tones: tones snapped to AO-buffer bins, all read in one pass."""
+    import logging
+
+    settings.modulation = dataclasses.replace(
+        settings.modulation.with_amplitude(0.1), tones=((75.3, 0.05), (150.0, 0.05))
+    )
+    programs = {"ch1": {"volt": 0.4}}
+    iso = IsoMode(connected_daq, settings, calibration, programs, ring_buffer_seconds=2.0)
+    with caplog.at_level(logging.INFO, logger="pioner.back.modes"):
+        iso.arm()
+    assert iso.modulation.tones == ((75.0, 0.05), (150.0, 0.05))
+    # 75.3 Hz has no whole-cycle span within one second: the buffer is the
+    # largest multiple of the 0.08 s primary period (12 of them) instead.
+    assert iso.ao_buffer_samples == int(0.96 * settings.ao_params.sample_rate)
+    assert any("75.3 Hz moved to 75 Hz" in rec.message for rec in caplog.records)
+    df = iso.run(duration_seconds=1.0)
+    tones = df.attrs["temp-hr_fft_tones"]
+    assert list(tones) == [37.5, 75.0, 150.0]
+    assert all(np.isfinite(tones[f][1]["amplitude"]) for f in tones)
+    # 2f of 37.5 Hz sits on the 75 Hz tone: only the fundamentals are read.
+    assert set(tones[37.5]) == {1}
+    assert 0.0 <= df.attrs["temp-hr_fft_tones_leakage"] <= 1.0
+
+    path = str(tmp_path / "exp_data.h5")
+    save_run_to_h5(df, iso.voltage_profiles, programs, calibration, settings, path)
+    with h5py.File(path, "r") as f:
+        group = f["fft_tones"]
+        np.testing.assert_array_equal(group["frequency"][:], [37.5, 75.0, 150.0])
+        np.testing.assert_array_equal(group["drive_amplitude"][:], [0.1, 0.05, 0.05])
+        assert group["amplitude"].shape == (3, 1)
+        assert group["amplitude"][0, 0] == tones[37.5][1]["amplitude"]
+
+
+def test_iso_mode_fft_frames_persisted_with_the_run(
+    connected_daq, settings, calibration, tmp_path
+):
+    """Modulation.FftFrameCycles > 0: short-time FFT series on attrs and in h5."""
+    settings.modulation = dataclasses.replace(
+        settings.modulation.with_amplitude(0.1), fft_frame_cycles=4.0, fft_hop_cycles=2.0
+    )
+    programs = {"ch1": {"volt": 0.4}}
+    iso = IsoMode(connected_daq, settings, calibration, programs, ring_buffer_seconds=2.0)
+    iso.arm()
+    df = iso.run(duration_seconds=1.0)
+    frames = df.attrs["fft_frames"]
+    assert len(frames) > 1
+    assert frames.harmonics == (1, 2, 3)
+    assert frames.amplitude.shape == (len(frames), 3)
+    assert np.all(np.diff(frames.time) > 0)
+    assert np.isfinite(frames.harmonic(1)[0]).all()
+
+    path = str(tmp_path / "exp_data.h5")
+    save_run_to_h5(df, iso.voltage_profiles, programs, calibration, settings, path)
+    with h5py.File(path, "r") as f:
+        group = f["fft_frames"]
+        np.testing.assert_array_equal(group["amplitude"][:], frames.amplitude)
+        np.testing.assert_array_equal(group["time"][:], frames.time)
+        assert list(group.attrs["harmonics"]) == [1, 2, 3]
+        assert group.attrs["frame_samples"] == frames.frame_samples
+
+
 def test_iso_ac_with_hardware_trigger_runs_clean(
     connected_daq, settings, calibration
 ):
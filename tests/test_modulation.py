@@ -6,12 +6,24 @@ import numpy as np
 import pytest
 
 from pioner.shared.modulation import (
+    BlockLockIn,
     ModulationParams,
+    SlidingDFT,
+    StreamingLockIn,
+    ToneBins,
+    align_tones,
     apply_modulation,
     check_ao_period_integrity,
+    clear_demod_caches,
+    demod_cache_stats,
     fft_demodulate,
+    fft_demodulate_frames,
+    fft_demodulate_tones,
+    lockin_decimation,
     lockin_demodulate,
+    lockin_demodulate_decimated,
     reference_phase,
+    seamless_buffer_length,
 )
 
 
@@ -308,3 +320,436 @@ def test_lockin_valid_all_false_for_short_signal():
     signal = np.sin(2 * np.pi * f * t)
     _, _, valid = lockin_demodulate(signal, sample_rate=fs, frequency=f, return_valid=True)
     assert not valid.any()
+
+
+def _drift_signal(n, fs=2000.0, f=37.5, seed=0):
+    t = np.arange(n) / fs
+    amp = 0.2 * (1.0 + 0.3 * np.sin(2 * np.pi * 0.05 * t))
+    rng = np.random.default_rng(seed)
+    return 0.5 + 0.01 * t + amp * np.sin(2 * np.pi * f * t - 0.7) + 0.01 * rng.standard_normal(n)
+
+
+def _run_blocks(engine, x, block):
+    outs = [engine.push(x[s:s + block]) for s in range(0, x.size, block)]
+    outs.append(engine.finish())
+    return tuple(np.concatenate([o[k] for o in outs]) for k in range(3))
+
+
+@pytest.mark.parametrize("block", [7, 1000, 20_000, 50_000])
+def test_block_lockin_matches_whole_signal(block):
+    fs, f = 2000.0, 37.5
+    x = _drift_signal(50_000, fs, f)
+    amp, phase, valid = lockin_demodulate(x, fs, f, return_valid=True)
+    b_amp, b_phase, b_valid = _run_blocks(BlockLockIn(fs, f), x, block)
+    assert b_amp.size == x.size
+    np.testing.assert_array_equal(b_valid, valid)
+    # Stated tolerance: ~1e-8 of the 0.2 V modulation amplitude.
+    np.testing.assert_allclose(b_amp, amp, rtol=0, atol=2e-9)
+    np.testing.assert_allclose(b_phase[valid], phase[valid], rtol=0, atol=1e-8)
+
+
+def test_block_lockin_holds_back_only_the_margin():
+    engine = BlockLockIn(2000.0, 37.5)
+    released = engine.push(_drift_signal(10_000))[0].size
+    assert released == 10_000 - engine.margin
+    assert engine.margin >= int(np.ceil(10 * 2000.0 / 37.5))  # covers the end settle edge
+
+
+@pytest.mark.parametrize("n", [30, 49, 100])
+def test_block_lockin_short_signals_match(n):
+    x = _drift_signal(n)
+    amp, _, valid = lockin_demodulate(x, 2000.0, 37.5, return_valid=True)
+    b_amp, _, b_valid = _run_blocks(BlockLockIn(2000.0, 37.5), x, max(1, n // 3))
+    np.testing.assert_allclose(b_amp, amp, atol=1e-12)
+    np.testing.assert_array_equal(b_valid, valid)
+
+
+def test_lockin_decimation_factor():
+    assert lockin_decimation(2000.0, 37.5, 30.0) == 66
+    assert lockin_decimation(2000.0, 37.5, 0.0) == 1
+    # Capped so the output rate stays above 2.5x the 7.5 Hz bandwidth.
+    assert lockin_decimation(2000.0, 37.5, 5.0) == int(2000.0 // 18.75)
+
+
+def test_decimated_lockin_tracks_the_envelope():
+    fs, f = 2000.0, 37.5
+    n = 60_000
+    t = np.arange(n) / fs
+    envelope = 0.2 * (1.0 + 0.3 * np.sin(2 * np.pi * 0.2 * t))
+    x = 3.0 + 0.01 * t + envelope * np.sin(2 * np.pi * f * t - 0.7)
+    time, amp, phase, valid = lockin_demodulate_decimated(x, fs, f, output_rate=30.0)
+    assert amp.size == phase.size == valid.size == time.size
+    assert amp.size < n // 60
+    np.testing.assert_allclose(np.diff(time), 66 / fs)
+    assert valid.any() and not valid[0] and not valid[-1]
+    truth = np.interp(time, t, envelope)
+    np.testing.assert_allclose(amp[valid], truth[valid], atol=2e-3)
+    np.testing.assert_allclose(phase[valid], 0.7, atol=1e-2)
+    # At least as close to the truth as the per-sample trace at those times.
+    full, _, full_valid = lockin_demodulate(x, fs, f, return_valid=True)
+    full_err = np.abs(np.interp(time, t, full) - truth)[valid]
+    assert np.max(np.abs(amp - truth)[valid]) <= np.max(full_err)
+
+
+@pytest.mark.parametrize("block", [100, 4_321, 60_000])
+def test_decimating_block_lockin_is_chunking_invariant(block):
+    fs, f = 2000.0, 37.5
+    x = _drift_signal(60_000, fs, f)
+    _, amp, phase, valid = lockin_demodulate_decimated(x, fs, f, output_rate=30.0)
+    engine = BlockLockIn(fs, f, decimate=66)
+    b_amp, b_phase, b_valid = _run_blocks(engine, x, block)
+    np.testing.assert_array_equal(b_valid, valid)
+    np.testing.assert_allclose(b_amp, amp, rtol=0, atol=1e-8)
+    np.testing.assert_allclose(b_phase[valid], phase[valid], rtol=0, atol=1e-7)
+
+
+def test_decimated_lockin_short_signal_is_empty():
+    time, amp, _, valid = lockin_demodulate_decimated(
+        _drift_signal(500), 2000.0, 37.5, output_rate=30.0
+    )
+    assert time.size == amp.size == valid.size == 0
+
+
+def _push_chunks(engine, x, sizes):
+    outs, start = [], 0
+    for size in sizes:
+        outs.append(engine.push(x[start:start + size]))
+        start += size
+    outs.append(engine.push(x[start:]))
+    return tuple(np.concatenate([o[k] for o in outs]) for k in range(3))
+
+
+def test_streaming_lockin_chunking_is_invisible():
+    """Arbitrary chunk sizes (including empty reads) == one push of the whole."""
+    fs, f = 2000.0, 37.5
+    x = _drift_signal(30_000, fs, f)
+    whole = StreamingLockIn(fs, f).push(x)
+    sizes = np.random.default_rng(1).integers(0, 700, size=80)
+    engine = StreamingLockIn(fs, f)
+    chunked = _push_chunks(engine, x, sizes)
+    assert engine.samples == x.size
+    np.testing.assert_allclose(chunked[0], whole[0], rtol=0, atol=1e-12)
+    np.testing.assert_allclose(chunked[1], whole[1], rtol=0, atol=1e-9)
+    np.testing.assert_array_equal(chunked[2], whole[2])
+
+
+def test_streaming_lockin_reads_stationary_tone():
+    fs, f, a, phi = 20000.0, 37.5, 0.3, 0.4
+    t = np.arange(int(4 * fs)) / fs
+    engine = StreamingLockIn(fs, f)
+    amp, phase, valid = engine.push(0.1 + a * np.sin(2 * np.pi * f * t - phi))
+    assert not valid[: int(np.ceil(10 * fs / f))].any()
+    settled = slice(int(2 * fs), None)  # well past the causal start-up
+    np.testing.assert_allclose(amp[settled], a, rtol=2e-3)
+    np.testing.assert_allclose(phase[settled], phi, atol=2e-3)
+
+
+def test_streaming_lockin_envelope_lags_by_group_delay():
+    """A slow amplitude ramp comes out shifted by ``delay_samples``."""
+    fs, f = 2000.0, 37.5
+    n = 60_000
+    t = np.arange(n) / fs
+    envelope = 0.1 + 0.004 * t                       # linear -> pure delay
+    engine = StreamingLockIn(fs, f)
+    amp, _, _ = engine.push(envelope * np.sin(2 * np.pi * f * t))
+    assert engine.delay_seconds == pytest.approx(2.6131 / (2 * np.pi * engine.bandwidth), rel=0.02)
+    k = np.arange(n // 2, n)
+    np.testing.assert_allclose(
+        amp[k], 0.1 + 0.004 * (k - engine.delay_samples) / fs, rtol=0, atol=2e-4
+    )
+    engine.reset()
+    assert engine.samples == 0
+
+
+def _multi_channel_signal(n=20_000, fs=2000.0, f=37.5):
+    return np.column_stack([
+        _drift_signal(n, fs, f, seed=k) * (k + 1) + 0.05 * k for k in range(4)
+    ])
+
+
+def test_lockin_2d_matches_per_channel_calls():
+    fs, f = 2000.0, 37.5
+    x = _multi_channel_signal(fs=fs, f=f)
+    ref = np.sin(2 * np.pi * f * np.arange(x.shape[0]) / fs - 0.3)
+    amp, phase, valid = lockin_demodulate(x, fs, f, return_valid=True, reference=ref)
+    assert amp.shape == phase.shape == x.shape and valid.shape == (x.shape[0],)
+    for k in range(x.shape[1]):
+        a1, p1, v1 = lockin_demodulate(x[:, k], fs, f, return_valid=True, reference=ref)
+        np.testing.assert_allclose(amp[:, k], a1, rtol=0, atol=1e-12)
+        np.testing.assert_allclose(phase[:, k], p1, rtol=0, atol=1e-12)
+        np.testing.assert_array_equal(valid, v1)
+
+
+def test_lockin_2d_short_signal_uses_fallback_per_channel():
+    x = _multi_channel_signal(n=40)
+    amp, phase = lockin_demodulate(x, 2000.0, 37.5)
+    for k in range(x.shape[1]):
+        np.testing.assert_allclose(amp[:, k], lockin_demodulate(x[:, k], 2000.0, 37.5)[0])
+
+
+def test_lockin_rejects_mismatched_reference_and_3d():
+    x = _multi_channel_signal(n=200)
+    with pytest.raises(ValueError):
+        lockin_demodulate(x, 2000.0, 37.5, reference=np.zeros(199))
+    with pytest.raises(ValueError):
+        lockin_demodulate(x[:, :, None], 2000.0, 37.5)
+
+
+def test_fft_demodulate_2d_matches_per_channel_calls():
+    fs, f = 2000.0, 37.5
+    x = _multi_channel_signal(fs=fs, f=f)
+    results = fft_demodulate(x, fs, f)
+    assert isinstance(results, tuple) and len(results) == x.shape[1]
+    for k, res in enumerate(results):
+        single = fft_demodulate(x[:, k], fs, f)
+        assert res.window_samples == single.window_samples
+        assert res.leakage_fraction == pytest.approx(single.leakage_fraction, abs=1e-12)
+        for h, h1 in zip(res.harmonics, single.harmonics):
+            assert h.harmonic == h1.harmonic
+            assert h.amplitude == pytest.approx(h1.amplitude, rel=1e-12)
+            assert h.phase == pytest.approx(h1.phase, abs=1e-12)
+
+
+def test_repeated_demodulation_hits_the_caches():
+    clear_demod_caches()
+    fs, f = 2000.0, 37.5
+    x = _drift_signal(4000, fs, f)
+    first = lockin_demodulate(x, fs, f)
+    for _ in range(3):
+        again = lockin_demodulate(x, fs, f)
+    np.testing.assert_array_equal(again[0], first[0])
+    stats = demod_cache_stats()
+    assert stats["reference"]["misses"] == 1 and stats["reference"]["hits"] == 3
+    assert stats["sos"]["misses"] == 1 and stats["sos"]["hits"] == 3
+    fft_demodulate(x, fs, f)
+    fft_demodulate(x, fs, f)
+    assert demod_cache_stats()["integer_cycle"]["hits"] >= 1
+    clear_demod_caches()
+    assert demod_cache_stats()["reference"] == {
+        "hits": 0, "misses": 0, "entries": 0, "bytes": 0,
+        "max_entries": 32, "max_bytes": 64 * 1024 * 1024,
+    }
+
+
+def test_tiled_reference_table_matches_direct_evaluation():
+    from pioner.shared.modulation import _reference_table
+
+    fs, f, n = 20000.0, 37.5, 50_000    # 800-sample period, tiled
+    table = _reference_table(fs, f, n)
+    theta = 2 * np.pi * f * (np.arange(n) / fs)
+    np.testing.assert_allclose(table[0], np.sin(theta), rtol=0, atol=1e-12)
+    np.testing.assert_allclose(table[1], np.cos(theta), rtol=0, atol=1e-12)
+    assert not table.flags.writeable
+
+
+def test_lru_cache_respects_the_byte_cap():
+    from pioner.shared.lru_cache import LRUCache
+
+    cache = LRUCache("t", max_entries=10, max_bytes=3 * 800)
+    for k in range(5):
+        cache.get(k, lambda: np.zeros(100))     # 800 bytes each
+    stats = cache.stats()
+    assert stats["entries"] == 3 and stats["bytes"] == 2400 and stats["misses"] == 5
+    cache.get(4, lambda: pytest.fail("evicted the newest entry"))
+    cache.get(0, lambda: np.zeros(100))          # oldest was evicted -> miss
+    big = cache.get("big", lambda: np.zeros(1000))  # over the cap: not kept
+    assert big.size == 1000 and cache.stats()["entries"] == 3
+
+
+# ---------------------------------------------------------------------------
+# SlidingDFT (live modulation readout)
+# ---------------------------------------------------------------------------
+def _two_tone(n, fs=20000.0, f=37.5, seed=0):
+    t = np.arange(n) / fs
+    noise = np.random.default_rng(seed).normal(0.0, 1e-4, n)
+    return (0.3 + 0.01 * np.sin(2 * np.pi * f * t - 0.4)
+            + 0.002 * np.sin(2 * np.pi * 2 * f * t + 0.2) + noise)
+
+
+def test_sliding_dft_matches_fft_demodulate_on_the_same_window():
+    fs, f = 20000.0, 37.5
+    x = _two_tone(400_000, fs, f)
+    sdft = SlidingDFT(fs, f, 20_000, harmonics=(1, 2))
+    rng = np.random.default_rng(1)
+    i = 0
+    while i < x.size:
+        n = int(rng.integers(1, 3000))
+        sdft.push(x[i:i + n])
+        i += n
+    # 400k - window is a whole number of periods, so the phases agree too.
+    ref = fft_demodulate(x[-sdft.window:], fs, frequency=f, harmonics=(1, 2))
+    assert sdft.window == ref.window_samples
+    for got, want in zip(sdft.harmonics(), ref.harmonics):
+        assert got.harmonic == want.harmonic
+        assert got.amplitude == pytest.approx(want.amplitude, rel=1e-9)
+        assert got.phase == pytest.approx(want.phase, abs=1e-9)
+
+
+def test_sliding_dft_is_chunking_invariant():
+    fs, f = 20000.0, 37.5
+    x = _two_tone(50_000, fs, f)
+    one = SlidingDFT(fs, f, 8000)
+    one.push(x)
+    many = SlidingDFT(fs, f, 8000)
+    for chunk in np.array_split(x, 97):
+        many.push(chunk)
+    assert many.samples == one.samples == x.size
+    assert many.harmonics()[0].amplitude == pytest.approx(one.harmonics()[0].amplitude, rel=1e-9)
+    assert many.harmonics()[0].phase == pytest.approx(one.harmonics()[0].phase, abs=1e-9)
+
+
+def test_sliding_dft_reports_nothing_until_filled():
+    sdft = SlidingDFT(20000.0, 37.5, 8000)
+    sdft.push(np.zeros(sdft.window - 1))
+    assert not sdft.filled
+    assert sdft.harmonics() == ()
+    sdft.push(np.zeros(1))
+    assert sdft.filled
+    sdft.reset()
+    assert sdft.samples == 0 and not sdft.filled
+
+
+# ---------------------------------------------------------------------------
+# fft_demodulate_frames (iso drift tracking)
+# ---------------------------------------------------------------------------
+def test_fft_frames_match_fft_demodulate_per_frame():
+    fs, f = 20000.0, 37.5
+    x = _two_tone(200_000, fs, f)
+    frames = fft_demodulate_frames(x, fs, f, harmonics=(1, 2), frame_cycles=20, hop_cycles=10)
+    assert frames.frame_samples == 9600           # 18 whole cycles fit in 20
+    assert frames.hop_samples == 5333
+    assert len(frames) == (x.size - 9600) // 5333 + 1
+    for i in (0, 7, len(frames) - 1):
+        start = i * frames.hop_samples
+        ref = fft_demodulate(x[start:start + frames.frame_samples], fs, frequency=f, harmonics=(1, 2))
+        assert frames.leakage[i] == pytest.approx(ref.leakage_fraction, rel=1e-9)
+        for j, h in enumerate(ref.harmonics):
+            assert frames.amplitude[i, j] == pytest.approx(h.amplitude, rel=1e-9)
+    # Phases are referenced to sample 0 of x, so a stationary tone is flat.
+    amp, phase = frames.harmonic(1)
+    np.testing.assert_allclose(phase, 0.4, atol=0.02)
+    np.testing.assert_allclose(amp, 0.01, rtol=5e-3)
+    assert frames.time[0] == pytest.approx((9600 - 1) / 2 / fs)
+
+
+def test_fft_frames_resolve_amplitude_drift():
+    fs, f = 2000.0, 37.5
+    t = np.arange(200_000) / fs
+    envelope = 0.01 * (1.0 + 0.5 * t / t[-1])
+    x = envelope * np.sin(2 * np.pi * f * t)
+    frames = fft_demodulate_frames(x, fs, f, harmonics=(1,), frame_cycles=30)
+    amp, _ = frames.harmonic(1)
+    np.testing.assert_allclose(amp, np.interp(frames.time, t, envelope), rtol=1e-3)
+
+
+def test_fft_frames_chunked_with_start_index_match_one_call():
+    fs, f = 20000.0, 37.5
+    x = _two_tone(120_000, fs, f)
+    whole = fft_demodulate_frames(x, fs, f, frame_cycles=20, hop_cycles=10)
+    parts, pending, start = [], x[:0], 0
+    for chunk in np.array_split(x, 11):
+        pending = np.concatenate((pending, chunk))
+        part = fft_demodulate_frames(pending, fs, f, frame_cycles=20, hop_cycles=10,
+                                     start_index=start)
+        parts.append(part)
+        consumed = len(part) * part.hop_samples
+        pending, start = pending[consumed:], start + consumed
+    np.testing.assert_array_equal(np.concatenate([p.time for p in parts]), whole.time)
+    np.testing.assert_allclose(np.concatenate([p.amplitude for p in parts]), whole.amplitude,
+                               rtol=1e-12)
+    np.testing.assert_allclose(np.concatenate([p.phase for p in parts]), whole.phase, atol=1e-9)
+
+
+def test_fft_frames_short_signal_is_empty():
+    frames = fft_demodulate_frames(np.zeros(1000), 20000.0, 37.5, frame_cycles=20)
+    assert len(frames) == 0
+    assert frames.amplitude.shape == (0, 3)
+
+
+# ---------------------------------------------------------------------------
+# Multi-tone drive and demodulation
+# ---------------------------------------------------------------------------
+_TONES = ((37.5, 0.01), (61.0, 0.005), (151.0, 0.003))
+
+
+def _multi_tone(n, fs=2000.0, seed=0):
+    t = np.arange(n) / fs
+    x = 100.0 + np.random.default_rng(seed).normal(0.0, 1e-4, n)
+    for i, (f, a) in enumerate(_TONES):
+        x += a * np.sin(2 * np.pi * f * t - 0.1 * i)
+    return x
+
+
+def test_apply_modulation_sums_every_tone():
+    params = ModulationParams(frequency=10.0, amplitude=0.2, offset=0.1, tones=((25.0, 0.05),))
+    t = np.linspace(0.0, 1.0, 1001)
+    out = apply_modulation(t, np.full_like(t, 0.5), params)
+    expected = 0.6 + 0.2 * np.sin(2 * np.pi * 10 * t) + 0.05 * np.sin(2 * np.pi * 25 * t)
+    np.testing.assert_allclose(out, expected, atol=1e-12)
+    assert ModulationParams(frequency=10.0, tones=((25.0, 0.05),)).enabled
+
+
+def test_align_tones_snaps_to_buffer_bins():
+    assert align_tones([75.3, 151.0], 2000.0, 2000) == (75.0, 151.0)
+    assert align_tones([37.4], 2000.0, 4000) == (37.5,)
+    with pytest.raises(ValueError, match="shares bin"):
+        align_tones([75.2, 74.9], 2000.0, 2000)
+    with pytest.raises(ValueError, match="between DC and Nyquist"):
+        align_tones([0.2], 2000.0, 2000)
+
+
+def test_seamless_buffer_length_is_the_shortest_whole_cycle_span():
+    assert seamless_buffer_length(20000.0, 37.5, 20000) == (1600, 37.5)  # 3 cycles
+    assert seamless_buffer_length(20000.0, 50.0, 20000) == (400, 50.0)
+    # Extra tones stretch it to the common period while that fits ...
+    assert seamless_buffer_length(20000.0, 37.5, 20000, tones=[75.0, 150.0]) == (1600, 37.5)
+    # ... else to the largest multiple of it (finest grid for align_tones).
+    assert seamless_buffer_length(20000.0, 37.5, 20000, tones=[75.3]) == (19200, 37.5)
+    # No whole-cycle span within max_samples: full buffer, or the nearest
+    # frequency that has one when asked to snap.
+    assert seamless_buffer_length(20000.0, 37.3, 20000) == (20000, 37.3)
+    n, f = seamless_buffer_length(20000.0, 37.3, 20000, snap=True)
+    assert n <= 20000 and f == pytest.approx(37.3, abs=1e-3)
+    assert check_ao_period_integrity(
+        np.sin(2 * np.pi * f * np.arange(n) / 20000.0), 20000.0, f
+    ).seamless
+    with pytest.raises(ValueError, match="Nyquist"):
+        seamless_buffer_length(2000.0, 1000.0, 2000)
+
+
+def test_fft_demodulate_tones_recovers_every_tone_in_one_pass():
+    x = _multi_tone(40_123)
+    results = fft_demodulate_tones(x, 2000.0, [f for f, _ in _TONES], harmonics=(1, 3))
+    assert results[0].window_samples == 40_000   # whole cycles of all three
+    for i, ((_, a), result) in enumerate(zip(_TONES, results)):
+        assert result.fundamental.amplitude == pytest.approx(a, rel=1e-3)
+        assert result.fundamental.phase == pytest.approx(0.1 * i, abs=0.02)
+    assert results[0].leakage_fraction < 0.01     # the other tones are not leakage
+
+
+def test_fft_demodulate_tones_single_tone_matches_fft_demodulate():
+    x = _two_tone(50_000)
+    one = fft_demodulate(x, 20000.0, frequency=37.5)
+    (multi,) = fft_demodulate_tones(x, 20000.0, [37.5], harmonics=(1, 2, 3))
+    assert multi == one
+
+
+def test_fft_demodulate_tones_rejects_shared_bins():
+    with pytest.raises(ValueError, match="share FFT bin"):
+        fft_demodulate_tones(_multi_tone(4000), 2000.0, [37.5, 75.0], harmonics=(1, 2))
+
+
+@pytest.mark.parametrize("n", [40_123, 39_999])
+def test_tone_bins_block_wise_match_one_rfft(n):
+    x = _multi_tone(n)
+    frequencies = [f for f, _ in _TONES]
+    whole = fft_demodulate_tones(x, 2000.0, frequencies, harmonics=(1, 2))
+    acc = ToneBins(2000.0, frequencies, n, harmonics=(1, 2))
+    for chunk in np.array_split(x, 13):
+        acc.push(chunk)
+    for got, want in zip(acc.result(), whole):
+        assert got.window_samples == want.window_samples
+        assert got.leakage_fraction == pytest.approx(want.leakage_fraction, rel=1e-6)
+        for g, w in zip(got.harmonics, want.harmonics):
+            assert g.amplitude == pytest.approx(w.amplitude, rel=1e-9, abs=1e-12)
+        assert got.fundamental.phase == pytest.approx(want.fundamental.phase, abs=1e-9)
@@ -0,0 +1,147 @@
+"""Tests for segmented raw recordings (SWMR segments + JSON index).
+
+A DiskRecorder with a segment limit rolls over into ``*.segNNNN.h5`` files and
+keeps ``*.segments.json`` current; :class:`RawRecording` reads the segments back
+as one row stream (also while recording, via SWMR), and ``finalize_raw_to_h5``
+accepts the index in place of a raw file.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+
+import h5py
+import numpy as np
+import pytest
+
+from pioner.back.acquisition.disk_recorder import DiskRecorder
+from pioner.back.acquisition.raw_recording import RawRecording, segment_index_path
+
+
+
+class FakeRing:
+    """Destructive single-cursor ring stub (matches ExperimentManager's API)."""
+
+    def __init__(self, channels: int = 2):
+        self._channels = channels
+        self._queue: list[np.ndarray] = []
+        self._lock = threading.Lock()
+
+    def reset_ring_cursor(self, consumer_id: str) -> None:
+        pass
+
+    def read_new_samples(self, consumer_id: str) -> np.ndarray:
+        with self._lock:
+            if not self._queue:
+                return np.empty((0, 0), dtype=float)
+            out = np.concatenate(self._queue, axis=0)
+            self._queue = []
+            return out
+
+
+def _feed_ramp(ring, start, n):
+    rows = np.arange(start, start + n, dtype=float)
+    with ring._lock:
+        ring._queue.append(np.repeat(rows[:, None], ring._channels, axis=1))
+
+
+def _segmented(ring, tmp_path, **kw) -> DiskRecorder:
+    # 100 Hz, 2 x float64 -> 4096-row chunks; segment_bytes rounds to whole chunks.
+    return DiskRecorder(ring, str(tmp_path / "x_raw.h5"), consumer_id="t",
+                        poll_interval=0.01, sample_rate=100.0, **kw)
+
+
+def test_rolls_over_and_reads_back_as_one_stream(tmp_path):
+    ring = FakeRing(channels=2)
+    rec = _segmented(ring, tmp_path, segment_bytes=8192 * 16, compression="lzf")
+    rec.start()
+    _feed_ramp(ring, 0, 3000)
+    rec.mark_start()
+    for k in range(1, 10):
+        _feed_ramp(ring, 3000 * k, 3000)
+    path = rec.stop()
+
+    assert path == segment_index_path(str(tmp_path / "x_raw.h5"))
+    assert not (tmp_path / "x_raw.h5").exists()
+    index = json.loads(open(path).read())
+    assert index["complete"] and index["rows"] == 30_000 and index["mark_index"] == 3000
+    assert [s["stop"] - s["start"] for s in index["segments"]] == [8192, 8192, 8192, 5424]
+
+    with RawRecording(path) as rec_in:
+        assert rec_in.rows == 30_000 and rec_in.segment_count == 4
+        assert rec_in.mark_index == 3000
+        summary = rec_in.summary()  # recorder stats, from the index
+        assert summary is not None
+        np.testing.assert_allclose(summary["baseline_mean"], 1499.5)
+        np.testing.assert_allclose(summary["max"], 29_999.0)
+        # A block straddling a segment boundary is stitched in order.
+        assert np.array_equal(rec_in.read(8000, 8400, column=1), np.arange(8000, 8400.0))
+        blocks = [b for _, b in rec_in.iter_blocks(7000)]
+    assert np.array_equal(np.concatenate(blocks)[:, 0], np.arange(30_000.0))
+
+
+def test_active_segment_is_tailable_while_recording(tmp_path):
+    ring = FakeRing(channels=2)
+    rec = _segmented(ring, tmp_path, segment_seconds=60.0)
+    rec.start()
+    _feed_ramp(ring, 0, 20_000)   # > one staging block -> reaches the writer
+    rec.mark_start()
+    with RawRecording(rec.path) as tail:
+        for _ in range(200):
+            if tail.rows >= 16_384:
+                break
+            threading.Event().wait(0.01)
+            tail.refresh()
+        assert not tail.complete
+        assert tail.rows >= 16_384
+        assert np.array_equal(tail.read(0, 100, column=0), np.arange(100.0))
+    rec.stop()
+    with RawRecording(rec.path) as done:
+        assert done.complete and done.rows == 20_000
+
+
+def test_every_index_snapshot_is_consistent(tmp_path, monkeypatch):
+    import pioner.back.acquisition.disk_recorder as dr
+
+    ring = FakeRing(channels=2)
+    rec = _segmented(ring, tmp_path, segment_bytes=8192 * 16)
+    seen = []
+    write = dr.write_segment_index
+
+    def spy(path, index):
+        seen.append(json.loads(json.dumps(index)))
+        write(path, index)
+
+    monkeypatch.setattr(dr, "write_segment_index", spy)
+    rec.start()
+    _feed_ramp(ring, 0, 3000)
+    rec.mark_start()
+    for k in range(1, 10):
+        _feed_ramp(ring, 3000 * k, 3000)
+    rec.stop()
+    assert len(seen) > 4
+    for index in seen:
+        closed = [s["stop"] for s in index["segments"] if s["stop"] is not None]
+        assert all(stop <= index["rows"] for stop in closed)
+    assert seen[-1]["rows"] == 30_000 and seen[-1]["mark_index"] == 3000
+
+
+def test_segment_seconds_needs_rate(tmp_path):
+    with pytest.raises(ValueError, match="sample_rate"):
+        DiskRecorder(FakeRing(), str(tmp_path / "r.h5"), segment_seconds=10.0)
+
+
+def test_monolithic_file_reads_through_same_reader(tmp_path):
+    ring = FakeRing(channels=2)
+    rec = DiskRecorder(ring, str(tmp_path / "r.h5"), consumer_id="t", poll_interval=0.01)
+    rec.start()
+    _feed_ramp(ring, 0, 50)
+    path = rec.stop()
+    with RawRecording(path) as r:
+        assert not r.segmented and r.rows == 50 and r.segment_count == 1
+        assert np.array_equal(r.read(10, 20, column=0), np.arange(10.0, 20.0))
+    with h5py.File(path, "r") as f:
+        assert f["raw_ai"].shape == (50, 2)
+    assert os.path.exists(path)
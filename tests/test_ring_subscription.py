@@ -0,0 +1,137 @@
+"""Tests for push subscriptions on the AI ring (Subscription / OverflowPolicy).
+
+The policy tests drive a :class:`Subscription` directly with synthetic chunks;
+the last test subscribes to a live mock-DAQ ring and checks every ingested
+sample arrives exactly once.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from pioner.back.acquisition import create_ai_provider
+from pioner.back.experiment_manager import ExperimentManager
+from pioner.back.subscription import OverflowPolicy, Subscription
+
+
+def _chunk(start: int, rows: int = 4) -> np.ndarray:
+    return np.arange(start, start + rows, dtype=float).reshape(rows, 1)
+
+
+def test_get_returns_chunks_in_order_and_tracks_lag():
+    sub = Subscription("t", maxsize=4)
+    sub._offer(_chunk(0))
+    sub._offer(_chunk(4))
+    assert sub.lag == 8
+    assert sub.get(timeout=0.1)[0, 0] == 0
+    assert sub.get(timeout=0.1)[0, 0] == 4
+    assert sub.lag == 0 and sub.get(timeout=0.01) is None
+
+
+def test_drop_oldest_counts_drops():
+    sub = Subscription("t", maxsize=2, policy="drop_oldest")
+    for k in range(4):
+        sub._offer(_chunk(4 * k))
+    out = sub.drain()
+    assert out[:, 0].tolist() == list(range(8, 16))
+    stats = sub.stats()
+    assert stats["dropped_chunks"] == 2 and stats["dropped_samples"] == 8
+    assert stats["delivered_chunks"] == 4
+
+
+def test_coalesce_keeps_every_sample():
+    sub = Subscription("t", maxsize=2, policy=OverflowPolicy.COALESCE)
+    for k in range(5):
+        sub._offer(_chunk(4 * k))
+    assert sub.stats()["coalesced_chunks"] == 3 and sub.stats()["dropped_chunks"] == 0
+    assert sub.get(timeout=0.1)[:, 0].tolist() == list(range(4))
+    joined = sub.get(timeout=0.1)
+    assert joined[:, 0].tolist() == list(range(4, 20)) and not joined.flags.writeable
+
+
+def test_coalesce_is_capped_and_falls_back_to_drop_oldest():
+    sub = Subscription("t", maxsize=2, policy="coalesce", coalesce_max_rows=12)
+    for k in range(5):
+        sub._offer(_chunk(4 * k))
+    stats = sub.stats()
+    assert stats["coalesced_chunks"] == 1 and stats["dropped_chunks"] == 2
+    assert stats["lag"] <= 12
+    assert sub.drain()[:, 0].tolist() == list(range(12, 20))
+
+
+def _wait_until(predicate, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+def test_block_waits_off_the_worker_then_falls_back_to_drop():
+    sub = Subscription("t", maxsize=1, policy="block", block_timeout=1.0)
+    sub._offer(_chunk(0))
+    _wait_until(lambda: sub.stats()["delivered_chunks"] == 1)
+    t0 = time.monotonic()
+    sub._offer(_chunk(4))  # queue full: handed to the handoff thread
+    assert time.monotonic() - t0 < 0.05
+    assert sub.get(timeout=0.5)[0, 0] == 0
+    assert sub.get(timeout=0.5)[0, 0] == 4
+    assert sub.stats()["dropped_chunks"] == 0
+    sub.close()
+
+    impatient = Subscription("t", maxsize=1, policy="block", block_timeout=0.02)
+    impatient._offer(_chunk(0))
+    _wait_until(lambda: impatient.stats()["delivered_chunks"] == 1)
+    impatient._offer(_chunk(4))  # nobody consumes: bounded wait, then drop
+    _wait_until(lambda: impatient.stats()["dropped_chunks"] == 1)
+    assert impatient.stats()["dropped_chunks"] == 1
+    assert impatient.drain()[0, 0] == 4
+    impatient.close()
+
+
+def test_callback_delivery_and_close():
+    got: list[np.ndarray] = []
+    sub = Subscription("cb", callback=got.append)
+    sub._offer(_chunk(0))
+    sub.close()
+    sub._offer(_chunk(4))
+    assert len(got) == 1 and sub.stats()["delivered_samples"] == 4
+    with pytest.raises(ValueError):
+        Subscription("bad", maxsize=0)
+
+
+def test_slow_callback_is_counted_and_logged(caplog):
+    sub = Subscription("slow", callback=lambda chunk: time.sleep(0.01), callback_budget=0.001)
+    with caplog.at_level("WARNING", logger="pioner.back.subscription"):
+        for k in range(3):
+            sub._offer(_chunk(4 * k))
+    stats = sub.stats()
+    assert stats["slow_callbacks"] == 3 and stats["callback_max_seconds"] >= 0.01
+    # First overrun and then powers of two only.
+    assert len([r for r in caplog.records if "slow" in r.getMessage()]) == 2
+
+
+def test_ring_subscribers_receive_each_chunk_once(connected_daq, settings):
+    """Two subscribers see the same read-only chunks, covering every sample."""
+    em = ExperimentManager(connected_daq, settings)
+    provider = create_ai_provider("persistent", em, ring_max_seconds=2.0)
+    queued = provider.subscribe("queue", maxsize=64, policy="coalesce")
+    pushed: list[np.ndarray] = []
+    provider.subscribe("callback", callback=pushed.append)
+    provider.on_connect([0, 1, 2, 3, 4, 5])
+    try:
+        deadline = time.monotonic() + 3.0
+        while queued.lag < settings.ai_params.sample_rate and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        provider.on_disconnect()
+        provider.unsubscribe(queued)
+    data = queued.drain()
+    with em._ring_lock:
+        total = em._ring_total_samples
+    assert data.shape == (total, 6)
+    assert sum(c.shape[0] for c in pushed) == total
+    assert pushed[0] is not None and not pushed[0].flags.writeable
+    assert [s["name"] for s in em.subscription_stats()] == ["callback"]
@@ -0,0 +1,61 @@
+"""Tests for SampleCodec -- compact raw AI storage (float32 / int16 counts)."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from pioner.shared.sample_codec import SampleCodec
+
+
+def test_float64_is_identity():
+    codec = SampleCodec.for_storage("float64", 3)
+    volts = np.random.default_rng(0).normal(size=(10, 3))
+    assert codec.encode(volts) is volts
+    assert np.array_equal(codec.decode(codec.encode(volts)), volts)
+    assert codec.attrs() == {"storage_dtype": "float64"}
+
+
+def test_float32_round_trip_within_single_precision():
+    codec = SampleCodec.for_storage("float32", 2)
+    volts = np.random.default_rng(1).uniform(-10, 10, size=(100, 2))
+    stored = codec.encode(volts)
+    assert stored.dtype == np.float32 and codec.itemsize == 4
+    decoded = codec.decode(stored)
+    assert decoded.dtype == np.float64
+    np.testing.assert_allclose(decoded, volts, rtol=1e-6)
+
+
+def test_int16_round_trip_within_half_lsb_and_saturates():
+    codec = SampleCodec.for_storage("int16", 2, full_scale_volts=10.0)
+    lsb = 20.0 / 65536
+    volts = np.random.default_rng(2).uniform(-9.9, 9.9, size=(1000, 2))
+    stored = codec.encode(volts)
+    assert stored.dtype == np.int16 and codec.itemsize == 2
+    assert np.max(np.abs(codec.decode(stored) - volts)) <= lsb / 2 + 1e-12
+    clipped = codec.encode(np.array([[50.0, -50.0]]))
+    assert clipped.tolist() == [[32767, -32768]]
+
+
+def test_int16_decode_column_subset():
+    codec = SampleCodec(
+        dtype="int16", scale=np.array([1.0, 0.5, 0.25]), offset=np.array([0.0, 1.0, 2.0])
+    )
+    stored = np.array([[4, 4, 4]], dtype=np.int16)
+    assert codec.decode(stored).tolist() == [[4.0, 3.0, 3.0]]
+    assert codec.decode(stored[:, 2], 2).tolist() == [3.0]
+
+
+def test_attrs_round_trip():
+    codec = SampleCodec.for_storage("int16", 4, full_scale_volts=5.0)
+    back = SampleCodec.from_attrs(codec.attrs())
+    assert back.dtype == "int16"
+    assert np.array_equal(back.scale, codec.scale) and np.array_equal(back.offset, codec.offset)
+    assert SampleCodec.from_attrs({}).dtype == "float64"
+
+
+def test_int16_requires_full_scale_and_known_dtype():
+    with pytest.raises(ValueError):
+        SampleCodec.for_storage("int16", 2)
+    with pytest.raises(ValueError):
+        SampleCodec.for_storage("int8", 2)
@@ -0,0 +1,136 @@
+"""Tests for SharedRing -- the seqlock shared-memory ring of the process mode."""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+
+import numpy as np
+import pytest
+
+from pioner.back.acquisition.shm_ring import SharedRing
+
+
+def _rows(start: int, stop: int) -> np.ndarray:
+    col = np.arange(start, stop, dtype=float)
+    return np.stack([col, -col, 2 * col], axis=1)
+
+
+def _write_stream(name: str, total: int, seed: int) -> None:
+    """Writer process: append rows ``0..total`` in random-sized chunks."""
+    ring = SharedRing.attach(name)
+    rng = np.random.default_rng(seed)
+    written = 0
+    try:
+        while written < total:
+            # Mostly small chunks, now and then one larger than the ring.
+            n = int(rng.integers(1, 400)) if rng.random() < 0.95 else 3 * ring.capacity
+            n = min(n, total - written)
+            ring.write(_rows(written, written + n))
+            written += n
+    finally:
+        ring.close()
+
+
+@pytest.fixture
+def ring():
+    r = SharedRing.create(capacity=10, n_channels=3)
+    try:
+        yield r
+    finally:
+        r.close()
+
+
+def test_attached_reader_sees_writes(ring):
+    reader = SharedRing.attach(ring.name)
+    try:
+        ring.write(_rows(0, 4))
+        assert reader.total_written() == 4 and reader.capacity == 10
+        rows, head, lost = reader.read(0)
+        assert (head, lost) == (4, 0) and rows[:, 0].tolist() == [0, 1, 2, 3]
+    finally:
+        reader.close()
+
+
+def test_read_across_wrap_and_clamped_stop(ring):
+    ring.write(_rows(0, 8))
+    ring.write(_rows(8, 14))  # wraps
+    rows, head, lost = ring.read(6, 12)
+    assert (head, lost) == (14, 0) and rows[:, 0].tolist() == list(range(6, 12))
+    rows, _, _ = ring.read(10, 99)
+    assert rows[:, 0].tolist() == [10, 11, 12, 13]
+
+
+def test_overwritten_rows_reported_as_lost(ring):
+    ring.write(_rows(0, 25))
+    rows, _, lost = ring.read(3)
+    assert lost == 12 and rows[:, 0].tolist() == list(range(15, 25))
+
+
+def test_oversized_write_keeps_newest(ring):
+    ring.write(_rows(0, 37))
+    assert ring.total_written() == 37
+    rows, _, _ = ring.read(27)
+    assert rows[:, 0].tolist() == list(range(27, 37))
+
+
+def test_storage_dtype_round_trips():
+    r = SharedRing.create(capacity=4, n_channels=2, dtype=np.int16)
+    try:
+        reader = SharedRing.attach(r.name)
+        r.write(np.array([[1, -2], [3, -4]], dtype=np.int16))
+        rows, _, _ = reader.read(0)
+        assert reader.dtype == np.int16 and rows.dtype == np.int16
+        assert rows.tolist() == [[1, -2], [3, -4]]
+        reader.close()
+    finally:
+        r.close()
+
+
+def test_writer_stuck_mid_write_times_out(ring):
+    ring.write(_rows(0, 3))
+    ring._header[0] += 1  # odd sequence word: a write that never finished
+    with pytest.raises(TimeoutError):
+        ring.read(0, timeout=0.05)
+
+
+def test_reader_racing_a_wrapping_writer_never_sees_torn_rows():
+    """A reader polling a ring another process keeps lapping.
+
+    Every row carries its stream index in all columns, so a copy that mixes
+    rows from two writes, or pairs the index with stale rows, shows up as a
+    row whose values do not match its position.
+    """
+    total = 1_000_000
+    ring = SharedRing.create(capacity=1024, n_channels=3)
+    writer = mp.get_context("spawn").Process(
+        target=_write_stream, args=(ring.name, total, 1234), daemon=True
+    )
+    try:
+        writer.start()
+        cursor = reads = lost_total = 0
+        while cursor < total:
+            # A cursor read (the recorder) and a whole-ring read (a peek),
+            # which copies exactly the rows the next write overwrites.
+            for start in (cursor, 0):
+                rows, head, lost = ring.read(start)
+                first = start + lost
+                expected = np.arange(first, first + rows.shape[0], dtype=float)
+                assert head == first + rows.shape[0]
+                np.testing.assert_array_equal(rows[:, 0], expected)
+                np.testing.assert_array_equal(rows[:, 1], -expected)
+                np.testing.assert_array_equal(rows[:, 2], 2 * expected)
+            rows, head, lost = ring.read(cursor)
+            lost_total += lost
+            reads += rows.shape[0] > 0
+            cursor = head
+            if not writer.is_alive() and ring.total_written() == cursor:
+                break
+        writer.join(timeout=10.0)
+        assert writer.exitcode == 0
+        assert cursor == total
+        # The writer lapped the reader repeatedly while it was reading.
+        assert reads > 10 and lost_total > 0
+    finally:
+        if writer.is_alive():
+            writer.terminate()
+        ring.close()